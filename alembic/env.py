@@ -25,6 +25,7 @@ from app.models import user, contractor, client, contract, timesheet
 from app.models import work_order, third_party, quote_sheet, proposal, template
 from app.models import payroll, payslip, invoice, payroll_batch, client_invoice
 from app.models import notification, offboarding, contract_extension, expense
+from app.models import leave_ledger, contractor_pay_terms, payroll_status_count, payslip_run, signed_document, document_job, email_outbox
 
 # this is the Alembic Config object
 config = context.config
@@ -0,0 +1,56 @@
+"""Add contractor_pay_terms snapshot table and payrolls.pay_terms.
+
+contractor_pay_terms stores the pay information ContractorDataExtractor
+derives from the CDS form, costing sheet and deal terms. Rows are built by
+the application (the fallback rules live in Python), lazily on first read
+and whenever the source rows change, so no SQL backfill is done here.
+
+payrolls.pay_terms records the terms each payroll was calculated against.
+
+Revision ID: add_contractor_pay_terms
+Revises: add_period_year_month
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "add_contractor_pay_terms"
+down_revision = "add_period_year_month"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "contractor_pay_terms",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("contractor_id", sa.String, sa.ForeignKey("contractors.id", ondelete="CASCADE"), unique=True, index=True, nullable=False),
+        sa.Column("rate_type", sa.String, nullable=True),
+        sa.Column("currency", sa.String(10), nullable=True),
+        sa.Column("monthly_rate", sa.Float, nullable=True),
+        sa.Column("day_rate", sa.Float, nullable=True),
+        sa.Column("charge_rate_month", sa.Float, nullable=True),
+        sa.Column("charge_rate_day", sa.Float, nullable=True),
+        sa.Column("leave_allowance", sa.Float, nullable=True),
+        sa.Column("third_party_name", sa.String, nullable=True),
+        sa.Column("management_fee", sa.Float, server_default="0"),
+        sa.Column("accrual_gratuity", sa.Float, server_default="0"),
+        sa.Column("accrual_airfare", sa.Float, server_default="0"),
+        sa.Column("accrual_annual_leave", sa.Float, server_default="0"),
+        sa.Column("country", sa.String, nullable=True),
+        sa.Column("client_name", sa.String, nullable=True),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("version", sa.Integer, nullable=False, server_default="1"),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime, server_default=sa.func.now()),
+    )
+    op.create_index("ix_contractor_pay_terms_id", "contractor_pay_terms", ["id"])
+
+    op.add_column("payrolls", sa.Column("pay_terms", sa.JSON, nullable=True))
+
+
+def downgrade():
+    op.drop_column("payrolls", "pay_terms")
+    op.drop_index("ix_contractor_pay_terms_id", table_name="contractor_pay_terms")
+    op.drop_table("contractor_pay_terms")
@@ -0,0 +1,25 @@
+"""Add the published-to record to document_jobs.
+
+Offboarding letters and extension agreements are rendered as document
+jobs; subject_id is the record the finished job's URL is written to.
+
+Revision ID: add_document_job_subject
+Revises: payroll_list_index_desc
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "add_document_job_subject"
+down_revision = "payroll_list_index_desc"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("document_jobs", sa.Column("subject_id", sa.String, nullable=True))
+
+
+def downgrade():
+    op.drop_column("document_jobs", "subject_id")
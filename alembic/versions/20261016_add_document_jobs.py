@@ -0,0 +1,45 @@
+"""Add document_jobs.
+
+Asynchronous document generation requests for any registered PDF
+document type, polled for their result URL.
+
+Revision ID: add_document_jobs
+Revises: add_signed_documents
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "add_document_jobs"
+down_revision = "add_signed_documents"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    job_status = sa.Enum("QUEUED", "RUNNING", "COMPLETED", "FAILED", name="documentjobstatus")
+
+    op.create_table(
+        "document_jobs",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("document_type", sa.String(32), nullable=False),
+        sa.Column("data", sa.JSON, nullable=False),
+        sa.Column("status", job_status, nullable=False),
+        sa.Column("requested_by", sa.String, sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("filename", sa.String, nullable=True),
+        sa.Column("storage_path", sa.String, nullable=True),
+        sa.Column("url", sa.String, nullable=True),
+        sa.Column("size_bytes", sa.Integer, nullable=True),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+        sa.Column("started_at", sa.DateTime, nullable=True),
+        sa.Column("completed_at", sa.DateTime, nullable=True),
+    )
+    op.create_index("ix_document_jobs_requested_by", "document_jobs", ["requested_by"])
+    op.create_index("ix_document_jobs_status_created", "document_jobs", ["status", "created_at"])
+
+
+def downgrade():
+    op.drop_table("document_jobs")
+    sa.Enum(name="documentjobstatus").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,42 @@
+"""Add email_outbox.
+
+Emails written in the same transaction as the change that triggers
+them and delivered by the worker's dispatcher.
+
+Revision ID: add_email_outbox
+Revises: add_document_jobs
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "add_email_outbox"
+down_revision = "add_document_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    outbox_status = sa.Enum("PENDING", "SENDING", "SENT", "DEAD", name="emailoutboxstatus")
+
+    op.create_table(
+        "email_outbox",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("email_type", sa.String(64), nullable=False),
+        sa.Column("recipient", sa.String, nullable=False),
+        sa.Column("data", sa.JSON, nullable=False),
+        sa.Column("status", outbox_status, nullable=False),
+        sa.Column("attempts", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("next_attempt_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
+        sa.Column("claimed_at", sa.DateTime, nullable=True),
+        sa.Column("last_error", sa.Text, nullable=True),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+        sa.Column("sent_at", sa.DateTime, nullable=True),
+    )
+    op.create_index("ix_email_outbox_status_next_attempt", "email_outbox", ["status", "next_attempt_at"])
+
+
+def downgrade():
+    op.drop_table("email_outbox")
+    sa.Enum(name="emailoutboxstatus").drop(op.get_bind(), checkfirst=True)
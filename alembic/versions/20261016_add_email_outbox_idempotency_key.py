@@ -0,0 +1,28 @@
+"""Add the idempotency key of each queued email to email_outbox.
+
+The dispatcher skips a row whose key already belongs to a sent email, so
+the same logical email queued twice (by two processes, or two retried
+requests) is delivered once.
+
+Revision ID: add_email_outbox_idempotency_key
+Revises: add_payslip_run_claim
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "add_email_outbox_idempotency_key"
+down_revision = "add_payslip_run_claim"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("email_outbox", sa.Column("idempotency_key", sa.String(32), nullable=True))
+    op.create_index("ix_email_outbox_idempotency_key", "email_outbox", ["idempotency_key"])
+
+
+def downgrade():
+    op.drop_index("ix_email_outbox_idempotency_key", table_name="email_outbox")
+    op.drop_column("email_outbox", "idempotency_key")
@@ -0,0 +1,27 @@
+"""Add the record an email delivers to email_outbox.
+
+Invoice and payslip emails carry subject_type/subject_id; the dispatcher
+marks that record SENT once the email is delivered.
+
+Revision ID: add_email_outbox_subject
+Revises: add_document_job_subject
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "add_email_outbox_subject"
+down_revision = "add_document_job_subject"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("email_outbox", sa.Column("subject_type", sa.String(32), nullable=True))
+    op.add_column("email_outbox", sa.Column("subject_id", sa.String, nullable=True))
+
+
+def downgrade():
+    op.drop_column("email_outbox", "subject_id")
+    op.drop_column("email_outbox", "subject_type")
@@ -0,0 +1,29 @@
+"""Add contractor and fire-and-forget tracking to email_outbox.
+
+Outbox rows double as per-contractor delivery status (queued, sent,
+failed); fire-and-forget emails are sent with InvocationType="Event".
+
+Revision ID: add_email_outbox_tracking
+Revises: add_email_outbox
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "add_email_outbox_tracking"
+down_revision = "add_email_outbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("email_outbox", sa.Column("contractor_id", sa.String, sa.ForeignKey("contractors.id"), nullable=True))
+    op.add_column("email_outbox", sa.Column("fire_and_forget", sa.Boolean, nullable=False, server_default=sa.false()))
+    op.create_index("ix_email_outbox_contractor_id", "email_outbox", ["contractor_id"])
+
+
+def downgrade():
+    op.drop_index("ix_email_outbox_contractor_id", table_name="email_outbox")
+    op.drop_column("email_outbox", "fire_and_forget")
+    op.drop_column("email_outbox", "contractor_id")
@@ -0,0 +1,93 @@
+"""Add leave_ledger table with per-contractor monthly leave totals.
+
+Backfills one row per contractor-month from approved timesheets, with a
+running year-to-date vacation total, then walks the years in order to
+apply the max-5-day carry-over from each previous year's closing balance.
+
+Revision ID: add_leave_ledger
+Revises: decompose_contractors
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "add_leave_ledger"
+down_revision = "decompose_contractors"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "leave_ledger",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("contractor_id", sa.String, sa.ForeignKey("contractors.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("year", sa.Integer, nullable=False),
+        sa.Column("month", sa.Integer, nullable=False),
+        sa.Column("vacation_days", sa.Float, server_default="0"),
+        sa.Column("sick_days", sa.Float, server_default="0"),
+        sa.Column("unpaid_days", sa.Float, server_default="0"),
+        sa.Column("ytd_vacation_days", sa.Float, server_default="0"),
+        sa.Column("leave_allowance", sa.Float, server_default="0"),
+        sa.Column("carry_over_days", sa.Float, server_default="0"),
+        sa.Column("leave_balance", sa.Float, server_default="0"),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime, server_default=sa.func.now()),
+        sa.UniqueConstraint("contractor_id", "year", "month", name="uq_leave_ledger_contractor_period"),
+    )
+    op.create_index("ix_leave_ledger_id", "leave_ledger", ["id"])
+    op.create_index("ix_leave_ledger_contractor_year", "leave_ledger", ["contractor_id", "year"])
+
+    # Month totals + running YTD vacation from approved timesheets.
+    # Allowance follows ContractorDataExtractor: deal terms -> CDS -> 30 days.
+    op.execute("""
+        INSERT INTO leave_ledger (contractor_id, year, month, vacation_days, sick_days, unpaid_days, ytd_vacation_days, leave_allowance, carry_over_days, leave_balance)
+        SELECT m.contractor_id, m.year, m.month, m.vacation_days, m.sick_days, m.unpaid_days,
+               SUM(m.vacation_days) OVER (PARTITION BY m.contractor_id, m.year ORDER BY m.month),
+               COALESCE(
+                   CASE WHEN dt.leave_allowance ~ '^[0-9]+(\\.[0-9]+)?$' THEN dt.leave_allowance::float END,
+                   CASE WHEN c.cds_form_data->>'leaveAllowance' ~ '^[0-9]+(\\.[0-9]+)?$' THEN (c.cds_form_data->>'leaveAllowance')::float END,
+                   30
+               ),
+               0, 0
+        FROM (
+            SELECT contractor_id, year, month_number AS month,
+                   COALESCE(SUM(vacation_days), 0) AS vacation_days,
+                   COALESCE(SUM(sick_days), 0) AS sick_days,
+                   COALESCE(SUM(unpaid_days), 0) AS unpaid_days
+            FROM timesheets
+            WHERE status = 'APPROVED'
+            GROUP BY contractor_id, year, month_number
+        ) m
+        JOIN contractors c ON c.id = m.contractor_id
+        LEFT JOIN contractor_deal_terms dt ON dt.contractor_id = m.contractor_id
+    """)
+
+    # Carry-over depends on the previous year's closing balance, so apply
+    # it one year at a time in ascending order.
+    conn = op.get_bind()
+    years = [row[0] for row in conn.execute(sa.text("SELECT DISTINCT year FROM leave_ledger ORDER BY year"))]
+    for year in years:
+        conn.execute(sa.text("""
+            UPDATE leave_ledger l
+            SET carry_over_days = COALESCE((
+                SELECT LEAST(5, GREATEST(0, p.leave_balance))
+                FROM leave_ledger p
+                WHERE p.contractor_id = l.contractor_id AND p.year = l.year - 1
+                ORDER BY p.month DESC
+                LIMIT 1
+            ), 0)
+            WHERE l.year = :year
+        """), {"year": year})
+        conn.execute(sa.text("""
+            UPDATE leave_ledger
+            SET leave_balance = leave_allowance + carry_over_days - ytd_vacation_days
+            WHERE year = :year
+        """), {"year": year})
+
+
+def downgrade():
+    op.drop_index("ix_leave_ledger_contractor_year", table_name="leave_ledger")
+    op.drop_index("ix_leave_ledger_id", table_name="leave_ledger")
+    op.drop_table("leave_ledger")
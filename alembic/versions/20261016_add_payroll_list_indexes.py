@@ -0,0 +1,26 @@
+"""Add indexes for the paginated payroll list.
+
+(created_at, id) backs keyset pagination of GET /api/v1/payroll/;
+batch_id backs the batch filter and per-batch status counts.
+
+Revision ID: add_payroll_list_indexes
+Revises: add_payroll_status_counts
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers
+revision = "add_payroll_list_indexes"
+down_revision = "add_payroll_status_counts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_payrolls_created_at_id", "payrolls", ["created_at", "id"])
+    op.create_index("ix_payrolls_batch_id", "payrolls", ["batch_id"])
+
+
+def downgrade():
+    op.drop_index("ix_payrolls_batch_id", table_name="payrolls")
+    op.drop_index("ix_payrolls_created_at_id", table_name="payrolls")
@@ -0,0 +1,41 @@
+"""Add payroll_status_counts cached counters.
+
+One row per payroll status, adjusted in the same transaction as payroll
+inserts, deletes and status changes when PAYROLL_STATUS_COUNTERS is on.
+Backfilled here from a grouped count of the existing payrolls.
+
+Revision ID: add_payroll_status_counts
+Revises: add_contractor_pay_terms
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = "add_payroll_status_counts"
+down_revision = "add_contractor_pay_terms"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "payroll_status_counts",
+        # Reuses the existing payrollstatus enum type from the payrolls table
+        sa.Column("status", postgresql.ENUM(name="payrollstatus", create_type=False), primary_key=True),
+        sa.Column("count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime, server_default=sa.func.now()),
+    )
+
+    op.execute("""
+        INSERT INTO payroll_status_counts (status, count, updated_at)
+        SELECT status, COUNT(*), NOW()
+        FROM payrolls
+        WHERE status IS NOT NULL
+        GROUP BY status
+    """)
+
+
+def downgrade():
+    op.drop_table("payroll_status_counts")
@@ -0,0 +1,25 @@
+"""Add a lease to payslip_runs.
+
+claimed_at is renewed as a run makes progress; a RUNNING run whose
+lease has expired was left by a dead process and is reclaimed.
+
+Revision ID: add_payslip_run_claim
+Revises: add_email_outbox_subject
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "add_payslip_run_claim"
+down_revision = "add_email_outbox_subject"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("payslip_runs", sa.Column("claimed_at", sa.DateTime, nullable=True))
+
+
+def downgrade():
+    op.drop_column("payslip_runs", "claimed_at")
@@ -0,0 +1,57 @@
+"""Add payslip_runs and payslip_run_items.
+
+Background payslip generation for Freelancer/WPS batches, with one
+progress row per payroll so clients can poll a run.
+
+Revision ID: add_payslip_runs
+Revises: add_payroll_list_indexes
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "add_payslip_runs"
+down_revision = "add_payroll_list_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    run_status = sa.Enum("QUEUED", "RUNNING", "COMPLETED", name="paysliprunstatus")
+    item_status = sa.Enum("PENDING", "UPLOADED", "SENT", "FAILED", name="paysliprunitemstatus")
+
+    op.create_table(
+        "payslip_runs",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("batch_id", sa.Integer, sa.ForeignKey("payroll_batches.id"), nullable=False),
+        sa.Column("status", run_status, nullable=False),
+        sa.Column("total", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+        sa.Column("started_at", sa.DateTime, nullable=True),
+        sa.Column("completed_at", sa.DateTime, nullable=True),
+    )
+    op.create_index("ix_payslip_runs_id", "payslip_runs", ["id"])
+    op.create_index("ix_payslip_runs_batch_id", "payslip_runs", ["batch_id"])
+
+    op.create_table(
+        "payslip_run_items",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("run_id", sa.Integer, sa.ForeignKey("payslip_runs.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("payroll_id", sa.Integer, sa.ForeignKey("payrolls.id"), nullable=False),
+        sa.Column("contractor_id", sa.String, sa.ForeignKey("contractors.id"), nullable=True),
+        sa.Column("status", item_status, nullable=False),
+        sa.Column("pdf_url", sa.String, nullable=True),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("sent_at", sa.DateTime, nullable=True),
+        sa.Column("updated_at", sa.DateTime, server_default=sa.func.now()),
+    )
+    op.create_index("ix_payslip_run_items_id", "payslip_run_items", ["id"])
+    op.create_index("ix_payslip_run_items_run_status", "payslip_run_items", ["run_id", "status"])
+
+
+def downgrade():
+    op.drop_table("payslip_run_items")
+    op.drop_table("payslip_runs")
+    sa.Enum(name="paysliprunitemstatus").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="paysliprunstatus").drop(op.get_bind(), checkfirst=True)
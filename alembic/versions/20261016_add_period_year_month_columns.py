@@ -0,0 +1,50 @@
+"""Add indexed year/month_number period columns.
+
+payrolls, payroll_batches and client_invoices store their period as a
+display string ("January 2026"). Adds integer year/month_number columns
+parsed from it, with composite indexes, so period filters and ordering
+no longer depend on string matching. The string stays as a display field.
+
+Revision ID: add_period_year_month
+Revises: add_leave_ledger
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "add_period_year_month"
+down_revision = "add_leave_ledger"
+branch_labels = None
+depends_on = None
+
+PERIOD_TABLES = ("payrolls", "payroll_batches", "client_invoices")
+
+PERIOD_PATTERN = (
+    "^(January|February|March|April|May|June|July|August|September|October|November|December) [0-9]{4}$"
+)
+
+
+def upgrade():
+    for table in PERIOD_TABLES:
+        op.add_column(table, sa.Column("year", sa.Integer, nullable=True))
+        op.add_column(table, sa.Column("month_number", sa.Integer, nullable=True))
+        op.execute(f"""
+            UPDATE {table}
+            SET year = split_part(trim(period), ' ', 2)::int,
+                month_number = EXTRACT(MONTH FROM to_date(split_part(trim(period), ' ', 1), 'Month'))::int
+            WHERE trim(period) ~ '{PERIOD_PATTERN}'
+        """)
+
+    op.create_index("ix_payrolls_year_month", "payrolls", ["year", "month_number"])
+    op.create_index("ix_payroll_batches_year_month_client", "payroll_batches", ["year", "month_number", "client_id"])
+    op.create_index("ix_client_invoices_client_year_month", "client_invoices", ["client_id", "year", "month_number"])
+
+
+def downgrade():
+    op.drop_index("ix_client_invoices_client_year_month", table_name="client_invoices")
+    op.drop_index("ix_payroll_batches_year_month_client", table_name="payroll_batches")
+    op.drop_index("ix_payrolls_year_month", table_name="payrolls")
+    for table in PERIOD_TABLES:
+        op.drop_column(table, "month_number")
+        op.drop_column(table, "year")
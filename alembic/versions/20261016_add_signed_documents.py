@@ -0,0 +1,49 @@
+"""Add signed_documents.
+
+Immutable PDFs of signed contracts, COHFs, work orders and quote sheets,
+rendered once at signing time and served for every later view.
+
+Revision ID: add_signed_documents
+Revises: add_payslip_runs
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "add_signed_documents"
+down_revision = "add_payslip_runs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    document_status = sa.Enum("PENDING", "READY", "FAILED", name="signeddocumentstatus")
+
+    op.create_table(
+        "signed_documents",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("document_type", sa.String(32), nullable=False),
+        sa.Column("subject_id", sa.String, nullable=False),
+        sa.Column("contractor_id", sa.String, sa.ForeignKey("contractors.id"), nullable=True),
+        sa.Column("stage", sa.String(32), nullable=False),
+        sa.Column("title", sa.String, nullable=True),
+        sa.Column("signed_by", sa.String, nullable=True),
+        sa.Column("signer_user_id", sa.String, sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("status", document_status, nullable=False),
+        sa.Column("filename", sa.String, nullable=False),
+        sa.Column("storage_path", sa.String, nullable=True),
+        sa.Column("url", sa.String, nullable=True),
+        sa.Column("sha256", sa.String(64), nullable=True),
+        sa.Column("size_bytes", sa.Integer, nullable=True),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+        sa.Column("rendered_at", sa.DateTime, nullable=True),
+    )
+    op.create_index("ix_signed_documents_id", "signed_documents", ["id"])
+    op.create_index("ix_signed_documents_subject", "signed_documents", ["document_type", "subject_id", "id"])
+
+
+def downgrade():
+    op.drop_table("signed_documents")
+    sa.Enum(name="signeddocumentstatus").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,31 @@
+"""Recreate the payroll list index in the order the list is read.
+
+The list pages by created_at DESC NULLS LAST, id DESC. A plain
+(created_at, id) index read backward gives DESC NULLS FIRST, so every
+page needed a sort.
+
+Revision ID: payroll_list_index_desc
+Revises: add_email_outbox_tracking
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "payroll_list_index_desc"
+down_revision = "add_email_outbox_tracking"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index("ix_payrolls_created_at_id", table_name="payrolls")
+    op.create_index(
+        "ix_payrolls_created_at_id", "payrolls",
+        [sa.text("created_at DESC NULLS LAST"), sa.text("id DESC")],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_payrolls_created_at_id", table_name="payrolls")
+    op.create_index("ix_payrolls_created_at_id", "payrolls", ["created_at", "id"])
@@ -6,6 +6,7 @@ from app.adapters.email.interface import (
     EmailAttachment,
 )
 from app.adapters.email.resend_adapter import LambdaEmailSender, MockEmailSender
+from app.adapters.email.stub_lambda import StubLambdaClient
 from app.adapters.email.template_engine import (
     EmailTemplateEngine,
     get_email_template_engine,
@@ -21,6 +22,7 @@ __all__ = [
     # Implementations
     "LambdaEmailSender",
     "MockEmailSender",
+    "StubLambdaClient",
     # Template engine (kept for non-email uses)
     "EmailTemplateEngine",
     "get_email_template_engine",
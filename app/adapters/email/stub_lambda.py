@@ -0,0 +1,76 @@
+"""
+Local stand-in for the email Lambda.
+
+StubLambdaClient answers invoke() like the boto3 Lambda client does for
+the email function, single and batch events alike, after a configurable
+delay and without any AWS access. It records what was delivered, so
+tests and benchmarks can measure sending throughput. Set
+EMAIL_LAMBDA_STUB=true to use it in place of the real client.
+"""
+import io
+import json
+import threading
+import time
+import uuid
+from typing import Iterable, List, Tuple
+
+
+class StubLambdaClient:
+    """
+    In-process email Lambda.
+
+    RequestResponse invocations take latency_seconds plus
+    per_message_seconds for each message. A rejected recipient fails a
+    single-message invocation with a FunctionError, and is reported in a
+    batch as {"failed": [{"index", "error"}]}. Event invocations only take
+    event_latency_seconds (the time Lambda needs to queue the event).
+    """
+
+    def __init__(
+        self,
+        latency_seconds: float = 0.05,
+        per_message_seconds: float = 0.0,
+        event_latency_seconds: float = 0.005,
+        fail_recipients: Iterable[str] = (),
+    ):
+        self.latency_seconds = latency_seconds
+        self.per_message_seconds = per_message_seconds
+        self.event_latency_seconds = event_latency_seconds
+        self.fail_recipients = set(fail_recipients)
+        self.invocations: List[Tuple[str, int]] = []  # (invocation type, message count)
+        self.delivered: List[dict] = []
+        self._lock = threading.Lock()
+
+    def invoke(self, FunctionName: str, InvocationType: str = "RequestResponse", Payload: bytes = b"{}", **kwargs) -> dict:
+        body = json.loads(Payload)["body"]
+        messages = body["batch"] if "batch" in body else [body]
+        failed = [
+            {"index": i, "error": "Address rejected"}
+            for i, message in enumerate(messages) if message["recipient"] in self.fail_recipients
+        ]
+        rejected = {f["index"] for f in failed}
+
+        if InvocationType == "Event":
+            time.sleep(self.event_latency_seconds)
+        else:
+            time.sleep(self.latency_seconds + self.per_message_seconds * len(messages))
+
+        with self._lock:
+            self.invocations.append((InvocationType, len(messages)))
+            self.delivered.extend(m for i, m in enumerate(messages) if i not in rejected)
+
+        metadata = {"RequestId": str(uuid.uuid4())}
+        if InvocationType == "Event":
+            return {"StatusCode": 202, "Payload": io.BytesIO(b""), "ResponseMetadata": metadata}
+        if "batch" not in body and failed:
+            error = {"errorMessage": failed[0]["error"], "errorType": "Exception"}
+            return {
+                "StatusCode": 200, "FunctionError": "Unhandled",
+                "Payload": io.BytesIO(json.dumps(error).encode()), "ResponseMetadata": metadata,
+            }
+        return {"StatusCode": 200, "Payload": io.BytesIO(json.dumps({"failed": failed}).encode()), "ResponseMetadata": metadata}
+
+    def delivered_to(self) -> List[str]:
+        """Recipients delivered so far, in delivery order."""
+        with self._lock:
+            return [m["recipient"] for m in self.delivered]
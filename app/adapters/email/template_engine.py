@@ -1,16 +1,30 @@
 """
 Email template engine.
 
-Jinja2-based template rendering for emails.
+Jinja2-based template rendering for emails. Templates are compiled once
+(precompile() at startup) with their bytecode kept on disk, so a
+restarted worker loads them instead of parsing them again. The static
+parts of base.html (styles, header, footer) are rendered once per
+branding context and reused by every email.
 """
+import os
+import tempfile
+import threading
 from pathlib import Path
-from typing import Any, Tuple, Optional
-from jinja2 import Environment, FileSystemLoader, select_autoescape, TemplateNotFound
+from typing import Any, Dict, Tuple, Optional
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, pass_context, select_autoescape, TemplateNotFound
+from markupsafe import Markup
 from app.config.settings import settings
 from app.telemetry.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Context variables the static base.html fragments depend on
+BRANDING_KEYS = ("company_name", "logo_url", "frontend_url", "support_email", "current_year")
+
+# Rendered fragments kept per engine (a handful of branding contexts in practice)
+FRAGMENT_CACHE_SIZE = 256
+
 
 class EmailTemplateEngine:
     """
@@ -44,10 +58,61 @@ class EmailTemplateEngine:
             autoescape=select_autoescape(["html", "xml"]),
             trim_blocks=True,
             lstrip_blocks=True,
+            bytecode_cache=self._bytecode_cache(),
+            auto_reload=settings.debug,  # Templates only change on deploy
+            cache_size=-1,  # Keep every compiled template
         )
+        self._fragments: Dict[tuple, Markup] = {}
+        self._fragments_lock = threading.Lock()
 
         # Register custom filters
         self._register_filters()
+        self.env.globals["branding_fragment"] = self.branding_fragment
+
+    @staticmethod
+    def _bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+        """On-disk cache of compiled templates, shared across restarts."""
+        if not settings.email_template_bytecode_cache:
+            return None
+        directory = settings.email_template_cache_dir or os.path.join(tempfile.gettempdir(), "email-templates")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            return FileSystemBytecodeCache(directory)
+        except OSError as e:
+            logger.warning("Email template bytecode cache disabled", extra={"directory": directory, "error": str(e)})
+            return None
+
+    def precompile(self) -> int:
+        """
+        Compile every email template now rather than on first use.
+
+        Returns:
+            Number of templates compiled (or loaded from the bytecode cache)
+        """
+        names = self.env.list_templates(filter_func=lambda name: name.startswith("email/") and name.endswith(".html"))
+        for name in names:
+            self.env.get_template(name)
+        logger.info("Email templates compiled", extra={"templates": len(names)})
+        return len(names)
+
+    @pass_context
+    def branding_fragment(self, context, name: str) -> Markup:
+        """
+        Render a static template fragment, memoized per branding context.
+
+        Used by base.html for its styles, header and footer, which only
+        depend on BRANDING_KEYS.
+        """
+        branding = tuple(context.get(key) for key in BRANDING_KEYS)
+        key = (name, branding)
+        fragment = self._fragments.get(key)
+        if fragment is None:
+            fragment = Markup(self.env.get_template(name).render(dict(zip(BRANDING_KEYS, branding))))
+            with self._fragments_lock:
+                if len(self._fragments) >= FRAGMENT_CACHE_SIZE:
+                    self._fragments.clear()
+                self._fragments[key] = fragment
+        return fragment
 
     def _register_filters(self):
         """Register custom Jinja2 filters."""
@@ -0,0 +1,218 @@
+"""
+Shared PDF styles and assets.
+
+Process-wide registry of the brand palette, the ReportLab sample styles,
+named style sets, pre-decoded logos and a bounded LRU of decoded
+signature/data-URI images. Everything is built once (see
+warm(), run at start-up and in every render worker) and shared by all
+generators, so a render no longer re-reads and re-decodes logo PNGs or
+rebuilds the same styles.
+
+Treat what the registry returns as read-only - the same objects are
+handed to every render.
+
+Usage:
+    @style_set
+    def _styles(sample):
+        return {"body": ParagraphStyle("Body", parent=sample["BodyText"], fontSize=10)}
+
+    body_style = _styles()["body"]
+    logo = logo_image("av-logo.png", width=40*mm, height=12*mm)
+    signature = data_image(signature_data, width=60*mm, height=15*mm)
+"""
+import base64
+import functools
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from PIL import Image as PILImage
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Image
+
+from app.config.settings import settings
+from app.telemetry.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Drawn signatures are exported from the browser canvas at screen size or
+# larger; they are drawn at most ~60mm wide, so anything past this is
+# shrunk once at decode time instead of being embedded at full size.
+SIGNATURE_MAX_PX = 600
+
+STATIC_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "static"))
+
+# Brand palette shared by the generators
+COLORS: Mapping[str, colors.Color] = MappingProxyType({
+    "orange": colors.HexColor("#FF6B00"),
+    "black": colors.HexColor("#111111"),
+    "dark_gray": colors.HexColor("#1F2937"),
+    "dark_text": colors.HexColor("#333333"),
+    "light_text": colors.HexColor("#666666"),
+    "light_gray": colors.HexColor("#F3F4F6"),
+    "border": colors.HexColor("#DDDDDD"),
+    "bg_light": colors.HexColor("#F8F8F8"),
+    "teal": colors.HexColor("#00A99D"),
+})
+
+_lock = threading.Lock()
+_logos: Dict[str, Optional[ImageReader]] = {}
+_style_sets = []
+_data_images: "OrderedDict[str, Optional[ImageReader]]" = OrderedDict()
+
+
+@functools.lru_cache(maxsize=None)
+def sample_styles() -> Mapping[str, Any]:
+    """ReportLab's sample stylesheet (names and aliases), built once."""
+    sheet = getSampleStyleSheet()
+    return MappingProxyType({**sheet.byAlias, **sheet.byName})
+
+
+def style_set(builder: Callable[[Mapping[str, Any]], Dict[str, Any]]) -> Callable[[], Mapping[str, Any]]:
+    """
+    Turn a style builder into a cached, read-only style set.
+
+    The builder receives the sample styles and returns named
+    ParagraphStyles/TableStyles; it runs once per process.
+    """
+    @functools.lru_cache(maxsize=None)
+    def get() -> Mapping[str, Any]:
+        return MappingProxyType(dict(builder(sample_styles())))
+
+    functools.update_wrapper(get, builder)
+    _style_sets.append(get)
+    return get
+
+
+def _resolve(name: str) -> str:
+    return name if os.path.isabs(name) else os.path.join(STATIC_DIR, name)
+
+
+def _predecode(reader: ImageReader) -> ImageReader:
+    """Decode pixel data (and the alpha mask, if any) now rather than on first draw."""
+    reader.getRGBData()
+    if getattr(reader, "_dataA", None) is not None:
+        reader._dataA.getRGBData()
+    return reader
+
+
+def logo_reader(name: str) -> Optional[ImageReader]:
+    """
+    Decoded image for a file in app/static (or an absolute path).
+
+    Decoded once per process; None if the file is missing or unreadable.
+    """
+    path = _resolve(name)
+    reader = _logos.get(path)
+    if reader is not None or path in _logos:
+        return reader
+
+    with _lock:
+        if path not in _logos:
+            try:
+                reader = _predecode(ImageReader(path))
+            except Exception as e:
+                if os.path.exists(path):
+                    logger.error("Logo could not be decoded", extra={"path": path, "error": str(e)})
+                reader = None
+            _logos[path] = reader
+        return _logos[path]
+
+
+class SharedImage(Image):
+    """Image flowable drawing an already decoded, shared ImageReader."""
+
+    def __init__(self, reader: ImageReader, width=None, height=None, kind="direct", hAlign="CENTER"):
+        # Mirrors Image.__init__ for file-like sources, minus the decode
+        self.hAlign = hAlign
+        self._mask = "auto"
+        self._drawing = None
+        self._dpi = False
+        self._file = None
+        self.filename = repr(reader)
+        self._img = reader
+        self._setup(width, height, kind, 0)
+
+
+def logo_image(name: str, width=None, height=None, kind: str = "direct", hAlign: str = "CENTER") -> Optional[Image]:
+    """New flowable for a shared logo, or None if the logo is unavailable."""
+    reader = logo_reader(name)
+    if reader is None:
+        return None
+    return SharedImage(reader, width=width, height=height, kind=kind, hAlign=hAlign)
+
+
+def _decode_data_image(payload: str) -> ImageReader:
+    image = PILImage.open(BytesIO(base64.b64decode(payload)))
+    image.load()
+    if max(image.size) > SIGNATURE_MAX_PX:
+        image.thumbnail((SIGNATURE_MAX_PX, SIGNATURE_MAX_PX), PILImage.LANCZOS)
+    return _predecode(ImageReader(image))
+
+
+def data_image_reader(data: str) -> Optional[ImageReader]:
+    """
+    Decoded, pre-scaled image for base64 data (a drawn signature or data URI).
+
+    Kept in an LRU keyed by a hash of the data, so the same signature is
+    decoded once per process rather than once per render. None (also
+    cached) if the data is not a readable image.
+    """
+    payload = data.split(",", 1)[1] if data.startswith("data:") else data
+    key = hashlib.sha256(payload.encode()).hexdigest()
+
+    with _lock:
+        if key in _data_images:
+            _data_images.move_to_end(key)
+            return _data_images[key]
+
+        try:
+            reader = _decode_data_image(payload)
+        except Exception as e:
+            logger.warning("Image data could not be decoded", extra={"key": key[:12], "error": str(e)})
+            reader = None
+
+        _data_images[key] = reader
+        while len(_data_images) > max(1, settings.pdf_signature_cache_size):
+            _data_images.popitem(last=False)
+        return reader
+
+
+def data_image(data: str, width=None, height=None, kind: str = "direct", hAlign: str = "CENTER") -> Optional[Image]:
+    """New flowable for base64 image data, or None if it cannot be decoded."""
+    reader = data_image_reader(data)
+    if reader is None:
+        return None
+    return SharedImage(reader, width=width, height=height, kind=kind, hAlign=hAlign)
+
+
+def configure_reportlab() -> None:
+    """
+    Apply this app's process-wide ReportLab output settings.
+
+    Without ReportLab's C accelerator, ASCII85-encoding every image and
+    page stream in pure Python dominated render time; binary streams are
+    valid PDF and smaller. ReportLab only reads this from rl_config, not
+    per document, so it is set explicitly by the processes that render
+    (app start-up, render workers, the background worker) rather than
+    on import.
+    """
+    rl_config.useA85 = 0
+
+
+def warm() -> None:
+    """Build the sample styles, every registered style set and the static logos."""
+    sample_styles()
+    for get in list(_style_sets):
+        get()
+    if os.path.isdir(STATIC_DIR):
+        for filename in sorted(os.listdir(STATIC_DIR)):
+            if filename.lower().endswith((".png", ".jpg", ".jpeg")):
+                logo_reader(filename)
@@ -4,6 +4,7 @@ Base PDF generator.
 Provides common PDF generation functionality using ReportLab.
 All document-specific generators inherit from this class.
 """
+import os
 from abc import abstractmethod
 from typing import Dict, Any, Optional, List, Tuple
 from io import BytesIO
@@ -11,7 +12,7 @@ from datetime import datetime
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import inch, mm
 from reportlab.platypus import (
     SimpleDocTemplate,
@@ -24,6 +25,7 @@ from reportlab.platypus import (
 )
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
 
+from app.adapters.pdf.assets import style_set, logo_image
 from app.adapters.pdf.interface import IPDFGenerator, PDFResult
 from app.config.settings import settings
 from app.telemetry.logger import get_logger
@@ -59,65 +61,8 @@ class BasePDFGenerator(IPDFGenerator):
     BORDER_COLOR = colors.HexColor("#e0e0e0")
 
     def __init__(self):
-        """Initialize base generator with styles."""
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
-
-    def _setup_custom_styles(self):
-        """Set up custom paragraph styles."""
-        # Title style
-        self.styles.add(ParagraphStyle(
-            name="DocumentTitle",
-            parent=self.styles["Heading1"],
-            fontSize=18,
-            textColor=self.PRIMARY_COLOR,
-            alignment=TA_CENTER,
-            spaceAfter=20,
-        ))
-
-        # Section header
-        self.styles.add(ParagraphStyle(
-            name="SectionHeader",
-            parent=self.styles["Heading2"],
-            fontSize=12,
-            textColor=self.SECONDARY_COLOR,
-            spaceBefore=15,
-            spaceAfter=10,
-            fontName="Helvetica-Bold",
-        ))
-
-        # Body text
-        self.styles.add(ParagraphStyle(
-            name="BodyText",
-            parent=self.styles["Normal"],
-            fontSize=10,
-            leading=14,
-            alignment=TA_JUSTIFY,
-        ))
-
-        # Small text
-        self.styles.add(ParagraphStyle(
-            name="SmallText",
-            parent=self.styles["Normal"],
-            fontSize=8,
-            textColor=colors.gray,
-        ))
-
-        # Field label
-        self.styles.add(ParagraphStyle(
-            name="FieldLabel",
-            parent=self.styles["Normal"],
-            fontSize=9,
-            textColor=colors.gray,
-        ))
-
-        # Field value
-        self.styles.add(ParagraphStyle(
-            name="FieldValue",
-            parent=self.styles["Normal"],
-            fontSize=10,
-            fontName="Helvetica-Bold",
-        ))
+        """Initialize base generator with the shared styles."""
+        self.styles = _base_styles()
 
     def generate(self, data: Dict[str, Any]) -> PDFResult:
         """Generate PDF document."""
@@ -215,11 +160,9 @@ class BasePDFGenerator(IPDFGenerator):
         # Add logo if available
         logo_path = data.get("logo_path") or settings.logo_path
         if logo_path:
-            try:
-                logo = Image(logo_path, width=1.5 * inch, height=0.5 * inch)
+            logo = logo_image(os.path.abspath(logo_path), width=1.5 * inch, height=0.5 * inch)
+            if logo:
                 elements.append(logo)
-            except Exception:
-                pass
 
         elements.append(Spacer(1, 10))
         return elements
@@ -371,3 +314,60 @@ class BasePDFGenerator(IPDFGenerator):
         ]))
 
         return table
+
+
+
+@style_set
+def _base_styles(sample):
+    """Sample styles plus the generator's custom styles, built once per process."""
+    custom = [
+        # Title style
+        ParagraphStyle(
+            name="DocumentTitle",
+            parent=sample["Heading1"],
+            fontSize=18,
+            textColor=BasePDFGenerator.PRIMARY_COLOR,
+            alignment=TA_CENTER,
+            spaceAfter=20,
+        ),
+        # Section header
+        ParagraphStyle(
+            name="SectionHeader",
+            parent=sample["Heading2"],
+            fontSize=12,
+            textColor=BasePDFGenerator.SECONDARY_COLOR,
+            spaceBefore=15,
+            spaceAfter=10,
+            fontName="Helvetica-Bold",
+        ),
+        # Body text (replaces the sample BodyText)
+        ParagraphStyle(
+            name="BodyText",
+            parent=sample["Normal"],
+            fontSize=10,
+            leading=14,
+            alignment=TA_JUSTIFY,
+        ),
+        # Small text
+        ParagraphStyle(
+            name="SmallText",
+            parent=sample["Normal"],
+            fontSize=8,
+            textColor=colors.gray,
+        ),
+        # Field label
+        ParagraphStyle(
+            name="FieldLabel",
+            parent=sample["Normal"],
+            fontSize=9,
+            textColor=colors.gray,
+        ),
+        # Field value
+        ParagraphStyle(
+            name="FieldValue",
+            parent=sample["Normal"],
+            fontSize=10,
+            fontName="Helvetica-Bold",
+        ),
+    ]
+    return {**sample, **{style.name: style for style in custom}}
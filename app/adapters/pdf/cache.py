@@ -0,0 +1,279 @@
+"""
+Content-addressed cache for generated PDFs.
+
+Keys are a SHA-256 of the generator name, generator version and the
+normalized input data (signature data included), so any change to the
+underlying record yields a new key and stale renders are never served -
+they simply age out. Two tiers: a bounded in-memory LRU and an optional
+on-disk store shared by workers on the same host. The disk tier holds
+personal data (signed contracts, payslips), so its files are private to
+the service user and are pruned by age and total size; renders keyed by
+today's date are kept in memory only.
+
+Usage:
+    @cached_pdf("work_order", version=1)
+    def generate_work_order_pdf(work_order_data: dict) -> BytesIO:
+        ...
+"""
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from io import BytesIO
+from typing import Any, Callable, Optional
+
+from app.config.settings import settings
+from app.telemetry.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Minimum time between two disk prunes triggered by writes
+PRUNE_INTERVAL_SECONDS = 60
+
+
+def normalize(value: Any) -> Any:
+    """Reduce input data to a JSON-stable structure for hashing."""
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, (Decimal, datetime, date)):
+        return str(value)
+    if isinstance(value, Enum):
+        return normalize(value.value)
+    if isinstance(value, (bytes, bytearray)):
+        return "sha256:" + hashlib.sha256(value).hexdigest()
+    if isinstance(value, dict):
+        return {str(k): normalize(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [normalize(v) for v in value]
+        return sorted(items, key=repr) if isinstance(value, (set, frozenset)) else items
+    # Unknown objects must not collide, so fall back to their repr
+    return repr(value)
+
+
+def cache_key(generator: str, version: Any, data: Any) -> str:
+    """Content address for one render."""
+    payload = json.dumps([generator, str(version), normalize(data)], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PDFCache:
+    """
+    Two-tier PDF byte cache.
+
+    The memory tier is an LRU bounded by total bytes. The disk tier stores
+    one file per key under `directory` (written atomically) and is skipped
+    when no directory is configured. Disk files older than max_disk_age
+    seconds are removed, then the least recently used ones until the tier
+    fits in max_disk_bytes (0 disables either limit).
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int,
+        directory: Optional[str] = None,
+        max_disk_bytes: int = 0,
+        max_disk_age: float = 0,
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.directory = directory or None
+        self.max_disk_bytes = max_disk_bytes
+        self.max_disk_age = max_disk_age
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._prune_lock = threading.Lock()
+        self._last_prune = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.pdf")
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return content
+
+        content = self._read_disk(key)
+        with self._lock:
+            if content is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._remember(key, content)
+        return content
+
+    def put(self, key: str, content: bytes, disk: bool = True) -> None:
+        """Store a render; disk=False keeps it in the memory tier only."""
+        self._remember(key, content)
+        if disk:
+            self._write_disk(key, content)
+
+    def clear(self) -> None:
+        """Drop the memory tier (the disk tier is content-addressed and left alone)."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def _remember(self, key: str, content: bytes) -> None:
+        if len(content) > self.max_memory_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = content
+            self._size += len(content)
+            while self._size > self.max_memory_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+            os.utime(path)  # Pruning removes the least recently used files
+            return content
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.error("PDF cache read failed", extra={"key": key, "error": str(e)})
+            return None
+
+    def _write_disk(self, key: str, content: bytes) -> None:
+        if not self.directory:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+            # mkstemp creates the file readable by the service user only
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error("PDF cache write failed", extra={"key": key, "error": str(e)})
+            return
+
+        now = time.monotonic()
+        if now - self._last_prune >= PRUNE_INTERVAL_SECONDS and self._prune_lock.acquire(blocking=False):
+            try:
+                self._last_prune = now
+                self.prune_disk()
+            finally:
+                self._prune_lock.release()
+
+    def prune_disk(self) -> int:
+        """
+        Remove expired files, then the least recently used until the disk
+        tier fits its size limit. Returns the number of files removed.
+
+        Safe to run from several processes at once: files another process
+        already removed are skipped.
+        """
+        if not self.directory or not (self.max_disk_bytes or self.max_disk_age):
+            return 0
+
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+
+        expired_before = time.time() - self.max_disk_age if self.max_disk_age else None
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for mtime, size, path in files:
+            expired = expired_before is not None and mtime < expired_before
+            if not expired and (not self.max_disk_bytes or total <= self.max_disk_bytes):
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error("PDF cache prune failed", extra={"path": path, "error": str(e)})
+                continue
+            total -= size
+
+        if removed:
+            logger.info("PDF cache pruned", extra={"removed": removed, "remaining_bytes": total})
+        return removed
+
+
+pdf_cache = PDFCache(
+    max_memory_bytes=settings.pdf_cache_memory_mb * 1024 * 1024,
+    directory=settings.pdf_cache_dir,
+    max_disk_bytes=settings.pdf_cache_disk_mb * 1024 * 1024,
+    max_disk_age=settings.pdf_cache_disk_max_age_hours * 3600,
+)
+
+
+def cached_pdf(
+    generator: str,
+    version: Any = 1,
+    key: Optional[Callable[..., Any]] = None,
+    daily: bool = False,
+):
+    """
+    Cache a BytesIO-returning PDF generator by content address.
+
+    Args:
+        generator: Generator name, part of the key
+        version: Bump whenever the layout changes so old renders are not reused
+        key: Optional function of the generator's arguments returning the data
+            to hash; defaults to all arguments (fine for plain dicts/strings)
+        daily: The render includes today's date, so include it in the key;
+            such renders are kept out of the disk tier, where yesterday's
+            keys would only pile up
+    """
+    def decorator(func: Callable[..., BytesIO]) -> Callable[..., BytesIO]:
+        def cache_address(*args, **kwargs) -> Optional[str]:
+            """Cache key for these arguments, or None while caching is disabled."""
+            if not settings.pdf_cache_enabled:
+                return None
+            data = key(*args, **kwargs) if key else {"args": args, "kwargs": kwargs}
+            if daily:
+                data = {"data": data, "date": date.today()}
+            return cache_key(generator, version, data)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> BytesIO:
+            address = cache_address(*args, **kwargs)
+            if address is None:
+                return func(*args, **kwargs)
+
+            content = pdf_cache.get(address)
+            if content is None:
+                content = func(*args, **kwargs).getvalue()
+                pdf_cache.put(address, content, disk=not daily)
+            return BytesIO(content)
+
+        wrapper.uncached = func
+        wrapper.cache_address = cache_address
+        wrapper.daily = daily
+        return wrapper
+    return decorator
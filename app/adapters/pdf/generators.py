@@ -22,7 +22,7 @@ class ContractPDFGenerator(IPDFGenerator):
     def generate(self, data: Dict[str, Any]) -> PDFResult:
         from app.utils.contract_pdf_generator import generate_consultant_contract_pdf
         try:
-            pdf_bytes = generate_consultant_contract_pdf(data)
+            pdf_bytes = generate_consultant_contract_pdf(data).getvalue()
             return PDFResult(success=True, content=pdf_bytes, filename="contract.pdf")
         except Exception as e:
             return PDFResult(success=False, error=str(e))
@@ -45,7 +45,7 @@ class WorkOrderPDFGenerator(IPDFGenerator):
     def generate(self, data: Dict[str, Any]) -> PDFResult:
         from app.utils.work_order_pdf_generator import generate_work_order_pdf
         try:
-            pdf_bytes = generate_work_order_pdf(data)
+            pdf_bytes = generate_work_order_pdf(data).getvalue()
             return PDFResult(success=True, content=pdf_bytes, filename="work_order.pdf")
         except Exception as e:
             return PDFResult(success=False, error=str(e))
@@ -68,7 +68,7 @@ class COHFPDFGenerator(IPDFGenerator):
     def generate(self, data: Dict[str, Any]) -> PDFResult:
         from app.utils.cohf_pdf_generator import generate_cohf_pdf
         try:
-            pdf_bytes = generate_cohf_pdf(data)
+            pdf_bytes = generate_cohf_pdf(data).getvalue()
             return PDFResult(success=True, content=pdf_bytes, filename="cohf.pdf")
         except Exception as e:
             return PDFResult(success=False, error=str(e))
@@ -91,7 +91,7 @@ class QuoteSheetPDFGenerator(IPDFGenerator):
     def generate(self, data: Dict[str, Any]) -> PDFResult:
         from app.utils.quote_sheet_pdf_generator import generate_quote_sheet_pdf
         try:
-            pdf_bytes = generate_quote_sheet_pdf(data)
+            pdf_bytes = generate_quote_sheet_pdf(data).getvalue()
             return PDFResult(success=True, content=pdf_bytes, filename="quote_sheet.pdf")
         except Exception as e:
             return PDFResult(success=False, error=str(e))
@@ -114,7 +114,7 @@ class TimesheetPDFGenerator(IPDFGenerator):
     def generate(self, data: Dict[str, Any]) -> PDFResult:
         from app.utils.timesheet_pdf_generator import generate_timesheet_pdf
         try:
-            pdf_bytes = generate_timesheet_pdf(data)
+            pdf_bytes = generate_timesheet_pdf(data).getvalue()
             return PDFResult(success=True, content=pdf_bytes, filename="timesheet.pdf")
         except Exception as e:
             return PDFResult(success=False, error=str(e))
@@ -122,3 +122,84 @@ class TimesheetPDFGenerator(IPDFGenerator):
     def generate_with_signature(self, data, signature, signature_position=None) -> PDFResult:
         data["signature"] = signature
         return self.generate(data)
+
+
+class _LetterPDFGenerator(IPDFGenerator):
+    """
+    Wrapper for generators taking (contractor_data, <record>_data).
+
+    Subclasses name the generator function and the data key of the record.
+    """
+
+    document_type = ""
+    record_key = ""
+    required_fields: List[str] = []
+
+    def get_template_fields(self) -> List[str]:
+        return self.required_fields
+
+    def render(self, contractor_data: Dict[str, Any], record_data: Dict[str, Any]):
+        raise NotImplementedError
+
+    def generate(self, data: Dict[str, Any]) -> PDFResult:
+        try:
+            pdf_bytes = self.render(data["contractor"], data[self.record_key]).getvalue()
+            return PDFResult(success=True, content=pdf_bytes, filename=f"{self.document_type}.pdf")
+        except Exception as e:
+            return PDFResult(success=False, error=str(e))
+
+    def generate_with_signature(self, data, signature, signature_position=None) -> PDFResult:
+        data["signature"] = signature
+        return self.generate(data)
+
+
+@PDFGeneratorRegistry.register("termination_letter")
+class TerminationLetterPDFGenerator(_LetterPDFGenerator):
+    """Wrapper for offboarding termination letter generation."""
+
+    document_type = "termination_letter"
+    record_key = "offboarding"
+    required_fields = ["contractor", "offboarding"]
+
+    def render(self, contractor_data, record_data):
+        from app.utils.offboarding_pdf_generator import generate_termination_letter_pdf
+        return generate_termination_letter_pdf(contractor_data, record_data)
+
+
+@PDFGeneratorRegistry.register("experience_letter")
+class ExperienceLetterPDFGenerator(_LetterPDFGenerator):
+    """Wrapper for offboarding experience letter generation."""
+
+    document_type = "experience_letter"
+    record_key = "offboarding"
+    required_fields = ["contractor", "offboarding"]
+
+    def render(self, contractor_data, record_data):
+        from app.utils.offboarding_pdf_generator import generate_experience_letter_pdf
+        return generate_experience_letter_pdf(contractor_data, record_data)
+
+
+@PDFGeneratorRegistry.register("clearance_certificate")
+class ClearanceCertificatePDFGenerator(_LetterPDFGenerator):
+    """Wrapper for offboarding clearance certificate generation."""
+
+    document_type = "clearance_certificate"
+    record_key = "offboarding"
+    required_fields = ["contractor", "offboarding"]
+
+    def render(self, contractor_data, record_data):
+        from app.utils.offboarding_pdf_generator import generate_clearance_certificate_pdf
+        return generate_clearance_certificate_pdf(contractor_data, record_data)
+
+
+@PDFGeneratorRegistry.register("contract_extension")
+class ContractExtensionPDFGenerator(_LetterPDFGenerator):
+    """Wrapper for contract extension agreement generation."""
+
+    document_type = "contract_extension"
+    record_key = "extension"
+    required_fields = ["contractor", "extension"]
+
+    def render(self, contractor_data, record_data):
+        from app.utils.contract_extension_pdf_generator import generate_extension_agreement_pdf
+        return generate_extension_agreement_pdf(contractor_data, record_data)
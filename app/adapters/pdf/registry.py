@@ -3,8 +3,8 @@ PDF Generator Registry.
 
 Provides dynamic registration and lookup of PDF generators.
 """
-from typing import Dict, Type, List, Optional
-from app.adapters.pdf.interface import IPDFGenerator
+from typing import Any, Dict, Type, List, Optional
+from app.adapters.pdf.interface import IPDFGenerator, PDFResult
 
 
 class PDFGeneratorRegistry:
@@ -85,6 +85,20 @@ class PDFGeneratorRegistry:
 
         return cls._instances[document_type]
 
+    @classmethod
+    async def render(cls, document_type: str, data: Dict[str, Any], timeout: Optional[float] = None) -> PDFResult:
+        """
+        Generate a document off the event loop via the PDF render service.
+
+        Raises:
+            KeyError: If document type is not registered
+            PDFRenderTimeout: If the render exceeds the timeout
+        """
+        from app.adapters.pdf.render_service import pdf_render_service
+
+        cls.get(document_type)  # fail fast on unknown types
+        return await pdf_render_service.render_document(document_type, data, timeout=timeout)
+
     @classmethod
     def get_or_none(cls, document_type: str) -> Optional[IPDFGenerator]:
         """Get generator or None if not found."""
@@ -0,0 +1,217 @@
+"""
+Disk-backed cache for remote PDF images (third-party logos).
+
+Quote sheets used to fetch logos over HTTP on every render. Fetched
+images are now pre-scaled and stored on disk next to their ETag and
+Last-Modified validators, and their decoded form is kept in memory per
+process. Once a copy exists a render never waits on the network: a copy
+older than the TTL is still served and revalidated in the background
+with a conditional GET. Only the very first fetch of a URL blocks, and a
+URL that fails is not retried on every render.
+
+Usage:
+    logo = remote_image(logo_url, width=22*mm, height=12*mm)
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Dict, Optional
+
+from PIL import Image as PILImage
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Image
+
+from app.adapters.pdf.assets import SIGNATURE_MAX_PX, SharedImage, _predecode
+from app.config.settings import settings
+from app.telemetry.logger import get_logger
+
+logger = get_logger(__name__)
+
+# How long a URL that could not be fetched is left alone before trying again
+FAILURE_RETRY_SECONDS = 300
+
+
+@dataclass
+class _Entry:
+    reader: ImageReader
+    checked_at: float
+
+
+class RemoteAssetCache:
+    """
+    Remote images cached on disk (shared by workers on the host) and in memory.
+
+    Each URL is stored as `<sha256>.png` (pre-scaled) plus `<sha256>.json`
+    with the validators and the time it was last confirmed fresh.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: float, timeout_seconds: float):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.timeout_seconds = timeout_seconds
+        self._entries: Dict[str, _Entry] = {}
+        self._failed: Dict[str, float] = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def _paths(self, url: str):
+        name = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.directory, f"{name}.png"), os.path.join(self.directory, f"{name}.json")
+
+    def get(self, url: str) -> Optional[ImageReader]:
+        """Decoded image for a URL, or None if it has never been fetched successfully."""
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is None:
+            entry = self._load_disk(url)
+        if entry is None:
+            return self._fetch_cold(url)
+
+        if time.time() - entry.checked_at > self.ttl_seconds:
+            self._revalidate_in_background(url)
+        return entry.reader
+
+    def clear(self) -> None:
+        """Drop the memory tier (files on disk are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._failed.clear()
+
+    def _load_disk(self, url: str) -> Optional[_Entry]:
+        image_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            reader = _predecode(ImageReader(image_path))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error("Remote asset cache read failed", extra={"url": url, "error": str(e)})
+            return None
+
+        entry = _Entry(reader=reader, checked_at=meta.get("checked_at", 0))
+        with self._lock:
+            self._entries[url] = entry
+        return entry
+
+    def _fetch_cold(self, url: str) -> Optional[ImageReader]:
+        with self._lock:
+            failed_at = self._failed.get(url)
+        if failed_at is not None and time.time() - failed_at < FAILURE_RETRY_SECONDS:
+            return None
+
+        try:
+            entry = self._fetch(url, meta={})
+        except Exception as e:
+            logger.error("Remote asset fetch failed", extra={"url": url, "error": str(e)})
+            with self._lock:
+                self._failed[url] = time.time()
+            return None
+        return entry.reader if entry else None
+
+    def _revalidate_in_background(self, url: str) -> None:
+        with self._lock:
+            if url in self._refreshing:
+                return
+            self._refreshing.add(url)
+        threading.Thread(target=self._revalidate, args=(url,), daemon=True).start()
+
+    def _revalidate(self, url: str) -> None:
+        try:
+            _, meta_path = self._paths(url)
+            try:
+                with open(meta_path) as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                meta = {}
+            self._fetch(url, meta)
+        except Exception as e:
+            # Keep serving the stale copy; try again after another TTL
+            logger.warning("Remote asset revalidation failed", extra={"url": url, "error": str(e)})
+            with self._lock:
+                entry = self._entries.get(url)
+                if entry:
+                    entry.checked_at = time.time()
+        finally:
+            with self._lock:
+                self._refreshing.discard(url)
+
+    def _fetch(self, url: str, meta: dict) -> Optional[_Entry]:
+        """GET the URL (conditionally when validators are known) and store the result."""
+        request = urllib.request.Request(url)
+        if meta.get("etag"):
+            request.add_header("If-None-Match", meta["etag"])
+        if meta.get("last_modified"):
+            request.add_header("If-Modified-Since", meta["last_modified"])
+
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout_seconds) as response:
+                content = response.read()
+                headers = response.headers
+        except urllib.error.HTTPError as e:
+            if e.code != 304:
+                raise
+            meta["checked_at"] = time.time()
+            self._write_meta(url, meta)
+            with self._lock:
+                entry = self._entries.get(url)
+                if entry:
+                    entry.checked_at = meta["checked_at"]
+            return entry
+
+        image = PILImage.open(BytesIO(content))
+        image.load()
+        if max(image.size) > SIGNATURE_MAX_PX:
+            image.thumbnail((SIGNATURE_MAX_PX, SIGNATURE_MAX_PX), PILImage.LANCZOS)
+        png = BytesIO()
+        image.save(png, format="PNG")
+
+        meta = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "checked_at": time.time(),
+        }
+        self._write_file(self._paths(url)[0], png.getvalue())
+        self._write_meta(url, meta)
+
+        entry = _Entry(reader=_predecode(ImageReader(image)), checked_at=meta["checked_at"])
+        with self._lock:
+            self._entries[url] = entry
+            self._failed.pop(url, None)
+        return entry
+
+    def _write_meta(self, url: str, meta: dict) -> None:
+        self._write_file(self._paths(url)[1], json.dumps(meta).encode())
+
+    def _write_file(self, path: str, content: bytes) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error("Remote asset cache write failed", extra={"path": path, "error": str(e)})
+
+
+remote_asset_cache = RemoteAssetCache(
+    directory=settings.pdf_asset_cache_dir or os.path.join(tempfile.gettempdir(), "pdf-assets"),
+    ttl_seconds=settings.pdf_asset_ttl_seconds,
+    timeout_seconds=settings.pdf_asset_fetch_timeout_seconds,
+)
+
+
+def remote_image(url: str, width=None, height=None, kind: str = "direct", hAlign: str = "CENTER") -> Optional[Image]:
+    """New flowable for a cached remote image, or None if it is unavailable."""
+    reader = remote_asset_cache.get(url)
+    if reader is None:
+        return None
+    return SharedImage(reader, width=width, height=height, kind=kind, hAlign=hAlign)
@@ -0,0 +1,201 @@
+"""
+PDF rendering service.
+
+ReportLab generators are synchronous and CPU-bound; calling them from an
+`async def` route blocks the event loop for every other request. This
+service runs them in a bounded process pool whose workers are warmed with
+the ReportLab modules, shared styles and logos at start-up, and exposes await-able calls
+with timeouts plus queue-depth/latency stats.
+
+Usage:
+    pdf_buffer = await render_pdf(generate_cohf_pdf, contractor_data, cohf_data)
+    result = await PDFGeneratorRegistry.render("work_order", data)
+
+Arguments cross a process boundary, so they must be picklable - pass
+plain dicts, or snapshots (see app.utils.payroll_pdf.payroll_pdf_args)
+rather than ORM objects. Cached generators (see app.adapters.pdf.cache)
+are looked up in the parent first and only misses are sent to the pool.
+"""
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Callable, Dict, Optional
+
+from app.adapters.pdf import cache as pdf_cache_module
+from app.adapters.pdf.interface import PDFResult
+from app.config.settings import settings
+from app.telemetry.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PDFRenderTimeout(TimeoutError):
+    """A render did not finish within its timeout."""
+
+
+def _warm_worker() -> None:
+    """Process initializer: configure ReportLab, import generators and build the shared styles, logos and contract template once."""
+    from app.adapters.pdf import assets
+    from app.adapters.pdf import generators  # noqa: F401 - registers document types
+    from app.utils import (  # noqa: F401
+        cohf_pdf_generator,
+        contract_extension_pdf_generator,
+        contract_pdf_generator,
+        offboarding_pdf_generator,
+        payroll_pdf,
+        quote_sheet_pdf_generator,
+        timesheet_pdf_generator,
+        work_order_pdf_generator,
+    )
+    assets.configure_reportlab()
+    assets.warm()
+    contract_pdf_generator.contract_template()
+
+
+def _render_call(func: Callable[..., BytesIO], args: tuple, kwargs: dict) -> bytes:
+    """
+    Worker entry point for generator functions returning BytesIO.
+
+    Cached generators are pickled as their module-level wrapper; the parent
+    already checked the cache, so the worker renders with the inner function.
+    """
+    return getattr(func, "uncached", func)(*args, **kwargs).getvalue()
+
+
+def _render_document(document_type: str, data: Dict[str, Any]) -> PDFResult:
+    """Worker entry point for registry document types."""
+    from app.adapters.pdf.registry import PDFGeneratorRegistry
+    return PDFGeneratorRegistry.get(document_type).generate(data)
+
+
+class PDFRenderService:
+    """
+    Runs PDF generators off the event loop.
+
+    With `workers` > 0 a spawn-based process pool is used; with 0 renders
+    run on a single background thread (tests, or hosts that cannot fork).
+    """
+
+    LATENCY_SAMPLES = 512
+
+    def __init__(self, workers: int, timeout_seconds: float):
+        self.workers = workers
+        self.timeout_seconds = timeout_seconds
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._latencies = deque(maxlen=self.LATENCY_SAMPLES)
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.workers > 0:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_warm_worker,
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-render")
+            return self._executor
+
+    def start(self) -> None:
+        """Create (and so warm) the pool ahead of the first request."""
+        self._get_executor()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _submit(self, label: str, fn: Callable, *args, timeout: Optional[float] = None):
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_executor(), fn, *args)
+        with self._lock:
+            self._in_flight += 1
+        started = time.perf_counter()
+        timeout = timeout or self.timeout_seconds
+        try:
+            result = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            # The worker keeps going until the render ends; only the caller stops waiting
+            with self._lock:
+                self._timeouts += 1
+            logger.error("PDF render timed out", extra={"document": label, "timeout": timeout})
+            raise PDFRenderTimeout(f"Rendering {label} took longer than {timeout}s")
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+        with self._lock:
+            self._completed += 1
+            self._latencies.append(time.perf_counter() - started)
+        return result
+
+    async def render(self, func: Callable[..., BytesIO], *args, timeout: Optional[float] = None, **kwargs) -> BytesIO:
+        """
+        Render with a BytesIO-returning generator function, e.g. generate_cohf_pdf.
+
+        Raises:
+            PDFRenderTimeout: If the render exceeds the timeout
+        """
+        address = func.cache_address(*args, **kwargs) if hasattr(func, "cache_address") else None
+        if address:
+            content = pdf_cache_module.pdf_cache.get(address)
+            if content is not None:
+                return BytesIO(content)
+
+        content = await self._submit(func.__name__, _render_call, func, args, kwargs, timeout=timeout)
+        if address:
+            # Renders keyed by today's date stay off the disk tier, as in cached_pdf
+            pdf_cache_module.pdf_cache.put(address, content, disk=not getattr(func, "daily", False))
+        return BytesIO(content)
+
+    async def render_document(self, document_type: str, data: Dict[str, Any], timeout: Optional[float] = None) -> PDFResult:
+        """Render a registered document type (see PDFGeneratorRegistry)."""
+        return await self._submit(document_type, _render_document, document_type, data, timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and latency figures for monitoring."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            in_flight = self._in_flight
+            stats = {
+                "workers": self.workers,
+                "in_flight": in_flight,
+                "queue_depth": max(0, in_flight - max(self.workers, 1)),
+                "completed": self._completed,
+                "failed": self._failed,
+                "timeouts": self._timeouts,
+            }
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1)
+
+        stats["latency_ms"] = {"p50": percentile(0.5), "p95": percentile(0.95), "max": percentile(1.0)}
+        return stats
+
+
+pdf_render_service = PDFRenderService(
+    workers=settings.pdf_render_workers,
+    timeout_seconds=settings.pdf_render_timeout_seconds,
+)
+
+
+async def render_pdf(func: Callable[..., BytesIO], *args, **kwargs) -> BytesIO:
+    """Await-able shortcut for pdf_render_service.render()."""
+    return await pdf_render_service.render(func, *args, **kwargs)
@@ -2,7 +2,11 @@
 Supabase storage adapter.
 
 Implementation of file storage using Supabase Storage.
+
+The Supabase client is synchronous; every call that goes over the network
+runs in a worker thread so the async methods never block the event loop.
 """
+import asyncio
 from typing import Optional, List, BinaryIO
 from datetime import datetime
 import mimetypes
@@ -63,7 +67,8 @@ class SupabaseStorageAdapter(IStorageAdapter):
                 content_type = content_type or "application/octet-stream"
 
             # Upload to Supabase
-            response = self.client.storage.from_(bucket).upload(
+            response = await asyncio.to_thread(
+                self.client.storage.from_(bucket).upload,
                 path=key,
                 file=content,
                 file_options={
@@ -117,7 +122,7 @@ class SupabaseStorageAdapter(IStorageAdapter):
     ) -> Optional[bytes]:
         """Download file from Supabase Storage."""
         try:
-            response = self.client.storage.from_(bucket).download(key)
+            response = await asyncio.to_thread(self.client.storage.from_(bucket).download, key)
             return response
         except Exception as e:
             logger.error(
@@ -133,7 +138,7 @@ class SupabaseStorageAdapter(IStorageAdapter):
     ) -> bool:
         """Delete file from Supabase Storage."""
         try:
-            self.client.storage.from_(bucket).remove([key])
+            await asyncio.to_thread(self.client.storage.from_(bucket).remove, [key])
             logger.info(
                 "File deleted",
                 extra={"bucket": bucket, "key": key}
@@ -156,7 +161,8 @@ class SupabaseStorageAdapter(IStorageAdapter):
         try:
             if expires_in:
                 # Get signed URL
-                response = self.client.storage.from_(bucket).create_signed_url(
+                response = await asyncio.to_thread(
+                    self.client.storage.from_(bucket).create_signed_url,
                     path=key,
                     expires_in=expires_in,
                 )
@@ -179,7 +185,7 @@ class SupabaseStorageAdapter(IStorageAdapter):
         """Check if file exists in Supabase Storage."""
         try:
             # List files with the exact key as prefix
-            response = self.client.storage.from_(bucket).list(path=key)
+            response = await asyncio.to_thread(self.client.storage.from_(bucket).list, path=key)
             return len(response) > 0
         except Exception:
             return False
@@ -192,7 +198,8 @@ class SupabaseStorageAdapter(IStorageAdapter):
     ) -> List[StorageFile]:
         """List files in Supabase Storage bucket."""
         try:
-            response = self.client.storage.from_(bucket).list(
+            response = await asyncio.to_thread(
+                self.client.storage.from_(bucket).list,
                 path=prefix or "",
                 options={"limit": limit}
             )
@@ -227,7 +234,8 @@ class SupabaseStorageAdapter(IStorageAdapter):
     ) -> Optional[str]:
         """Get signed URL for direct upload."""
         try:
-            response = self.client.storage.from_(bucket).create_signed_upload_url(
+            response = await asyncio.to_thread(
+                self.client.storage.from_(bucket).create_signed_upload_url,
                 path=key,
             )
             return response.get("signedURL")
@@ -63,6 +63,32 @@ class Settings(BaseSettings):
     # AWS (Email via Lambda/SES)
     aws_region: str = Field(default="me-central-1", env="AWS_REGION")
     email_lambda_function_name: str = Field(default="", env="EMAIL_LAMBDA_FUNCTION_NAME")
+    email_lambda_stub: bool = Field(default=False, env="EMAIL_LAMBDA_STUB")  # Local in-process Lambda, no AWS
+
+    # Batch sending (many emails per Lambda invocation)
+    email_lambda_batch_enabled: bool = Field(default=False, env="EMAIL_LAMBDA_BATCH_ENABLED")  # Only for a Lambda that accepts batch events
+    email_batch_max_messages: int = Field(default=100, env="EMAIL_BATCH_MAX_MESSAGES")
+    email_batch_max_bytes: int = Field(default=1_000_000, env="EMAIL_BATCH_MAX_BYTES")  # Well under the 6 MB invoke limit
+    email_batch_concurrency: int = Field(default=8, env="EMAIL_BATCH_CONCURRENCY")  # Invocations in flight per process
+
+    # Email idempotency (in-memory index of recent sends)
+    email_dedup_enabled: bool = Field(default=True, env="EMAIL_DEDUP_ENABLED")
+    email_dedup_ttl_seconds: float = Field(default=60.0, env="EMAIL_DEDUP_TTL_SECONDS")  # Repeats within this window are skipped
+    email_dedup_max_entries: int = Field(default=50_000, env="EMAIL_DEDUP_MAX_ENTRIES")
+
+    # Email templates (app/templates/email)
+    email_template_bytecode_cache: bool = Field(default=True, env="EMAIL_TEMPLATE_BYTECODE_CACHE")
+    email_template_cache_dir: str = Field(default="", env="EMAIL_TEMPLATE_CACHE_DIR")  # Empty uses the system temp dir
+
+    # Email outbox (delivered by the worker's dispatcher)
+    email_outbox_enabled: bool = Field(default=False, env="EMAIL_OUTBOX_ENABLED")  # Only with a worker running (python -m app.workers.main)
+    email_dispatch_batch_size: int = Field(default=500, env="EMAIL_DISPATCH_BATCH_SIZE")  # Rows claimed per round
+    email_dispatch_poll_seconds: float = Field(default=2.0, env="EMAIL_DISPATCH_POLL_SECONDS")
+    email_dispatch_max_attempts: int = Field(default=8, env="EMAIL_DISPATCH_MAX_ATTEMPTS")  # Then DEAD
+    email_dispatch_retry_base_seconds: float = Field(default=5.0, env="EMAIL_DISPATCH_RETRY_BASE_SECONDS")
+    email_dispatch_retry_max_seconds: float = Field(default=900.0, env="EMAIL_DISPATCH_RETRY_MAX_SECONDS")
+    email_dispatch_lease_seconds: int = Field(default=300, env="EMAIL_DISPATCH_LEASE_SECONDS")  # Reclaim rows a dead worker left SENDING
+    email_outbox_retention_days: int = Field(default=90, env="EMAIL_OUTBOX_RETENTION_DAYS")  # Sent and dead rows are purged after this; 0 keeps them
 
     # Supabase (Storage)
     supabase_url: str = Field(default="", env="SUPABASE_URL")
@@ -71,6 +97,30 @@ class Settings(BaseSettings):
     supabase_service_role_key: str = Field(default="", env="SUPABASE_SERVICE_ROLE_KEY")
     supabase_bucket: str = Field(default="contractor-documents", env="SUPABASE_BUCKET")
 
+    # PDF cache
+    pdf_cache_enabled: bool = Field(default=True, env="PDF_CACHE_ENABLED")
+    pdf_cache_memory_mb: int = Field(default=64, env="PDF_CACHE_MEMORY_MB")
+    pdf_cache_dir: str = Field(default="", env="PDF_CACHE_DIR")  # Empty disables the disk tier
+    pdf_cache_disk_mb: int = Field(default=512, env="PDF_CACHE_DISK_MB")  # Least recently used files pruned above this; 0 = no limit
+    pdf_cache_disk_max_age_hours: float = Field(default=72, env="PDF_CACHE_DISK_MAX_AGE_HOURS")  # Files unused this long are removed; 0 keeps them
+
+    # Remote PDF assets (third-party logos fetched over HTTP)
+    pdf_asset_cache_dir: str = Field(default="", env="PDF_ASSET_CACHE_DIR")  # Empty uses the system temp dir
+    pdf_asset_ttl_seconds: int = Field(default=86400, env="PDF_ASSET_TTL_SECONDS")  # Revalidated in the background after this
+    pdf_asset_fetch_timeout_seconds: float = Field(default=5.0, env="PDF_ASSET_FETCH_TIMEOUT_SECONDS")
+
+    # PDF rendering (process pool; 0 workers renders on a background thread)
+    pdf_render_workers: int = Field(default=2, env="PDF_RENDER_WORKERS")
+    pdf_render_timeout_seconds: float = Field(default=30.0, env="PDF_RENDER_TIMEOUT_SECONDS")
+    pdf_signature_cache_size: int = Field(default=256, env="PDF_SIGNATURE_CACHE_SIZE")  # Decoded signatures kept per process
+    pdf_contract_template: bool = Field(default=True, env="PDF_CONTRACT_TEMPLATE")  # Stamp contracts into pre-laid-out static pages
+    document_job_lease_seconds: int = Field(default=300, env="DOCUMENT_JOB_LEASE_SECONDS")  # Reclaim jobs a dead process left RUNNING or QUEUED
+
+    # Payroll
+    payroll_status_counters: bool = Field(default=False, env="PAYROLL_STATUS_COUNTERS")
+    payslip_run_concurrency: int = Field(default=8, env="PAYSLIP_RUN_CONCURRENCY")  # Parallel uploads/emails per run
+    payslip_run_lease_seconds: int = Field(default=600, env="PAYSLIP_RUN_LEASE_SECONDS")  # Reclaim runs a dead process left RUNNING
+
     # Rate Limiting
     rate_limit_requests: int = Field(default=100, env="RATE_LIMIT_REQUESTS")
     rate_limit_period: int = Field(default=60, env="RATE_LIMIT_PERIOD")
@@ -13,6 +13,8 @@ from app.domain.payroll.value_objects import (
     LeaveAdjustment,
     AccrualBreakdown,
     ContractorPayInfo,
+    PayrollColumns,
+    PayrollResultTable,
     can_approve_payroll,
     can_mark_paid,
     normalize_rate_type,
@@ -41,6 +43,8 @@ __all__ = [
     "LeaveAdjustment",
     "AccrualBreakdown",
     "ContractorPayInfo",
+    "PayrollColumns",
+    "PayrollResultTable",
     # Helper functions
     "can_approve_payroll",
     "can_mark_paid",
@@ -6,7 +6,7 @@ Follows the Strategy Pattern and Open/Closed Principle.
 """
 from abc import ABC, abstractmethod
 from decimal import Decimal
-from typing import Optional
+from typing import Optional, Sequence
 from calendar import monthrange
 from datetime import datetime
 
@@ -17,6 +17,8 @@ from app.domain.payroll.value_objects import (
     LeaveAdjustment,
     AccrualBreakdown,
     ContractorPayInfo,
+    PayrollColumns,
+    PayrollResultTable,
 )
 from app.domain.payroll.exceptions import InvalidRateConfigurationError
 
@@ -319,3 +321,126 @@ class PayrollCalculatorFactory:
             return DailyRateCalculator()
         else:
             raise ValueError(f"Unsupported rate type: {rate_type}")
+
+    @staticmethod
+    def to_columns(
+        contractor_infos: Sequence[ContractorPayInfo],
+        days_worked: Sequence[float],
+        periods: Sequence[str],
+        leave_adjustments: Sequence[LeaveAdjustment],
+        manual_accruals: Optional[Sequence[dict]] = None,
+        expenses_reimbursements: Optional[Sequence[float]] = None,
+    ) -> PayrollColumns:
+        """
+        Build columnar inputs from the same arguments calculate() takes.
+
+        Args mirror IPayrollCalculator.calculate(), one sequence entry per
+        contractor. Manual accruals and expenses default to none.
+
+        Returns:
+            PayrollColumns ready for calculate_many()
+        """
+        helper = MonthlyRateCalculator()
+        count = len(contractor_infos)
+        manual_accruals = manual_accruals or [{}] * count
+        expenses_reimbursements = expenses_reimbursements or [0] * count
+
+        rate_type, rate, accruals, management_fee, vat_rate, currency = [], [], [], [], [], []
+        for info, manual in zip(contractor_infos, manual_accruals):
+            configured = info.monthly_rate if info.rate_type == RateType.MONTHLY else info.day_rate
+            rate_type.append(info.rate_type)
+            rate.append(Decimal(str(configured)) if configured else None)
+            accruals.append(helper._build_accruals(info, manual, info.currency).total.amount)
+            management_fee.append(Decimal(str(info.management_fee)))
+            vat_rate.append(helper._get_vat_rate(info.country))
+            currency.append(info.currency)
+
+        return PayrollColumns(
+            rate_type=rate_type,
+            rate=rate,
+            days_worked=[Decimal(str(days)) for days in days_worked],
+            calendar_days=[helper._get_calendar_days(period) for period in periods],
+            leave_deductibles=[adj.leave_deductibles.amount for adj in leave_adjustments],
+            expenses=[Decimal(str(amount)) for amount in expenses_reimbursements],
+            accruals=accruals,
+            management_fee=management_fee,
+            vat_rate=vat_rate,
+            currency=currency,
+        )
+
+    @staticmethod
+    def calculate_many(columns: PayrollColumns) -> PayrollResultTable:
+        """
+        Calculate payroll for many contractors from columnar inputs.
+
+        Applies the same formulas, in the same Decimal operation order, as
+        MonthlyRateCalculator and DailyRateCalculator, without building Money
+        objects per row. Rows the scalar path would reject are reported in
+        `errors` instead of raising, so one bad row does not stop the table.
+
+        Args:
+            columns: Columnar inputs (see PayrollColumns)
+
+        Returns:
+            PayrollResultTable with one row per input row
+        """
+        prorata_col, gross_col, net_col = [], [], []
+        invoice_col, vat_col, payable_col, errors = [], [], [], []
+        zero = Decimal("0")
+
+        for rate_type, rate, days, calendar_days, deductibles, expenses, accruals, fee, vat_rate in zip(
+            columns.rate_type, columns.rate, columns.days_worked, columns.calendar_days,
+            columns.leave_deductibles, columns.expenses, columns.accruals,
+            columns.management_fee, columns.vat_rate,
+        ):
+            error = None
+            if rate_type == RateType.MONTHLY:
+                if not rate:
+                    error = "Monthly rate not configured for this contractor"
+                else:
+                    prorata = rate / Decimal(str(calendar_days))
+                    gross = rate
+                    earned = (gross / Decimal(str(calendar_days))) * days
+                    if earned < zero or earned - deductibles < zero:
+                        error = "Amount cannot be negative"
+                    net = earned - deductibles + expenses
+            elif rate_type == RateType.DAILY:
+                if not rate:
+                    error = "Day rate not configured for this contractor"
+                else:
+                    prorata = rate
+                    gross = rate * days
+                    net = gross + expenses
+            else:
+                error = f"Unsupported rate type: {rate_type}"
+
+            if error is None and min(rate, days, expenses, accruals, fee, gross) < zero:
+                error = "Amount cannot be negative"
+
+            if error is not None:
+                for col in (prorata_col, gross_col, net_col, invoice_col, vat_col, payable_col):
+                    col.append(None)
+                errors.append(error)
+                continue
+
+            invoice_total = net + accruals + fee
+            vat_amount = invoice_total * Decimal(str(float(vat_rate)))
+
+            prorata_col.append(prorata)
+            gross_col.append(gross)
+            net_col.append(net)
+            invoice_col.append(invoice_total)
+            vat_col.append(vat_amount)
+            payable_col.append(invoice_total + vat_amount)
+            errors.append(None)
+
+        return PayrollResultTable(
+            prorata_day_rate=prorata_col,
+            gross_pay=gross_col,
+            net_salary=net_col,
+            invoice_total=invoice_col,
+            vat_amount=vat_col,
+            total_payable=payable_col,
+            currency=list(columns.currency),
+            errors=errors,
+        )
@@ -5,7 +5,7 @@ Immutable objects representing payroll concepts.
 """
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Optional
+from typing import Optional, Sequence
 
 # Import enums from model to avoid duplication
 from app.models.payroll import PayrollStatus, RateType
@@ -209,3 +209,72 @@ class ContractorPayInfo:
             raise ValueError("Monthly rate not configured for MONTHLY rate type")
         if self.rate_type == RateType.DAILY and not self.day_rate:
             raise ValueError("Day rate not configured for DAILY rate type")
+
+
+@dataclass(frozen=True)
+class PayrollColumns:
+    """
+    Columnar payroll inputs for PayrollCalculatorFactory.calculate_many().
+
+    Each field is one column; row i of every column describes one contractor.
+    `rate` is the monthly rate for MONTHLY rows and the day rate for DAILY
+    rows. Amounts are Decimals converted the same way the scalar calculators
+    convert them (Decimal(str(value))) so both paths agree to the cent.
+    """
+    rate_type: Sequence[RateType]
+    rate: Sequence[Optional[Decimal]]
+    days_worked: Sequence[Decimal]
+    calendar_days: Sequence[int]
+    leave_deductibles: Sequence[Decimal]
+    expenses: Sequence[Decimal]
+    accruals: Sequence[Decimal]
+    management_fee: Sequence[Decimal]
+    vat_rate: Sequence[Decimal]
+    currency: Sequence[str]
+
+    def __post_init__(self):
+        lengths = {
+            len(self.rate_type), len(self.rate), len(self.days_worked),
+            len(self.calendar_days), len(self.leave_deductibles), len(self.expenses),
+            len(self.accruals), len(self.management_fee), len(self.vat_rate),
+            len(self.currency),
+        }
+        if len(lengths) > 1:
+            raise ValueError("All payroll columns must have the same length")
+
+    def __len__(self) -> int:
+        return len(self.rate_type)
+
+
+@dataclass(frozen=True)
+class PayrollResultTable:
+    """
+    Columnar output of PayrollCalculatorFactory.calculate_many().
+
+    Rows that the scalar calculators would reject (missing rate, negative
+    amount) have None amounts and the error message in `errors`.
+    """
+    prorata_day_rate: Sequence[Optional[Decimal]]
+    gross_pay: Sequence[Optional[Decimal]]
+    net_salary: Sequence[Optional[Decimal]]
+    invoice_total: Sequence[Optional[Decimal]]
+    vat_amount: Sequence[Optional[Decimal]]
+    total_payable: Sequence[Optional[Decimal]]
+    currency: Sequence[str]
+    errors: Sequence[Optional[str]]
+
+    def __len__(self) -> int:
+        return len(self.errors)
+
+    def row(self, index: int) -> dict:
+        """Return one result row as a dict."""
+        return {
+            "prorata_day_rate": self.prorata_day_rate[index],
+            "gross_pay": self.gross_pay[index],
+            "net_salary": self.net_salary[index],
+            "invoice_total": self.invoice_total[index],
+            "vat_amount": self.vat_amount[index],
+            "total_payable": self.total_payable[index],
+            "currency": self.currency[index],
+            "error": self.errors[index],
+        }
@@ -2,8 +2,11 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from app.config import settings
-from app.routes import auth, contractors, third_parties, timesheets, clients, contracts, work_orders, templates, quote_sheets, proposals, payroll, payslips, invoices, notifications, offboarding, contract_extensions, expenses, payroll_batches, client_invoices
+from app.routes import auth, contractors, third_parties, timesheets, clients, contracts, work_orders, templates, quote_sheets, proposals, payroll, payslips, invoices, notifications, offboarding, contract_extensions, expenses, payroll_batches, client_invoices, exports, jobs
 from app.database import engine, Base
+from app.adapters.pdf import assets as pdf_assets
+from app.adapters.pdf.render_service import pdf_render_service
+from app.adapters.email.template_engine import email_template_engine
 import traceback
 
 # Create database tables
@@ -61,6 +64,27 @@ app.include_router(contract_extensions.router)  # Already has /api/v1 prefix
 app.include_router(expenses.router)  # Already has /api/v1/expenses prefix
 app.include_router(payroll_batches.router)  # Already has /api/v1/payroll-batches prefix
 app.include_router(client_invoices.router)  # Already has /api/v1/client-invoices prefix
+app.include_router(exports.router)  # Already has /api/v1/exports prefix
+app.include_router(jobs.router)  # Already has /api/v1/jobs prefix
+
+
+@app.on_event("startup")
+async def start_pdf_render_pool():
+    """Configure ReportLab, build the shared PDF assets and warm the render workers before the first request."""
+    pdf_assets.configure_reportlab()
+    pdf_assets.warm()
+    pdf_render_service.start()
+
+
+@app.on_event("startup")
+async def compile_email_templates():
+    """Compile every email template once, before the first render."""
+    email_template_engine.precompile()
+
+
+@app.on_event("shutdown")
+async def stop_pdf_render_pool():
+    pdf_render_service.shutdown()
 
 
 @app.get("/")
@@ -80,6 +104,12 @@ async def health_check():
     return {"status": "healthy", "version": "af932cd"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime figures for monitoring (PDF render queue depth and latency)."""
+    return {"pdf_render": pdf_render_service.stats()}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
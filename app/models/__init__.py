@@ -17,6 +17,13 @@ from app.models.contract_extension import ContractExtension, ExtensionStatus
 from app.models.expense import Expense, ExpenseStatus, ExpenseCategory
 from app.models.payroll_batch import PayrollBatch, BatchStatus
 from app.models.client_invoice import ClientInvoice, ClientInvoiceStatus, ClientInvoiceLineItem, ClientInvoicePayment
+from app.models.leave_ledger import LeaveLedger
+from app.models.contractor_pay_terms import ContractorPayTerms
+from app.models.payroll_status_count import PayrollStatusCount
+from app.models.payslip_run import PayslipRun, PayslipRunStatus, PayslipRunItem, PayslipRunItemStatus
+from app.models.signed_document import SignedDocument, SignedDocumentStatus
+from app.models.document_job import DocumentJob, DocumentJobStatus
+from app.models.email_outbox import EmailOutbox, EmailOutboxStatus
 
 __all__ = [
     "User", "UserSignedContract",
@@ -38,4 +45,11 @@ __all__ = [
     "Expense", "ExpenseStatus", "ExpenseCategory",
     "PayrollBatch", "BatchStatus",
     "ClientInvoice", "ClientInvoiceStatus", "ClientInvoiceLineItem", "ClientInvoicePayment",
+    "LeaveLedger",
+    "ContractorPayTerms",
+    "PayrollStatusCount",
+    "PayslipRun", "PayslipRunStatus", "PayslipRunItem", "PayslipRunItemStatus",
+    "SignedDocument", "SignedDocumentStatus",
+    "DocumentJob", "DocumentJobStatus",
+    "EmailOutbox", "EmailOutboxStatus",
 ]
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey, Enum as SQLEnum, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey, Enum as SQLEnum, Text, Index
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 import enum
 from app.database import Base
+from app.utils.period import parse_period
 
 
 class ClientInvoiceStatus(str, enum.Enum):
@@ -16,10 +17,16 @@ class ClientInvoiceStatus(str, enum.Enum):
 
 class ClientInvoice(Base):
     __tablename__ = "client_invoices"
+    __table_args__ = (
+        Index("ix_client_invoices_client_year_month", "client_id", "year", "month_number"),
+    )
+
 
     id = Column(Integer, primary_key=True, index=True)
     client_id = Column(String, ForeignKey("clients.id"), nullable=False)
     period = Column(String, nullable=False)  # e.g. "January 2026"
+    year = Column(Integer, nullable=True)  # Parsed from period
+    month_number = Column(Integer, nullable=True)  # 1-12, parsed from period
 
     # Document Identification
     invoice_number = Column(String, unique=True, nullable=False, index=True)  # CINV-2026-0001
@@ -61,6 +68,13 @@ class ClientInvoice(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    @validates("period")
+    def _sync_period_columns(self, key, value):
+        """Keep the indexed year/month_number columns in step with the display period."""
+        parsed = parse_period(value)
+        self.year, self.month_number = parsed if parsed else (None, None)
+        return value
+
     # Relationships
     client = relationship("Client", foreign_keys=[client_id])
     line_items = relationship("ClientInvoiceLineItem", back_populates="client_invoice", cascade="all, delete-orphan")
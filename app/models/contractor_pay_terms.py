@@ -0,0 +1,52 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text
+from datetime import datetime
+from app.database import Base
+
+
+class ContractorPayTerms(Base):
+    """
+    Persisted pay-terms snapshot for a contractor.
+
+    Holds the ContractorPayInfo that ContractorDataExtractor derives from the
+    CDS form, costing sheet and deal terms, so payroll reads are a plain row
+    fetch. Refreshed automatically whenever those sources change (see
+    app.services.pay_terms_service).
+    """
+    __tablename__ = "contractor_pay_terms"
+
+    id = Column(Integer, primary_key=True, index=True)
+    contractor_id = Column(String, ForeignKey("contractors.id", ondelete="CASCADE"), unique=True, index=True, nullable=False)
+
+    # Rates
+    rate_type = Column(String, nullable=True)  # "monthly" / "daily"; None if it could not be determined
+    currency = Column(String(10), nullable=True)
+    monthly_rate = Column(Float, nullable=True)
+    day_rate = Column(Float, nullable=True)
+    charge_rate_month = Column(Float, nullable=True)
+    charge_rate_day = Column(Float, nullable=True)
+
+    # Leave
+    leave_allowance = Column(Float, nullable=True)
+
+    # Third party / fees
+    third_party_name = Column(String, nullable=True)
+    management_fee = Column(Float, default=0)
+
+    # Accruals from costing sheet
+    accrual_gratuity = Column(Float, default=0)
+    accrual_airfare = Column(Float, default=0)
+    accrual_annual_leave = Column(Float, default=0)
+
+    # VAT / display
+    country = Column(String, nullable=True)
+    client_name = Column(String, nullable=True)
+
+    # Extraction failure (e.g. unknown rate type), surfaced on read
+    error = Column(Text, nullable=True)
+
+    # Bumped each time the extracted terms actually change
+    version = Column(Integer, default=1, nullable=False)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, JSON, Text, Index
+from datetime import datetime
+import enum
+import uuid
+from app.database import Base
+
+
+class DocumentJobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"  # Rendered and stored; url is set
+    FAILED = "failed"
+
+
+class DocumentJob(Base):
+    """
+    One asynchronous document generation request.
+
+    Any PDFGeneratorRegistry document type can be queued; the PDF is
+    rendered and stored in the background and the job polled for its
+    result URL (see app.services.document_job_service). Jobs queued by a
+    service for one of its records also publish the URL to that record.
+    """
+    __tablename__ = "document_jobs"
+    __table_args__ = (
+        Index("ix_document_jobs_status_created", "status", "created_at"),
+    )
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    document_type = Column(String(32), nullable=False)
+    data = Column(JSON, nullable=False)  # Generator input, as submitted
+    status = Column(SQLEnum(DocumentJobStatus), default=DocumentJobStatus.QUEUED, nullable=False)
+    requested_by = Column(String, ForeignKey("users.id"), nullable=True, index=True)
+    subject_id = Column(String, nullable=True)  # Record the URL is published to; set by services, never by the API
+
+    filename = Column(String, nullable=True)
+    storage_path = Column(String, nullable=True)
+    url = Column(String, nullable=True)
+    size_bytes = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
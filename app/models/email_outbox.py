@@ -0,0 +1,54 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum as SQLEnum, JSON, Text, Index
+from datetime import datetime
+import enum
+import uuid
+from app.database import Base
+
+
+class EmailOutboxStatus(str, enum.Enum):
+    PENDING = "pending"  # Waiting for its next attempt
+    SENDING = "sending"  # Claimed by a dispatcher
+    SENT = "sent"
+    DEAD = "dead"  # Gave up after the maximum number of attempts
+
+    @property
+    def delivery_status(self) -> str:
+        """Status as reported to users: queued, sent or failed."""
+        if self in (EmailOutboxStatus.PENDING, EmailOutboxStatus.SENDING):
+            return "queued"
+        return "sent" if self == EmailOutboxStatus.SENT else "failed"
+
+
+class EmailOutbox(Base):
+    """
+    One email waiting to be handed to the email Lambda.
+
+    Rows are written in the same transaction as the change that triggers
+    the email (see app.utils.email.email_outbox) and delivered by the
+    worker's dispatcher (see app.services.email_outbox_service). The id is
+    the email's message id; rows are kept after delivery as its status.
+    """
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+        Index("ix_email_outbox_idempotency_key", "idempotency_key"),
+    )
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    email_type = Column(String(64), nullable=False)
+    recipient = Column(String, nullable=False)
+    data = Column(JSON, nullable=False)  # Template data, as passed to the Lambda
+    status = Column(SQLEnum(EmailOutboxStatus), default=EmailOutboxStatus.PENDING, nullable=False)
+    contractor_id = Column(String, ForeignKey("contractors.id"), nullable=True, index=True)  # Who the email is about
+    fire_and_forget = Column(Boolean, default=False, nullable=False)  # Sent with InvocationType="Event"
+    subject_type = Column(String(32), nullable=True)  # Record marked SENT on delivery, e.g. "invoice"
+    subject_id = Column(String, nullable=True)
+    idempotency_key = Column(String(32), nullable=True)  # Hex email_idempotency_key(); duplicates are not sent twice
+
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    claimed_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
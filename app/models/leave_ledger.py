@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, UniqueConstraint, Index
+from datetime import datetime
+from app.database import Base
+
+
+class LeaveLedger(Base):
+    """
+    Per-contractor, per-month leave totals from approved timesheets.
+
+    Maintained incrementally whenever a timesheet is approved, declined,
+    edited or deleted, so yearly leave figures are a single row lookup
+    instead of a scan over every timesheet the contractor ever submitted.
+    """
+    __tablename__ = "leave_ledger"
+    __table_args__ = (
+        UniqueConstraint("contractor_id", "year", "month", name="uq_leave_ledger_contractor_period"),
+        Index("ix_leave_ledger_contractor_year", "contractor_id", "year"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    contractor_id = Column(String, ForeignKey("contractors.id", ondelete="CASCADE"), nullable=False)
+
+    # Period
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)  # 1-12
+
+    # Days taken this month (approved timesheets only)
+    vacation_days = Column(Float, default=0)
+    sick_days = Column(Float, default=0)
+    unpaid_days = Column(Float, default=0)
+
+    # Running totals for the year up to and including this month
+    ytd_vacation_days = Column(Float, default=0)
+    leave_allowance = Column(Float, default=0)  # Annual allowance at time of refresh
+    carry_over_days = Column(Float, default=0)  # Unused leave brought in from last year (max 5)
+    leave_balance = Column(Float, default=0)  # leave_allowance + carry_over_days - ytd_vacation_days
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
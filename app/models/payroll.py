@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum as SQLEnum, JSON, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum as SQLEnum, JSON, Text, Index
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 import enum
 from app.database import Base
+from app.utils.period import parse_period
 
 
 class PayrollStatus(str, enum.Enum):
@@ -21,6 +22,10 @@ class RateType(str, enum.Enum):
 
 class Payroll(Base):
     __tablename__ = "payrolls"
+    __table_args__ = (
+        Index("ix_payrolls_year_month", "year", "month_number"),
+    )
+
 
     id = Column(Integer, primary_key=True, index=True)
     timesheet_id = Column(Integer, ForeignKey("timesheets.id"), unique=True, nullable=False)
@@ -28,6 +33,8 @@ class Payroll(Base):
 
     # Basic Info
     period = Column(String, nullable=True)  # e.g., "November 2024"
+    year = Column(Integer, nullable=True)  # Parsed from period
+    month_number = Column(Integer, nullable=True)  # 1-12, parsed from period
     currency = Column(String(10), default="AED")
     rate_type = Column(SQLEnum(RateType), default=RateType.MONTHLY)
 
@@ -84,7 +91,10 @@ class Payroll(Base):
     invoice_amount = Column(Float, nullable=True)
 
     # Batch reference (nullable for backward compatibility)
-    batch_id = Column(Integer, ForeignKey("payroll_batches.id"), nullable=True)
+    batch_id = Column(Integer, ForeignKey("payroll_batches.id"), nullable=True, index=True)
+
+    # Pay terms the calculation used (copy of the contractor's snapshot at the time)
+    pay_terms = Column(JSON, nullable=True)
 
     # 3rd party reconciliation
     tp_draft_amount = Column(Float, nullable=True)
@@ -103,6 +113,13 @@ class Payroll(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    @validates("period")
+    def _sync_period_columns(self, key, value):
+        """Keep the indexed year/month_number columns in step with the display period."""
+        parsed = parse_period(value)
+        self.year, self.month_number = parsed if parsed else (None, None)
+        return value
+
     # Properties — resolved from FK relationships (Phase 6)
     @property
     def client_name(self):
@@ -147,3 +164,13 @@ class Payroll(Base):
     payslip = relationship("Payslip", back_populates="payroll", uselist=False)
     invoice = relationship("Invoice", back_populates="payroll", uselist=False)
     batch = relationship("PayrollBatch", back_populates="payrolls")
+
+
+# Keyset pagination of the list view (see app.utils.pagination). SQLite
+# rejects NULLS LAST in an index but already sorts NULLs last under DESC.
+Index(
+    "ix_payrolls_created_at_id", Payroll.created_at.desc().nulls_last(), Payroll.id.desc(),
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_payrolls_created_at_id", Payroll.created_at.desc(), Payroll.id.desc(),
+).ddl_if(callable_=lambda ddl, target, bind, dialect, **kw: dialect.name != "postgresql")
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum as SQLEnum, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum as SQLEnum, Text, Index
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 import enum
 from app.database import Base
+from app.utils.period import parse_period
 
 
 class BatchStatus(str, enum.Enum):
@@ -19,11 +20,17 @@ class BatchStatus(str, enum.Enum):
 
 class PayrollBatch(Base):
     __tablename__ = "payroll_batches"
+    __table_args__ = (
+        Index("ix_payroll_batches_year_month_client", "year", "month_number", "client_id"),
+    )
+
 
     id = Column(Integer, primary_key=True, index=True)
 
     # Grouping keys
     period = Column(String, nullable=False)  # e.g. "January 2026"
+    year = Column(Integer, nullable=True)  # Parsed from period
+    month_number = Column(Integer, nullable=True)  # 1-12, parsed from period
     client_id = Column(String, ForeignKey("clients.id"), nullable=False)
     onboarding_route = Column(String, nullable=False)  # OnboardingRoute value
     route_label = Column(String, nullable=True)  # e.g. "UAE - Auxilium"
@@ -62,6 +69,13 @@ class PayrollBatch(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    @validates("period")
+    def _sync_period_columns(self, key, value):
+        """Keep the indexed year/month_number columns in step with the display period."""
+        parsed = parse_period(value)
+        self.year, self.month_number = parsed if parsed else (None, None)
+        return value
+
     # Properties — resolved from FK relationships (Phase 6)
     @property
     def client_name(self):
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, DateTime, Enum as SQLEnum
+from datetime import datetime
+from app.database import Base
+from app.models.payroll import PayrollStatus
+
+
+class PayrollStatusCount(Base):
+    """
+    Cached number of payrolls per status.
+
+    Only maintained when settings.payroll_status_counters is on; adjusted in
+    the same transaction as every payroll insert, delete or status change
+    (see app.services.payroll_stats_service).
+    """
+    __tablename__ = "payroll_status_counts"
+
+    status = Column(SQLEnum(PayrollStatus), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
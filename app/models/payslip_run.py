@@ -0,0 +1,61 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Text, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import enum
+from app.database import Base
+
+
+class PayslipRunStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+
+
+class PayslipRunItemStatus(str, enum.Enum):
+    PENDING = "pending"
+    UPLOADED = "uploaded"  # PDF rendered and stored
+    SENT = "sent"  # Payslip email queued in the outbox
+    FAILED = "failed"
+
+
+class PayslipRun(Base):
+    """
+    One background payslip generation run for a Freelancer/WPS batch.
+
+    Progress is tracked per payroll in PayslipRunItem so it can be polled
+    (see app.services.payslip_run_service). A RUNNING run whose claimed_at
+    lease has expired is reclaimed by the worker.
+    """
+    __tablename__ = "payslip_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    batch_id = Column(Integer, ForeignKey("payroll_batches.id"), nullable=False, index=True)
+    status = Column(SQLEnum(PayslipRunStatus), default=PayslipRunStatus.QUEUED, nullable=False)
+    total = Column(Integer, default=0, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    claimed_at = Column(DateTime, nullable=True)  # Lease, renewed as items progress
+    completed_at = Column(DateTime, nullable=True)
+
+    items = relationship("PayslipRunItem", back_populates="run", order_by="PayslipRunItem.id")
+
+
+class PayslipRunItem(Base):
+    __tablename__ = "payslip_run_items"
+    __table_args__ = (
+        Index("ix_payslip_run_items_run_status", "run_id", "status"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("payslip_runs.id", ondelete="CASCADE"), nullable=False)
+    payroll_id = Column(Integer, ForeignKey("payrolls.id"), nullable=False)
+    contractor_id = Column(String, ForeignKey("contractors.id"), nullable=True)
+
+    status = Column(SQLEnum(PayslipRunItemStatus), default=PayslipRunItemStatus.PENDING, nullable=False)
+    pdf_url = Column(String, nullable=True)
+    error = Column(Text, nullable=True)
+    sent_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    run = relationship("PayslipRun", back_populates="items")
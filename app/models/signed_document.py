@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum, Text, Index
+from datetime import datetime
+import enum
+from app.database import Base
+
+
+class SignedDocumentStatus(str, enum.Enum):
+    PENDING = "pending"
+    READY = "ready"  # Rendered and stored; served for every later view
+    FAILED = "failed"
+
+
+class SignedDocument(Base):
+    """
+    Final PDF of a signed contract, COHF, work order or quote sheet.
+
+    Rendered once when the document is signed or counter-signed, stored
+    under a content-addressed path and never re-rendered, so later views
+    do not depend on the generator code
+    (see app.services.signed_document_service).
+    """
+    __tablename__ = "signed_documents"
+    __table_args__ = (
+        Index("ix_signed_documents_subject", "document_type", "subject_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    document_type = Column(String(32), nullable=False)  # contract, cohf, work_order, quote_sheet
+    subject_id = Column(String, nullable=False)  # Contractor id (work order id for work orders)
+    contractor_id = Column(String, ForeignKey("contractors.id"), nullable=True)
+    stage = Column(String(32), nullable=False)  # signed, counter_signed
+    title = Column(String, nullable=True)  # Name shown in the contractor's documents
+    signed_by = Column(String, nullable=True)  # Signer name
+    signer_user_id = Column(String, ForeignKey("users.id"), nullable=True)
+    status = Column(SQLEnum(SignedDocumentStatus), default=SignedDocumentStatus.PENDING, nullable=False)
+
+    filename = Column(String, nullable=False)
+    storage_path = Column(String, nullable=True)
+    url = Column(String, nullable=True)
+    sha256 = Column(String(64), nullable=True)
+    size_bytes = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    rendered_at = Column(DateTime, nullable=True)
@@ -10,6 +10,7 @@ from sqlalchemy import func
 from app.repositories.implementations.base import BaseRepository
 from app.repositories.interfaces.payroll_repo import IPayrollRepository
 from app.models.payroll import Payroll, PayrollStatus
+from app.utils.period import period_filter
 
 
 class PayrollRepository(BaseRepository[Payroll], IPayrollRepository):
@@ -49,7 +50,7 @@ class PayrollRepository(BaseRepository[Payroll], IPayrollRepository):
     async def get_by_period(self, period: str) -> List[Payroll]:
         """Get all payroll records for a specific period."""
         return self.db.query(Payroll).filter(
-            Payroll.period == period
+            period_filter(Payroll, period)
         ).order_by(Payroll.contractor_id).all()
 
     async def count_by_status(self) -> dict:
@@ -1,8 +1,8 @@
-from app.routes import auth, contractors, third_parties, timesheets, clients, contracts, work_orders, templates, quote_sheets, proposals, payroll, payslips, invoices, notifications, offboarding, contract_extensions, expenses, payroll_batches, client_invoices
+from app.routes import auth, contractors, third_parties, timesheets, clients, contracts, work_orders, templates, quote_sheets, proposals, payroll, payslips, invoices, notifications, offboarding, contract_extensions, expenses, payroll_batches, client_invoices, exports, jobs
 
 __all__ = [
     "auth", "contractors", "third_parties", "timesheets", "clients", "contracts",
     "work_orders", "templates", "quote_sheets", "proposals", "payroll",
     "payslips", "invoices", "notifications", "offboarding", "contract_extensions",
-    "expenses", "payroll_batches", "client_invoices",
+    "expenses", "payroll_batches", "client_invoices", "exports", "jobs",
 ]
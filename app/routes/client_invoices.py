@@ -13,6 +13,7 @@ from app.services import client_invoice_service
 from app.schemas.client_invoice import (
     GenerateClientInvoiceRequest, RecordPaymentRequest,
 )
+from app.utils.period import period_filter
 
 router = APIRouter(prefix="/api/v1/client-invoices", tags=["Client Invoices"])
 
@@ -91,7 +92,7 @@ def list_client_invoices(
     if client_id:
         query = query.filter(ClientInvoice.client_id == client_id)
     if period:
-        query = query.filter(ClientInvoice.period == period)
+        query = query.filter(period_filter(ClientInvoice, period))
     if status:
         try:
             inv_status = ClientInvoiceStatus(status)
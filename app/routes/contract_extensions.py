@@ -3,7 +3,7 @@ Contract Extension API Routes.
 
 Endpoints for managing contractor contract extensions.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -12,6 +12,7 @@ from app.models.user import User
 from app.models.contractor import Contractor
 from app.models.contract_extension import ExtensionStatus
 from app.services.contract_extension_service import ContractExtensionService
+from app.services.document_job_service import process_document_job
 from app.schemas.contract_extension import (
     RequestExtensionRequest,
     ApproveExtensionRequest,
@@ -186,17 +187,22 @@ async def reject_extension(
 )
 async def generate_extension_document(
     extension_id: str,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["admin", "superadmin"])),
 ):
     """
     Generate extension agreement document.
+
+    The document is rendered by a background job; poll `poll_url` until
+    it completes, after which the extension's document URL is set.
     """
     service = ContractExtensionService(db)
 
     try:
-        document_url = await service.generate_extension_document(extension_id)
-        return {"document_url": document_url}
+        result = await service.generate_extension_document(extension_id, requested_by=current_user.id)
+        background_tasks.add_task(process_document_job, result["job_id"])
+        return {**result, "poll_url": f"/api/v1/jobs/{result['job_id']}"}
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1,9 +1,10 @@
 # Contractors API routes
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, UploadFile, File, Form, Request
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_modified
 from typing import List, Optional
 from datetime import datetime, timedelta, timezone
+import hashlib
 import uuid
 import json
 
@@ -40,6 +41,7 @@ from app.utils.auth import (
     get_password_hash
 )
 from app.utils.email import (
+    email_outbox,
     send_contract_email,
     send_activation_email,
     send_document_upload_email,
@@ -48,12 +50,22 @@ from app.utils.email import (
     send_third_party_contractor_request,
     send_work_order_to_client
 )
+from app.utils.email_dedup import claim_email, email_idempotency_key, recent_sends
 from app.utils.contract_template import populate_contract_template
+from app.adapters.pdf.render_service import render_pdf
 from app.utils.contract_pdf_generator import generate_consultant_contract_pdf
 from app.utils.work_order_pdf_generator import generate_work_order_pdf
 from app.utils.cohf_pdf_generator import generate_cohf_pdf
 from app.utils.quote_sheet_pdf_generator import generate_quote_sheet_pdf
 from app.utils.storage import upload_file
+from app.utils.range_response import range_response
+from app.services.signed_document_service import (
+    capture_signed_document,
+    load_signed_document,
+    render_signed_document,
+    latest_signed_document,
+    signed_document_summary,
+)
 from app.config import settings
 from fastapi.responses import StreamingResponse, RedirectResponse
 
@@ -73,6 +85,70 @@ def _inject_superadmin_signature(contractor_data: dict, db) -> dict:
     return contractor_data
 
 
+def _contract_pdf_args(contractor: Contractor) -> tuple:
+    """(args, kwargs) for the signed 5-page consultant contract."""
+    cds_data = contractor.cds_form_data or {}
+    contractor_data = {
+        'first_name': contractor.first_name,
+        'surname': contractor.surname,
+        'client_name': cds_data.get('clientName', contractor.client_name),
+        'client_address': cds_data.get('clientAddress', ''),
+        'role': cds_data.get('role', contractor.role),
+        'location': cds_data.get('location', contractor.location),
+        'duration': contractor.duration or cds_data.get('duration', '6 months'),
+        'start_date': contractor.start_date or cds_data.get('startDate', ''),
+        'candidate_pay_rate': contractor.candidate_pay_rate or cds_data.get('dayRate', ''),
+        'currency': contractor.currency or 'USD'
+    }
+    return (contractor_data,), {
+        'contractor_signature_type': contractor.signature_type,
+        'contractor_signature_data': contractor.signature_data,
+        'superadmin_signature_type': contractor.superadmin_signature_type,
+        'superadmin_signature_data': contractor.superadmin_signature_data,
+        'signed_date': contractor.signed_date.strftime('%Y-%m-%d') if contractor.signed_date else None,
+    }
+
+
+def _quote_sheet_pdf_data(contractor: Contractor) -> dict:
+    """Data for the quote sheet PDF (contractor fields merged with the submitted sheet)."""
+    # Prepare contractor data from model fields
+    contractor_data = {
+        "id": str(contractor.id),
+        "first_name": contractor.first_name,
+        "surname": contractor.surname,
+        "email": contractor.email,
+        "phone": contractor.phone,
+        "nationality": contractor.nationality,
+        "dob": contractor.dob,
+        "current_location": contractor.current_location,
+        "client_name": contractor.client_name,
+        "role": contractor.role,
+        "location": contractor.location,
+        "start_date": contractor.start_date,
+        "end_date": contractor.end_date,
+        "duration": contractor.duration,
+    }
+
+    # Parse Quote Sheet data if exists
+    quote_sheet_data = {}
+    if contractor.quote_sheet_data:
+        if isinstance(contractor.quote_sheet_data, str):
+            try:
+                quote_sheet_data = json.loads(contractor.quote_sheet_data)
+            except:
+                quote_sheet_data = {}
+        elif isinstance(contractor.quote_sheet_data, dict):
+            quote_sheet_data = contractor.quote_sheet_data
+
+    # Merge contractor data with quote sheet data
+    return {**contractor_data, **quote_sheet_data}
+
+
+def _quote_sheet_filename(contractor: Contractor) -> str:
+    contractor_name = f"{contractor.first_name}_{contractor.surname}".replace(" ", "_")
+    return f"QuoteSheet_{contractor_name}_{datetime.now().strftime('%Y%m%d')}.pdf"
+
+
 def _parse_cohf_data(raw) -> Optional[dict]:
     """Safely parse cohf_data from the database, handling both str and dict."""
     if raw is None:
@@ -130,24 +206,20 @@ async def create_contractor_initial(
         currency="AED"
     )
 
-    # Save to database
+    # Save to database, queueing the document upload email with it
     db.add(contractor)
-    db.commit()
-    db.refresh(contractor)
-
-    # Send document upload email to contractor
     contractor_name = f"{contractor.first_name} {contractor.surname}"
 
-    try:
-        email_sent = send_document_upload_email(
+    with email_outbox(db, contractor_id=contractor.id):
+        send_document_upload_email(
             contractor_email=contractor.email,
             contractor_name=contractor_name,
             upload_token=document_token,
             expiry_date=token_expiry
         )
-    except Exception as e:
-        # Log error but don't fail the request
-        pass
+
+    db.commit()
+    db.refresh(contractor)
 
     return contractor
 
@@ -402,30 +474,15 @@ async def get_signed_contract(
             detail="Contract has not been signed yet"
         )
 
-    # Prepare contractor data for the 5-page consultant contract
-    cds_data = contractor.cds_form_data or {}
-    contractor_data = {
-        'first_name': contractor.first_name,
-        'surname': contractor.surname,
-        'client_name': cds_data.get('clientName', contractor.client_name),
-        'client_address': cds_data.get('clientAddress', ''),
-        'role': cds_data.get('role', contractor.role),
-        'location': cds_data.get('location', contractor.location),
-        'duration': contractor.duration or cds_data.get('duration', '6 months'),
-        'start_date': contractor.start_date or cds_data.get('startDate', ''),
-        'candidate_pay_rate': contractor.candidate_pay_rate or cds_data.get('dayRate', ''),
-        'currency': contractor.currency or 'USD'
-    }
+    # Serve the PDF stored when the contract was signed
+    stored = await load_signed_document(db, "contract", contractor.id)
+    if stored:
+        document, content = stored
+        return range_response(request, content, document.filename, etag=document.sha256)
 
-    # Generate PDF with the 5-page consultant contract generator including signatures
-    pdf_buffer = generate_consultant_contract_pdf(
-        contractor_data,
-        contractor_signature_type=contractor.signature_type,
-        contractor_signature_data=contractor.signature_data,
-        superadmin_signature_type=contractor.superadmin_signature_type,
-        superadmin_signature_data=contractor.superadmin_signature_data,
-        signed_date=contractor.signed_date.strftime('%Y-%m-%d') if contractor.signed_date else None
-    )
+    # Signed before artifacts were stored - render with the 5-page consultant contract generator
+    args, kwargs = _contract_pdf_args(contractor)
+    pdf_buffer = await render_pdf(generate_consultant_contract_pdf, *args, **kwargs)
 
     # Return PDF as streaming response
     return StreamingResponse(
@@ -520,7 +577,7 @@ async def get_contractor_contract_preview(
     }
 
     # Generate PDF
-    pdf_buffer = generate_consultant_contract_pdf(contractor_data)
+    pdf_buffer = await render_pdf(generate_consultant_contract_pdf, contractor_data)
 
     # Return as streaming response
     return StreamingResponse(
@@ -644,6 +701,16 @@ async def resend_document_upload_link(
             detail=f"Cannot resend upload link for contractor with status '{contractor.status.value}'"
         )
 
+    # A repeated click within the dedup window keeps the link already sent
+    # instead of rotating the token and emailing again
+    upload_key = email_idempotency_key("document_upload", contractor.email, contractor.id)
+    if not claim_email(upload_key, db):
+        return {
+            "message": "Document upload link was already resent",
+            "contractor_id": contractor.id,
+            "new_expiry": contractor.document_token_expiry.isoformat() if contractor.document_token_expiry else None
+        }
+
     # Generate new token and expiry
     new_token = generate_unique_token()
     new_expiry = datetime.now(timezone.utc) + timedelta(hours=settings.contract_token_expiry_hours)
@@ -651,21 +718,20 @@ async def resend_document_upload_link(
     contractor.document_upload_token = new_token
     contractor.document_token_expiry = new_expiry
 
-    db.commit()
-    db.refresh(contractor)
-
-    # Send document upload email
+    # Queue document upload email with the new token
     contractor_name = f"{contractor.first_name} {contractor.surname}"
 
-    try:
+    with email_outbox(db, contractor_id=contractor.id):
         send_document_upload_email(
             contractor_email=contractor.email,
             contractor_name=contractor_name,
             upload_token=new_token,
-            expiry_date=new_expiry
+            expiry_date=new_expiry,
+            idempotency_key=upload_key
         )
-    except Exception as e:
-        pass
+
+    db.commit()
+    db.refresh(contractor)
 
     return {
         "message": "Document upload link resent successfully",
@@ -778,23 +844,19 @@ async def upload_documents(
         contractor.documents_uploaded_date = datetime.now(timezone.utc)
         contractor.status = ContractorStatus.DOCUMENTS_UPLOADED
 
-        db.commit()
-        db.refresh(contractor)
-
-        # Send notification email to consultant
-        # Get consultant info to send notification
+        # Queue notification email to consultant with the status change
         if contractor.consultant_id:
             consultant = db.query(User).filter(User.id == contractor.consultant_id).first()
             if consultant:
-                try:
+                with email_outbox(db, contractor_id=contractor.id):
                     send_documents_uploaded_notification(
-                        consultant_email=consultant.email,
-                        consultant_name=consultant.name,
+                        admin_email=consultant.email,
                         contractor_name=f"{contractor.first_name} {contractor.surname}",
                         contractor_id=contractor.id
                     )
-                except Exception as e:
-                    pass  # Silent fail on notification
+
+        db.commit()
+        db.refresh(contractor)
 
         return {
             "message": "Documents uploaded successfully",
@@ -1322,30 +1384,25 @@ async def submit_costing_sheet(
     # Update status to PENDING_REVIEW so admin can approve/reject
     contractor.status = ContractorStatus.PENDING_REVIEW
 
-    db.commit()
-    db.refresh(contractor)
-
-    # Send notification email to admin/superadmin
-    # Get all admin and superadmin emails to notify
+    # Queue notification emails to every active admin/superadmin with the
+    # status change (fire-and-forget: nobody waits on their delivery)
     admins = db.query(User).filter(
         User.role.in_([UserRole.ADMIN, UserRole.SUPERADMIN]),
         User.is_active == True
     ).all()
 
-    if admins:
-        admin_emails = [admin.email for admin in admins]
-        consultant_name = contractor.consultant_name or "Unknown"
-        contractor_name = f"{contractor.first_name} {contractor.surname}"
-
-        try:
+    contractor_name = f"{contractor.first_name} {contractor.surname}"
+    with email_outbox(db, contractor_id=contractor.id):
+        for admin in admins:
             send_review_notification(
-                admin_emails=admin_emails,
+                admin_email=admin.email,
                 contractor_name=contractor_name,
-                consultant_name=consultant_name,
-                contractor_id=contractor.id
+                contractor_id=contractor.id,
+                notification_type="Costing Sheet Review"
             )
-        except Exception as e:
-            pass  # Silent fail on notification
+
+    db.commit()
+    db.refresh(contractor)
 
     return {
         "message": "Costing sheet submitted successfully",
@@ -1643,6 +1700,7 @@ async def get_contractor_work_order(
 @router.get("/{contractor_id}/work-order/pdf")
 async def get_contractor_work_order_pdf(
     contractor_id: str,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -1674,6 +1732,12 @@ async def get_contractor_work_order_pdf(
     ).order_by(WorkOrder.created_at.desc()).first()
 
     if existing_work_order:
+        # Serve the PDF stored when the work order was signed
+        stored = await load_signed_document(db, "work_order", existing_work_order.id)
+        if stored:
+            document, content = stored
+            return range_response(request, content, document.filename, etag=document.sha256)
+
         # Use existing work order data
         work_order_data = {
             "work_order_number": existing_work_order.work_order_number,
@@ -1731,7 +1795,7 @@ async def get_contractor_work_order_pdf(
         }
 
     # Generate PDF
-    pdf_buffer = generate_work_order_pdf(work_order_data)
+    pdf_buffer = await render_pdf(generate_work_order_pdf, work_order_data)
 
     return StreamingResponse(
         pdf_buffer,
@@ -1810,7 +1874,10 @@ async def approve_contractor_work_order(
                         client_name=client.company_name,
                         contractor_name=f"{contractor.first_name} {contractor.surname}",
                         work_order_token=existing_work_order.client_signature_token,
-                        expiry_date=token_expiry
+                        expiry_date=token_expiry,
+                        idempotency_key=email_idempotency_key(
+                            "work_order_client", client_email, existing_work_order.client_signature_token
+                        )
                     )
                     if email_sent:
                         existing_work_order.sent_date = datetime.now(timezone.utc)
@@ -1883,7 +1950,8 @@ async def approve_contractor_work_order(
                 client_name=client.company_name,
                 contractor_name=f"{contractor.first_name} {contractor.surname}",
                 work_order_token=signature_token,
-                expiry_date=token_expiry
+                expiry_date=token_expiry,
+                idempotency_key=email_idempotency_key("work_order_client", client_email, signature_token)
             )
 
             # Update sent_date and sent_by if email was sent successfully
@@ -2003,7 +2071,8 @@ async def send_work_order_to_client_endpoint(
                 client_name=client.company_name,
                 contractor_name=f"{contractor.first_name} {contractor.surname}",
                 work_order_token=signature_token,
-                expiry_date=token_expiry
+                expiry_date=token_expiry,
+                idempotency_key=email_idempotency_key("work_order_client", client_email, signature_token)
             )
 
             # Update sent_date and sent_by if email was sent successfully
@@ -2226,7 +2295,8 @@ async def get_contract_pdf(
     # Generate PDF using the 5-page consultant contract generator
     # If contractor has signed, include their signature in the preview
     if contractor.status == ContractorStatus.PENDING_SUPERADMIN_SIGNATURE and contractor.signature_data:
-        pdf_buffer = generate_consultant_contract_pdf(
+        pdf_buffer = await render_pdf(
+            generate_consultant_contract_pdf,
             contractor_data,
             contractor_signature_type=contractor.signature_type,
             contractor_signature_data=contractor.signature_data,
@@ -2236,7 +2306,7 @@ async def get_contract_pdf(
         )
     else:
         # Contractor hasn't signed yet, show blank contract
-        pdf_buffer = generate_consultant_contract_pdf(contractor_data)
+        pdf_buffer = await render_pdf(generate_consultant_contract_pdf, contractor_data)
 
     # Return PDF as streaming response
     return StreamingResponse(
@@ -2252,6 +2322,7 @@ async def get_contract_pdf(
 async def sign_contract(
     token: str,
     signature: SignatureSubmission,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -2308,8 +2379,19 @@ async def sign_contract(
 
     contractor.status = ContractorStatus.SIGNED
 
+    # Store the final signed PDF once, in the background
+    args, kwargs = _contract_pdf_args(contractor)
+    job = capture_signed_document(
+        db, "contract", contractor.id, "counter_signed",
+        f"signed_contract_{contractor.first_name}_{contractor.surname}.pdf", args, kwargs,
+        contractor_id=contractor.id,
+        title=f"Signed Contract - {contractor.first_name} {contractor.surname}",
+        signed_by=f"{contractor.first_name} {contractor.surname}",
+    )
+
     db.commit()
     db.refresh(contractor)
+    background_tasks.add_task(render_signed_document, job)
 
     return {
         "message": "Contract signed successfully",
@@ -2378,7 +2460,8 @@ async def activate_contractor(
         db.refresh(user)
 
         # Send activation email with credentials (intentionally after commit —
-        # email is a non-fatal side effect; activation should not rollback if email fails)
+        # email is a non-fatal side effect; activation should not rollback if email fails).
+        # Sent inline rather than queued so the password is never stored in the outbox.
         email_sent = False
         try:
             contractor_name = f"{contractor.first_name} {contractor.surname}"
@@ -2568,6 +2651,34 @@ async def get_superadmin_signature(
     }
 
 
+# Email Delivery Tracking
+
+@router.get("/{contractor_id}/emails")
+async def get_contractor_emails(
+    contractor_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["admin", "superadmin"]))
+):
+    """
+    Get the most recent emails about a contractor with their delivery
+    status (queued, sent or failed)
+    """
+    from app.services.email_outbox_service import list_contractor_emails
+
+    contractor = db.query(Contractor).filter(Contractor.id == contractor_id).first()
+    if not contractor:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Contractor not found"
+        )
+
+    return {
+        "contractor_id": contractor_id,
+        "emails": list_contractor_emails(db, contractor_id, limit=limit)
+    }
+
+
 # Document Retrieval Endpoints
 
 @router.get("/{contractor_id}/documents")
@@ -2933,6 +3044,17 @@ async def request_quote_sheet(
         # Extract company name from email domain if no third party selected
         third_party_company_name = data.third_party_email.split('@')[1] if '@' in data.third_party_email else "Third Party"
 
+    # A repeated click within the dedup window keeps the request already
+    # sent instead of creating a second one and emailing again
+    request_key = email_idempotency_key("quote_sheet_request", data.third_party_email, contractor.id)
+    if not claim_email(request_key, db):
+        return {
+            "message": f"Quote sheet request already sent to {data.third_party_email}",
+            "contractor_id": contractor_id,
+            "email_sent_to": data.third_party_email,
+            "email_cc": data.email_cc
+        }
+
     # Generate upload token (valid for 14 days)
     upload_token = secrets.token_urlsafe(32)
     token_expiry = datetime.utcnow() + timedelta(days=14)
@@ -2969,9 +3091,10 @@ async def request_quote_sheet(
     )
 
     if not email_sent:
-        # If email fails, delete the quote sheet record
+        # If email fails, delete the quote sheet record and let a retry send
         db.delete(quote_sheet)
         db.commit()
+        recent_sends.release(request_key)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to send email"
@@ -3295,6 +3418,18 @@ async def send_contract_to_contractor(
             detail=f"Contractor must be approved before sending contract. Current status: {contractor.status.value}"
         )
 
+    # A repeated click within the dedup window keeps the contract link
+    # already sent instead of rotating the token and emailing again
+    contract_key = email_idempotency_key("contract", contractor.email, contractor.id)
+    if not claim_email(contract_key, db):
+        return {
+            "message": "Contract was already sent to contractor",
+            "contractor_id": contractor.id,
+            "contractor_email": contractor.email,
+            "token_expiry": contractor.token_expiry.isoformat() if contractor.token_expiry else None,
+            "status": contractor.status.value
+        }
+
     # Generate contract token
     contract_token = generate_unique_token()
     token_expiry = datetime.now(timezone.utc) + timedelta(days=7)  # 7 days expiry
@@ -3305,27 +3440,21 @@ async def send_contract_to_contractor(
     contractor.sent_date = datetime.now(timezone.utc)
     contractor.status = ContractorStatus.PENDING_SIGNATURE
 
-    db.commit()
-    db.refresh(contractor)
-
-    # Send email to contractor
+    # Queue email to contractor with the status change
     contractor_name = f"{contractor.first_name} {contractor.surname}"
     contract_link = f"{settings.frontend_url}/sign-contract/{contract_token}"
 
-    try:
-        email_sent = send_contract_email(
+    with email_outbox(db, contractor_id=contractor.id):
+        send_contract_email(
             contractor_email=contractor.email,
             contractor_name=contractor_name,
             contract_token=contract_token,
-            expiry_date=token_expiry
+            expiry_date=token_expiry,
+            idempotency_key=contract_key
         )
 
-        if email_sent:
-            print(f"[SUCCESS] Contract email sent to {contractor.email}")
-        else:
-            print(f"[WARNING] Failed to send contract email to {contractor.email}")
-    except Exception as e:
-        print(f"[ERROR] Exception sending contract email: {str(e)}")
+    db.commit()
+    db.refresh(contractor)
 
     return {
         "message": "Contract sent to contractor for signature",
@@ -3451,6 +3580,11 @@ async def superadmin_sign_contract(
     """
     Superadmin reviews and signs the contract after contractor has signed
     Can use saved signature or upload a new one (custom stamp)
+
+    The PDF with both signatures is rendered and stored before responding,
+    so signed_contract_url is set on success. If storing it fails the
+    signing still stands: signed_contract_url is null, signed_document
+    carries the error, and the contract view falls back to live rendering.
     """
     contractor = db.query(Contractor).filter(Contractor.id == contractor_id).first()
 
@@ -3479,82 +3613,33 @@ async def superadmin_sign_contract(
     contractor.superadmin_signature_data = signature_data.signature_data
     contractor.status = ContractorStatus.SIGNED
 
-    db.commit()
-    db.refresh(contractor)
-
-    # Generate signed PDF with both signatures
-    print(f"[INFO] Generating signed contract PDF with superadmin signature for contractor {contractor.id}")
-    try:
-        # Prepare contractor data
-        cds_data = contractor.cds_form_data or {}
-        contractor_data = {
-            'first_name': contractor.first_name,
-            'surname': contractor.surname,
-            'client_name': cds_data.get('clientName', contractor.client_name),
-            'client_address': cds_data.get('clientAddress', ''),
-            'role': cds_data.get('role', contractor.role),
-            'location': cds_data.get('location', contractor.location),
-            'duration': contractor.duration or cds_data.get('duration', '6 months'),
-            'start_date': contractor.start_date or cds_data.get('startDate', ''),
-            'candidate_pay_rate': contractor.candidate_pay_rate or cds_data.get('dayRate', ''),
-            'currency': contractor.currency or 'USD'
-        }
-
-        # Generate PDF with both signatures
-        pdf_buffer = generate_consultant_contract_pdf(
-            contractor_data,
-            contractor_signature_type=contractor.signature_type,
-            contractor_signature_data=contractor.signature_data,
-            superadmin_signature_type=contractor.superadmin_signature_type,
-            superadmin_signature_data=contractor.superadmin_signature_data,
-            signed_date=contractor.signed_date.strftime('%Y-%m-%d') if contractor.signed_date else None
-        )
-
-        # Upload to Supabase in contractor folder
-        contractor_filename = f"signed_contract_{contractor.first_name}_{contractor.surname}.pdf"
-        contractor_folder = f"contractor-documents/{contractor.id}"
-        contractor_file_url = upload_file(pdf_buffer, contractor_filename, contractor_folder)
-
-        # Upload to Supabase in superadmin folder
-        superadmin = current_user
-        superadmin_filename = f"{contractor.first_name}_{contractor.surname}_contract_{contractor.signed_date.strftime('%Y%m%d')}.pdf"
-        superadmin_folder = f"superadmin-contracts/{superadmin.id}"
-        pdf_buffer.seek(0)  # Reset buffer for second upload
-        superadmin_file_url = upload_file(pdf_buffer, superadmin_filename, superadmin_folder)
-
-        # Add to superadmin's signed contracts child table
-        from app.models.user import UserSignedContract
-        signed = UserSignedContract(
-            user_id=superadmin.id,
-            contractor_id=contractor.id,
-            contractor_name=f"{contractor.first_name} {contractor.surname}",
-            contract_url=superadmin_file_url,
-            signed_date=contractor.signed_date,
-        )
-        db.add(signed)
-
-        # Update contractor with signed contract URL
-        contractor.signed_contract_url = contractor_file_url
-
-        db.commit()
-        db.refresh(contractor)
-        db.refresh(superadmin)
+    # Render the PDF with both signatures once; it is linked from the
+    # contractor and the superadmin's signed contracts
+    args, kwargs = _contract_pdf_args(contractor)
+    job = capture_signed_document(
+        db, "contract", contractor.id, "counter_signed",
+        f"signed_contract_{contractor.first_name}_{contractor.surname}.pdf", args, kwargs,
+        contractor_id=contractor.id,
+        title=f"Signed Contract - {contractor.first_name} {contractor.surname}",
+        signed_by=current_user.name,
+        signer_user_id=current_user.id,
+    )
 
-        print(f"[INFO] Signed contract saved successfully")
+    db.commit()
 
-    except Exception as e:
-        print(f"[ERROR] Failed to generate/upload signed contract: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to generate signed contract: {str(e)}"
-        )
+    # Superadmin signing is low-volume, so wait for the stored artifact
+    # rather than hand back a URL that is not there yet
+    artifact = await render_signed_document(job)
+    db.refresh(contractor)
 
     # Contract is now fully signed - ready for activation
     return {
         "message": "Contract signed successfully - Ready for activation",
         "contractor_name": f"{contractor.first_name} {contractor.surname}",
         "signed_date": contractor.signed_date.isoformat(),
-        "signed_contract_url": contractor.signed_contract_url,
+        "signed_contract_url": contractor.signed_contract_url,  # Null only if storing the PDF failed
+        "signed_document_id": job.document_id,
+        "signed_document": artifact,  # Artifact summary, or {"error": ...} if storing failed
         "status": "signed",
         "next_step": "Activate contractor account"
     }
@@ -3601,6 +3686,7 @@ async def reset_contractor_to_pending_signature(
 @router.get("/{contractor_id}/cohf/pdf")
 async def get_cohf_pdf(
     contractor_id: str,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -3628,6 +3714,12 @@ async def get_cohf_pdf(
             detail="Contractor not found"
         )
 
+    # Serve the PDF stored when the COHF was signed
+    stored = await load_signed_document(db, "cohf", contractor.id)
+    if stored:
+        document, content = stored
+        return range_response(request, content, document.filename, etag=document.sha256)
+
     # If fully signed COHF document exists (with counter-signature), redirect to it
     # Only redirect if admin has counter-signed (cohf_aventus_signed_date exists)
     if contractor.cohf_signed_document and contractor.cohf_aventus_signed_date:
@@ -3677,7 +3769,7 @@ async def get_cohf_pdf(
     _inject_superadmin_signature(contractor_data, db)
 
     # Generate PDF
-    pdf_buffer = generate_cohf_pdf(contractor_data, cohf_data)
+    pdf_buffer = await render_pdf(generate_cohf_pdf, contractor_data, cohf_data)
 
     # Create filename
     contractor_name = f"{contractor.first_name}_{contractor.surname}".replace(" ", "_")
@@ -3808,7 +3900,7 @@ async def update_cohf(
     if data.cohf_data:
         cohf = data.cohf_data if isinstance(data.cohf_data, dict) else json.loads(data.cohf_data) if isinstance(data.cohf_data, str) else data.cohf_data
         contractor.cohf_data = cohf
-        flag_modified(contractor, "cohf_data")
+        flag_modified(contractor.cohf_record, "cohf_data")
 
     # Handle action
     if data.action == "save":
@@ -3895,8 +3987,25 @@ async def send_cohf_email_endpoint(
             cohf_data_to_use = json.loads(cohf_data_to_use)
         except (json.JSONDecodeError, TypeError):
             pass
+
+    # The same form sent to the same 3rd party again within the dedup
+    # window (e.g. a double-click) keeps the link already sent
+    cohf_version = hashlib.blake2b(
+        json.dumps(cohf_data_to_use, sort_keys=True, default=str).encode("utf-8"), digest_size=8
+    ).hexdigest()
+    cohf_key = email_idempotency_key("cohf", data.third_party_email, contractor.id, cohf_version)
+    if not claim_email(cohf_key, db):
+        return {
+            "message": f"COHF email already sent to {data.third_party_email}",
+            "contractor_id": contractor.id,
+            "cohf_status": contractor.cohf_status,
+            "status": contractor.status.value,
+            "email_sent_to": data.third_party_email,
+            "token_expiry": contractor.cohf_token_expiry.isoformat() if contractor.cohf_token_expiry else None
+        }
+
     contractor.cohf_data = cohf_data_to_use
-    flag_modified(contractor, "cohf_data")
+    flag_modified(contractor.cohf_record, "cohf_data")
 
     # Generate unique token for 3rd party access
     cohf_token = str(uuid.uuid4())
@@ -3909,20 +4018,19 @@ async def send_cohf_email_endpoint(
     contractor.cohf_sent_to_3rd_party_date = datetime.now(timezone.utc)
     contractor.status = ContractorStatus.AWAITING_COHF_SIGNATURE
 
-    db.commit()
-    db.refresh(contractor)
-
-    # Send email to 3rd party
+    # Queue email to 3rd party
     contractor_name = f"{contractor.first_name} {contractor.surname}"
     third_party_company = data.third_party_company or "Third Party"
 
-    email_sent = send_cohf_email(
-        third_party_email=data.third_party_email,
-        third_party_name=third_party_company,
-        contractor_name=contractor_name,
-        cohf_token=cohf_token,
-        expiry_date=token_expiry
-    )
+    with email_outbox(db, contractor_id=contractor.id):
+        email_sent = send_cohf_email(
+            third_party_email=data.third_party_email,
+            third_party_name=third_party_company,
+            contractor_name=contractor_name,
+            cohf_token=cohf_token,
+            expiry_date=token_expiry,
+            idempotency_key=cohf_key
+        )
 
     if not email_sent:
         raise HTTPException(
@@ -3930,6 +4038,9 @@ async def send_cohf_email_endpoint(
             detail="Failed to send COHF email"
         )
 
+    db.commit()
+    db.refresh(contractor)
+
     return {
         "message": f"COHF email sent to {data.third_party_email}",
         "contractor_id": contractor.id,
@@ -4104,7 +4215,7 @@ async def get_cohf_pdf_by_token(
     _inject_superadmin_signature(contractor_data, db)
 
     # Generate PDF
-    pdf_buffer = generate_cohf_pdf(contractor_data, cohf_data)
+    pdf_buffer = await render_pdf(generate_cohf_pdf, contractor_data, cohf_data)
 
     contractor_name = f"{contractor.first_name}_{contractor.surname}".replace(" ", "_")
     filename = f"COHF_{contractor_name}.pdf"
@@ -4123,6 +4234,7 @@ async def get_cohf_pdf_by_token(
 async def sign_cohf(
     cohf_token: str,
     signature_data: dict,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -4179,7 +4291,7 @@ async def sign_cohf(
             except (json.JSONDecodeError, TypeError):
                 pass
         contractor.cohf_data = updated_cohf_data
-        flag_modified(contractor, "cohf_data")
+        flag_modified(contractor.cohf_record, "cohf_data")
 
     # Save third party (Auxilium) signature
     contractor.cohf_third_party_name = signer_name
@@ -4203,7 +4315,8 @@ async def sign_cohf(
     # Update contractor status
     contractor.status = ContractorStatus.PENDING_CDS_CS if superadmin and superadmin.signature_data else ContractorStatus.COHF_COMPLETED
 
-    # Generate signed PDF and upload to storage
+    # Snapshot the signed PDF's data; it is rendered and stored once, in the background
+    job = None
     try:
         contractor_data = {
             "id": str(contractor.id),
@@ -4233,36 +4346,19 @@ async def sign_cohf(
         # Inject superadmin signature for PDF
         _inject_superadmin_signature(contractor_data, db)
 
-        # Generate PDF
-        pdf_buffer = generate_cohf_pdf(contractor_data, cohf_data)
-
-        # Upload to storage
         contractor_name = f"{contractor.first_name}_{contractor.surname}".replace(" ", "_")
         filename = f"COHF_Signed_{contractor_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
 
-        # Upload to Supabase storage (upload_file is sync, not async)
-        pdf_url = upload_file(
-            pdf_buffer,
-            filename,
-            f"cohf/{contractor.id}"
-        )
-
-        contractor.cohf_signed_document = pdf_url
-
-        # Add to contractor documents child table
-        from app.models.contractor import ContractorDocument
-        doc = ContractorDocument(
+        # Listed in the contractor's documents once stored
+        job = capture_signed_document(
+            db, "cohf", contractor.id, contractor.cohf_status, filename, (contractor_data, cohf_data),
             contractor_id=contractor.id,
-            document_type="cohf_signed",
-            name=f"COHF - Signed by {signer_name}",
-            url=pdf_url,
-            uploaded_at=datetime.now(timezone.utc),
+            title=f"COHF - Signed by {signer_name}",
             signed_by=signer_name,
         )
-        db.add(doc)
 
     except Exception as e:
-        print(f"Error generating/uploading signed COHF PDF: {e}")
+        print(f"Error preparing signed COHF PDF: {e}")
         import traceback
         traceback.print_exc()
         # Continue anyway - the signature is saved
@@ -4273,6 +4369,8 @@ async def sign_cohf(
 
     db.commit()
     db.refresh(contractor)
+    if job:
+        background_tasks.add_task(render_signed_document, job)
 
     # Notify admins that COHF has been signed
     try:
@@ -4346,6 +4444,7 @@ async def view_signed_cohf(
             "signed_date": contractor.cohf_completed_date.isoformat() if contractor.cohf_completed_date else None
         },
         "cohf_signed_document": contractor.cohf_signed_document,
+        "signed_document": signed_document_summary(latest_signed_document(db, "cohf", contractor_id)),
         "ready_for_counter_signature": not contractor.cohf_aventus_signed_date
     }
 
@@ -4354,6 +4453,7 @@ async def view_signed_cohf(
 async def counter_sign_cohf(
     contractor_id: str,
     signature_data: dict,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["admin", "superadmin"]))
 ):
@@ -4389,7 +4489,8 @@ async def counter_sign_cohf(
     if contractor.status == ContractorStatus.COHF_COMPLETED:
         contractor.status = ContractorStatus.PENDING_CDS_CS
 
-    # Generate and save the fully signed PDF with both signatures
+    # Snapshot the fully signed PDF's data; it is rendered and stored once, in the background
+    job = None
     try:
         # Prepare contractor data for PDF generation
         contractor_data = {
@@ -4432,25 +4533,26 @@ async def counter_sign_cohf(
         # Inject superadmin signature for PDF
         _inject_superadmin_signature(contractor_data, db)
 
-        # Generate the fully signed PDF
-        pdf_buffer = generate_cohf_pdf(contractor_data, cohf_data)
-
-        # Upload to storage
         contractor_name = f"{contractor.first_name}_{contractor.surname}".replace(" ", "_")
         filename = f"COHF_{contractor_name}_fully_signed_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        folder = f"contractor-documents/{contractor.id}"
 
-        pdf_url = upload_file(pdf_buffer, filename, folder)
-
-        # Update the signed document URL with the fully signed version
-        contractor.cohf_signed_document = pdf_url
+        # Replaces the signed document URL with the fully signed version once stored
+        job = capture_signed_document(
+            db, "cohf", contractor.id, "counter_signed", filename, (contractor_data, cohf_data),
+            contractor_id=contractor.id,
+            title="COHF - Counter-signed by Aventus",
+            signed_by=current_user.name,
+            signer_user_id=current_user.id,
+        )
 
     except Exception as e:
-        print(f"Error generating/uploading fully signed COHF PDF: {e}")
+        print(f"Error preparing fully signed COHF PDF: {e}")
         # Continue even if PDF generation fails - the signature is still saved
 
     db.commit()
     db.refresh(contractor)
+    if job:
+        background_tasks.add_task(render_signed_document, job)
 
     return {
         "message": "COHF counter-signed successfully by Aventus",
@@ -4553,6 +4655,7 @@ async def update_quote_sheet(
 @router.get("/{contractor_id}/quote-sheet/pdf")
 async def get_quote_sheet_pdf(
     contractor_id: str,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -4579,44 +4682,18 @@ async def get_quote_sheet_pdf(
             detail="Contractor not found"
         )
 
-    # Prepare contractor data from model fields
-    contractor_data = {
-        "id": str(contractor.id),
-        "first_name": contractor.first_name,
-        "surname": contractor.surname,
-        "email": contractor.email,
-        "phone": contractor.phone,
-        "nationality": contractor.nationality,
-        "dob": contractor.dob,
-        "current_location": contractor.current_location,
-        "client_name": contractor.client_name,
-        "role": contractor.role,
-        "location": contractor.location,
-        "start_date": contractor.start_date,
-        "end_date": contractor.end_date,
-        "duration": contractor.duration,
-    }
-
-    # Parse Quote Sheet data if exists
-    quote_sheet_data = {}
-    if contractor.quote_sheet_data:
-        if isinstance(contractor.quote_sheet_data, str):
-            try:
-                quote_sheet_data = json.loads(contractor.quote_sheet_data)
-            except:
-                quote_sheet_data = {}
-        elif isinstance(contractor.quote_sheet_data, dict):
-            quote_sheet_data = contractor.quote_sheet_data
+    # Serve the PDF stored when the quote sheet was signed
+    stored = await load_signed_document(db, "quote_sheet", contractor.id)
+    if stored:
+        document, content = stored
+        return range_response(request, content, document.filename, etag=document.sha256)
 
-    # Merge contractor data with quote sheet data
-    pdf_data = {**contractor_data, **quote_sheet_data}
+    pdf_data = _quote_sheet_pdf_data(contractor)
 
     # Generate PDF
-    pdf_buffer = generate_quote_sheet_pdf(pdf_data)
+    pdf_buffer = await render_pdf(generate_quote_sheet_pdf, pdf_data)
 
-    # Create filename
-    contractor_name = f"{contractor.first_name}_{contractor.surname}".replace(" ", "_")
-    filename = f"QuoteSheet_{contractor_name}_{datetime.now().strftime('%Y%m%d')}.pdf"
+    filename = _quote_sheet_filename(contractor)
 
     return StreamingResponse(
         pdf_buffer,
@@ -4803,6 +4880,7 @@ async def get_quote_sheet_by_token(
 async def submit_quote_sheet(
     token: str,
     data: dict,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -4851,8 +4929,18 @@ async def submit_quote_sheet(
     contractor.quote_sheet_token = None
     contractor.quote_sheet_token_expiry = None
 
+    # Store the signed quote sheet PDF once, in the background
+    job = capture_signed_document(
+        db, "quote_sheet", contractor.id, "signed", _quote_sheet_filename(contractor),
+        (_quote_sheet_pdf_data(contractor),),
+        contractor_id=contractor.id,
+        title=f"Quote Sheet - Signed by {third_party_name}",
+        signed_by=third_party_name,
+    )
+
     db.commit()
     db.refresh(contractor)
+    background_tasks.add_task(render_signed_document, job)
 
     return {
         "message": "Quote sheet submitted successfully",
@@ -4899,6 +4987,7 @@ async def view_signed_quote_sheet(
             "signed_date": contractor.quote_sheet_third_party_signed_date.isoformat() if contractor.quote_sheet_third_party_signed_date else None
         },
         "third_party_document": contractor.third_party_document,
+        "signed_document": signed_document_summary(latest_signed_document(db, "quote_sheet", contractor_id)),
         "ready_for_counter_signature": not contractor.quote_sheet_aventus_signed_date
     }
 
@@ -4907,6 +4996,7 @@ async def view_signed_quote_sheet(
 async def counter_sign_quote_sheet(
     contractor_id: str,
     signature_data: dict,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["admin", "superadmin"]))
 ):
@@ -4937,8 +5027,19 @@ async def counter_sign_quote_sheet(
     contractor.quote_sheet_aventus_signed_date = datetime.now(timezone.utc)
     contractor.quote_sheet_aventus_signed_by = current_user.id
 
+    # Store the counter-signed quote sheet PDF once, in the background
+    job = capture_signed_document(
+        db, "quote_sheet", contractor.id, "counter_signed", _quote_sheet_filename(contractor),
+        (_quote_sheet_pdf_data(contractor),),
+        contractor_id=contractor.id,
+        title="Quote Sheet - Counter-signed by Aventus",
+        signed_by=current_user.name,
+        signer_user_id=current_user.id,
+    )
+
     db.commit()
     db.refresh(contractor)
+    background_tasks.add_task(render_signed_document, job)
 
     return {
         "message": "Quote sheet counter-signed successfully by Aventus",
@@ -10,7 +10,8 @@ from app.models.contract import Contract, ContractTemplate, ContractStatus
 from app.models.contractor import Contractor
 from app.models.user import User, UserRole
 from app.utils.auth import get_current_active_user, require_role
-from app.utils.email import send_contract_email, send_activation_email, send_signed_contract_email
+from app.utils.email import email_outbox, send_contract_email, send_activation_email, send_signed_contract_email
+from app.utils.email_dedup import email_idempotency_key
 from app.utils.contract_pdf_generator import generate_consultant_contract_pdf
 from app.utils.storage import upload_file
 from sqlalchemy.orm.attributes import flag_modified
@@ -231,13 +232,15 @@ def send_contract(
     if not contractor:
         raise HTTPException(status_code=404, detail="Contractor not found")
 
-    # Send email
-    email_sent = send_contract_email(
-        contractor_email=contractor.email,
-        contractor_name=f"{contractor.first_name} {contractor.surname}",
-        contract_token=contract.contract_token,
-        expiry_date=contract.token_expiry
-    )
+    # Queue email in the same transaction as the status change
+    with email_outbox(db, contractor_id=contractor.id):
+        email_sent = send_contract_email(
+            contractor_email=contractor.email,
+            contractor_name=f"{contractor.first_name} {contractor.surname}",
+            contract_token=contract.contract_token,
+            expiry_date=contract.token_expiry,
+            idempotency_key=email_idempotency_key("contract", contractor.email, contract.id, contract.contract_token)
+        )
 
     if not email_sent:
         raise HTTPException(status_code=500, detail="Failed to send contract email")
@@ -462,20 +465,17 @@ def counter_sign_contract(
             detail="Failed to generate signed contract PDF. Contract was not signed."
         )
 
-    # Single commit: signature + PDF URL saved atomically
-    db.commit()
-    db.refresh(contract)
-
-    # Email is a side effect — sent after commit (failure is non-fatal)
-    try:
+    # Email is queued in the outbox and only sent once the signing commits
+    with email_outbox(db, contractor_id=contractor.id):
         send_signed_contract_email(
             contractor_email=contractor.email,
             contractor_name=f"{contractor.first_name} {contractor.surname}",
             pdf_url=pdf_url
         )
-        print(f"Signed contract email sent to {contractor.email}")
-    except Exception as email_error:
-        print(f"Warning: Failed to send signed contract email: {email_error}")
+
+    # Single commit: signature + PDF URL + email saved atomically
+    db.commit()
+    db.refresh(contract)
 
     return {
         "message": "Contract counter-signed successfully. Signed copy emailed to contractor.",
@@ -639,7 +639,7 @@ def activate_account(
     # Generate temporary password
     temp_password = generate_temporary_password()
 
-    # Send activation email
+    # Send activation email inline; credentials are never stored in the outbox
     email_sent = send_activation_email(
         contractor_email=contractor.email,
         contractor_name=f"{contractor.first_name} {contractor.surname}",
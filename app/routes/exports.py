@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.database import get_db
+from app.services.export_service import EXPORT_DATASETS, export_rows, stream_csv, stream_xlsx
+
+router = APIRouter(prefix="/api/v1/exports", tags=["exports"])
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+@router.get("/{dataset}")
+def export_dataset(
+    dataset: str,
+    format: str = Query(default="csv", pattern="^(csv|xlsx)$"),
+    from_period: Optional[str] = Query(default=None, description="First period, e.g. 'January 2026'"),
+    to_period: Optional[str] = Query(default=None, description="Last period, e.g. 'December 2026'"),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream payroll, batches or client invoices as CSV or XLSX.
+
+    `dataset` is one of payroll, batches, client-invoices. Rows are ordered
+    by period and streamed as they are read, so large ranges are safe.
+    """
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(status_code=404, detail=f"Unknown export '{dataset}'")
+
+    try:
+        headers, rows = export_rows(db, dataset, from_period, to_period)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    body = stream_csv(headers, rows) if format == "csv" else stream_xlsx(headers, rows, sheet_name=dataset)
+    filename = f"{dataset}-export.{format}"
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
@@ -30,7 +30,8 @@ from app.repositories.implementations.invoice_repo import InvoiceRepository, Inv
 from app.services.invoice_service import InvoiceService
 from app.utils.auth import get_current_active_user
 from app.models.user import User
-from app.utils.payroll_pdf import generate_invoice_pdf
+from app.adapters.pdf.render_service import render_pdf
+from app.utils.payroll_pdf import generate_invoice_pdf, payroll_pdf_args
 
 router = APIRouter(prefix="/api/v1/invoices", tags=["invoices"])
 
@@ -466,7 +467,7 @@ async def download_invoice_pdf(
             detail="Related records not found"
         )
 
-    pdf_buffer = generate_invoice_pdf(payroll, contractor)
+    pdf_buffer = await render_pdf(generate_invoice_pdf, *payroll_pdf_args(payroll, contractor))
 
     return StreamingResponse(
         pdf_buffer,
@@ -0,0 +1,114 @@
+"""
+Document Job Routes - Asynchronous document generation with polling.
+"""
+from typing import Set
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.adapters.pdf import PDFGeneratorRegistry
+from app.database import get_db
+from app.models.user import User, UserRole
+from app.schemas.document_job import DocumentJobCreate
+from app.services import document_job_service
+from app.utils.auth import get_current_active_user, require_role
+
+router = APIRouter(prefix="/api/v1/jobs", tags=["Jobs"])
+
+# Contracts are signed by the superadmin only, so only the superadmin can
+# render one; admins can queue every other registered type.
+SUPERADMIN_ONLY_DOCUMENT_TYPES = {"contract"}
+
+
+def allowed_document_types(role: UserRole) -> Set[str]:
+    """Registered document types a role may queue."""
+    registered = set(PDFGeneratorRegistry.available_types())
+    if role == UserRole.SUPERADMIN:
+        return registered
+    if role == UserRole.ADMIN:
+        return registered - SUPERADMIN_ONLY_DOCUMENT_TYPES
+    return set()
+
+
+@router.post("", status_code=202)
+def create_job(
+    request: DocumentJobCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["admin", "superadmin"])),
+):
+    """
+    Queue generation of a registered document type the user's role may request.
+
+    Returns immediately; poll GET /api/v1/jobs/{job_id} until the status is
+    completed (url set) or failed (error set).
+    """
+    if (
+        PDFGeneratorRegistry.is_registered(request.document_type)
+        and request.document_type not in allowed_document_types(current_user.role)
+    ):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    result = document_job_service.create_document_job(
+        db, request.document_type, request.data, requested_by=current_user.id
+    )
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    db.commit()
+
+    background_tasks.add_task(document_job_service.process_document_job, result["job_id"])
+    return {
+        "job_id": result["job_id"],
+        "status": result["status"],
+        "poll_url": f"/api/v1/jobs/{result['job_id']}",
+    }
+
+
+@router.get("/{job_id}")
+def get_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Status of a document job, with the result URL once completed."""
+    job = document_job_service.get_document_job(db, job_id)
+    # Only the requester and admins can see a job (and its document URL)
+    if not job or (
+        job["requested_by"] != current_user.id
+        and current_user.role not in (UserRole.ADMIN, UserRole.SUPERADMIN)
+    ):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/{job_id}/retry", status_code=202)
+def retry_job(
+    job_id: str,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["admin", "superadmin"])),
+):
+    """
+    Queue a failed job again with its original data.
+
+    Poll GET /api/v1/jobs/{job_id} as for a new job. A job queued for a
+    record (offboarding letters, extension agreements) still publishes its
+    URL to that record once it completes.
+    """
+    job = document_job_service.get_document_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["document_type"] not in allowed_document_types(current_user.role):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    result = document_job_service.retry_document_job(db, job_id)
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    db.commit()
+
+    background_tasks.add_task(document_job_service.process_document_job, job_id)
+    return {
+        "job_id": job_id,
+        "status": result["status"],
+        "poll_url": f"/api/v1/jobs/{job_id}",
+    }
@@ -311,19 +311,20 @@ def notify_manager_timesheet_submitted(db: Session, manager_email: str, contract
 
 
 def notify_users_by_role(db: Session, role: str, notification_type: str, title: str, message: str, reference_type: str = None, reference_id: str = None, action_url: str = None):
-    """Notify all users with a specific role"""
-    users = db.query(User).filter(User.role == role).all()
-    notifications = []
-    for user in users:
-        notification = create_notification(
-            db=db,
-            user_id=user.id,
-            notification_type=notification_type,
+    """Notify all users with a specific role (one insert batch, one commit)"""
+    user_ids = [user_id for (user_id,) in db.query(User.id).filter(User.role == role).all()]
+    notifications = [
+        Notification(
+            user_id=user_id,
+            type=notification_type,
             title=title,
             message=message,
             reference_type=reference_type,
             reference_id=reference_id,
             action_url=action_url
         )
-        notifications.append(notification)
+        for user_id in user_ids
+    ]
+    db.add_all(notifications)
+    db.commit()
     return notifications
@@ -3,7 +3,7 @@ Offboarding API Routes.
 
 Endpoints for managing contractor offboarding process.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -11,6 +11,7 @@ from app.database import get_db
 from app.models.user import User
 from app.models.offboarding import OffboardingStatus
 from app.models.contractor import Contractor
+from app.services.document_job_service import process_document_job
 from app.services.offboarding_service import OffboardingService
 from app.schemas.offboarding import (
     InitiateOffboardingRequest,
@@ -145,31 +146,31 @@ async def approve_settlement(
 )
 async def generate_documents(
     offboarding_id: str,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["admin", "superadmin"])),
 ):
     """
     Generate offboarding documents.
 
-    Creates termination letter, experience letter, and clearance certificate.
+    Queues the termination letter, experience letter, and clearance
+    certificate as background jobs and returns their IDs in `jobs`. Poll
+    /api/v1/jobs/{job_id} (or the offboarding record); the document URLs
+    are set as each job completes.
     """
     service = OffboardingService(db)
 
     try:
-        documents = await service.generate_offboarding_documents(offboarding_id)
+        documents = await service.generate_offboarding_documents(offboarding_id, requested_by=current_user.id)
+        for job_id in documents["jobs"].values():
+            background_tasks.add_task(process_document_job, job_id)
         offboarding = await service.get_offboarding_by_id(offboarding_id)
 
         return OffboardingDocumentsResponse(
             offboarding_id=offboarding_id,
-            termination_letter_url=documents.get("termination_letter_url"),
-            experience_letter_url=documents.get("experience_letter_url"),
-            clearance_certificate_url=documents.get("clearance_certificate_url"),
             final_payslip_url=offboarding.final_payslip_url if offboarding else None,
-            all_documents_generated=all([
-                documents.get("termination_letter_url"),
-                documents.get("experience_letter_url"),
-                documents.get("clearance_certificate_url"),
-            ]),
+            all_documents_generated=False,
+            jobs=documents["jobs"],
         )
     except ValueError as e:
         raise HTTPException(
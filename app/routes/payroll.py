@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import extract
@@ -13,6 +13,14 @@ from app.models.payroll_batch import PayrollBatch
 from app.models.timesheet import Timesheet, TimesheetStatus
 from app.models.contractor import Contractor
 from app.services.expense_service import get_approved_expenses_total
+from app.services.leave_ledger_service import get_leave_position
+from app.services.pay_terms_service import get_pay_terms, get_pay_terms_bulk, snapshot
+from app.services.payroll_batch_service import record_payroll_amount_change, remove_payroll_from_batch
+from app.services.payroll_service import PayrollService
+from app.services.payroll_stats_service import get_status_counts, get_payroll_stats
+from app.repositories.implementations.payroll_repo import PayrollRepository
+from app.schemas.payroll import PayrollRunRequest
+from app.utils.period import parse_period, previous_period
 
 router = APIRouter(prefix="/api/v1/payroll", tags=["payroll"])
 
@@ -218,101 +226,19 @@ def _get_vat_rate(country: str) -> float:
     return 0.05  # Default to UAE
 
 
-def _get_contractor_full_info(contractor: Contractor, db: Session) -> dict:
-    """Extract all pay-related information from contractor using DRY helper functions."""
-    cds = contractor.cds_form_data or {}
-    costing = contractor.costing_sheet_data or {}
-
-    # Rate type - normalize "day" -> "daily"
-    rate_type = (cds.get("rateType") or contractor.rate_type or "monthly").lower()
-    if rate_type == "day":
-        rate_type = "daily"
-
-    # Currency
-    currency = cds.get("currency") or contractor.currency or "AED"
-
-    # Rates - using DRY helper
-    monthly_rate = _get_float_value(contractor.gross_salary, cds, "grossSalary", 0)
-    day_rate = _get_float_value(contractor.day_rate, cds, "dayRate", None)
-    charge_rate_month = _get_float_value(contractor.charge_rate_month, cds, "chargeRateMonth", 0)
-    charge_rate_day = _get_float_value(contractor.charge_rate_day, cds, "chargeRateDay", None)
-
-    # Leave allowance - check multiple sources
-    leave_allowance = _get_float_value(contractor.leave_allowance, cds, "leaveAllowance", None)
-    if leave_allowance is None:
-        leave_allowance = _get_float_value(contractor.vacation_days, None, "", 30)
-
-    # Management fee - check multiple keys in costing sheet
-    management_fee = 0
-    for key in ["management_company_charges", "managementFee", "management_fee", "serviceCharge"]:
-        fee = _get_float_value(None, costing, key, None)
-        if fee is not None and fee > 0:
-            management_fee = fee
-            break
-
-    # Accruals from costing sheet - using DRY helper
-    accrual_gratuity = _get_float_value(None, costing, "eosb", None) or _get_float_value(None, costing, "gratuity", 0)
-    accrual_airfare = _get_float_value(None, costing, "flights", None) or _get_float_value(None, costing, "airfare", 0)
-    accrual_annual_leave = _get_float_value(None, costing, "leave", None) or _get_float_value(None, costing, "annualLeave", 0)
-
-    return {
-        "rate_type": rate_type,
-        "currency": currency,
-        "monthly_rate": monthly_rate,
-        "day_rate": day_rate,
-        "charge_rate_month": charge_rate_month,
-        "charge_rate_day": charge_rate_day,
-        "leave_allowance": leave_allowance,
-        "third_party_name": contractor.company_name or "",
-        "management_fee": management_fee,
-        "accrual_gratuity": accrual_gratuity,
-        "accrual_airfare": accrual_airfare,
-        "accrual_annual_leave": accrual_annual_leave,
-        "country": contractor.onboarding_route or "UAE",
-        "client_name": contractor.client_name or "",
-    }
-
-
-def _get_total_leave_taken_this_year(contractor_id: str, year: int, db: Session) -> float:
-    """Calculate total vacation days taken this year from all timesheets."""
-    timesheets = db.query(Timesheet).filter(
-        Timesheet.contractor_id == contractor_id,
-        Timesheet.status == TimesheetStatus.APPROVED
-    ).all()
-
-    total_leave = 0
-    for ts in timesheets:
-        # Parse month to check if it's the same year
-        try:
-            ts_date = datetime.strptime(ts.month, "%B %Y")
-            if ts_date.year == year:
-                total_leave += ts.vacation_days or 0
-        except (ValueError, AttributeError):
-            pass
-
-    return total_leave
-
-
 def _get_previous_month_timesheet(contractor_id: str, current_period: str, db: Session) -> Optional[Timesheet]:
     """Get the previous month's timesheet."""
-    try:
-        current_date = datetime.strptime(current_period, "%B %Y")
-        if current_date.month == 1:
-            prev_month = 12
-            prev_year = current_date.year - 1
-        else:
-            prev_month = current_date.month - 1
-            prev_year = current_date.year
-
-        prev_period = datetime(prev_year, prev_month, 1).strftime("%B %Y")
-
-        return db.query(Timesheet).filter(
-            Timesheet.contractor_id == contractor_id,
-            Timesheet.month == prev_period,
-            Timesheet.status == TimesheetStatus.APPROVED
-        ).first()
-    except (ValueError, AttributeError):
+    parsed = parse_period(current_period)
+    if parsed is None:
         return None
+    prev_year, prev_month = previous_period(*parsed)
+
+    return db.query(Timesheet).filter(
+        Timesheet.contractor_id == contractor_id,
+        Timesheet.year == prev_year,
+        Timesheet.month_number == prev_month,
+        Timesheet.status == TimesheetStatus.APPROVED
+    ).first()
 
 
 def auto_calculate_payroll(timesheet_id: int, db: Session) -> Optional[int]:
@@ -335,8 +261,11 @@ def auto_calculate_payroll(timesheet_id: int, db: Session) -> Optional[int]:
     if not contractor:
         return None
 
-    # Get all contractor info
-    info = _get_contractor_full_info(contractor, db)
+    # Pay terms from the contractor's snapshot (built on first calculation)
+    terms = get_pay_terms(db, contractor)
+    if terms.error:
+        return None
+    info = snapshot(terms)
 
     # Determine rate type
     rate_type = RateType.MONTHLY if info["rate_type"] == "monthly" else RateType.DAILY
@@ -435,6 +364,7 @@ def auto_calculate_payroll(timesheet_id: int, db: Session) -> Optional[int]:
     payroll = Payroll(
         timesheet_id=timesheet_id,
         contractor_id=contractor.id,
+        pay_terms=info,
         period=period,
         rate_type=rate_type,
         currency=info["currency"],
@@ -502,43 +432,48 @@ def get_timesheets_ready_for_payroll(
         .all()
     )
 
-    # Batch load all contractors to avoid N+1 queries
+    # Slim contractor rows plus persisted pay terms - no JSON re-parsing per row
     contractor_ids = {ts.contractor_id for ts in timesheets if ts.contractor_id}
     contractors_map = {}
     if contractor_ids:
-        contractors = db.query(Contractor).filter(Contractor.id.in_(contractor_ids)).all()
+        contractors = (
+            db.query(Contractor.id, Contractor.first_name, Contractor.surname, Contractor.email)
+            .filter(Contractor.id.in_(contractor_ids))
+            .all()
+        )
         contractors_map = {c.id: c for c in contractors}
+    pay_terms = get_pay_terms_bulk(db, contractors_map.keys(), persist=False)
 
     result = []
     for ts in timesheets:
         contractor = contractors_map.get(ts.contractor_id)
-        if not contractor:
+        terms = pay_terms.get(ts.contractor_id)
+        if not contractor or not terms:
             continue
 
-        info = _get_contractor_full_info(contractor, db)
         contractor_name = _get_contractor_name(contractor)
 
         # Calculate estimated gross based on rate type
         estimated_gross = None
-        if info["rate_type"] == "daily" and info["day_rate"]:
-            estimated_gross = info["day_rate"] * (ts.work_days or 0)
-        elif info["rate_type"] == "monthly" and info["monthly_rate"]:
-            estimated_gross = info["monthly_rate"]
+        if terms.rate_type == "daily" and terms.day_rate:
+            estimated_gross = terms.day_rate * (ts.work_days or 0)
+        elif terms.rate_type == "monthly" and terms.monthly_rate:
+            estimated_gross = terms.monthly_rate
 
         result.append({
             "id": ts.id,
             "contractor_id": ts.contractor_id,
             "contractor_name": contractor_name,
             "contractor_email": contractor.email,
-            "client_name": info["client_name"],
-            "third_party_name": info["third_party_name"],
+            "client_name": terms.client_name or "",
+            "third_party_name": terms.third_party_name or "",
             "period": ts.month,
             "work_days": ts.work_days,
             "total_days": ts.total_days,
-            "rate_type": info["rate_type"],
-            "monthly_rate": info["monthly_rate"],
-            "day_rate": info["day_rate"],
-            "currency": info["currency"],
+            "rate_type": terms.rate_type,
+            "monthly_rate": terms.monthly_rate,
+            "day_rate": terms.day_rate,
+            "currency": terms.currency,
             "estimated_gross": estimated_gross,
             "submitted_date": ts.submitted_date,
             "approved_date": ts.approved_date,
@@ -550,41 +485,41 @@ def get_timesheets_ready_for_payroll(
 @router.get("/")
 def get_all_payroll_records(
     status: Optional[str] = None,
+    period: Optional[str] = None,
+    client_id: Optional[str] = None,
+    route: Optional[str] = None,
+    batch_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
     db: Session = Depends(get_db)
 ):
-    """Get all payroll records with optional status filter."""
-    query = db.query(Payroll)
-
-    if status:
-        try:
-            status_enum = PayrollStatus(status)
-            query = query.filter(Payroll.status == status_enum)
-        except ValueError:
-            pass
-
-    payrolls = query.order_by(Payroll.created_at.desc()).all()
+    """
+    Get payroll records newest first, optionally one page at a time.
 
-    # Batch load all contractors to avoid N+1 queries
-    contractor_ids = {p.contractor_id for p in payrolls if p.contractor_id}
-    contractors_map = {}
-    if contractor_ids:
-        contractors = db.query(Contractor).filter(Contractor.id.in_(contractor_ids)).all()
-        contractors_map = {c.id: c for c in contractors}
+    Filter by status, period, client, onboarding route or batch. Without
+    `limit` or `cursor` every matching record is returned, as before. With
+    `limit`, pass the returned `next_cursor` as `cursor` to fetch the next
+    page (default size 100); it is null on the last page. `total` is the
+    number of matching records and `count` the number on this page.
+    """
+    service = PayrollService(PayrollRepository(db), db)
+    try:
+        page = service.get_all_payroll_records(
+            status_filter=status, period=period, client_id=client_id, route=route,
+            batch_id=batch_id, cursor=cursor, limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     result = []
-    for p in payrolls:
-        contractor = contractors_map.get(p.contractor_id)
-        contractor_name = _get_contractor_name(contractor) if contractor else "Unknown"
-        contractor_email = contractor.email if contractor else None
-        client_name = contractor.client_name if contractor else None
-
+    for p in page["rows"]:
         result.append({
             "id": p.id,
             "timesheet_id": p.timesheet_id,
             "contractor_id": p.contractor_id,
-            "contractor_name": contractor_name,
-            "contractor_email": contractor_email,
-            "client_name": client_name,
+            "contractor_name": f"{p.first_name} {p.surname}" if p.first_name is not None else "Unknown",
+            "contractor_email": p.contractor_email,
+            "client_name": p.client_name,
             "third_party_name": p.third_party_name,
             "period": p.period,
             "rate_type": p.rate_type.value if p.rate_type else "monthly",
@@ -598,26 +533,55 @@ def get_all_payroll_records(
             "total_payable": p.total_payable,
             "currency": p.currency,
             "status": p.status.value,
+            "batch_id": p.batch_id,
             "calculated_at": p.calculated_at,
             "approved_at": p.approved_at,
             "paid_at": p.paid_at,
         })
 
-    # Count by status using SQL COUNT (not loading all records into memory)
-    from sqlalchemy import func
+    # Count by status in one grouped query (or the cached counters)
+    counts = get_status_counts(db)
     status_counts = {
-        "calculated": db.query(func.count(Payroll.id)).filter(Payroll.status == PayrollStatus.CALCULATED).scalar() or 0,
-        "approved": db.query(func.count(Payroll.id)).filter(Payroll.status == PayrollStatus.APPROVED).scalar() or 0,
-        "paid": db.query(func.count(Payroll.id)).filter(Payroll.status == PayrollStatus.PAID).scalar() or 0,
+        "calculated": counts[PayrollStatus.CALCULATED.value],
+        "approved": counts[PayrollStatus.APPROVED.value],
+        "paid": counts[PayrollStatus.PAID.value],
     }
 
     return {
         "payrolls": result,
-        "total": len(result),
+        "total": page["total"],
+        "count": len(result),
+        "next_cursor": page["next_cursor"],
         **status_counts,
     }
 
 
+@router.get("/stats")
+def get_payroll_stats_summary(db: Session = Depends(get_db)):
+    """Ready-for-payroll timesheet count and payroll counts per status."""
+    return get_payroll_stats(db)
+
+
+@router.post("/run")
+def run_payroll_for_period(
+    request: PayrollRunRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Calculate payroll for every approved timesheet of a period in one pass.
+
+    Contractors, leave, previous-month timesheets and expenses are bulk-loaded,
+    all calculations are done in memory, payroll rows are inserted together and
+    assigned to batches. Contractors that fail calculation are reported in
+    `failed` without aborting the run.
+    """
+    service = PayrollService(PayrollRepository(db), db)
+    try:
+        return service.run_payroll_for_period(request.period, request.timesheet_ids)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Period must be in 'Month YYYY' format, e.g. 'January 2026'")
+
+
 @router.post("/{timesheet_id}/calculate")
 def calculate_payroll(
     timesheet_id: int,
@@ -663,8 +627,11 @@ def calculate_payroll(
     if not contractor:
         raise HTTPException(status_code=404, detail="Contractor not found")
 
-    # Get all contractor info
-    info = _get_contractor_full_info(contractor, db)
+    # Pay terms from the contractor's snapshot (built on first calculation)
+    terms = get_pay_terms(db, contractor)
+    if terms.error:
+        raise HTTPException(status_code=400, detail=terms.error)
+    info = snapshot(terms)
 
     # Determine rate type
     rate_type = RateType.MONTHLY if info["rate_type"] == "monthly" else RateType.DAILY
@@ -680,12 +647,11 @@ def calculate_payroll(
     prev_timesheet = _get_previous_month_timesheet(contractor.id, period, db)
     previous_month_days_worked = prev_timesheet.work_days if prev_timesheet else 0
 
-    # Parse year from period for leave calculations
+    # Parse year/month from period for leave calculations
     try:
         period_date = datetime.strptime(period, "%B %Y")
-        current_year = period_date.year
     except (ValueError, AttributeError):
-        current_year = datetime.now().year
+        period_date = datetime.now()
 
     # ========== BASIC CALCULATION ==========
     monthly_rate = info["monthly_rate"]
@@ -704,9 +670,10 @@ def calculate_payroll(
 
     # ========== LEAVE ADJUSTMENTS ==========
     leave_allowance = info["leave_allowance"]
-    carry_over_leave = 0  # TODO: Calculate from previous year (max 5 days)
+    leave_position = get_leave_position(db, contractor.id, period_date.year, period_date.month)
+    carry_over_leave = leave_position.carry_over_days if leave_position else 0
     total_leave_allowance = leave_allowance + carry_over_leave
-    total_leave_taken = _get_total_leave_taken_this_year(contractor.id, current_year, db)
+    total_leave_taken = leave_position.ytd_vacation_days if leave_position else 0
     leave_balance = total_leave_allowance - total_leave_taken
 
     # Leave deductibles only apply if balance is negative
@@ -762,6 +729,7 @@ def calculate_payroll(
     payroll = Payroll(
         timesheet_id=timesheet_id,
         contractor_id=contractor.id,
+        pay_terms=info,
 
         # Basic Info
         period=period,
@@ -969,6 +937,9 @@ def update_payroll(
     if payroll.status != PayrollStatus.CALCULATED:
         raise HTTPException(status_code=400, detail="Can only edit payroll in CALCULATED status")
 
+    previous_net_salary = payroll.net_salary
+    previous_total_payable = payroll.total_payable
+
     # Update fields if provided
     if expenses_reimbursement is not None:
         payroll.expenses_reimbursement = expenses_reimbursement
@@ -1011,6 +982,7 @@ def update_payroll(
     payroll.invoice_total = payroll.net_salary + payroll.total_accruals + (payroll.management_fee or 0)
     payroll.vat_amount = payroll.invoice_total * payroll.vat_rate
     payroll.total_payable = payroll.invoice_total + payroll.vat_amount
+    record_payroll_amount_change(db, payroll, previous_net_salary, previous_total_payable)
 
     db.commit()
     db.refresh(payroll)
@@ -1068,9 +1040,11 @@ def approve_payroll(
     invoice_buffer = generate_invoice_pdf(payroll=payroll, contractor=contractor)
     invoice_bytes = invoice_buffer.getvalue()
 
-    # Send emails
-    _send_invoice_to_client(contractor, contractor_name, payroll, invoice_bytes)
-    _send_payslip_to_contractor(contractor, contractor_name, payroll, payslip_bytes)
+    # Queue emails with the approval
+    from app.utils.email import email_outbox
+    with email_outbox(db, contractor_id=contractor.id):
+        _send_invoice_to_client(contractor, contractor_name, payroll, invoice_bytes)
+        _send_payslip_to_contractor(contractor, contractor_name, payroll, payslip_bytes)
 
     payroll.status = PayrollStatus.APPROVED
     payroll.approved_at = datetime.utcnow()
@@ -1109,6 +1083,7 @@ def delete_payroll(
     if not payroll:
         raise HTTPException(status_code=404, detail="Payroll record not found")
 
+    remove_payroll_from_batch(db, payroll)
     db.delete(payroll)
     db.commit()
 
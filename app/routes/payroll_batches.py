@@ -1,7 +1,7 @@
 """
 Payroll Batch Routes - API endpoints for batch payroll management.
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime
@@ -9,12 +9,12 @@ from datetime import datetime
 from app.database import get_db
 from app.models.payroll import Payroll, PayrollStatus
 from app.models.payroll_batch import PayrollBatch, BatchStatus
-from app.models.contractor import Contractor
-from app.services import payroll_batch_service
+from app.services import payroll_batch_service, payslip_run_service
 from app.schemas.payroll_batch import (
     AdjustPayrollRequest, FlagMismatchRequest, RequestInvoiceRequest,
     FinanceRejectRequest, MarkPaidRequest,
 )
+from app.utils.period import period_filter
 
 router = APIRouter(prefix="/api/v1/payroll-batches", tags=["Payroll Batches"])
 
@@ -108,7 +108,7 @@ def list_batches(
     query = db.query(PayrollBatch).order_by(PayrollBatch.created_at.desc())
 
     if period:
-        query = query.filter(PayrollBatch.period == period)
+        query = query.filter(period_filter(PayrollBatch, period))
     if client_id:
         query = query.filter(PayrollBatch.client_id == client_id)
     if status:
@@ -270,41 +270,38 @@ def mark_batch_paid(
     return result
 
 
-@router.post("/{batch_id}/generate-payslips")
+@router.post("/{batch_id}/generate-payslips", status_code=202)
 def generate_payslips(
     batch_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
-    """Generate payslips for freelancer/WPS batch (no 3rd party invoice needed)."""
-    result = payroll_batch_service.generate_payslips_for_batch(db, batch_id)
+    """
+    Generate payslips for freelancer/WPS batch (no 3rd party invoice needed).
+
+    Payslips are rendered, uploaded and emailed in the background; poll
+    GET /{batch_id}/payslip-runs/{run_id} for progress.
+    """
+    result = payslip_run_service.start_payslip_run(db, batch_id)
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
+    db.commit()
 
-    # Generate actual payslip PDFs and send emails for each payroll
-    payroll_ids = result.get("payroll_ids", [])
-    generated = []
-    for pid in payroll_ids:
-        payroll = db.query(Payroll).filter(Payroll.id == pid).first()
-        if not payroll:
-            continue
-        contractor = db.query(Contractor).filter(Contractor.id == payroll.contractor_id).first()
-        if not contractor:
-            continue
+    background_tasks.add_task(payslip_run_service.process_payslip_run, result["run_id"])
+    return {
+        "message": f"Generating payslips for {result['total']} payrolls",
+        "run_id": result["run_id"],
+        "total": result["total"],
+    }
 
-        try:
-            from app.utils.payroll_pdf import generate_payslip_pdf
-            payslip_buffer = generate_payslip_pdf(payroll=payroll, contractor=contractor)
-            # Send payslip email
-            parts = [contractor.first_name, contractor.surname]
-            contractor_name = " ".join(p for p in parts if p) or "Unknown"
-            from app.routes.payroll import _send_payslip_to_contractor
-            _send_payslip_to_contractor(contractor, contractor_name, payroll, payslip_buffer.getvalue())
-            generated.append(pid)
-        except Exception as e:
-            print(f"Error generating payslip for payroll {pid}: {e}")
 
-    db.commit()
-    return {"message": f"Payslips generated for {len(generated)} payrolls", "generated": generated}
+@router.get("/{batch_id}/payslip-runs/{run_id}")
+def get_payslip_run(batch_id: int, run_id: int, db: Session = Depends(get_db)):
+    """Progress of a payslip run, with per-payslip status."""
+    run = payslip_run_service.get_payslip_run(db, run_id)
+    if not run or run["batch_id"] != batch_id:
+        raise HTTPException(status_code=404, detail="Payslip run not found")
+    return run
 
 
 # --- Public endpoints (no auth) for 3rd party / freelancer invoice upload ---
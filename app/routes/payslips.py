@@ -24,7 +24,8 @@ from app.repositories.implementations.payslip_repo import PayslipRepository
 from app.services.payslip_service import PayslipService
 from app.utils.auth import get_current_active_user
 from app.models.user import User
-from app.utils.payroll_pdf import generate_payslip_pdf
+from app.adapters.pdf.render_service import render_pdf
+from app.utils.payroll_pdf import generate_payslip_pdf, payroll_pdf_args
 
 router = APIRouter(prefix="/api/v1/payslips", tags=["payslips"])
 
@@ -297,7 +298,7 @@ async def download_payslip_pdf(
             detail="Related records not found"
         )
 
-    pdf_buffer = generate_payslip_pdf(payroll, contractor)
+    pdf_buffer = await render_pdf(generate_payslip_pdf, *payroll_pdf_args(payroll, contractor))
 
     return StreamingResponse(
         pdf_buffer,
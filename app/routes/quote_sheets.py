@@ -12,6 +12,7 @@ from app.schemas.quote_sheet import QuoteSheetCreate, QuoteSheetUpdate, QuoteShe
 from app.utils.auth import get_current_active_user
 from app.utils.email import send_quote_sheet_request_email
 from app.utils.storage import storage
+from app.adapters.pdf.render_service import render_pdf
 from app.utils.quote_sheet_pdf_generator import generate_quote_sheet_pdf
 from datetime import datetime, timedelta
 import uuid
@@ -609,7 +610,7 @@ async def submit_quote_sheet_form(
             'issued_date': quote_sheet.issued_date,
         }
 
-        pdf_buffer = generate_quote_sheet_pdf(pdf_data)
+        pdf_buffer = await render_pdf(generate_quote_sheet_pdf, pdf_data)
 
         # Upload PDF to storage
         timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
@@ -697,7 +698,7 @@ async def preview_quote_sheet_pdf(
         if column.name not in pdf_data:
             pdf_data[column.name] = getattr(quote_sheet, column.name, None)
 
-    pdf_buffer = generate_quote_sheet_pdf(pdf_data)
+    pdf_buffer = await render_pdf(generate_quote_sheet_pdf, pdf_data)
 
     return StreamingResponse(
         pdf_buffer,
@@ -735,7 +736,7 @@ async def download_quote_sheet_pdf(
     for column in QuoteSheet.__table__.columns:
         pdf_data[column.name] = getattr(quote_sheet, column.name, None)
 
-    pdf_buffer = generate_quote_sheet_pdf(pdf_data)
+    pdf_buffer = await render_pdf(generate_quote_sheet_pdf, pdf_data)
 
     filename = f"Quote_Sheet_{quote_sheet.contractor_name or 'Unknown'}_{datetime.now().strftime('%Y%m%d')}.pdf"
 
@@ -6,6 +6,7 @@ import secrets
 from app.database import get_db
 from app.models.timesheet import Timesheet, TimesheetStatus
 from app.models.contractor import Contractor
+from app.services.leave_ledger_service import refresh_for_timesheet
 from app.utils.email import send_timesheet_to_manager
 from app.utils.timesheet_pdf_generator import generate_timesheet_pdf
 from app.config import settings
@@ -367,24 +368,26 @@ async def upload_timesheet(
     )
 
     db.add(new_timesheet)
-    db.commit()
-    db.refresh(new_timesheet)
 
-    # Send email to manager
+    # Queue fire-and-forget email to manager with the timesheet
     contractor_name = f"{contractor.first_name} {contractor.surname}" if contractor.first_name and contractor.surname else "Contractor"
     review_link = f"{settings.frontend_url}/timesheet/review/{review_token}"
 
-    from app.utils.email import send_uploaded_timesheet_to_manager
+    from app.utils.email import email_outbox, send_uploaded_timesheet_to_manager
+
+    with email_outbox(db, contractor_id=contractor.id):
+        email_sent = send_uploaded_timesheet_to_manager(
+            manager_email=manager_email,
+            manager_name=manager_name,
+            contractor_name=contractor_name,
+            review_link=review_link,
+            filename=timesheet_file.filename,
+            period=month,
+            client_name=contractor.client_name
+        )
 
-    email_sent = send_uploaded_timesheet_to_manager(
-        manager_email=manager_email,
-        manager_name=manager_name,
-        contractor_name=contractor_name,
-        review_link=review_link,
-        filename=timesheet_file.filename,
-        period=month,
-        client_name=contractor.client_name
-    )
+    db.commit()
+    db.refresh(new_timesheet)
 
     return {
         "message": "Timesheet uploaded successfully" + (" and sent to manager for approval" if email_sent else ""),
@@ -467,6 +470,9 @@ def update_timesheet(
     if updates.decline_reason is not None:
         timesheet.decline_reason = updates.decline_reason
 
+    # Keep the leave ledger in step with approved leave days
+    refresh_for_timesheet(db, timesheet)
+
     db.commit()
     db.refresh(timesheet)
 
@@ -483,6 +489,7 @@ def delete_timesheet(timesheet_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Timesheet not found")
 
     db.delete(timesheet)
+    refresh_for_timesheet(db, timesheet)
     db.commit()
 
     return {"message": "Timesheet deleted successfully"}
@@ -555,6 +562,7 @@ def approve_timesheet_by_token(token: str, db: Session = Depends(get_db)):
     # Update status to approved
     timesheet.status = TimesheetStatus.APPROVED
     timesheet.approved_date = datetime.utcnow()
+    refresh_for_timesheet(db, timesheet)
 
     db.commit()
     db.refresh(timesheet)
@@ -615,6 +623,7 @@ def decline_timesheet_by_token(token: str, request: DeclineRequest, db: Session
     timesheet.status = TimesheetStatus.DECLINED
     timesheet.declined_date = datetime.utcnow()
     timesheet.decline_reason = request.reason
+    refresh_for_timesheet(db, timesheet)
 
     db.commit()
     db.refresh(timesheet)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, File, UploadFile, Form, Request
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_modified
@@ -11,8 +11,17 @@ from app.schemas.work_order import WorkOrderCreate, WorkOrderUpdate, WorkOrderRe
 from app.models.user import User, UserRole
 from app.models.contractor import Contractor, ContractorStatus
 from app.utils.auth import get_current_active_user, require_role
-from app.utils.storage import storage, upload_file
+from app.utils.storage import storage
+from app.adapters.pdf.render_service import render_pdf
 from app.utils.work_order_pdf_generator import generate_work_order_pdf
+from app.utils.range_response import range_response
+from app.services.signed_document_service import (
+    capture_signed_document,
+    load_signed_document,
+    render_signed_document,
+    latest_signed_document,
+    signed_document_summary,
+)
 from datetime import datetime, timezone
 import uuid
 from pydantic import BaseModel
@@ -377,27 +386,9 @@ async def get_work_order_by_token(
     }
 
 
-@router.get("/public/pdf/{signature_token}")
-async def get_work_order_pdf_by_token(
-    signature_token: str,
-    db: Session = Depends(get_db)
-):
-    """
-    PUBLIC ENDPOINT: Get work order PDF by signature token
-    No authentication required
-    """
-    work_order = db.query(WorkOrder).filter(
-        WorkOrder.client_signature_token == signature_token
-    ).first()
-
-    if not work_order:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Work order not found or link is invalid"
-        )
-
-    # Prepare data for PDF
-    work_order_data = {
+def _work_order_pdf_data(work_order: WorkOrder, contractor: Optional[Contractor] = None) -> dict:
+    """Data for the work order PDF, including any signatures."""
+    data = {
         "work_order_number": work_order.work_order_number,
         "contractor_name": work_order.contractor_name,
         "client_name": work_order.client_name,
@@ -422,9 +413,55 @@ async def get_work_order_pdf_by_token(
         "aventus_signer_name": work_order.aventus_signer_name or '',
         "aventus_signed_date": work_order.aventus_signed_date.strftime('%d %B %Y') if work_order.aventus_signed_date else '',
     }
+    if contractor:
+        data["rate_type"] = getattr(contractor, 'rate_type', 'monthly') or 'monthly'
+    return data
+
+
+def _capture_work_order(db: Session, work_order: WorkOrder, contractor: Optional[Contractor], stage: str, **signer):
+    """Queue the immutable PDF of a work order that has just been signed."""
+    timestamp = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
+    title = "Signed Work Order" if stage == "signed" else "Executed Work Order"
+    return capture_signed_document(
+        db, "work_order", work_order.id, stage,
+        f"work_order_{work_order.work_order_number}_{timestamp}.pdf",
+        (_work_order_pdf_data(work_order, contractor),),
+        contractor_id=contractor.id if contractor else None,
+        title=f"{title} - {work_order.work_order_number}",
+        **signer,
+    )
+
+
+@router.get("/public/pdf/{signature_token}")
+async def get_work_order_pdf_by_token(
+    signature_token: str,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    PUBLIC ENDPOINT: Get work order PDF by signature token
+    No authentication required
+    """
+    work_order = db.query(WorkOrder).filter(
+        WorkOrder.client_signature_token == signature_token
+    ).first()
+
+    if not work_order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Work order not found or link is invalid"
+        )
+
+    # Serve the PDF stored when the work order was signed
+    stored = await load_signed_document(db, "work_order", work_order.id)
+    if stored:
+        document, content = stored
+        return range_response(request, content, document.filename, etag=document.sha256)
+
+    work_order_data = _work_order_pdf_data(work_order)
 
     # Generate PDF
-    pdf_buffer = generate_work_order_pdf(work_order_data)
+    pdf_buffer = await render_pdf(generate_work_order_pdf, work_order_data)
 
     return StreamingResponse(
         pdf_buffer,
@@ -439,6 +476,7 @@ async def get_work_order_pdf_by_token(
 async def sign_work_order(
     signature_token: str,
     signature_data: ClientSignatureData,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -480,61 +518,17 @@ async def sign_work_order(
         # Note: Contractor status is NOT updated yet
         # It will be updated to WORK_ORDER_COMPLETED only after Aventus counter-signs
 
+        # Store the signed PDF once, in the background; it is added to the
+        # contractor's documents when ready
+        contractor = db.query(Contractor).filter(Contractor.id == work_order.contractor_id).first()
+        job = _capture_work_order(
+            db, work_order, contractor, "signed",
+            signed_by=work_order.client_signer_name,
+        )
+
         db.commit()
         db.refresh(work_order)
-
-        # Generate signed work order PDF and save to contractor documents
-        try:
-            contractor = db.query(Contractor).filter(Contractor.id == work_order.contractor_id).first()
-            if contractor:
-                # Convert WorkOrder model to dictionary for PDF generator
-                work_order_data = {
-                    "work_order_number": work_order.work_order_number,
-                    "contractor_name": work_order.contractor_name,
-                    "client_name": work_order.client_name,
-                    "role": work_order.role,
-                    "location": work_order.location,
-                    "start_date": work_order.start_date.strftime("%d %B %Y") if work_order.start_date else "",
-                    "end_date": work_order.end_date.strftime("%d %B %Y") if work_order.end_date else "",
-                    "duration": work_order.duration,
-                    "charge_rate": work_order.charge_rate,
-                    "pay_rate": work_order.pay_rate,
-                    "currency": work_order.currency,
-                    "project_name": work_order.project_name,
-                    "rate_type": getattr(contractor, 'rate_type', 'monthly') or 'monthly',
-                    "client_signature_type": work_order.client_signature_type,
-                    "client_signature_data": work_order.client_signature_data,
-                    "client_signer_name": work_order.client_signer_name,
-                    "client_signed_date": work_order.client_signed_date.strftime("%d %B %Y") if work_order.client_signed_date else "",
-                }
-
-                # Generate the PDF
-                pdf_buffer = generate_work_order_pdf(work_order_data)
-
-                # Upload to storage
-                timestamp = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
-                filename = f"work_order_{work_order.work_order_number}_{timestamp}.pdf"
-                folder = f"contractor-documents/{contractor.id}"
-
-                pdf_url = upload_file(pdf_buffer, filename, folder)
-
-                # Add to contractor's documents child table
-                from app.models.contractor import ContractorDocument
-                doc = ContractorDocument(
-                    contractor_id=contractor.id,
-                    document_type="signed_work_order",
-                    name=f"Signed Work Order - {work_order.work_order_number}",
-                    url=pdf_url,
-                    uploaded_at=datetime.now(timezone.utc),
-                    work_order_id=work_order.id,
-                )
-                db.add(doc)
-
-                db.commit()
-                print(f"Signed work order PDF saved to contractor documents: {pdf_url}")
-        except Exception as pdf_error:
-            # Don't fail the signing if PDF upload fails, just log it
-            print(f"Warning: Failed to save signed work order PDF: {pdf_error}")
+        background_tasks.add_task(render_signed_document, job)
 
         return {
             "message": "Work order signed successfully. Awaiting Aventus counter-signature.",
@@ -600,6 +594,7 @@ async def view_signed_work_order(
             "data": work_order.client_signature_data,
             "signed_date": work_order.client_signed_date.isoformat() if work_order.client_signed_date else None
         },
+        "signed_document": signed_document_summary(latest_signed_document(db, "work_order", work_order.id)),
         "ready_for_counter_signature": True
     }
 
@@ -613,6 +608,7 @@ class AventusSignatureData(BaseModel):
 async def counter_sign_work_order(
     work_order_id: str,
     signature_data: AventusSignatureData,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["admin", "superadmin"]))
 ):
@@ -658,8 +654,15 @@ async def counter_sign_work_order(
     if contractor:
         contractor.status = ContractorStatus.WORK_ORDER_COMPLETED
 
+    # Store the fully executed PDF once, in the background
+    job = _capture_work_order(
+        db, work_order, contractor, "counter_signed",
+        signed_by=current_user.name, signer_user_id=current_user.id,
+    )
+
     db.commit()
     db.refresh(work_order)
+    background_tasks.add_task(render_signed_document, job)
 
     return {
         "message": "Work order counter-signed successfully. Work order is now fully executed.",
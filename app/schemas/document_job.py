@@ -0,0 +1,13 @@
+"""
+Document Job Schemas.
+
+Pydantic models for asynchronous document generation requests.
+"""
+from pydantic import BaseModel, Field
+from typing import Any, Dict
+
+
+class DocumentJobCreate(BaseModel):
+    """Request to generate a registered document type in the background."""
+    document_type: str = Field(..., description="PDFGeneratorRegistry document type, e.g. work_order")
+    data: Dict[str, Any] = Field(default_factory=dict, description="Generator input data")
@@ -4,7 +4,7 @@ Offboarding Schemas.
 Pydantic models for offboarding requests and responses.
 """
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime, date
 from decimal import Decimal
 from app.models.offboarding import OffboardingReason, OffboardingStatus
@@ -145,6 +145,7 @@ class OffboardingDocumentsResponse(BaseModel):
     clearance_certificate_url: Optional[str] = None
     final_payslip_url: Optional[str] = None
     all_documents_generated: bool = False
+    jobs: Dict[str, str] = {}  # Document job ID by document type, while documents are generated
 
     class Config:
         from_attributes = True
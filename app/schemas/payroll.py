@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 from app.models.payroll import PayrollStatus
 
@@ -90,3 +90,9 @@ class TimesheetReadyForPayroll(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class PayrollRunRequest(BaseModel):
+    """Request to calculate payroll for a whole period in one pass"""
+    period: str  # e.g., "January 2026"
+    timesheet_ids: Optional[List[int]] = None
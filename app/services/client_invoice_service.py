@@ -12,6 +12,7 @@ from app.models.client_invoice import ClientInvoice, ClientInvoiceStatus, Client
 from app.models.payroll import Payroll, PayrollStatus
 from app.models.contractor import Contractor
 from app.models.client import Client
+from app.utils.period import period_filter
 
 
 def _generate_invoice_number(db: Session) -> str:
@@ -57,7 +58,7 @@ def generate_client_invoice(
     # Check if invoice already exists
     existing = db.query(ClientInvoice).filter(
         ClientInvoice.client_id == client_id,
-        ClientInvoice.period == period,
+        period_filter(ClientInvoice, period),
     ).first()
     if existing:
         return {"error": f"Invoice already exists for this client/period: {existing.invoice_number}"}
@@ -73,7 +74,7 @@ def generate_client_invoice(
         .join(Contractor, Payroll.contractor_id == Contractor.id)
         .filter(
             Contractor.client_id == client_id,
-            Payroll.period == period,
+            period_filter(Payroll, period),
             Payroll.status.in_([PayrollStatus.APPROVED, PayrollStatus.APPROVED_ADJUSTED, PayrollStatus.PAID]),
         )
         .all()
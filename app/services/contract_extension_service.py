@@ -19,6 +19,7 @@ from app.schemas.contract_extension import (
     ExtensionSignatureRequest,
     ExtensionSigningPageResponse,
 )
+from app.services.document_job_service import create_document_job
 from app.telemetry.logger import get_logger
 
 logger = get_logger(__name__)
@@ -223,15 +224,21 @@ class ContractExtensionService:
     async def generate_extension_document(
         self,
         extension_id: str,
-    ) -> str:
+        requested_by: Optional[str] = None,
+    ) -> dict:
         """
-        Generate extension agreement document.
+        Queue generation of the extension agreement document.
+
+        The caller schedules process_document_job for the job; once it
+        finishes, its URL is stored as the extension's document URL.
 
         Args:
             extension_id: Extension record ID
+            requested_by: User ID requesting the document
 
         Returns:
-            URL to generated document
+            Dict with the current document URL (replaced when the job
+            finishes), the job ID and its status
         """
         extension = self.db.query(ContractExtension).filter(
             ContractExtension.id == extension_id
@@ -250,24 +257,44 @@ class ContractExtensionService:
         if not contractor:
             raise ValueError(f"Contractor not found: {extension.contractor_id}")
 
-        # Document generation would go here
-        # For now, we'll set a placeholder URL
-        # In production, use PDF generators and upload to storage
-
-        document_url = None  # Would be actual URL from storage
-
-        extension.extension_document_url = document_url
+        # Snapshot what the agreement shows, so the job renders without the database
+        data = {
+            "contractor": {
+                "id": contractor.id,
+                "first_name": contractor.first_name,
+                "surname": contractor.surname,
+                "client_name": contractor.client_name or "",
+                "currency": contractor.currency or "AED",
+            },
+            "extension": {
+                "original_end_date": extension.original_end_date.strftime("%B %d, %Y"),
+                "new_end_date": extension.new_end_date.strftime("%B %d, %Y"),
+                "extension_months": extension.extension_months,
+                "new_monthly_rate": str(extension.new_monthly_rate) if extension.new_monthly_rate else None,
+                "new_day_rate": str(extension.new_day_rate) if extension.new_day_rate else None,
+            },
+        }
+        result = create_document_job(
+            self.db, "contract_extension", data, requested_by=requested_by, subject_id=extension.id,
+        )
+        if "error" in result:
+            raise ValueError(result["error"])
         self.db.commit()
 
         logger.info(
-            "Extension document generated",
+            "Extension document queued",
             extra={
                 "extension_id": extension_id,
                 "contractor_id": contractor.id,
+                "job_id": result["job_id"],
             }
         )
 
-        return document_url
+        return {
+            "document_url": extension.extension_document_url,
+            "job_id": result["job_id"],
+            "status": result["status"],
+        }
 
     async def send_for_signature(
         self,
@@ -0,0 +1,306 @@
+"""
+Document Job Service - Asynchronous document generation.
+
+Generating a document inside the HTTP request ties the request up for as
+long as the render and upload take. A job instead records the request in
+document_jobs and returns straight away; the PDF is rendered on the PDF
+render pool and stored in the background, and the caller polls the job
+for its result URL. Any PDFGeneratorRegistry document type can be queued;
+the route limits which types each role may request.
+
+A service queueing a document for one of its records (offboarding
+letters, extension agreements) passes subject_id; the finished job's URL
+is then written to that record (see JOB_TARGETS). Jobs from the API never
+carry a subject_id, so they cannot overwrite a record's documents.
+
+Invoices are not generated through jobs: their PDFs are rendered from the
+payroll rows by InvoiceService, not from caller-supplied data.
+
+A RUNNING job holds a lease (started_at). If the process running it dies,
+or a queued job's background task is lost, the worker reclaims the job
+once the lease expires and renders it again. A FAILED job can be queued
+again with retry_document_job.
+
+Usage (in a route):
+    result = create_document_job(db, "work_order", data, requested_by=user.id)
+    db.commit()
+    background_tasks.add_task(process_document_job, result["job_id"])
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.adapters.pdf import PDFGeneratorRegistry
+from app.config.settings import settings
+from app.database import SessionLocal
+from app.models.contract_extension import ContractExtension
+from app.models.document_job import DocumentJob, DocumentJobStatus
+from app.models.offboarding import OffboardingRecord, OffboardingStatus
+from app.services.signed_document_service import get_storage
+from app.telemetry.logger import get_logger
+
+logger = get_logger(__name__)
+
+# How often the worker looks for jobs to reclaim
+REAP_INTERVAL_SECONDS = 60
+
+# Record and column a finished job's URL is published to, by document type
+JOB_TARGETS = {
+    "termination_letter": (OffboardingRecord, "termination_letter_url"),
+    "experience_letter": (OffboardingRecord, "experience_letter_url"),
+    "clearance_certificate": (OffboardingRecord, "clearance_certificate_url"),
+    "contract_extension": (ContractExtension, "extension_document_url"),
+}
+
+OFFBOARDING_DOCUMENT_COLUMNS = ("termination_letter_url", "experience_letter_url", "clearance_certificate_url")
+
+
+def create_document_job(
+    db: Session,
+    document_type: str,
+    data: Dict[str, Any],
+    requested_by: Optional[str] = None,
+    subject_id: Optional[str] = None,
+) -> dict:
+    """
+    Validate a generation request and queue it.
+
+    subject_id is the record the result URL is published to, for the
+    document types in JOB_TARGETS. The caller commits and then schedules
+    process_document_job(job_id).
+    """
+    generator = PDFGeneratorRegistry.get_or_none(document_type)
+    if generator is None:
+        available = ", ".join(sorted(PDFGeneratorRegistry.available_types()))
+        return {"error": f"Unknown document type: {document_type}. Available types: {available}"}
+
+    missing = generator.validate_data(data)
+    if missing:
+        return {"error": f"Missing required fields: {', '.join(missing)}"}
+
+    job = DocumentJob(
+        document_type=document_type,
+        data=data,
+        status=DocumentJobStatus.QUEUED,
+        requested_by=requested_by,
+        subject_id=subject_id if document_type in JOB_TARGETS else None,
+    )
+    db.add(job)
+    db.flush()
+    return {"success": True, "job_id": job.id, "status": job.status.value}
+
+
+def _claimable(now: datetime):
+    """Jobs that may be claimed: QUEUED, or RUNNING with an expired lease."""
+    stale = now - timedelta(seconds=settings.document_job_lease_seconds)
+    return or_(
+        DocumentJob.status == DocumentJobStatus.QUEUED,
+        and_(
+            DocumentJob.status == DocumentJobStatus.RUNNING,
+            or_(DocumentJob.started_at.is_(None), DocumentJob.started_at < stale),
+        ),
+    )
+
+
+def _start_job(session_factory: Callable[[], Session], job_id: str) -> Tuple[Optional[DocumentJob], Optional[dict]]:
+    """
+    Claim a job and mark it RUNNING in its own session.
+
+    Returns the detached job to render, or None with the reason the job
+    is not rendered (missing, finished, or held by a live process). The
+    claim is a single conditional UPDATE, so two processes never both
+    take the same job.
+    """
+    now = datetime.utcnow()
+    db = session_factory()
+    try:
+        claimed = (
+            db.query(DocumentJob)
+            .filter(DocumentJob.id == job_id, _claimable(now))
+            .update({"status": DocumentJobStatus.RUNNING, "started_at": now}, synchronize_session=False)
+        )
+        db.commit()
+        if not claimed:
+            job = get_document_job(db, job_id)
+            return None, job if job else {"error": "Document job not found"}
+        return db.get(DocumentJob, job_id), None
+    finally:
+        db.close()
+
+
+def _publish(db: Session, job: DocumentJob) -> None:
+    """Write a completed job's URL to the record it was queued for."""
+    target = JOB_TARGETS.get(job.document_type)
+    if not target or not job.subject_id:
+        return
+    model, column = target
+    record = db.get(model, job.subject_id)
+    if record is None:
+        return
+    setattr(record, column, job.url)
+
+    # Offboarding moves on to approval once all three letters are stored
+    if (
+        isinstance(record, OffboardingRecord)
+        and record.status == OffboardingStatus.PENDING_DOCUMENTS
+        and all(getattr(record, c) for c in OFFBOARDING_DOCUMENT_COLUMNS)
+    ):
+        record.status = OffboardingStatus.PENDING_APPROVAL
+
+
+def _finish_job(session_factory: Callable[[], Session], job_id: str, claimed_at: datetime, **values) -> dict:
+    """
+    Record a job's outcome, and publish a completed one, in its own session.
+
+    Nothing is written if the job was reclaimed since claimed_at; the
+    process that holds it now records the outcome.
+    """
+    db = session_factory()
+    try:
+        job = db.get(DocumentJob, job_id)
+        if job.status != DocumentJobStatus.RUNNING or job.started_at != claimed_at:
+            return get_document_job(db, job_id)
+        for name, value in values.items():
+            setattr(job, name, value)
+        job.completed_at = datetime.utcnow()
+        if job.status == DocumentJobStatus.COMPLETED:
+            _publish(db, job)
+        db.commit()
+        return get_document_job(db, job_id)
+    finally:
+        db.close()
+
+
+async def process_document_job(job_id: str, session_factory: Callable[[], Session] = SessionLocal) -> dict:
+    """
+    Render and store one queued document, then record its URL.
+
+    Runs as a background task. Database work runs in worker threads, each
+    step with its own session, so the event loop only awaits the render
+    and the upload. A failure is stored on the job as FAILED with its error.
+    """
+    job, finished = await asyncio.to_thread(_start_job, session_factory, job_id)
+    if job is None:
+        return finished
+
+    try:
+        result = await PDFGeneratorRegistry.render(job.document_type, dict(job.data))
+        if not result.success:
+            raise RuntimeError(result.error or "Document generation failed")
+        filename = result.filename or f"{job.document_type}.pdf"
+        key = f"document-jobs/{job.document_type}/{job.id}/{filename}"
+        upload = await get_storage().upload(
+            settings.supabase_bucket, key, result.content, content_type="application/pdf",
+        )
+        if not upload.success:
+            raise RuntimeError(upload.error or "Upload failed")
+    except Exception as e:
+        logger.error("Document job failed", extra={"job_id": job_id, "document_type": job.document_type, "error": str(e)})
+        return await asyncio.to_thread(
+            _finish_job, session_factory, job_id, job.started_at, status=DocumentJobStatus.FAILED, error=str(e),
+        )
+
+    finished = await asyncio.to_thread(
+        _finish_job, session_factory, job_id, job.started_at,
+        status=DocumentJobStatus.COMPLETED,
+        filename=filename,
+        storage_path=key,
+        url=upload.file.url,
+        size_bytes=len(result.content),
+    )
+    logger.info("Document job completed", extra={
+        "job_id": job_id, "document_type": job.document_type, "size_bytes": len(result.content),
+    })
+    return finished
+
+
+def retry_document_job(db: Session, job_id: str) -> dict:
+    """
+    Queue a FAILED job again with its original data.
+
+    The caller commits and then schedules process_document_job(job_id).
+    """
+    job = db.query(DocumentJob).filter(DocumentJob.id == job_id).first()
+    if not job:
+        return {"error": "Document job not found"}
+    if job.status != DocumentJobStatus.FAILED:
+        return {"error": f"Only failed jobs can be retried (job is {job.status.value})"}
+
+    job.status = DocumentJobStatus.QUEUED
+    job.error = None
+    job.started_at = None
+    job.completed_at = None
+    db.flush()
+    return {"success": True, "job_id": job.id, "status": job.status.value}
+
+
+def _stale_jobs(session_factory: Callable[[], Session]) -> List[str]:
+    """
+    Jobs left behind by a process that died.
+
+    RUNNING jobs whose lease expired, and QUEUED jobs whose background
+    task never started within the lease.
+    """
+    now = datetime.utcnow()
+    stale = now - timedelta(seconds=settings.document_job_lease_seconds)
+    db = session_factory()
+    try:
+        return [
+            job_id for (job_id,) in
+            db.query(DocumentJob.id)
+            .filter(_claimable(now), or_(DocumentJob.status == DocumentJobStatus.RUNNING, DocumentJob.created_at < stale))
+            .order_by(DocumentJob.created_at)
+            .all()
+        ]
+    finally:
+        db.close()
+
+
+async def reclaim_stale_jobs(session_factory: Callable[[], Session] = SessionLocal) -> int:
+    """Process every stale job again; returns the number of jobs reclaimed."""
+    reclaimed = 0
+    for job_id in await asyncio.to_thread(_stale_jobs, session_factory):
+        result = await process_document_job(job_id, session_factory=session_factory)
+        if result and result.get("status") in (DocumentJobStatus.COMPLETED.value, DocumentJobStatus.FAILED.value):
+            reclaimed += 1
+            logger.info("Stale document job reclaimed", extra={"job_id": job_id, "status": result["status"]})
+    return reclaimed
+
+
+async def run_document_job_reaper(
+    stop: asyncio.Event,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> None:
+    """Reclaim stale jobs every REAP_INTERVAL_SECONDS until stop is set."""
+    while not stop.is_set():
+        try:
+            await reclaim_stale_jobs(session_factory)
+        except Exception as e:
+            logger.error("Document job reclaim failed", extra={"error": str(e)})
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=REAP_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+def get_document_job(db: Session, job_id: str) -> Optional[dict]:
+    """Job status, with the result URL once COMPLETED."""
+    job = db.query(DocumentJob).filter(DocumentJob.id == job_id).first()
+    if not job:
+        return None
+    return {
+        "id": job.id,
+        "document_type": job.document_type,
+        "status": job.status.value,
+        "requested_by": job.requested_by,
+        "url": job.url,
+        "filename": job.filename,
+        "size_bytes": job.size_bytes,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+    }
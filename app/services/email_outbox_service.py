@@ -0,0 +1,382 @@
+"""
+Email Outbox Service - Delivers queued emails from the worker process.
+
+Emails sent inside app.utils.email.email_outbox() are written to
+email_outbox in the same transaction as the change that triggers them,
+so a rolled-back request sends nothing and a committed one is never
+lost. The dispatcher claims due rows, sends them with concurrent
+invocations of the email Lambda, and records the outcome: SENT, PENDING again with an
+exponential backoff, or DEAD once the maximum number of attempts is
+used up.
+
+Rows are claimed with FOR UPDATE SKIP LOCKED so several workers can
+drain the same table. A row left SENDING by a worker that died is
+reclaimed once its lease expires.
+
+An email may deliver a record (an invoice or payslip, see
+EMAIL_SUBJECTS). The record is marked SENT when its email is delivered,
+not when it is queued; if the email is dead-lettered the record stays
+unsent so it can be sent again.
+
+An email queued twice with the same idempotency key (see
+app.utils.email_dedup), within EMAIL_DEDUP_TTL_SECONDS, is delivered
+once, even when two processes queued it: a row whose key already has a
+SENT row is marked SENT without sending, and one whose key is being sent
+by another row waits for that attempt's outcome.
+
+A row's template data is cleared once it is SENT or DEAD, and those rows
+are deleted after EMAIL_OUTBOX_RETENTION_DAYS. Emails carrying
+credentials are never queued (see app.utils.email.CREDENTIAL_EMAIL_TYPES).
+
+Usage (see app.workers.main):
+    await run_email_dispatcher(stop_event)
+"""
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.database import SessionLocal
+from app.models.email_outbox import EmailOutbox, EmailOutboxStatus
+from app.models.invoice import Invoice, InvoiceStatus
+from app.models.payslip import Payslip, PayslipStatus
+from app.telemetry.logger import get_logger
+from app.utils.email import _send_email_events
+
+logger = get_logger(__name__)
+
+# How often the dispatcher purges old delivered rows
+PURGE_INTERVAL_SECONDS = 3600
+
+# Records an email delivers, by subject_type: model, status while unsent,
+# status once the email is delivered
+EMAIL_SUBJECTS = {
+    "invoice": (Invoice, InvoiceStatus.DRAFT, InvoiceStatus.SENT),
+    "payslip": (Payslip, PayslipStatus.GENERATED, PayslipStatus.SENT),
+}
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds to wait before the next attempt, with full jitter."""
+    ceiling = min(
+        settings.email_dispatch_retry_max_seconds,
+        settings.email_dispatch_retry_base_seconds * (2 ** max(attempts - 1, 0)),
+    )
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def claim_due_emails(db: Session, limit: int, now: Optional[datetime] = None) -> List[EmailOutbox]:
+    """
+    Mark up to limit due emails SENDING and commit the claim.
+
+    Due means PENDING with next_attempt_at reached, or SENDING with an
+    expired lease. Duplicates of a delivered email are marked SENT, and
+    duplicates of one being sent are postponed; neither is returned.
+    """
+    now = now or datetime.utcnow()
+    stale = now - timedelta(seconds=settings.email_dispatch_lease_seconds)
+
+    rows = (
+        db.query(EmailOutbox)
+        .filter(or_(
+            and_(EmailOutbox.status == EmailOutboxStatus.PENDING, EmailOutbox.next_attempt_at <= now),
+            and_(EmailOutbox.status == EmailOutboxStatus.SENDING, EmailOutbox.claimed_at < stale),
+        ))
+        .order_by(EmailOutbox.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    recent = _recent_keyed_emails(db, rows)
+    claimed = []
+    for row in rows:
+        holder = _duplicate_of(row, recent)
+        if holder == EmailOutboxStatus.SENT:
+            _finish_duplicate(db, row, now)
+        elif holder == EmailOutboxStatus.SENDING:
+            # Sent later only if the email holding the key is not delivered
+            row.status = EmailOutboxStatus.PENDING
+            row.next_attempt_at = now + timedelta(seconds=retry_delay(row.attempts + 1))
+        else:
+            row.status = EmailOutboxStatus.SENDING
+            row.claimed_at = now
+            claimed.append(row)
+            if row.idempotency_key:
+                recent.append((row.idempotency_key, row.status, row.created_at))
+    db.commit()
+    return claimed
+
+
+def _recent_keyed_emails(db: Session, rows: List[EmailOutbox]) -> List[Tuple[str, EmailOutboxStatus, datetime]]:
+    """Other SENT or SENDING emails sharing a key with rows, queued around the same time."""
+    keyed = [row for row in rows if row.idempotency_key and row.created_at]
+    if not settings.email_dedup_enabled or not keyed:
+        return []
+    window = timedelta(seconds=settings.email_dedup_ttl_seconds)
+    return (
+        db.query(EmailOutbox.idempotency_key, EmailOutbox.status, EmailOutbox.created_at)
+        .filter(
+            EmailOutbox.idempotency_key.in_({row.idempotency_key for row in keyed}),
+            EmailOutbox.id.notin_([row.id for row in rows]),
+            EmailOutbox.status.in_([EmailOutboxStatus.SENT, EmailOutboxStatus.SENDING]),
+            EmailOutbox.created_at >= min(row.created_at for row in keyed) - window,
+        )
+        .all()
+    )
+
+
+def _duplicate_of(row: EmailOutbox, recent: List[Tuple[str, EmailOutboxStatus, datetime]]) -> Optional[EmailOutboxStatus]:
+    """
+    Status of the email row duplicates, or None if it should be sent.
+
+    A duplicate has the same key and was queued within
+    EMAIL_DEDUP_TTL_SECONDS of row, as for the sender's own check; a
+    delivered duplicate wins over one still being sent.
+    """
+    if not row.idempotency_key or not row.created_at:
+        return None
+    window = timedelta(seconds=settings.email_dedup_ttl_seconds)
+    statuses = {
+        status for key, status, created_at in recent
+        if key == row.idempotency_key and abs(created_at - row.created_at) <= window
+    }
+    if EmailOutboxStatus.SENT in statuses:
+        return EmailOutboxStatus.SENT
+    return EmailOutboxStatus.SENDING if statuses else None
+
+
+def _finish_duplicate(db: Session, row: EmailOutbox, now: datetime) -> None:
+    """Mark SENT an email whose key was already delivered, without sending it."""
+    row.status = EmailOutboxStatus.SENT
+    row.sent_at = now
+    row.claimed_at = None
+    row.data = {}
+    row.last_error = None
+    _update_subject(db, row, now)
+    logger.info("Duplicate email skipped", extra={"email_id": row.id, "email_type": row.email_type})
+
+
+def _update_subject(db: Session, row: EmailOutbox, now: datetime) -> None:
+    """Mark the record a finally SENT or DEAD email delivers."""
+    if row.subject_type not in EMAIL_SUBJECTS or row.subject_id is None:
+        return
+    model, unsent, sent = EMAIL_SUBJECTS[row.subject_type]
+    record = db.query(model).filter(model.id == row.subject_id).first()
+    if record is None:
+        return
+
+    if row.status == EmailOutboxStatus.DEAD:
+        logger.error(
+            "Email for record not delivered",
+            extra={"email_id": row.id, "subject_type": row.subject_type, "subject_id": row.subject_id},
+        )
+        return
+    # The recipient may already have opened the portal link (VIEWED)
+    if record.status == unsent:
+        record.status = sent
+    if record.sent_at is None:
+        record.sent_at = now
+
+
+def record_result(db: Session, email_id: str, error: Optional[str], now: Optional[datetime] = None) -> Optional[EmailOutbox]:
+    """
+    Record one delivery attempt; error is None when the email was sent.
+
+    A final outcome is also applied to the record the email delivers.
+    """
+    now = now or datetime.utcnow()
+    row = db.get(EmailOutbox, email_id)
+    if row is None or row.status != EmailOutboxStatus.SENDING:
+        return row
+
+    row.attempts += 1
+    row.claimed_at = None
+    if error is None:
+        row.status = EmailOutboxStatus.SENT
+        row.sent_at = now
+        row.last_error = None
+    elif row.attempts >= settings.email_dispatch_max_attempts:
+        row.status = EmailOutboxStatus.DEAD
+        row.last_error = error
+        logger.error(
+            "Email dead-lettered",
+            extra={"email_id": row.id, "email_type": row.email_type, "attempts": row.attempts, "error": error},
+        )
+    else:
+        row.status = EmailOutboxStatus.PENDING
+        row.next_attempt_at = now + timedelta(seconds=retry_delay(row.attempts))
+        row.last_error = error
+    if row.status in (EmailOutboxStatus.SENT, EmailOutboxStatus.DEAD):
+        # Template data is only needed to send; don't keep it once final
+        row.data = {}
+        _update_subject(db, row, now)
+    return row
+
+
+def purge_finished_emails(db: Session, now: Optional[datetime] = None) -> int:
+    """
+    Delete SENT and DEAD rows older than EMAIL_OUTBOX_RETENTION_DAYS.
+
+    Returns the number of rows deleted; the caller commits.
+    """
+    if settings.email_outbox_retention_days <= 0:
+        return 0
+    cutoff = (now or datetime.utcnow()) - timedelta(days=settings.email_outbox_retention_days)
+    return (
+        db.query(EmailOutbox)
+        .filter(
+            EmailOutbox.status.in_([EmailOutboxStatus.SENT, EmailOutboxStatus.DEAD]),
+            EmailOutbox.created_at < cutoff,
+        )
+        .delete(synchronize_session=False)
+    )
+
+
+def _purge(session_factory: Callable[[], Session]) -> int:
+    db = session_factory()
+    try:
+        deleted = purge_finished_emails(db)
+        db.commit()
+        return deleted
+    finally:
+        db.close()
+
+
+async def dispatch_once(
+    session_factory: Callable[[], Session] = SessionLocal,
+    send: Callable[[List[dict], str], List[Optional[str]]] = _send_email_events,
+) -> Dict[str, int]:
+    """
+    Claim one batch of due emails and deliver it.
+
+    The claimed emails are sent with concurrent invocations (see
+    app.utils.email._send_email_events); fire-and-forget emails count as
+    sent once Lambda accepts their Event invocation.
+
+    Returns counts of the emails sent, rescheduled and dead-lettered.
+    """
+    db = session_factory()
+    try:
+        rows = claim_due_emails(db, settings.email_dispatch_batch_size)
+        # Fire-and-forget emails go out as Event invocations, the rest
+        # wait for the Lambda's per-message answer
+        groups = {
+            invocation_type: [
+                (row.id, {"email_type": row.email_type, "recipient": row.recipient, "data": dict(row.data)})
+                for row in rows if row.fire_and_forget == (invocation_type == "Event")
+            ]
+            for invocation_type in ("RequestResponse", "Event")
+        }
+    finally:
+        db.close()
+
+    counts = {"sent": 0, "retry": 0, "dead": 0}
+    claimed = [email for group in groups.values() for email in group]
+    if not claimed:
+        return counts
+
+    async def deliver(invocation_type: str, group: list) -> List[Optional[str]]:
+        if not group:
+            return []
+        try:
+            return await asyncio.to_thread(send, [message for _, message in group], invocation_type)
+        except Exception as e:
+            return [str(e) or e.__class__.__name__] * len(group)
+
+    errors = [
+        error
+        for group_errors in await asyncio.gather(*(deliver(t, g) for t, g in groups.items()))
+        for error in group_errors
+    ]
+
+    db = session_factory()
+    try:
+        for (email_id, _), error in zip(claimed, errors):
+            row = record_result(db, email_id, error)
+            if row is None:
+                continue
+            if row.status == EmailOutboxStatus.SENT:
+                counts["sent"] += 1
+            elif row.status == EmailOutboxStatus.DEAD:
+                counts["dead"] += 1
+            else:
+                counts["retry"] += 1
+        db.commit()
+    finally:
+        db.close()
+
+    logger.info("Email outbox batch dispatched", extra={"claimed": len(claimed), **counts})
+    return counts
+
+
+def get_email_status(db: Session, message_id: str) -> Optional[dict]:
+    """Delivery status of one email by its message id."""
+    row = db.get(EmailOutbox, message_id)
+    return _email_summary(row) if row else None
+
+
+def list_contractor_emails(db: Session, contractor_id: str, limit: int = 50) -> List[dict]:
+    """Most recent emails about a contractor with their delivery status."""
+    rows = (
+        db.query(EmailOutbox)
+        .filter(EmailOutbox.contractor_id == contractor_id)
+        .order_by(EmailOutbox.created_at.desc())
+        .limit(limit)
+        .all()
+    )
+    return [_email_summary(row) for row in rows]
+
+
+def _email_summary(row: EmailOutbox) -> dict:
+    return {
+        "message_id": row.id,
+        "email_type": row.email_type,
+        "recipient": row.recipient,
+        "status": row.status.delivery_status,
+        "fire_and_forget": row.fire_and_forget,
+        "attempts": row.attempts,
+        "error": row.last_error if row.status != EmailOutboxStatus.SENT else None,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "sent_at": row.sent_at.isoformat() if row.sent_at else None,
+    }
+
+
+async def run_email_dispatcher(
+    stop: asyncio.Event,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> None:
+    """
+    Drain the outbox until stop is set, sleeping only when it is empty.
+
+    Old finished rows are purged every PURGE_INTERVAL_SECONDS.
+    """
+    logger.info("Email dispatcher started", extra={"concurrency": settings.email_batch_concurrency})
+    next_purge = 0.0
+    while not stop.is_set():
+        if time.monotonic() >= next_purge:
+            next_purge = time.monotonic() + PURGE_INTERVAL_SECONDS
+            try:
+                deleted = await asyncio.to_thread(_purge, session_factory)
+                if deleted:
+                    logger.info("Email outbox purged", extra={"deleted": deleted})
+            except Exception as e:
+                logger.error("Email outbox purge failed", extra={"error": str(e)})
+
+        try:
+            counts = await dispatch_once(session_factory)
+            busy = any(counts.values())
+        except Exception as e:
+            logger.error("Email dispatch failed", extra={"error": str(e)})
+            busy = False
+
+        if not busy:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=settings.email_dispatch_poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+    logger.info("Email dispatcher stopped")
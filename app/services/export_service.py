@@ -0,0 +1,250 @@
+"""
+Export Service - Streaming CSV/XLSX exports for finance.
+
+Rows are read with yield_per (a server-side cursor on PostgreSQL) and
+written out in small chunks, so memory stays flat however many periods
+are exported. XLSX is produced by streaming a minimal workbook zip with
+inline strings, which needs no spreadsheet library.
+"""
+import csv
+import io
+import re
+import zipfile
+from datetime import date, datetime
+from enum import Enum
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from sqlalchemy.orm import Session
+
+from app.models.client import Client
+from app.models.client_invoice import ClientInvoice
+from app.models.contractor import Contractor
+from app.models.payroll import Payroll
+from app.models.payroll_batch import PayrollBatch
+from app.models.third_party import ThirdParty
+from app.utils.period import period_range_filter
+
+
+YIELD_PER = 1000
+CHUNK_ROWS = 500
+
+# (header, column) pairs per dataset
+PAYROLL_COLUMNS = (
+    ("Payroll ID", Payroll.id),
+    ("Period", Payroll.period),
+    ("Contractor ID", Payroll.contractor_id),
+    ("First Name", Contractor.first_name),
+    ("Surname", Contractor.surname),
+    ("Email", Contractor.email),
+    ("Client", Client.company_name),
+    ("Third Party", ThirdParty.company_name),
+    ("Route", Contractor.onboarding_route),
+    ("Batch ID", Payroll.batch_id),
+    ("Currency", Payroll.currency),
+    ("Rate Type", Payroll.rate_type),
+    ("Days Worked", Payroll.days_worked),
+    ("Gross Pay", Payroll.gross_pay),
+    ("Leave Deductibles", Payroll.leave_deductibles),
+    ("Expenses Reimbursement", Payroll.expenses_reimbursement),
+    ("Net Salary", Payroll.net_salary),
+    ("Total Accruals", Payroll.total_accruals),
+    ("Management Fee", Payroll.management_fee),
+    ("Invoice Total", Payroll.invoice_total),
+    ("VAT Rate", Payroll.vat_rate),
+    ("VAT Amount", Payroll.vat_amount),
+    ("Total Payable", Payroll.total_payable),
+    ("Status", Payroll.status),
+    ("Calculated At", Payroll.calculated_at),
+    ("Approved At", Payroll.approved_at),
+    ("Paid At", Payroll.paid_at),
+)
+
+BATCH_COLUMNS = (
+    ("Batch ID", PayrollBatch.id),
+    ("Period", PayrollBatch.period),
+    ("Client", Client.company_name),
+    ("Route", PayrollBatch.onboarding_route),
+    ("Route Label", PayrollBatch.route_label),
+    ("Third Party", ThirdParty.company_name),
+    ("Contractors", PayrollBatch.contractor_count),
+    ("Total Net Salary", PayrollBatch.total_net_salary),
+    ("Total Payable", PayrollBatch.total_payable),
+    ("Currency", PayrollBatch.currency),
+    ("Status", PayrollBatch.status),
+    ("Invoice Requested At", PayrollBatch.invoice_requested_at),
+    ("Paid At", PayrollBatch.paid_at),
+    ("Payment Reference", PayrollBatch.payment_reference),
+)
+
+CLIENT_INVOICE_COLUMNS = (
+    ("Invoice Number", ClientInvoice.invoice_number),
+    ("Period", ClientInvoice.period),
+    ("Client", Client.company_name),
+    ("Subtotal", ClientInvoice.subtotal),
+    ("VAT Rate", ClientInvoice.vat_rate),
+    ("VAT Amount", ClientInvoice.vat_amount),
+    ("Total Amount", ClientInvoice.total_amount),
+    ("Amount Paid", ClientInvoice.amount_paid),
+    ("Balance", ClientInvoice.balance),
+    ("Currency", ClientInvoice.currency),
+    ("Invoice Date", ClientInvoice.invoice_date),
+    ("Due Date", ClientInvoice.due_date),
+    ("Status", ClientInvoice.status),
+    ("Sent At", ClientInvoice.sent_at),
+    ("Paid At", ClientInvoice.paid_at),
+)
+
+EXPORT_DATASETS = ("payroll", "batches", "client-invoices")
+
+
+def export_rows(
+    db: Session, dataset: str, from_period: Optional[str] = None, to_period: Optional[str] = None
+) -> Tuple[List[str], Iterator[tuple]]:
+    """
+    Headers and a lazily streamed row iterator for a dataset.
+
+    Raises:
+        ValueError: If the dataset is unknown or a period bound is malformed
+    """
+    if dataset == "payroll":
+        columns, model = PAYROLL_COLUMNS, Payroll
+        query = (
+            db.query(*[c for _, c in columns])
+            .outerjoin(Contractor, Payroll.contractor_id == Contractor.id)
+            .outerjoin(Client, Contractor.client_id == Client.id)
+            .outerjoin(ThirdParty, Contractor.third_party_id == ThirdParty.id)
+        )
+    elif dataset == "batches":
+        columns, model = BATCH_COLUMNS, PayrollBatch
+        query = (
+            db.query(*[c for _, c in columns])
+            .outerjoin(Client, PayrollBatch.client_id == Client.id)
+            .outerjoin(ThirdParty, PayrollBatch.third_party_id == ThirdParty.id)
+        )
+    elif dataset == "client-invoices":
+        columns, model = CLIENT_INVOICE_COLUMNS, ClientInvoice
+        query = db.query(*[c for _, c in columns]).outerjoin(Client, ClientInvoice.client_id == Client.id)
+    else:
+        raise ValueError(f"Unknown export '{dataset}', expected one of: {', '.join(EXPORT_DATASETS)}")
+
+    query = (
+        query.filter(period_range_filter(model, from_period, to_period))
+        .order_by(model.year, model.month_number, model.id)
+        .yield_per(YIELD_PER)
+    )
+    return [header for header, _ in columns], iter(query)
+
+
+def _cell(value):
+    """Plain value for a cell: enums by value, dates as ISO strings."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def stream_csv(headers: Sequence[str], rows: Iterable[tuple]) -> Iterator[bytes]:
+    """Write rows as CSV, yielding every CHUNK_ROWS rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+
+    for i, row in enumerate(rows, start=1):
+        writer.writerow(["" if v is None else _cell(v) for v in row])
+        if i % CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable write target that hands written bytes back in chunks."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+_ILLEGAL_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+
+def _xlsx_row(values: Iterable) -> str:
+    cells = []
+    for value in values:
+        value = _cell(value)
+        if value is None:
+            cells.append("<c/>")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f"<c><v>{value}</v></c>")
+        else:
+            text = escape(_ILLEGAL_XML_CHARS.sub("", str(value)))
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f"<row>{''.join(cells)}</row>"
+
+
+def stream_xlsx(headers: Sequence[str], rows: Iterable[tuple], sheet_name: str = "Export") -> Iterator[bytes]:
+    """Write rows as a single-sheet XLSX workbook, yielding every CHUNK_ROWS rows."""
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as workbook:
+        workbook.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        workbook.writestr("_rels/.rels", _ROOT_RELS)
+        workbook.writestr("xl/workbook.xml", _WORKBOOK.format(name=escape(sheet_name[:31])))
+        workbook.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+
+        with workbook.open("xl/worksheets/sheet1.xml", mode="w") as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(_xlsx_row(headers).encode("utf-8"))
+            for i, row in enumerate(rows, start=1):
+                sheet.write(_xlsx_row(row).encode("utf-8"))
+                if i % CHUNK_ROWS == 0:
+                    yield sink.drain()
+            sheet.write(b"</sheetData></worksheet>")
+
+    yield sink.drain()
@@ -3,6 +3,7 @@ Invoice Service - Business logic for invoice management.
 
 Handles invoice generation, payment tracking, and email delivery.
 """
+import asyncio
 from typing import List, Optional, Dict, Tuple
 from datetime import datetime, timedelta, date
 import secrets
@@ -14,9 +15,11 @@ from app.models.payroll import Payroll, PayrollStatus
 from app.models.contractor import Contractor
 from app.models.client import Client
 from app.repositories.implementations.invoice_repo import InvoiceRepository, InvoicePaymentRepository
-from app.utils.payroll_pdf import generate_invoice_pdf
+from app.adapters.pdf.render_service import render_pdf
+from app.utils.payroll_pdf import generate_invoice_pdf, payroll_pdf_args
 from app.utils.storage import upload_file
-from app.utils.email import _invoke_email_lambda
+from app.utils.email import _invoke_email_lambda, email_outbox, send_email_batch
+from app.utils.email_dedup import email_idempotency_key
 from app.config.settings import settings
 from app.telemetry.logger import get_logger
 
@@ -105,7 +108,7 @@ class InvoiceService:
         due_date = invoice_date + timedelta(days=days_terms)
 
         # Generate PDF
-        pdf_buffer = generate_invoice_pdf(payroll, contractor)
+        pdf_buffer = await render_pdf(generate_invoice_pdf, *payroll_pdf_args(payroll, contractor))
 
         # Upload to storage
         filename = f"{invoice_number}.pdf"
@@ -165,16 +168,8 @@ class InvoiceService:
             return 7
         return 30  # Default to Net 30
 
-    async def send_invoice(self, invoice_id: int) -> bool:
-        """
-        Send invoice email to client via Lambda.
-
-        Args:
-            invoice_id: ID of the invoice
-
-        Returns:
-            True if sent successfully
-        """
+    async def _invoice_email(self, invoice_id: int) -> Tuple[Invoice, dict]:
+        """Load a sendable invoice and build its email message."""
         invoice = await self.repo.get(invoice_id)
         if not invoice:
             raise ValueError(f"Invoice {invoice_id} not found")
@@ -201,52 +196,106 @@ class InvoiceService:
         portal_link = f"{settings.frontend_url}/invoice/{invoice.access_token}"
         contractor_name = f"{contractor.first_name} {contractor.surname}"
 
-        success = _invoke_email_lambda("invoice", client_email, {
-            "client_name": client.company_name,
-            "invoice_number": invoice.invoice_number,
-            "contractor_name": contractor_name,
-            "period": payroll.period if payroll else "",
-            "total_amount": str(invoice.total_amount),
-            "currency": payroll.currency if payroll else "AED",
-            "due_date": invoice.due_date.strftime("%B %d, %Y"),
-            "portal_link": portal_link,
-        })
+        return invoice, {
+            "email_type": "invoice",
+            "recipient": client_email,
+            "contractor_id": contractor.id,
+            "idempotency_key": email_idempotency_key("invoice", client_email, invoice.id, invoice.status.value),
+            "data": {
+                "client_name": client.company_name,
+                "invoice_number": invoice.invoice_number,
+                "contractor_name": contractor_name,
+                "period": payroll.period if payroll else "",
+                "total_amount": str(invoice.total_amount),
+                "currency": payroll.currency if payroll else "AED",
+                "due_date": invoice.due_date.strftime("%B %d, %Y"),
+                "portal_link": portal_link,
+            },
+        }
+
+    async def send_invoice(self, invoice_id: int) -> bool:
+        """
+        Send invoice email to client via Lambda.
+
+        The email is queued in the outbox; the invoice becomes SENT when
+        the dispatcher delivers it.
+
+        Args:
+            invoice_id: ID of the invoice
+
+        Returns:
+            True if sent (or queued) successfully
+        """
+        invoice, email = await self._invoice_email(invoice_id)
+
+        # Queued for the worker, which marks the invoice SENT once delivered
+        subject = ("invoice", invoice.id)
+        with email_outbox(self.db, contractor_id=email["contractor_id"], subject=subject) as outbox:
+            success = _invoke_email_lambda(
+                email["email_type"], email["recipient"], email["data"], idempotency_key=email["idempotency_key"]
+            )
 
         if success:
-            invoice.status = InvoiceStatus.SENT
-            invoice.sent_at = datetime.utcnow()
+            queued = subject in outbox.subjects
+            if not queued:
+                # Sent inline (outbox disabled)
+                invoice.status = InvoiceStatus.SENT
+                invoice.sent_at = datetime.utcnow()
             self.db.commit()
 
             logger.info(
-                "Invoice sent",
+                "Invoice email queued" if queued else "Invoice sent",
                 extra={
                     "invoice_id": invoice_id,
-                    "to": client_email,
+                    "to": email["recipient"],
                 }
             )
 
         return success
 
     async def send_bulk(self, invoice_ids: List[int]) -> Dict[str, List]:
-        """Bulk send invoices."""
+        """
+        Bulk send invoices.
+
+        The emails are queued with send_email_batch in one commit; each
+        invoice becomes SENT when the dispatcher delivers its email.
+        """
         results = {"success": [], "failed": []}
 
+        prepared = []
         for invoice_id in invoice_ids:
             try:
-                success = await self.send_invoice(invoice_id)
-                if success:
-                    results["success"].append(invoice_id)
-                else:
-                    results["failed"].append({
-                        "invoice_id": invoice_id,
-                        "error": "Failed to send",
-                    })
+                prepared.append(await self._invoice_email(invoice_id))
             except Exception as e:
                 results["failed"].append({
                     "invoice_id": invoice_id,
                     "error": str(e),
                 })
 
+        for invoice, email in prepared:
+            email["subject"] = ("invoice", invoice.id)
+        with email_outbox(self.db) as outbox:
+            sent = await asyncio.to_thread(send_email_batch, [email for _, email in prepared])
+
+        now = datetime.utcnow()
+        for (invoice, email), success in zip(prepared, sent):
+            if success:
+                # Queued emails mark their invoice SENT once delivered
+                if email["subject"] not in outbox.subjects:
+                    invoice.status = InvoiceStatus.SENT
+                    invoice.sent_at = now
+                results["success"].append(invoice.id)
+            else:
+                results["failed"].append({
+                    "invoice_id": invoice.id,
+                    "error": "Failed to send",
+                })
+        self.db.commit()
+
+        logger.info(
+            "Invoices sent in bulk",
+            extra={"sent": len(results["success"]), "failed": len(results["failed"])},
+        )
         return results
 
     async def record_payment(
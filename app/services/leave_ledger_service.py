@@ -0,0 +1,168 @@
+"""
+Leave Ledger Service - Incremental per-month leave totals.
+
+Keeps the leave_ledger table in step with approved timesheets so yearly
+leave taken, balance and carry-over are a single indexed lookup.
+"""
+from typing import Optional, List, Dict, Iterable
+
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+
+from app.models.contractor import Contractor
+from app.models.leave_ledger import LeaveLedger
+from app.models.timesheet import Timesheet, TimesheetStatus
+from app.utils.contractor_data_extractor import ContractorDataExtractor
+
+
+MAX_CARRY_OVER_DAYS = 5
+
+
+def refresh_month(db: Session, contractor_id: str, year: int, month: int) -> Optional[LeaveLedger]:
+    """
+    Re-aggregate one contractor-month from its approved timesheets and roll
+    the running totals forward. Call after any timesheet status/day change
+    (before commit). Returns the month's row, or None if it has no approved
+    timesheet any more.
+    """
+    db.flush()
+
+    vacation, sick, unpaid, count = (
+        db.query(
+            func.coalesce(func.sum(Timesheet.vacation_days), 0),
+            func.coalesce(func.sum(Timesheet.sick_days), 0),
+            func.coalesce(func.sum(Timesheet.unpaid_days), 0),
+            func.count(Timesheet.id),
+        )
+        .filter(
+            Timesheet.contractor_id == contractor_id,
+            Timesheet.year == year,
+            Timesheet.month_number == month,
+            Timesheet.status == TimesheetStatus.APPROVED,
+        )
+        .one()
+    )
+
+    entry = db.query(LeaveLedger).filter(
+        LeaveLedger.contractor_id == contractor_id,
+        LeaveLedger.year == year,
+        LeaveLedger.month == month,
+    ).first()
+
+    if count == 0:
+        if entry:
+            db.delete(entry)
+            db.flush()
+        entry = None
+    else:
+        if not entry:
+            entry = LeaveLedger(contractor_id=contractor_id, year=year, month=month)
+            db.add(entry)
+        entry.vacation_days = float(vacation)
+        entry.sick_days = float(sick)
+        entry.unpaid_days = float(unpaid)
+        db.flush()
+
+    contractor = db.query(Contractor).filter(Contractor.id == contractor_id).first()
+    allowance = ContractorDataExtractor(contractor).extract_leave_allowance() if contractor else 0.0
+    _roll_forward(db, contractor_id, year, allowance)
+    return entry
+
+
+def refresh_for_timesheet(db: Session, timesheet: Timesheet) -> Optional[LeaveLedger]:
+    """Refresh the ledger month a timesheet belongs to."""
+    return refresh_month(db, timesheet.contractor_id, timesheet.year, timesheet.month_number)
+
+
+def get_leave_position(
+    db: Session, contractor_id: str, year: int, month: int = 12
+) -> Optional[LeaveLedger]:
+    """Latest ledger row for a contractor in `year` up to and including `month`."""
+    return (
+        db.query(LeaveLedger)
+        .filter(
+            LeaveLedger.contractor_id == contractor_id,
+            LeaveLedger.year == year,
+            LeaveLedger.month <= month,
+        )
+        .order_by(LeaveLedger.month.desc())
+        .first()
+    )
+
+
+def get_leave_positions(
+    db: Session, contractor_ids: Iterable[str], year: int, month: int = 12
+) -> Dict[str, LeaveLedger]:
+    """Latest ledger row per contractor in `year` up to `month`, in one query."""
+    rows = (
+        db.query(LeaveLedger)
+        .filter(
+            LeaveLedger.contractor_id.in_(list(contractor_ids)),
+            LeaveLedger.year == year,
+            LeaveLedger.month <= month,
+        )
+        .order_by(LeaveLedger.contractor_id, LeaveLedger.month)
+        .all()
+    )
+    # Ordered by month, so the last row seen per contractor wins
+    return {row.contractor_id: row for row in rows}
+
+
+def rebuild_ledger(db: Session, contractor_id: Optional[str] = None) -> int:
+    """
+    Rebuild ledger rows from approved timesheets from scratch.
+
+    Used to backfill or to repair drift. Returns the number of rows written.
+    """
+    query = db.query(LeaveLedger)
+    if contractor_id:
+        query = query.filter(LeaveLedger.contractor_id == contractor_id)
+    query.delete(synchronize_session=False)
+    db.flush()
+
+    periods = (
+        db.query(Timesheet.contractor_id, Timesheet.year, Timesheet.month_number)
+        .filter(Timesheet.status == TimesheetStatus.APPROVED)
+        .distinct()
+    )
+    if contractor_id:
+        periods = periods.filter(Timesheet.contractor_id == contractor_id)
+
+    written = 0
+    for cid, year, month in periods.order_by(Timesheet.contractor_id, Timesheet.year, Timesheet.month_number).all():
+        if refresh_month(db, cid, year, month):
+            written += 1
+    return written
+
+
+def _roll_forward(db: Session, contractor_id: str, year: int, allowance: float) -> None:
+    """Recompute running totals for `year` and every later year on the ledger."""
+    while year is not None:
+        _recompute_year(db, contractor_id, year, allowance)
+        db.flush()
+        year = db.query(func.min(LeaveLedger.year)).filter(
+            LeaveLedger.contractor_id == contractor_id,
+            LeaveLedger.year > year,
+        ).scalar()
+
+
+def _recompute_year(db: Session, contractor_id: str, year: int, allowance: float) -> None:
+    """Recompute YTD vacation, carry-over and balance for one contractor-year."""
+    previous = get_leave_position(db, contractor_id, year - 1)
+    carry_over = 0.0
+    if previous:
+        carry_over = min(MAX_CARRY_OVER_DAYS, max(0.0, previous.leave_balance or 0.0))
+
+    rows: List[LeaveLedger] = (
+        db.query(LeaveLedger)
+        .filter(LeaveLedger.contractor_id == contractor_id, LeaveLedger.year == year)
+        .order_by(LeaveLedger.month)
+        .all()
+    )
+    ytd = 0.0
+    for row in rows:
+        ytd += row.vacation_days or 0
+        row.ytd_vacation_days = ytd
+        row.leave_allowance = allowance
+        row.carry_over_days = carry_over
+        row.leave_balance = allowance + carry_over - ytd
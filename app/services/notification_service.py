@@ -85,7 +85,7 @@ class NotificationService:
         return _invoke_email_lambda("documents_uploaded", admin_email, {
             "contractor_name": contractor_name,
             "review_link": review_link,
-        })
+        }, wait=False)
 
     async def send_cohf_signature_request(
         self,
@@ -155,7 +155,7 @@ class NotificationService:
             "contractor_name": contractor_name,
             "notification_type": notification_type,
             "review_link": review_link,
-        })
+        }, wait=False)
 
     async def send_password_reset_email(
         self,
@@ -19,6 +19,8 @@ from app.schemas.offboarding import (
     OffboardingStatusResponse,
 )
 from app.domain.contractor.state_machine import ContractorStateMachine
+from app.services.document_job_service import create_document_job
+from app.services.leave_ledger_service import get_leave_position
 from app.telemetry.logger import get_logger
 
 logger = get_logger(__name__)
@@ -179,9 +181,13 @@ class OffboardingService:
         daily_rate = monthly_rate / Decimal(str(days_in_month)) if days_in_month > 0 else Decimal("0")
         pro_rata_salary = daily_rate * Decimal(str(days_worked))
 
-        # Calculate leave payout
-        total_leave_accrued = Decimal(contractor.leave_allowance or "0")
-        leave_used = Decimal("0")  # Would need to fetch from leave records
+        # Calculate leave payout from the leave ledger position at the exit month
+        leave_position = get_leave_position(
+            self.db, contractor_id, last_working_date.year, last_working_date.month
+        )
+        carry_over = Decimal(str(leave_position.carry_over_days or 0)) if leave_position else Decimal("0")
+        total_leave_accrued = Decimal(contractor.leave_allowance or "0") + carry_over
+        leave_used = Decimal(str(leave_position.ytd_vacation_days or 0)) if leave_position else Decimal("0")
         leave_remaining = total_leave_accrued - leave_used
         unused_leave_payout = daily_rate * leave_remaining
 
@@ -327,20 +333,26 @@ class OffboardingService:
     async def generate_offboarding_documents(
         self,
         offboarding_id: str,
+        requested_by: Optional[str] = None,
     ) -> dict:
         """
-        Generate offboarding documents.
+        Queue generation of the offboarding documents.
 
-        Creates:
+        Queues one document job each for:
         - Termination letter
         - Experience letter
         - Clearance certificate
 
+        The caller schedules process_document_job for each job. Each
+        finished job stores its URL on the offboarding record, which moves
+        to PENDING_APPROVAL once all three are stored.
+
         Args:
             offboarding_id: Offboarding record ID
+            requested_by: User ID requesting the documents
 
         Returns:
-            Dict with document URLs
+            Dict with the job ID of each document type
         """
         offboarding = self.db.query(OffboardingRecord).filter(
             OffboardingRecord.id == offboarding_id
@@ -356,33 +368,51 @@ class OffboardingService:
         if not contractor:
             raise ValueError(f"Contractor not found: {offboarding.contractor_id}")
 
-        # Document generation would go here
-        # For now, we'll set placeholder URLs
-        # In production, use PDF generators and upload to storage
-
-        documents = {
-            "termination_letter_url": None,
-            "experience_letter_url": None,
-            "clearance_certificate_url": None,
+        # Snapshot what the letters show, so the jobs render without the database
+        data = {
+            "contractor": {
+                "id": contractor.id,
+                "first_name": contractor.first_name,
+                "surname": contractor.surname,
+                "home_address": contractor.home_address or "",
+                "role": contractor.role or "Consultant",
+                "client_name": contractor.client_name or "",
+                "start_date": contractor.start_date or "",
+            },
+            "offboarding": {
+                "reason": offboarding.reason.value,
+                "last_working_date": _letter_date(offboarding.last_working_date),
+            },
         }
+        if offboarding.effective_termination_date:
+            data["offboarding"]["effective_termination_date"] = _letter_date(offboarding.effective_termination_date)
 
-        # Update offboarding record with document URLs
-        offboarding.termination_letter_url = documents.get("termination_letter_url")
-        offboarding.experience_letter_url = documents.get("experience_letter_url")
-        offboarding.clearance_certificate_url = documents.get("clearance_certificate_url")
-        offboarding.status = OffboardingStatus.PENDING_APPROVAL
+        jobs = {}
+        for document_type in ("termination_letter", "experience_letter", "clearance_certificate"):
+            result = create_document_job(
+                self.db, document_type, data, requested_by=requested_by, subject_id=offboarding.id,
+            )
+            if "error" in result:
+                raise ValueError(result["error"])
+            jobs[document_type] = result["job_id"]
+
+        # Previous documents are replaced as the new jobs finish
+        offboarding.termination_letter_url = None
+        offboarding.experience_letter_url = None
+        offboarding.clearance_certificate_url = None
+        offboarding.status = OffboardingStatus.PENDING_DOCUMENTS
 
         self.db.commit()
 
         logger.info(
-            "Offboarding documents generated",
+            "Offboarding documents queued",
             extra={
                 "offboarding_id": offboarding_id,
                 "contractor_id": contractor.id,
             }
         )
 
-        return documents
+        return {"jobs": jobs}
 
     async def complete_offboarding(
         self,
@@ -573,3 +603,8 @@ class OffboardingService:
             query = query.filter(OffboardingRecord.status == status)
 
         return query.order_by(OffboardingRecord.initiated_date.desc()).offset(skip).limit(limit).all()
+
+
+def _letter_date(value: Optional[date]) -> str:
+    """A date as written in the offboarding letters."""
+    return value.strftime("%B %d, %Y") if value else ""
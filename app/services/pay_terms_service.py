@@ -0,0 +1,227 @@
+"""
+Pay Terms Service - Persisted contractor pay-terms snapshots.
+
+ContractorDataExtractor walks the CDS form, costing sheet and deal terms
+with several fallback keys per field. This service stores its result in
+contractor_pay_terms so payroll reads are a plain indexed row fetch, and
+keeps that row current by re-extracting whenever a contractor, one of its
+pay-related child rows, its client or its third party is flushed with
+changes. Contractors that predate the table get their row when payroll is
+first calculated for them; read-only views build the terms in memory.
+"""
+from typing import Optional, List, Dict, Iterable
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.domain.payroll.value_objects import ContractorPayInfo, RateType
+from app.models.client import Client
+from app.models.third_party import ThirdParty
+from app.models.contractor import Contractor, ContractorDealTerms, ContractorMgmtCompany
+from app.models.contractor_pay_terms import ContractorPayTerms
+from app.utils.contractor_data_extractor import ContractorDataExtractor
+
+
+PAY_TERM_FIELDS = (
+    "rate_type", "currency", "monthly_rate", "day_rate", "charge_rate_month",
+    "charge_rate_day", "leave_allowance", "third_party_name", "management_fee",
+    "accrual_gratuity", "accrual_airfare", "accrual_annual_leave", "country",
+    "client_name", "error",
+)
+
+
+def extract_terms(contractor: Contractor) -> dict:
+    """Run the extractor and flatten its result into pay-terms column values."""
+    extractor = ContractorDataExtractor(contractor)
+    try:
+        info = extractor.extract_pay_info()
+    except (ValueError, TypeError) as e:
+        # Keep whatever can still be read so the ready list can show it
+        return {
+            **{field: None for field in PAY_TERM_FIELDS},
+            "currency": extractor._extract_currency(),
+            "client_name": extractor._extract_client_name(),
+            "error": str(e),
+        }
+
+    return {
+        "rate_type": info.rate_type.value,
+        "currency": info.currency,
+        "monthly_rate": info.monthly_rate,
+        "day_rate": info.day_rate,
+        "charge_rate_month": info.charge_rate_month,
+        "charge_rate_day": info.charge_rate_day,
+        "leave_allowance": info.leave_allowance,
+        "third_party_name": info.third_party_name,
+        "management_fee": info.management_fee,
+        "accrual_gratuity": info.accrual_gratuity,
+        "accrual_airfare": info.accrual_airfare,
+        "accrual_annual_leave": info.accrual_annual_leave,
+        "country": info.country,
+        "client_name": info.client_name,
+        "error": None,
+    }
+
+
+def _pending_or_get(db: Session, model, obj_id: str):
+    """A row added to the session but not flushed yet, or the stored one."""
+    return next(
+        (obj for obj in db.new if isinstance(obj, model) and obj.id == obj_id),
+        None,
+    ) or db.get(model, obj_id)
+
+
+def _terms_values(db: Session, contractor: Contractor) -> dict:
+    """Extracted terms, with names the contractor only references by id filled in."""
+    values = extract_terms(contractor)
+    # Pending contractors have the ids set but no loaded relationships yet
+    if not values["client_name"] and contractor.client_id:
+        client = _pending_or_get(db, Client, contractor.client_id)
+        values["client_name"] = client.company_name if client else values["client_name"]
+    if not values["third_party_name"] and contractor.third_party_id:
+        third_party = _pending_or_get(db, ThirdParty, contractor.third_party_id)
+        values["third_party_name"] = third_party.company_name if third_party else values["third_party_name"]
+    return values
+
+
+def refresh_pay_terms(db: Session, contractor: Contractor) -> ContractorPayTerms:
+    """Re-extract and store a contractor's pay terms (bumps version on change)."""
+    with db.no_autoflush:
+        terms = db.query(ContractorPayTerms).filter(
+            ContractorPayTerms.contractor_id == contractor.id
+        ).first()
+        values = _terms_values(db, contractor)
+
+        if not terms:
+            terms = ContractorPayTerms(contractor_id=contractor.id, version=1, **values)
+            db.add(terms)
+        elif any(getattr(terms, field) != value for field, value in values.items()):
+            for field, value in values.items():
+                setattr(terms, field, value)
+            terms.version = (terms.version or 0) + 1
+    return terms
+
+
+def get_pay_terms(db: Session, contractor: Contractor) -> ContractorPayTerms:
+    """Fetch a contractor's pay terms, building the snapshot on first use."""
+    terms = db.query(ContractorPayTerms).filter(
+        ContractorPayTerms.contractor_id == contractor.id
+    ).first()
+    return terms or refresh_pay_terms(db, contractor)
+
+
+def get_pay_terms_bulk(
+    db: Session,
+    contractor_ids: Iterable[str],
+    contractors: Optional[Dict[str, Contractor]] = None,
+    persist: bool = True,
+) -> Dict[str, ContractorPayTerms]:
+    """
+    Fetch pay terms for many contractors in one query.
+
+    Contractors without a snapshot yet get one built, loading them unless
+    already supplied in `contractors`. With persist=False (read-only
+    views) the built terms are not added to the session.
+    """
+    contractor_ids = list(contractor_ids)
+    if not contractor_ids:
+        return {}
+
+    result = {
+        t.contractor_id: t
+        for t in db.query(ContractorPayTerms).filter(ContractorPayTerms.contractor_id.in_(contractor_ids)).all()
+    }
+
+    missing = [cid for cid in contractor_ids if cid not in result]
+    if missing:
+        contractors = contractors or {}
+        to_load = [cid for cid in missing if cid not in contractors]
+        if to_load:
+            contractors = {**contractors, **{
+                c.id: c for c in db.query(Contractor).filter(Contractor.id.in_(to_load)).all()
+            }}
+        for cid in missing:
+            if cid not in contractors:
+                continue
+            if persist:
+                result[cid] = refresh_pay_terms(db, contractors[cid])
+            else:
+                result[cid] = ContractorPayTerms(
+                    contractor_id=cid, version=0, **_terms_values(db, contractors[cid])
+                )
+    return result
+
+
+def to_pay_info(terms: ContractorPayTerms) -> ContractorPayInfo:
+    """
+    Convert a stored snapshot into the domain value object.
+
+    Raises:
+        ValueError: If the terms could not be extracted (e.g. bad rate type)
+    """
+    if terms.error:
+        raise ValueError(terms.error)
+
+    return ContractorPayInfo(
+        rate_type=RateType(terms.rate_type),
+        currency=terms.currency,
+        monthly_rate=terms.monthly_rate,
+        day_rate=terms.day_rate,
+        charge_rate_month=terms.charge_rate_month,
+        charge_rate_day=terms.charge_rate_day,
+        leave_allowance=terms.leave_allowance,
+        third_party_name=terms.third_party_name or "",
+        management_fee=terms.management_fee or 0.0,
+        accrual_gratuity=terms.accrual_gratuity or 0.0,
+        accrual_airfare=terms.accrual_airfare or 0.0,
+        accrual_annual_leave=terms.accrual_annual_leave or 0.0,
+        country=terms.country,
+        client_name=terms.client_name or "",
+    )
+
+
+def snapshot(terms: ContractorPayTerms) -> dict:
+    """Serialisable copy of the terms, stored on each payroll it was used for."""
+    data = {field: getattr(terms, field) for field in PAY_TERM_FIELDS if field != "error"}
+    data["version"] = terms.version
+    return data
+
+
+def _changed_contractors(session: Session) -> List[Contractor]:
+    """Contractors whose pay-term sources are new or modified in this flush."""
+    changed = {}
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Contractor):
+            contractor = obj
+        elif isinstance(obj, (ContractorDealTerms, ContractorMgmtCompany)):
+            contractor = obj.contractor
+        else:
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        if contractor is None or contractor.id is None or contractor in session.deleted:
+            continue
+        changed[contractor.id] = contractor
+    return list(changed.values())
+
+
+@event.listens_for(Session, "before_flush")
+def _refresh_changed_pay_terms(session: Session, flush_context, instances) -> None:
+    """Keep pay-term snapshots in step with the rows they are derived from."""
+    for contractor in _changed_contractors(session):
+        refresh_pay_terms(session, contractor)
+
+    for obj in session.dirty:
+        if not isinstance(obj, (Client, ThirdParty)) or not inspect(obj).attrs.company_name.history.has_changes():
+            continue
+        with session.no_autoflush:
+            if isinstance(obj, Client):
+                # A client rename changes the client_name of every contractor it has
+                contractor_ids = session.query(Contractor.id).filter(Contractor.client_id == obj.id)
+                session.query(ContractorPayTerms).filter(
+                    ContractorPayTerms.contractor_id.in_(contractor_ids.scalar_subquery())
+                ).update({"client_name": obj.company_name}, synchronize_session=False)
+            else:
+                # The third party name is only a fallback, so re-extract
+                for contractor in session.query(Contractor).filter(Contractor.third_party_id == obj.id):
+                    refresh_pay_terms(session, contractor)
@@ -1,18 +1,21 @@
 """
 Payroll Batch Service - Business logic for batch payroll processing.
 """
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, List, Dict
 import uuid
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select, update
 
 from app.models.payroll import Payroll, PayrollStatus
 from app.models.payroll_batch import PayrollBatch, BatchStatus
 from app.models.contractor import Contractor, OnboardingRoute
 from app.models.client import Client
 from app.models.third_party import ThirdParty
+from app.services.payroll_stats_service import count_payrolls_by_status, apply_status_deltas
+from app.utils.period import period_filter
 
 
 # Routes that go through 3rd party invoice flow
@@ -45,7 +48,7 @@ def create_or_get_batch(
     """Find an existing batch or create a new one for the given grouping keys."""
     # Look for existing batch with same grouping
     query = db.query(PayrollBatch).filter(
-        PayrollBatch.period == period,
+        period_filter(PayrollBatch, period),
         PayrollBatch.client_id == client_id,
         PayrollBatch.onboarding_route == route,
     )
@@ -109,19 +112,210 @@ def assign_payroll_to_batch(db: Session, payroll_id: int) -> Optional[int]:
         currency=payroll.currency or "AED",
     )
 
-    payroll.batch_id = batch.id
-    db.flush()  # Flush so the payroll is included in aggregate query
-    _recalculate_batch_aggregates(db, batch)
+    if payroll.batch_id != batch.id:
+        if payroll.batch_id is not None:
+            remove_payroll_from_batch(db, payroll)
+        payroll.batch_id = batch.id
+        _apply_batch_delta(db, batch.id, 1, payroll.net_salary, payroll.total_payable)
     db.flush()
     return batch.id
 
 
-def _recalculate_batch_aggregates(db: Session, batch: PayrollBatch):
-    """Recalculate batch totals from its payrolls."""
-    payrolls = db.query(Payroll).filter(Payroll.batch_id == batch.id).all()
-    batch.contractor_count = len(payrolls)
-    batch.total_net_salary = sum(p.net_salary or 0 for p in payrolls)
-    batch.total_payable = sum(p.total_payable or 0 for p in payrolls)
+def assign_payrolls_to_batches(
+    db: Session, payrolls: List[Payroll], contractors: Dict[str, Contractor]
+) -> Dict[int, int]:
+    """
+    Assign many freshly calculated payrolls to batches in one pass.
+
+    Payrolls are grouped by (period, client, route, third party) so each batch
+    is looked up once, and its totals are advanced by one UPDATE for the
+    whole group.
+    Returns a mapping of payroll_id -> batch_id for the payrolls that were assigned.
+    """
+    groups: Dict[tuple, List[Payroll]] = {}
+    third_party_names: Dict[Optional[str], Optional[str]] = {}
+    for payroll in payrolls:
+        contractor = contractors.get(payroll.contractor_id)
+        if not contractor or not contractor.client_id or not contractor.onboarding_route:
+            continue
+
+        route_value = contractor.onboarding_route.value if hasattr(contractor.onboarding_route, 'value') else str(contractor.onboarding_route)
+
+        third_party_id = None
+        if route_value in THIRD_PARTY_ROUTES and contractor.third_party:
+            third_party_id = contractor.third_party.id
+            third_party_names[third_party_id] = contractor.third_party.company_name
+
+        key = (payroll.period, contractor.client_id, route_value, third_party_id)
+        groups.setdefault(key, []).append(payroll)
+
+    assigned = {}
+    for (period, client_id, route, third_party_id), members in groups.items():
+        batch = create_or_get_batch(
+            db=db,
+            period=period,
+            client_id=client_id,
+            route=route,
+            third_party_id=third_party_id,
+            third_party_name=third_party_names.get(third_party_id),
+            currency=members[0].currency or "AED",
+        )
+        added = [p for p in members if p.batch_id != batch.id]
+        for payroll in added:
+            if payroll.batch_id is not None:
+                remove_payroll_from_batch(db, payroll)
+            payroll.batch_id = batch.id
+        if added:
+            _apply_batch_delta(
+                db, batch.id, len(added),
+                sum(p.net_salary or 0 for p in added),
+                sum(p.total_payable or 0 for p in added),
+            )
+        for payroll in members:
+            assigned[payroll.id] = batch.id
+
+    db.flush()
+    return assigned
+
+
+def _apply_batch_delta(
+    db: Session, batch_id: int, count: int, net_salary: Optional[float], total_payable: Optional[float]
+):
+    """
+    Adjust batch totals by a payroll contribution.
+
+    The arithmetic runs in the UPDATE itself (total = total + delta), so
+    concurrent assignments and edits of the same batch all add up instead
+    of overwriting each other. Loaded batch objects are refreshed.
+    """
+    db.execute(
+        update(PayrollBatch)
+        .where(PayrollBatch.id == batch_id)
+        .values(
+            contractor_count=func.coalesce(PayrollBatch.contractor_count, 0) + count,
+            total_net_salary=func.coalesce(PayrollBatch.total_net_salary, 0) + (net_salary or 0),
+            total_payable=func.coalesce(PayrollBatch.total_payable, 0) + (total_payable or 0),
+        )
+        .execution_options(synchronize_session="fetch")
+    )
+
+
+def remove_payroll_from_batch(db: Session, payroll: Payroll):
+    """Take a payroll's amounts off its batch totals (before unassigning or deleting it)."""
+    if payroll.batch_id is None:
+        return
+    _apply_batch_delta(db, payroll.batch_id, -1, -(payroll.net_salary or 0), -(payroll.total_payable or 0))
+
+
+def record_payroll_amount_change(
+    db: Session, payroll: Payroll, previous_net_salary: Optional[float], previous_total_payable: Optional[float]
+):
+    """Carry an edit of a batched payroll's amounts into its batch totals."""
+    if payroll.batch_id is None:
+        return
+    _apply_batch_delta(
+        db, payroll.batch_id, 0,
+        (payroll.net_salary or 0) - (previous_net_salary or 0),
+        (payroll.total_payable or 0) - (previous_total_payable or 0),
+    )
+
+
+def recalculate_batch_aggregates(db: Session, batch_id: Optional[int] = None) -> List[dict]:
+    """
+    Consistency check: recompute batch totals with one grouped SUM and fix drift.
+
+    Covers every batch unless batch_id is given. Returns the batches whose
+    stored totals differed, with the stored and recomputed values.
+    """
+    db.flush()
+    sums = db.query(
+        Payroll.batch_id,
+        func.count(Payroll.id),
+        func.coalesce(func.sum(Payroll.net_salary), 0),
+        func.coalesce(func.sum(Payroll.total_payable), 0),
+    ).filter(Payroll.batch_id.isnot(None))
+    batches = db.query(PayrollBatch)
+    if batch_id is not None:
+        sums = sums.filter(Payroll.batch_id == batch_id)
+        batches = batches.filter(PayrollBatch.id == batch_id)
+    totals = {row[0]: row[1:] for row in sums.group_by(Payroll.batch_id).all()}
+
+    corrected = []
+    for batch in batches.all():
+        count, net_salary, total_payable = totals.get(batch.id, (0, 0, 0))
+        stored = (batch.contractor_count or 0, batch.total_net_salary or 0, batch.total_payable or 0)
+        if stored[0] != count or abs(stored[1] - net_salary) > 0.005 or abs(stored[2] - total_payable) > 0.005:
+            corrected.append({
+                "batch_id": batch.id,
+                "stored": {"contractor_count": stored[0], "total_net_salary": stored[1], "total_payable": stored[2]},
+                "actual": {"contractor_count": count, "total_net_salary": net_salary, "total_payable": total_payable},
+            })
+        batch.contractor_count = count
+        batch.total_net_salary = net_salary
+        batch.total_payable = total_payable
+
+    db.flush()
+    return corrected
+
+
+def _transition_statement(batch_id: int, from_statuses: tuple, to_status: PayrollStatus, values: dict):
+    """
+    WITH old AS (SELECT ... FOR UPDATE) UPDATE payrolls ... FROM old RETURNING id, old status.
+
+    The CTE locks the matching rows and reads their status before the
+    update, so each returned row carries the status it moved from.
+    """
+    old = (
+        select(Payroll.id, Payroll.status.label("old_status"))
+        .where(Payroll.batch_id == batch_id, Payroll.status.in_(from_statuses))
+        .with_for_update()
+        .cte("old")
+    )
+    return (
+        update(Payroll)
+        .where(Payroll.id == old.c.id)
+        .values(status=to_status, **values)
+        .returning(Payroll.id, old.c.old_status)
+    )
+
+
+def _transition_batch_payrolls(
+    db: Session, batch_id: int, from_statuses: tuple, to_status: PayrollStatus, **values
+) -> List[int]:
+    """
+    Move a batch's payrolls from any of `from_statuses` to `to_status` set-based.
+
+    Runs a single UPDATE ... WHERE status IN (...) RETURNING id, old status
+    (see _transition_statement) instead of loading and locking each payroll,
+    then applies the per-status counter deltas in one statement. SQLite
+    (tests) cannot return columns of an UPDATE's FROM clause, so there the
+    old statuses are read first; it serializes writers anyway. `values` are
+    extra columns to set, e.g. timestamps. Returns the ids of the payrolls
+    that changed.
+    """
+    db.flush()  # Don't let pending ORM edits race the bulk update
+    if db.get_bind().dialect.name == "postgresql":
+        changed = db.execute(_transition_statement(batch_id, from_statuses, to_status, values)).all()
+    else:
+        changed = db.execute(
+            select(Payroll.id, Payroll.status)
+            .where(Payroll.batch_id == batch_id, Payroll.status.in_(from_statuses))
+        ).all()
+        if changed:
+            db.execute(
+                update(Payroll)
+                .where(Payroll.id.in_([payroll_id for payroll_id, _ in changed]))
+                .values(status=to_status, **values)
+            )
+
+    deltas = Counter()
+    for _, old_status in changed:
+        deltas[old_status] -= 1
+        deltas[to_status] += 1
+
+    # Bulk updates bypass the flush listener that maintains cached counters
+    apply_status_deltas(db, deltas)
+    return [payroll_id for payroll_id, _ in changed]
 
 
 def approve_payroll_in_batch(db: Session, batch_id: int, payroll_id: int) -> dict:
@@ -162,24 +356,18 @@ def approve_all_payrolls_in_batch(db: Session, batch_id: int) -> dict:
     if batch.status not in (BatchStatus.AWAITING_APPROVAL, BatchStatus.PARTIALLY_APPROVED):
         return {"error": f"Batch must be in awaiting_approval or partially_approved status, currently {batch.status.value}"}
 
-    payrolls = db.query(Payroll).filter(
-        Payroll.batch_id == batch_id,
-        Payroll.status == PayrollStatus.CALCULATED,
-    ).with_for_update().all()
-
-    if not payrolls:
+    approved_ids = _transition_batch_payrolls(
+        db, batch_id, (PayrollStatus.CALCULATED,), PayrollStatus.APPROVED,
+        approved_at=datetime.utcnow(),
+    )
+    if not approved_ids:
         return {"error": "No payrolls in CALCULATED status to approve"}
 
-    now = datetime.utcnow()
-    for p in payrolls:
-        p.status = PayrollStatus.APPROVED
-        p.approved_at = now
-
     _check_and_advance_batch(db, batch)
     db.flush()
     return {
         "success": True,
-        "approved_count": len(payrolls),
+        "approved_count": len(approved_ids),
         "batch_status": batch.status.value,
     }
 
@@ -201,6 +389,9 @@ def adjust_payroll_in_batch(
     if not payroll:
         return {"error": "Payroll not found in this batch"}
 
+    previous_net_salary = payroll.net_salary
+    previous_total_payable = payroll.total_payable
+
     # Apply adjustments
     if "net_salary" in adjustments and adjustments["net_salary"] is not None:
         payroll.net_salary = adjustments["net_salary"]
@@ -220,7 +411,7 @@ def adjust_payroll_in_batch(
     payroll.adjusted_at = datetime.utcnow()
     payroll.approved_at = datetime.utcnow()
 
-    _recalculate_batch_aggregates(db, batch)
+    record_payroll_amount_change(db, payroll, previous_net_salary, previous_total_payable)
     _check_and_advance_batch(db, batch)
     db.flush()
     return {"success": True, "batch_status": batch.status.value}
@@ -246,16 +437,15 @@ def flag_mismatch(
 
 def _check_and_advance_batch(db: Session, batch: PayrollBatch):
     """Auto-advance batch status if all payrolls are approved/adjusted."""
-    payrolls = db.query(Payroll).filter(Payroll.batch_id == batch.id).all()
-    if not payrolls:
+    # Flush pending status changes so the grouped count sees them
+    db.flush()
+    counts = count_payrolls_by_status(db, batch.id)
+    total = sum(counts.values())
+    if not total:
         return
 
-    total = len(payrolls)
-    approved_count = sum(
-        1 for p in payrolls
-        if p.status in (PayrollStatus.APPROVED, PayrollStatus.APPROVED_ADJUSTED)
-    )
-    mismatch_count = sum(1 for p in payrolls if p.status == PayrollStatus.MISMATCH_3RD_PARTY)
+    approved_count = counts[PayrollStatus.APPROVED.value] + counts[PayrollStatus.APPROVED_ADJUSTED.value]
+    mismatch_count = counts[PayrollStatus.MISMATCH_3RD_PARTY.value]
 
     if approved_count == total:
         batch.status = BatchStatus.SUBMIT_FOR_INVOICE
@@ -375,12 +565,11 @@ def mark_paid(db: Session, batch_id: int, payment_ref: str, paid_by: str) -> dic
     batch.paid_by = paid_by
     batch.payment_reference = payment_ref
 
-    # Mark all payrolls as paid
-    payrolls = db.query(Payroll).filter(Payroll.batch_id == batch_id).all()
-    for p in payrolls:
-        if p.status in (PayrollStatus.APPROVED, PayrollStatus.APPROVED_ADJUSTED):
-            p.status = PayrollStatus.PAID
-            p.paid_at = datetime.utcnow()
+    # Mark all approved payrolls as paid
+    _transition_batch_payrolls(
+        db, batch_id, (PayrollStatus.APPROVED, PayrollStatus.APPROVED_ADJUSTED), PayrollStatus.PAID,
+        paid_at=batch.paid_at,
+    )
 
     db.flush()
     return {"success": True}
@@ -403,22 +592,22 @@ def generate_payslips_for_batch(db: Session, batch_id: int) -> dict:
 
     batch.status = BatchStatus.PAYSLIPS_GENERATED
 
-    # Mark all payrolls as paid (for direct routes, approval = paid)
-    payrolls = db.query(Payroll).filter(Payroll.batch_id == batch_id).all()
-    for p in payrolls:
-        if p.status in (PayrollStatus.APPROVED, PayrollStatus.APPROVED_ADJUSTED):
-            p.status = PayrollStatus.PAID
-            p.paid_at = datetime.utcnow()
+    # Mark all approved payrolls as paid (for direct routes, approval = paid)
+    _transition_batch_payrolls(
+        db, batch_id, (PayrollStatus.APPROVED, PayrollStatus.APPROVED_ADJUSTED), PayrollStatus.PAID,
+        paid_at=datetime.utcnow(),
+    )
+    payroll_ids = [pid for (pid,) in db.query(Payroll.id).filter(Payroll.batch_id == batch_id).all()]
 
     db.flush()
-    return {"success": True, "payroll_ids": [p.id for p in payrolls]}
+    return {"success": True, "payroll_ids": payroll_ids}
 
 
 def get_batch_stats(db: Session, period: Optional[str] = None) -> dict:
     """Get batch counts by status."""
     query = db.query(PayrollBatch.status, func.count(PayrollBatch.id))
     if period:
-        query = query.filter(PayrollBatch.period == period)
+        query = query.filter(period_filter(PayrollBatch, period))
     counts = query.group_by(PayrollBatch.status).all()
 
     stats = {s.value: 0 for s in BatchStatus}
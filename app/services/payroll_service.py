@@ -5,10 +5,12 @@ Handles payroll calculation, approval workflow, and data coordination.
 Follows Single Responsibility and Dependency Inversion principles.
 """
 from decimal import Decimal
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Set
 from datetime import datetime
+from calendar import monthrange
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
 
 from app.domain.payroll import (
     PayrollCalculation,
@@ -26,10 +28,33 @@ from app.domain.payroll.exceptions import (
 )
 from app.models.payroll import Payroll
 from app.models.timesheet import Timesheet, TimesheetStatus
-from app.models.contractor import Contractor
+from app.models.client import Client
+from app.models.contractor import Contractor, OnboardingRoute
+from app.models.third_party import ThirdParty
+from app.models.expense import Expense, ExpenseStatus
+from app.models.leave_ledger import LeaveLedger
 from app.repositories.interfaces.payroll_repo import IPayrollRepository
-from app.utils.contractor_data_extractor import ContractorDataExtractor
+from app.utils.pagination import keyset_page
+from app.utils.period import parse_period, previous_period, period_filter
 from app.services.expense_service import get_approved_expenses_total
+from app.services.payroll_batch_service import assign_payrolls_to_batches
+from app.services.leave_ledger_service import get_leave_position, get_leave_positions
+from app.services.pay_terms_service import get_pay_terms, get_pay_terms_bulk, to_pay_info, snapshot
+from app.services.payroll_stats_service import get_payroll_stats
+
+
+# Columns the payroll list view needs; avoids loading Contractor and its eager children
+PAYROLL_LIST_COLUMNS = (
+    Payroll.id, Payroll.timesheet_id, Payroll.contractor_id, Payroll.period,
+    Payroll.rate_type, Payroll.days_worked, Payroll.gross_pay, Payroll.net_salary,
+    Payroll.total_accruals, Payroll.management_fee, Payroll.invoice_total,
+    Payroll.vat_amount, Payroll.total_payable, Payroll.currency, Payroll.status,
+    Payroll.batch_id, Payroll.calculated_at, Payroll.approved_at, Payroll.paid_at,
+    Payroll.created_at,
+    Contractor.first_name, Contractor.surname, Contractor.email.label("contractor_email"),
+    Client.company_name.label("client_name"),
+    ThirdParty.company_name.label("third_party_name"),
+)
 
 
 class PayrollService:
@@ -71,42 +96,45 @@ class PayrollService:
             .all()
         )
 
+        contractor_ids = {ts.contractor_id for ts in timesheets}
+        names = {
+            row.id: row
+            for row in self.db.query(Contractor.id, Contractor.first_name, Contractor.surname, Contractor.email)
+            .filter(Contractor.id.in_(contractor_ids))
+            .all()
+        }
+        pay_terms = get_pay_terms_bulk(self.db, names.keys())
+
         result = []
         for ts in timesheets:
-            contractor = self.db.query(Contractor).filter(
-                Contractor.id == ts.contractor_id
-            ).first()
-
-            if not contractor:
+            contractor = names.get(ts.contractor_id)
+            terms = pay_terms.get(ts.contractor_id)
+            if not contractor or not terms:
                 continue
 
-            # Extract contractor info
-            extractor = ContractorDataExtractor(contractor)
-            pay_info = extractor.extract_pay_info()
-
             contractor_name = f"{contractor.first_name} {contractor.surname}"
 
             # Calculate estimated gross based on rate type
             estimated_gross = None
-            if pay_info.rate_type == RateType.DAILY and pay_info.day_rate:
-                estimated_gross = pay_info.day_rate * (ts.work_days or 0)
-            elif pay_info.rate_type == RateType.MONTHLY and pay_info.monthly_rate:
-                estimated_gross = pay_info.monthly_rate
+            if terms.rate_type == RateType.DAILY.value and terms.day_rate:
+                estimated_gross = terms.day_rate * (ts.work_days or 0)
+            elif terms.rate_type == RateType.MONTHLY.value and terms.monthly_rate:
+                estimated_gross = terms.monthly_rate
 
             result.append({
                 "id": ts.id,
                 "contractor_id": ts.contractor_id,
                 "contractor_name": contractor_name,
                 "contractor_email": contractor.email,
-                "client_name": pay_info.client_name,
-                "third_party_name": pay_info.third_party_name,
+                "client_name": terms.client_name,
+                "third_party_name": terms.third_party_name,
                 "period": ts.month,
                 "work_days": ts.work_days,
                 "total_days": ts.total_days,
-                "rate_type": pay_info.rate_type.value,
-                "monthly_rate": pay_info.monthly_rate,
-                "day_rate": pay_info.day_rate,
-                "currency": pay_info.currency,
+                "rate_type": terms.rate_type,
+                "monthly_rate": terms.monthly_rate,
+                "day_rate": terms.day_rate,
+                "currency": terms.currency,
                 "estimated_gross": estimated_gross,
                 "submitted_date": ts.submitted_date,
                 "approved_date": ts.approved_date,
@@ -163,9 +191,9 @@ class PayrollService:
         if not contractor:
             raise ValueError("Contractor not found")
 
-        # Extract contractor pay info
-        extractor = ContractorDataExtractor(contractor)
-        contractor_info = extractor.extract_pay_info()
+        # Read the contractor's persisted pay terms
+        pay_terms = get_pay_terms(self.db, contractor)
+        contractor_info = to_pay_info(pay_terms)
 
         # Validate rates are configured
         contractor_info.validate()
@@ -206,61 +234,206 @@ class PayrollService:
             timesheet_id=timesheet_id,
             contractor_id=contractor.id,
             calculation=calculation,
+            pay_terms=snapshot(pay_terms),
         )
 
         return payroll
 
+    def run_payroll_for_period(
+        self,
+        period: str,
+        timesheet_ids: Optional[List[int]] = None,
+    ) -> dict:
+        """
+        Calculate payroll for every approved timesheet of a period in one pass.
+
+        Contractors, yearly leave, previous-month timesheets and expense totals
+        are each loaded with a single query for the whole period, so the cost
+        no longer grows with one round trip set per timesheet.
+
+        Args:
+            period: Pay period (e.g., "January 2026")
+            timesheet_ids: Optional subset of timesheets to restrict the run to
+
+        Returns:
+            Dictionary with created payroll IDs, batch assignments and
+            per-contractor failures
+
+        Raises:
+            ValueError: If the period is not in "Month YYYY" format
+        """
+        period_date = datetime.strptime(period, "%B %Y")
+        year, month = period_date.year, period_date.month
+
+        # Approved timesheets for the period that have no payroll yet
+        query = (
+            self.db.query(Timesheet)
+            .outerjoin(Payroll, Timesheet.id == Payroll.timesheet_id)
+            .filter(Timesheet.status == TimesheetStatus.APPROVED)
+            .filter(Timesheet.year == year, Timesheet.month_number == month)
+            .filter(Payroll.id == None)
+        )
+        if timesheet_ids:
+            query = query.filter(Timesheet.id.in_(timesheet_ids))
+        timesheets = query.order_by(Timesheet.id).all()
+
+        result = {
+            "period": period,
+            "calculated": 0,
+            "payroll_ids": [],
+            "batch_ids": [],
+            "failed": [],
+        }
+        if not timesheets:
+            return result
+
+        contractor_ids = {ts.contractor_id for ts in timesheets}
+        contractors = {
+            c.id: c
+            for c in self.db.query(Contractor)
+            .options(selectinload(Contractor.client), selectinload(Contractor.third_party))
+            .filter(Contractor.id.in_(contractor_ids))
+            .all()
+        }
+        pay_terms = get_pay_terms_bulk(self.db, contractor_ids, contractors)
+        leave_positions = get_leave_positions(self.db, contractor_ids, year, month)
+        previous_days = self._bulk_previous_month_days(contractor_ids, year, month)
+        expenses = self._bulk_expenses_totals(contractor_ids, year, month)
+
+        payrolls = []
+        for ts in timesheets:
+            contractor = contractors.get(ts.contractor_id)
+            try:
+                if not contractor:
+                    raise ValueError("Contractor not found")
+
+                terms = pay_terms[contractor.id]
+                contractor_info = to_pay_info(terms)
+                contractor_info.validate()
+
+                leave_adjustment = self._build_leave_adjustment(
+                    contractor_info=contractor_info,
+                    period=ts.month,
+                    leave_position=leave_positions.get(contractor.id),
+                    previous_month_days_worked=previous_days.get(contractor.id),
+                )
+                calculator = PayrollCalculatorFactory.create(contractor_info.rate_type)
+                calculation = calculator.calculate(
+                    contractor_info=contractor_info,
+                    days_worked=ts.work_days or 0,
+                    period=ts.month,
+                    leave_adjustment=leave_adjustment,
+                    manual_accruals={},
+                    expenses_reimbursement=expenses.get(contractor.id, 0),
+                )
+            except Exception as e:
+                result["failed"].append({
+                    "timesheet_id": ts.id,
+                    "contractor_id": ts.contractor_id,
+                    "contractor_name": f"{contractor.first_name} {contractor.surname}" if contractor else None,
+                    "error": str(e),
+                })
+                continue
+
+            payrolls.append(self._build_payroll_record(ts.id, contractor.id, calculation, snapshot(terms)))
+
+        if not payrolls:
+            return result
+
+        # Single flush inserts all rows; IDs are needed for batch assignment
+        self.db.add_all(payrolls)
+        self.db.flush()
+
+        batch_ids = assign_payrolls_to_batches(self.db, payrolls, contractors)
+        self.db.commit()
+
+        result["calculated"] = len(payrolls)
+        result["payroll_ids"] = [p.id for p in payrolls]
+        result["batch_ids"] = sorted(set(batch_ids.values()))
+        return result
+
     async def get_payroll_by_id(self, payroll_id: int) -> Optional[Payroll]:
         """Get payroll record by ID."""
         return await self.payroll_repo.get(payroll_id)
 
-    async def get_all_payroll_records(
-        self, status_filter: Optional[str] = None
-    ) -> List[Payroll]:
+    def get_all_payroll_records(
+        self,
+        status_filter: Optional[str] = None,
+        period: Optional[str] = None,
+        client_id: Optional[str] = None,
+        route: Optional[str] = None,
+        batch_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = 100,
+    ) -> dict:
         """
-        Get all payroll records with optional status filter.
+        Get one page of payroll records, newest first, with optional filters.
+
+        Selects only the list columns (plus contractor, client and third-party
+        names via joins) and pages by (created_at, id), so cost does not grow
+        with payroll history. With neither cursor nor limit every matching
+        record is returned, as before paging was added.
 
         Args:
-            status_filter: Optional status to filter by
+            status_filter: Optional status to filter by ("all" or invalid = no filter)
+            period: Optional period, e.g. "January 2026"
+            client_id: Optional client of the contractor
+            route: Optional onboarding route of the contractor
+            batch_id: Optional payroll batch
+            cursor: Cursor from the previous page's next_cursor
+            limit: Page size (None = all records, without a cursor)
 
         Returns:
-            List of payroll records
+            Dictionary with "rows", "next_cursor" (None on the last page)
+            and "total", the number of records matching the filters
+
+        Raises:
+            ValueError: If the cursor is malformed
         """
+        query = (
+            self.db.query(*PAYROLL_LIST_COLUMNS)
+            .outerjoin(Contractor, Payroll.contractor_id == Contractor.id)
+            .outerjoin(Client, Contractor.client_id == Client.id)
+            .outerjoin(ThirdParty, Contractor.third_party_id == ThirdParty.id)
+        )
+
         if status_filter and status_filter != "all":
             try:
-                status_enum = PayrollStatus(status_filter)
-                return await self.payroll_repo.get_by_status(status_enum)
+                query = query.filter(Payroll.status == PayrollStatus(status_filter))
             except ValueError:
                 pass  # Invalid status, return all
+        if period:
+            query = query.filter(period_filter(Payroll, period))
+        if client_id:
+            query = query.filter(Contractor.client_id == client_id)
+        if route:
+            try:
+                query = query.filter(Contractor.onboarding_route == OnboardingRoute(route))
+            except ValueError:
+                pass  # Invalid route, return all
+        if batch_id is not None:
+            query = query.filter(Payroll.batch_id == batch_id)
 
-        # Return all records
-        return self.db.query(Payroll).order_by(Payroll.created_at.desc()).all()
+        if limit is None and cursor is None:
+            rows = query.order_by(Payroll.created_at.desc().nulls_last(), Payroll.id.desc()).all()
+            return {"rows": rows, "next_cursor": None, "total": len(rows)}
+
+        rows, next_cursor = keyset_page(query, Payroll.created_at, Payroll.id, cursor, limit or 100)
+        if next_cursor is None and cursor is None:
+            total = len(rows)  # The only page
+        else:
+            total = query.with_entities(func.count(Payroll.id)).order_by(None).scalar()
+        return {"rows": rows, "next_cursor": next_cursor, "total": total}
 
     async def get_payroll_stats(self) -> dict:
         """
         Get payroll statistics.
 
         Returns:
-            Dictionary with counts by status
+            Dictionary with the ready count and counts by status
         """
-        # Count ready timesheets
-        ready_count = (
-            self.db.query(Timesheet)
-            .outerjoin(Payroll, Timesheet.id == Payroll.timesheet_id)
-            .filter(Timesheet.status == TimesheetStatus.APPROVED)
-            .filter(Payroll.id == None)
-            .count()
-        )
-
-        # Count by status
-        status_counts = await self.payroll_repo.count_by_status()
-
-        return {
-            "ready": ready_count,
-            "calculated": status_counts.get("calculated", 0),
-            "approved": status_counts.get("approved", 0),
-            "paid": status_counts.get("paid", 0),
-        }
+        # Ready count and per-status counts in one grouped statement
+        return get_payroll_stats(self.db)
 
     async def approve_payroll(self, payroll_id: int, approved_by: Optional[str] = None) -> Payroll:
         """
@@ -331,16 +504,15 @@ class PayrollService:
         timesheet_id: int,
     ) -> LeaveAdjustment:
         """Calculate leave balance and deductibles."""
-        # Get current year from period
+        # Get current year/month from period
         try:
             period_date = datetime.strptime(period, "%B %Y")
-            current_year = period_date.year
         except:
-            current_year = datetime.now().year
+            period_date = datetime.now()
 
-        # Calculate total leave taken this year
-        total_leave_taken = await self._get_total_leave_taken_this_year(
-            contractor.id, current_year
+        # Year-to-date leave comes from the leave ledger in one lookup
+        leave_position = get_leave_position(
+            self.db, contractor.id, period_date.year, period_date.month
         )
 
         # Get previous month data
@@ -349,9 +521,25 @@ class PayrollService:
         )
         previous_month_days_worked = prev_timesheet.work_days if prev_timesheet else None
 
+        return self._build_leave_adjustment(
+            contractor_info=contractor_info,
+            period=period,
+            leave_position=leave_position,
+            previous_month_days_worked=previous_month_days_worked,
+        )
+
+    def _build_leave_adjustment(
+        self,
+        contractor_info,
+        period: str,
+        leave_position: Optional[LeaveLedger],
+        previous_month_days_worked: Optional[float],
+    ) -> LeaveAdjustment:
+        """Build the leave adjustment from the contractor's leave ledger position."""
         # Leave allowance and balance
         leave_allowance = contractor_info.leave_allowance
-        carry_over_leave = 0  # TODO: Calculate from previous year (max 5 days)
+        total_leave_taken = leave_position.ytd_vacation_days if leave_position else 0
+        carry_over_leave = leave_position.carry_over_days if leave_position else 0
         total_leave_allowance = leave_allowance + carry_over_leave
         leave_balance = total_leave_allowance - total_leave_taken
 
@@ -360,7 +548,6 @@ class PayrollService:
         if leave_balance < 0 and contractor_info.rate_type == RateType.MONTHLY:
             # Deduct based on prorata day rate
             if contractor_info.monthly_rate:
-                from calendar import monthrange
                 period_date = datetime.strptime(period, "%B %Y")
                 calendar_days = monthrange(period_date.year, period_date.month)[1]
                 prorata_day_rate = contractor_info.monthly_rate / calendar_days
@@ -379,60 +566,84 @@ class PayrollService:
             previous_month_days_worked=previous_month_days_worked,
         )
 
-    async def _get_total_leave_taken_this_year(
-        self, contractor_id: str, year: int
-    ) -> float:
-        """Calculate total vacation days taken this year from all timesheets."""
-        timesheets = self.db.query(Timesheet).filter(
-            Timesheet.contractor_id == contractor_id,
-            Timesheet.status == TimesheetStatus.APPROVED
-        ).all()
-
-        total_leave = 0
-        for ts in timesheets:
-            # Parse month to check if it's the same year
-            try:
-                ts_date = datetime.strptime(ts.month, "%B %Y")
-                if ts_date.year == year:
-                    total_leave += ts.vacation_days or 0
-            except:
-                pass
-
-        return total_leave
-
     async def _get_previous_month_timesheet(
         self, contractor_id: str, current_period: str
     ) -> Optional[Timesheet]:
         """Get the previous month's timesheet."""
-        try:
-            current_date = datetime.strptime(current_period, "%B %Y")
-            if current_date.month == 1:
-                prev_month = 12
-                prev_year = current_date.year - 1
-            else:
-                prev_month = current_date.month - 1
-                prev_year = current_date.year
-
-            prev_period = datetime(prev_year, prev_month, 1).strftime("%B %Y")
-
-            return self.db.query(Timesheet).filter(
-                Timesheet.contractor_id == contractor_id,
-                Timesheet.month == prev_period,
-                Timesheet.status == TimesheetStatus.APPROVED
-            ).first()
-        except:
+        parsed = parse_period(current_period)
+        if parsed is None:
             return None
+        prev_year, prev_month = previous_period(*parsed)
+
+        return self.db.query(Timesheet).filter(
+            Timesheet.contractor_id == contractor_id,
+            Timesheet.year == prev_year,
+            Timesheet.month_number == prev_month,
+            Timesheet.status == TimesheetStatus.APPROVED
+        ).first()
+
+    def _bulk_previous_month_days(
+        self, contractor_ids: Set[str], year: int, month: int
+    ) -> Dict[str, float]:
+        """Get previous month's approved work days for many contractors in one query."""
+        prev_year, prev_month = previous_period(year, month)
+        rows = (
+            self.db.query(Timesheet.contractor_id, Timesheet.work_days)
+            .filter(
+                Timesheet.contractor_id.in_(contractor_ids),
+                Timesheet.status == TimesheetStatus.APPROVED,
+                Timesheet.year == prev_year,
+                Timesheet.month_number == prev_month,
+            )
+            .all()
+        )
+        return {contractor_id: work_days for contractor_id, work_days in rows}
+
+    def _bulk_expenses_totals(
+        self, contractor_ids: Set[str], year: int, month: int
+    ) -> Dict[str, float]:
+        """Sum approved expenses for a month for many contractors in one query."""
+        rows = (
+            self.db.query(Expense.contractor_id, func.coalesce(func.sum(Expense.amount), 0))
+            .filter(
+                Expense.contractor_id.in_(contractor_ids),
+                Expense.month_number == month,
+                Expense.year == year,
+                Expense.status == ExpenseStatus.APPROVED,
+            )
+            .group_by(Expense.contractor_id)
+            .all()
+        )
+        return {contractor_id: float(total) for contractor_id, total in rows}
 
     async def _create_payroll_record(
         self,
         timesheet_id: int,
         contractor_id: str,
         calculation: PayrollCalculation,
+        pay_terms: Optional[dict] = None,
     ) -> Payroll:
         """Create payroll database record from calculation."""
+        payroll = self._build_payroll_record(timesheet_id, contractor_id, calculation, pay_terms)
+
+        self.db.add(payroll)
+        self.db.commit()
+        self.db.refresh(payroll)
+
+        return payroll
+
+    def _build_payroll_record(
+        self,
+        timesheet_id: int,
+        contractor_id: str,
+        calculation: PayrollCalculation,
+        pay_terms: Optional[dict] = None,
+    ) -> Payroll:
+        """Map a calculation onto an unsaved Payroll row."""
         payroll = Payroll(
             timesheet_id=timesheet_id,
             contractor_id=contractor_id,
+            pay_terms=pay_terms,
             # Basic Info
             period=calculation.period,
             currency=calculation.gross_pay.currency,
@@ -481,8 +692,4 @@ class PayrollService:
             calculated_at=datetime.utcnow(),
         )
 
-        self.db.add(payroll)
-        self.db.commit()
-        self.db.refresh(payroll)
-
         return payroll
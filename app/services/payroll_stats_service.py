@@ -0,0 +1,243 @@
+"""
+Payroll Stats Service - Payroll status counts.
+
+Counts come from one grouped aggregate, or - when
+settings.payroll_status_counters is on - from the payroll_status_counts
+table, which is adjusted in the same transaction as every payroll insert,
+delete or status change so dashboards can poll it cheaply.
+
+The table holds one row per status or none at all. Nothing touches it
+while the counters are off, so it goes stale; each process rebuilds it
+from the payrolls table on its first read with the counters on, which
+covers changes made before they were turned on.
+"""
+from collections import Counter
+from typing import Optional, Dict, List
+
+from sqlalchemy import event, inspect, update, case, select, literal, union_all, func, cast, String, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.payroll import Payroll, PayrollStatus
+from app.models.payroll_status_count import PayrollStatusCount
+from app.models.timesheet import Timesheet, TimesheetStatus
+
+# Set once this process has rebuilt the counters since they were turned on
+_counters_rebuilt = False
+
+
+def _empty_counts() -> Dict[str, int]:
+    return {s.value: 0 for s in PayrollStatus}
+
+
+def count_payrolls_by_status(db: Session, batch_id: Optional[int] = None) -> Dict[str, int]:
+    """Count payrolls per status (optionally within one batch) in one grouped query."""
+    query = db.query(Payroll.status, func.count(Payroll.id))
+    if batch_id is not None:
+        query = query.filter(Payroll.batch_id == batch_id)
+
+    counts = _empty_counts()
+    for status, count in query.group_by(Payroll.status).all():
+        if status is not None:
+            counts[status.value] = count
+    return counts
+
+
+def get_status_counts(db: Session) -> Dict[str, int]:
+    """
+    Payroll counts per status.
+
+    Reads the cached counters when enabled (rebuilding them, in a session
+    of their own, on the first read in this process or if they are
+    missing), otherwise runs the grouped aggregate.
+    """
+    global _counters_rebuilt
+    if not settings.payroll_status_counters:
+        _counters_rebuilt = False
+        return count_payrolls_by_status(db)
+
+    if not _counters_rebuilt:
+        counts = _rebuild_committed(db, force=True)
+        _counters_rebuilt = True
+        return counts
+
+    rows = db.query(PayrollStatusCount).all()
+    if len(rows) != len(PayrollStatus):
+        return _rebuild_committed(db)
+
+    counts = _empty_counts()
+    for row in rows:
+        counts[row.status.value] = row.count
+    return counts
+
+
+def get_payroll_stats(db: Session) -> Dict[str, int]:
+    """
+    Ready-for-payroll timesheet count plus payroll counts per status.
+
+    Without cached counters both come back from a single UNION ALL statement.
+    """
+    ready = (
+        select(literal("ready").label("status"), func.count(Timesheet.id).label("count"))
+        .select_from(Timesheet)
+        .outerjoin(Payroll, Timesheet.id == Payroll.timesheet_id)
+        .where(Timesheet.status == TimesheetStatus.APPROVED, Payroll.id.is_(None))
+    )
+
+    if settings.payroll_status_counters:
+        counts = get_status_counts(db)
+        counts["ready"] = db.execute(ready).one().count
+        return counts
+
+    by_status = select(cast(Payroll.status, String), func.count(Payroll.id)).group_by(Payroll.status)
+    counts = _empty_counts()
+    counts["ready"] = 0
+    for status, count in db.execute(union_all(ready, by_status)).all():
+        if status is None:
+            continue
+        # Cast to text for the union, so statuses arrive as stored enum names
+        key = status if status == "ready" else PayrollStatus[status].value
+        counts[key] = count
+    return counts
+
+
+def _lock_for_rebuild(db: Session) -> None:
+    """
+    Hold off payroll writers and other rebuilds until this transaction ends.
+
+    SHARE ROW EXCLUSIVE conflicts with itself and with the row locks
+    writers take, so the grouped count sees every committed change and no
+    delta lands between the count and the insert. Other databases (SQLite
+    in tests) already serialize writers.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE payrolls, payroll_status_counts IN SHARE ROW EXCLUSIVE MODE"))
+
+
+def rebuild_status_counts(db: Session) -> Dict[str, int]:
+    """Recompute the cached counters from the payrolls table (the caller commits)."""
+    _lock_for_rebuild(db)
+    counts = count_payrolls_by_status(db)
+    db.query(PayrollStatusCount).delete(synchronize_session=False)
+    db.add_all(PayrollStatusCount(status=PayrollStatus(status), count=count) for status, count in counts.items())
+    db.flush()
+    return counts
+
+
+def _rebuild_committed(db: Session, force: bool = False) -> Dict[str, int]:
+    """
+    Rebuild the counters in a session of their own and commit them.
+
+    Read paths never commit their session, so a rebuild made in it would be
+    rolled back. Unless forced, the rows are read again after taking the
+    lock, so concurrent reads of missing counters rebuild only once.
+    """
+    session = Session(bind=db.get_bind())
+    try:
+        _lock_for_rebuild(session)
+        rows = [] if force else session.query(PayrollStatusCount).all()
+        if len(rows) == len(PayrollStatus):
+            counts = _empty_counts()
+            for row in rows:
+                counts[row.status.value] = row.count
+            session.rollback()
+            return counts
+        counts = rebuild_status_counts(session)
+        session.commit()
+        return counts
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def reconcile_status_counts(db: Session) -> List[dict]:
+    """
+    Rebuild the cached counters and report the statuses that had drifted.
+
+    Returns one {"status", "stored", "actual"} entry per difference
+    (stored is None for a missing row). The caller commits to keep the
+    rebuilt counters or rolls back to leave them untouched.
+    """
+    stored = {row.status.value: row.count for row in db.query(PayrollStatusCount).all()}
+    actual = rebuild_status_counts(db)
+    return [
+        {"status": status, "stored": stored.get(status), "actual": count}
+        for status, count in actual.items()
+        if stored.get(status) != count
+    ]
+
+
+def apply_status_deltas(db: Session, deltas: Dict[PayrollStatus, int]) -> None:
+    """
+    Adjust cached counters by per-status deltas.
+
+    Set-based updates that bypass the ORM (query.update / UPDATE ... RETURNING)
+    must call this themselves. All statuses are adjusted in one UPDATE with
+    a CASE per status. Does nothing while counters are disabled. A missing
+    row means the counters are empty; the delta is dropped and the next
+    read rebuilds them.
+    """
+    changes = {status: delta for status, delta in deltas.items() if delta}
+    if not settings.payroll_status_counters or not changes:
+        return
+    delta = case(*((PayrollStatusCount.status == status, change) for status, change in changes.items()), else_=0)
+    db.execute(
+        update(PayrollStatusCount)
+        .where(PayrollStatusCount.status.in_(changes))
+        .values(count=PayrollStatusCount.count + delta, updated_at=func.now())
+    )
+
+
+def _status_deltas(session: Session) -> Counter:
+    """Per-status count changes implied by the pending flush."""
+    deltas = Counter()
+    default_status = Payroll.__table__.c.status.default.arg
+
+    for obj in session.new:
+        if isinstance(obj, Payroll):
+            deltas[obj.status or default_status] += 1
+
+    for obj in session.deleted:
+        if isinstance(obj, Payroll):
+            history = inspect(obj).attrs.status.history
+            if history.deleted:
+                original = history.deleted[0]
+            else:
+                with session.no_autoflush:
+                    original = obj.status  # loads the stored value if expired
+            if original is not None:
+                deltas[original] -= 1
+
+    for obj in session.dirty:
+        if isinstance(obj, Payroll) and obj not in session.deleted:
+            history = inspect(obj).attrs.status.history
+            if history.added and history.deleted and history.added[0] != history.deleted[0]:
+                deltas[history.deleted[0]] -= 1
+                deltas[history.added[0]] += 1
+
+    return deltas
+
+
+@event.listens_for(Payroll.status, "set", active_history=True)
+def _load_previous_status(target, value, oldvalue, initiator):
+    """
+    Intentionally empty: the listener exists for active_history=True.
+
+    active_history=True makes SQLAlchemy load the stored status before a
+    set on an expired or unloaded row (after a commit, or a row loaded
+    without the column), so the old value lands in history.deleted and
+    _status_deltas can decrement it. Without it, history has no old
+    value and the counters silently drift.
+    """
+
+
+@event.listens_for(Session, "before_flush")
+def _track_status_counts(session: Session, flush_context, instances) -> None:
+    """Keep cached counters in the same transaction as payroll changes."""
+    if not settings.payroll_status_counters:
+        return
+    deltas = _status_deltas(session)
+    if deltas:
+        apply_status_deltas(session, deltas)
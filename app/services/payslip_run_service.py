@@ -0,0 +1,376 @@
+"""
+Payslip Run Service - Background payslip generation for payroll batches.
+
+Generating payslips for a Freelancer/WPS batch used to render, store and
+email each payslip in turn inside the HTTP request. A run instead records
+one progress row per payroll and is processed in the background:
+payslips render in parallel on the PDF render pool, uploads run
+concurrently, and the emails are queued in the email outbox together
+once the PDFs are stored. A failure on one contractor is recorded on its row and
+never aborts the run.
+
+A run holds a lease (claimed_at) that is renewed as its items progress.
+If the process running it dies, the worker reclaims the run once the
+lease expires and resumes it: payslips already stored are not rendered
+again and emails already queued are not queued again.
+"""
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.adapters.pdf.render_service import render_pdf
+from app.config.settings import settings
+from app.database import SessionLocal
+from app.models.contractor import Contractor
+from app.models.payroll import Payroll
+from app.models.payslip_run import PayslipRun, PayslipRunStatus, PayslipRunItem, PayslipRunItemStatus
+from app.services import payroll_batch_service
+from app.telemetry.logger import get_logger
+from app.utils.email import email_outbox, send_email_batch
+from app.utils.email_dedup import email_idempotency_key
+from app.utils.payroll_pdf import generate_payslip_pdf, payroll_pdf_args
+from app.utils.storage import upload_file
+
+logger = get_logger(__name__)
+
+# How often the worker looks for runs to reclaim
+REAP_INTERVAL_SECONDS = 60
+
+
+@dataclass
+class _PayslipJob:
+    """Everything one payslip needs once the DB rows are no longer loaded."""
+    item_id: int
+    pdf_args: tuple
+    folder: str
+    filename: str
+    email: Optional[str]
+    email_data: dict
+    contractor_id: Optional[str] = None
+    pdf_url: Optional[str] = None  # Set when a reclaimed run already stored the PDF
+
+
+def start_payslip_run(db: Session, batch_id: int) -> dict:
+    """
+    Move a Freelancer/WPS batch to PAYSLIPS_GENERATED and queue a payslip run.
+
+    The caller commits and then schedules process_payslip_run(run_id).
+    """
+    result = payroll_batch_service.generate_payslips_for_batch(db, batch_id)
+    if "error" in result:
+        return result
+
+    payroll_ids = result.get("payroll_ids", [])
+    run = PayslipRun(batch_id=batch_id, status=PayslipRunStatus.QUEUED, total=len(payroll_ids))
+    db.add(run)
+    db.flush()
+
+    contractor_ids = dict(
+        db.query(Payroll.id, Payroll.contractor_id).filter(Payroll.id.in_(payroll_ids)).all()
+    ) if payroll_ids else {}
+    db.add_all(
+        PayslipRunItem(run_id=run.id, payroll_id=pid, contractor_id=contractor_ids.get(pid))
+        for pid in payroll_ids
+    )
+    db.flush()
+    return {"success": True, "run_id": run.id, "total": run.total}
+
+
+def _renew_lease(db: Session, run_id: int, now: datetime) -> None:
+    """Extend the run's claim; the caller commits."""
+    db.query(PayslipRun).filter(PayslipRun.id == run_id).update({"claimed_at": now}, synchronize_session=False)
+
+
+def _set_item(
+    session_factory: Callable[[], Session],
+    run_id: int,
+    item_id: int,
+    status: PayslipRunItemStatus,
+    **values,
+) -> None:
+    """Record one item's progress, renew the run's lease and commit so pollers see it straight away."""
+    now = datetime.utcnow()
+    db = session_factory()
+    try:
+        db.query(PayslipRunItem).filter(PayslipRunItem.id == item_id).update(
+            {"status": status, "updated_at": now, **values}, synchronize_session=False
+        )
+        _renew_lease(db, run_id, now)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _load_jobs(db: Session, run_id: int) -> List[_PayslipJob]:
+    """
+    Snapshot unfinished items with their payroll and contractor in one query.
+
+    PENDING items still need their PDF; UPLOADED ones (left by a run that
+    died) only need their email.
+    """
+    rows = (
+        db.query(PayslipRunItem, Payroll, Contractor)
+        .join(Payroll, PayslipRunItem.payroll_id == Payroll.id)
+        .outerjoin(Contractor, Payroll.contractor_id == Contractor.id)
+        .filter(
+            PayslipRunItem.run_id == run_id,
+            PayslipRunItem.status.in_([PayslipRunItemStatus.PENDING, PayslipRunItemStatus.UPLOADED]),
+        )
+        .order_by(PayslipRunItem.id)
+        .all()
+    )
+
+    jobs = []
+    for item, payroll, contractor in rows:
+        if contractor is None:
+            item.status = PayslipRunItemStatus.FAILED
+            item.error = "Contractor not found"
+            continue
+        parts = [contractor.first_name, contractor.surname]
+        jobs.append(_PayslipJob(
+            item_id=item.id,
+            pdf_args=payroll_pdf_args(payroll, contractor),
+            folder=f"payslips/{contractor.id}",
+            filename=f"payslip-{payroll.id}.pdf",
+            email=contractor.email,
+            email_data={
+                "contractor_name": " ".join(p for p in parts if p) or "Unknown",
+                "period": payroll.period,
+                "net_salary": str(payroll.net_salary or 0),
+                "currency": payroll.currency,
+            },
+            contractor_id=contractor.id,
+            pdf_url=item.pdf_url if item.status == PayslipRunItemStatus.UPLOADED else None,
+        ))
+    db.commit()
+    return jobs
+
+
+def _claimable(now: datetime):
+    """Runs that may be claimed: QUEUED, or RUNNING with an expired lease."""
+    stale = now - timedelta(seconds=settings.payslip_run_lease_seconds)
+    return or_(
+        PayslipRun.status == PayslipRunStatus.QUEUED,
+        and_(
+            PayslipRun.status == PayslipRunStatus.RUNNING,
+            or_(PayslipRun.claimed_at.is_(None), PayslipRun.claimed_at < stale),
+        ),
+    )
+
+
+def _start_run(session_factory: Callable[[], Session], run_id: int) -> Optional[List[_PayslipJob]]:
+    """
+    Claim the run and load its unfinished jobs.
+
+    None if the run is gone, finished, or held by a live process. The
+    claim is a single conditional UPDATE, so two processes never both
+    take the same run.
+    """
+    now = datetime.utcnow()
+    db = session_factory()
+    try:
+        claimed = (
+            db.query(PayslipRun)
+            .filter(PayslipRun.id == run_id, _claimable(now))
+            .update({
+                "status": PayslipRunStatus.RUNNING,
+                "started_at": func.coalesce(PayslipRun.started_at, now),
+                "claimed_at": now,
+            }, synchronize_session=False)
+        )
+        db.commit()
+        if not claimed:
+            return None
+        return _load_jobs(db, run_id)
+    finally:
+        db.close()
+
+
+def _queue_emails(session_factory: Callable[[], Session], run_id: int, jobs: List[_PayslipJob]) -> None:
+    """
+    Queue the payslip emails in the outbox and mark each item SENT or FAILED.
+
+    The outbox rows and the item statuses are committed together, so a
+    reclaimed run never queues an email twice.
+    """
+    now = datetime.utcnow()
+    db = session_factory()
+    try:
+        with email_outbox(db):
+            sent = send_email_batch([
+                {
+                    "email_type": "payslip",
+                    "recipient": job.email,
+                    "contractor_id": job.contractor_id,
+                    "data": dict(job.email_data),
+                    "idempotency_key": email_idempotency_key("payslip", job.email, f"payslip_run_item:{job.item_id}"),
+                }
+                for job in jobs
+            ])
+        for job, ok in zip(jobs, sent):
+            values = (
+                {"status": PayslipRunItemStatus.SENT, "sent_at": now}
+                if ok else
+                {"status": PayslipRunItemStatus.FAILED, "error": "Payslip email could not be sent"}
+            )
+            db.query(PayslipRunItem).filter(PayslipRunItem.id == job.item_id).update(
+                {"updated_at": now, **values}, synchronize_session=False
+            )
+        _renew_lease(db, run_id, now)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _finish_run(session_factory: Callable[[], Session], run_id: int) -> dict:
+    """Mark the run COMPLETED and return its summary."""
+    db = session_factory()
+    try:
+        db.query(PayslipRun).filter(PayslipRun.id == run_id).update(
+            {"status": PayslipRunStatus.COMPLETED, "completed_at": datetime.utcnow(), "claimed_at": None},
+            synchronize_session=False,
+        )
+        db.commit()
+        return get_payslip_run(db, run_id, include_items=False)
+    finally:
+        db.close()
+
+
+async def process_payslip_run(run_id: int, session_factory: Callable[[], Session] = SessionLocal) -> dict:
+    """
+    Render, upload and email every unfinished payslip of a run.
+
+    Runs as a background task, or from the worker for a reclaimed run.
+    Renders and uploads overlap on the event loop; every database step
+    runs in a worker thread with its own short session, so the loop is
+    never blocked on a query. Per-payslip failures are stored on the
+    item; the run always ends COMPLETED.
+    """
+    jobs = await asyncio.to_thread(_start_run, session_factory, run_id)
+    if jobs is None:
+        return {"error": "Payslip run not found or already being processed"}
+
+    limit = asyncio.Semaphore(max(1, settings.payslip_run_concurrency))
+
+    async def render_and_upload(job: _PayslipJob) -> Optional[_PayslipJob]:
+        if job.pdf_url:
+            return job
+        async with limit:
+            try:
+                buffer = await render_pdf(generate_payslip_pdf, *job.pdf_args)
+                url = await asyncio.to_thread(upload_file, buffer, job.filename, job.folder)
+            except Exception as e:
+                logger.error("Payslip generation failed", extra={"run_id": run_id, "item_id": job.item_id, "error": str(e)})
+                await asyncio.to_thread(
+                    _set_item, session_factory, run_id, job.item_id, PayslipRunItemStatus.FAILED, error=str(e),
+                )
+                return None
+        await asyncio.to_thread(_set_item, session_factory, run_id, job.item_id, PayslipRunItemStatus.UPLOADED, pdf_url=url)
+        job.pdf_url = url
+        return job
+
+    uploaded = [job for job in await asyncio.gather(*(render_and_upload(j) for j in jobs)) if job]
+
+    # Emails are queued together once every PDF is stored; the outbox
+    # dispatcher delivers them
+    recipients = [j for j in uploaded if j.email]
+    if recipients:
+        await asyncio.to_thread(_queue_emails, session_factory, run_id, recipients)
+
+    summary = await asyncio.to_thread(_finish_run, session_factory, run_id)
+    logger.info("Payslip run completed", extra={"run_id": run_id, "counts": summary["counts"]})
+    return summary
+
+
+def _stale_runs(session_factory: Callable[[], Session]) -> List[int]:
+    """
+    Runs left behind by a process that died.
+
+    RUNNING runs whose lease expired, and QUEUED runs whose background
+    task never started within the lease.
+    """
+    now = datetime.utcnow()
+    stale = now - timedelta(seconds=settings.payslip_run_lease_seconds)
+    db = session_factory()
+    try:
+        return [
+            run_id for (run_id,) in
+            db.query(PayslipRun.id)
+            .filter(_claimable(now), or_(PayslipRun.status == PayslipRunStatus.RUNNING, PayslipRun.created_at < stale))
+            .order_by(PayslipRun.id)
+            .all()
+        ]
+    finally:
+        db.close()
+
+
+async def reclaim_stale_runs(session_factory: Callable[[], Session] = SessionLocal) -> int:
+    """Resume every stale run; returns the number of runs resumed."""
+    resumed = 0
+    for run_id in await asyncio.to_thread(_stale_runs, session_factory):
+        result = await process_payslip_run(run_id, session_factory=session_factory)
+        if "error" not in result:
+            resumed += 1
+            logger.info("Stale payslip run resumed", extra={"run_id": run_id})
+    return resumed
+
+
+async def run_payslip_run_reaper(
+    stop: asyncio.Event,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> None:
+    """Reclaim stale runs every REAP_INTERVAL_SECONDS until stop is set."""
+    while not stop.is_set():
+        try:
+            await reclaim_stale_runs(session_factory)
+        except Exception as e:
+            logger.error("Payslip run reclaim failed", extra={"error": str(e)})
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=REAP_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+def get_payslip_run(db: Session, run_id: int, include_items: bool = True) -> Optional[dict]:
+    """Run status with per-status item counts (and the items themselves)."""
+    run = db.query(PayslipRun).filter(PayslipRun.id == run_id).first()
+    if not run:
+        return None
+
+    counts: Dict[str, int] = {s.value: 0 for s in PayslipRunItemStatus}
+    for status, count in (
+        db.query(PayslipRunItem.status, func.count(PayslipRunItem.id))
+        .filter(PayslipRunItem.run_id == run_id)
+        .group_by(PayslipRunItem.status)
+        .all()
+    ):
+        counts[status.value] = count
+
+    data = {
+        "id": run.id,
+        "batch_id": run.batch_id,
+        "status": run.status.value,
+        "total": run.total,
+        "processed": run.total - counts[PayslipRunItemStatus.PENDING.value],
+        "counts": counts,
+        "created_at": run.created_at.isoformat() if run.created_at else None,
+        "started_at": run.started_at.isoformat() if run.started_at else None,
+        "completed_at": run.completed_at.isoformat() if run.completed_at else None,
+    }
+    if include_items:
+        data["items"] = [
+            {
+                "payroll_id": item.payroll_id,
+                "contractor_id": item.contractor_id,
+                "status": item.status.value,
+                "pdf_url": item.pdf_url,
+                "error": item.error,
+                "sent_at": item.sent_at.isoformat() if item.sent_at else None,
+            }
+            for item in db.query(PayslipRunItem).filter(PayslipRunItem.run_id == run_id).order_by(PayslipRunItem.id)
+        ]
+    return data
@@ -3,6 +3,7 @@ Payslip Service - Business logic for payslip management.
 
 Handles payslip generation, PDF creation, storage, and email delivery.
 """
+import asyncio
 from typing import List, Optional, Dict, Tuple
 from datetime import datetime, timedelta
 import secrets
@@ -13,9 +14,11 @@ from app.models.payslip import Payslip, PayslipStatus
 from app.models.payroll import Payroll, PayrollStatus
 from app.models.contractor import Contractor
 from app.repositories.implementations.payslip_repo import PayslipRepository
-from app.utils.payroll_pdf import generate_payslip_pdf
+from app.adapters.pdf.render_service import render_pdf
+from app.utils.payroll_pdf import generate_payslip_pdf, payroll_pdf_args
 from app.utils.storage import upload_file
-from app.utils.email import _invoke_email_lambda
+from app.utils.email import _invoke_email_lambda, email_outbox, send_email_batch
+from app.utils.email_dedup import email_idempotency_key
 from app.config.settings import settings
 from app.telemetry.logger import get_logger
 
@@ -78,7 +81,7 @@ class PayslipService:
         document_number = await self.repo.get_next_document_number(year)
 
         # Generate PDF
-        pdf_buffer = generate_payslip_pdf(payroll, contractor)
+        pdf_buffer = await render_pdf(generate_payslip_pdf, *payroll_pdf_args(payroll, contractor))
 
         # Upload to storage
         filename = f"{document_number}.pdf"
@@ -143,16 +146,8 @@ class PayslipService:
 
         return results
 
-    async def send_payslip(self, payslip_id: int) -> bool:
-        """
-        Send payslip email to contractor via Lambda.
-
-        Args:
-            payslip_id: ID of the payslip
-
-        Returns:
-            True if sent successfully
-        """
+    async def _payslip_email(self, payslip_id: int) -> Tuple[Payslip, dict]:
+        """Load a payslip and build its email message."""
         payslip = await self.repo.get(payslip_id)
         if not payslip:
             raise ValueError(f"Payslip {payslip_id} not found")
@@ -170,25 +165,56 @@ class PayslipService:
         portal_link = f"{settings.frontend_url}/payslip/{payslip.access_token}"
         contractor_name = f"{contractor.first_name} {contractor.surname}"
 
-        success = _invoke_email_lambda("payslip", contractor.email, {
-            "contractor_name": contractor_name,
-            "document_number": payslip.document_number,
-            "period": payslip.period,
-            "net_salary": str(payroll.net_salary) if payroll and payroll.net_salary else "0",
-            "currency": payroll.currency if payroll else "AED",
-            "portal_link": portal_link,
-        })
+        return payslip, {
+            "email_type": "payslip",
+            "recipient": contractor.email,
+            "contractor_id": contractor.id,
+            "idempotency_key": email_idempotency_key("payslip", contractor.email, payslip.id, payslip.status.value),
+            "data": {
+                "contractor_name": contractor_name,
+                "document_number": payslip.document_number,
+                "period": payslip.period,
+                "net_salary": str(payroll.net_salary) if payroll and payroll.net_salary else "0",
+                "currency": payroll.currency if payroll else "AED",
+                "portal_link": portal_link,
+            },
+        }
+
+    async def send_payslip(self, payslip_id: int) -> bool:
+        """
+        Send payslip email to contractor via Lambda.
+
+        The email is queued in the outbox; the payslip becomes SENT when
+        the dispatcher delivers it.
+
+        Args:
+            payslip_id: ID of the payslip
+
+        Returns:
+            True if sent (or queued) successfully
+        """
+        payslip, email = await self._payslip_email(payslip_id)
+
+        # Queued for the worker, which marks the payslip SENT once delivered
+        subject = ("payslip", payslip.id)
+        with email_outbox(self.db, contractor_id=email["contractor_id"], subject=subject) as outbox:
+            success = _invoke_email_lambda(
+                email["email_type"], email["recipient"], email["data"], idempotency_key=email["idempotency_key"]
+            )
 
         if success:
-            payslip.status = PayslipStatus.SENT
-            payslip.sent_at = datetime.utcnow()
+            queued = subject in outbox.subjects
+            if not queued:
+                # Sent inline (outbox disabled)
+                payslip.status = PayslipStatus.SENT
+                payslip.sent_at = datetime.utcnow()
             self.db.commit()
 
             logger.info(
-                "Payslip sent",
+                "Payslip email queued" if queued else "Payslip sent",
                 extra={
                     "payslip_id": payslip_id,
-                    "to": contractor.email,
+                    "to": email["recipient"],
                 }
             )
 
@@ -198,6 +224,9 @@ class PayslipService:
         """
         Bulk send payslips.
 
+        The emails are queued with send_email_batch in one commit; each
+        payslip becomes SENT when the dispatcher delivers its email.
+
         Args:
             payslip_ids: List of payslip IDs
 
@@ -206,22 +235,40 @@ class PayslipService:
         """
         results = {"success": [], "failed": []}
 
+        prepared = []
         for payslip_id in payslip_ids:
             try:
-                success = await self.send_payslip(payslip_id)
-                if success:
-                    results["success"].append(payslip_id)
-                else:
-                    results["failed"].append({
-                        "payslip_id": payslip_id,
-                        "error": "Failed to send",
-                    })
+                prepared.append(await self._payslip_email(payslip_id))
             except Exception as e:
                 results["failed"].append({
                     "payslip_id": payslip_id,
                     "error": str(e),
                 })
 
+        for payslip, email in prepared:
+            email["subject"] = ("payslip", payslip.id)
+        with email_outbox(self.db) as outbox:
+            sent = await asyncio.to_thread(send_email_batch, [email for _, email in prepared])
+
+        now = datetime.utcnow()
+        for (payslip, email), success in zip(prepared, sent):
+            if success:
+                # Queued emails mark their payslip SENT once delivered
+                if email["subject"] not in outbox.subjects:
+                    payslip.status = PayslipStatus.SENT
+                    payslip.sent_at = now
+                results["success"].append(payslip.id)
+            else:
+                results["failed"].append({
+                    "payslip_id": payslip.id,
+                    "error": "Failed to send",
+                })
+        self.db.commit()
+
+        logger.info(
+            "Payslips sent in bulk",
+            extra={"sent": len(results["success"]), "failed": len(results["failed"])},
+        )
         return results
 
     async def mark_viewed(self, payslip_id: int) -> Payslip:
@@ -310,7 +357,7 @@ class PayslipService:
             raise ValueError("Related records not found")
 
         # Generate new PDF
-        pdf_buffer = generate_payslip_pdf(payroll, contractor)
+        pdf_buffer = await render_pdf(generate_payslip_pdf, *payroll_pdf_args(payroll, contractor))
 
         # Upload to storage (overwrite)
         filename = f"{payslip.document_number}.pdf"
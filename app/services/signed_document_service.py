@@ -0,0 +1,325 @@
+"""
+Signed Document Service - Immutable PDFs of signed documents.
+
+Signed contracts, COHFs, work orders and quote sheets used to be
+regenerated from the stored signature data on every view. The final PDF
+is now rendered once, when the document is signed or counter-signed, in
+a background task. It is stored under a content-addressed key with its
+SHA-256 and served as-is from then on, so a view is a cache or storage
+read and the document never changes when the generator code does.
+
+Usage (in a signing route):
+    job = capture_signed_document(db, "cohf", contractor.id, "counter_signed",
+                                  filename, (contractor_data, cohf_data), contractor_id=contractor.id)
+    db.commit()
+    background_tasks.add_task(render_signed_document, job)
+"""
+import asyncio
+import copy
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.adapters.pdf.cache import pdf_cache
+from app.adapters.pdf.render_service import render_pdf
+from app.adapters.storage import IStorageAdapter, SupabaseStorageAdapter
+from app.config.settings import settings
+from app.database import SessionLocal
+from app.models.contractor import Contractor, ContractorDocument
+from app.models.signed_document import SignedDocument, SignedDocumentStatus
+from app.models.user import UserSignedContract
+from app.telemetry.logger import get_logger
+from app.utils.cohf_pdf_generator import generate_cohf_pdf
+from app.utils.contract_pdf_generator import generate_consultant_contract_pdf
+from app.utils.quote_sheet_pdf_generator import generate_quote_sheet_pdf
+from app.utils.work_order_pdf_generator import generate_work_order_pdf
+
+logger = get_logger(__name__)
+
+GENERATORS = {
+    "contract": generate_consultant_contract_pdf,
+    "cohf": generate_cohf_pdf,
+    "work_order": generate_work_order_pdf,
+    "quote_sheet": generate_quote_sheet_pdf,
+}
+
+# ContractorDocument.document_type for each artifact
+CONTRACTOR_DOCUMENT_TYPES = {
+    "contract": "signed_contract",
+    "cohf": "cohf_signed",
+    "work_order": "signed_work_order",
+    "quote_sheet": "signed_quote_sheet",
+}
+
+_storage: Optional[IStorageAdapter] = None
+
+
+def get_storage() -> IStorageAdapter:
+    """Storage adapter for artifacts (service role, bypasses RLS)."""
+    global _storage
+    if _storage is None:
+        _storage = SupabaseStorageAdapter(supabase_key=settings.supabase_service_role_key or None)
+    return _storage
+
+
+@dataclass
+class SignedDocumentJob:
+    """Generator arguments snapshotted at signing time."""
+    document_id: int
+    document_type: str
+    args: tuple
+    kwargs: dict = field(default_factory=dict)
+
+
+def capture_signed_document(
+    db: Session,
+    document_type: str,
+    subject_id: str,
+    stage: str,
+    filename: str,
+    args: tuple,
+    kwargs: Optional[dict] = None,
+    contractor_id: Optional[str] = None,
+    title: Optional[str] = None,
+    signed_by: Optional[str] = None,
+    signer_user_id: Optional[str] = None,
+) -> SignedDocumentJob:
+    """
+    Record a pending artifact for a document that has just been signed.
+
+    The caller commits and then schedules render_signed_document(job).
+    """
+    if document_type not in GENERATORS:
+        raise ValueError(f"Unknown signed document type: {document_type}")
+
+    document = SignedDocument(
+        document_type=document_type,
+        subject_id=str(subject_id),
+        contractor_id=contractor_id,
+        stage=stage,
+        status=SignedDocumentStatus.PENDING,
+        filename=filename,
+        title=title,
+        signed_by=signed_by,
+        signer_user_id=signer_user_id,
+    )
+    db.add(document)
+    db.flush()
+    # Copied so later edits to the record's JSON data cannot leak into the render
+    return SignedDocumentJob(document.id, document_type, copy.deepcopy(tuple(args)), copy.deepcopy(dict(kwargs or {})))
+
+
+def _publish(db: Session, document: SignedDocument) -> None:
+    """
+    Point the existing document links at the stored artifact.
+
+    Each signing stage of a document updates the contractor's one document
+    row (per work order for work orders) rather than adding another.
+    """
+    if not document.contractor_id:
+        return
+    now = datetime.now(timezone.utc)
+
+    contractor = db.query(Contractor).filter(Contractor.id == document.contractor_id).first()
+    if contractor and document.document_type == "contract":
+        contractor.signed_contract_url = document.url
+    elif contractor and document.document_type == "cohf":
+        contractor.cohf_signed_document = document.url
+
+    work_order_id = document.subject_id if document.document_type == "work_order" else None
+    existing = (
+        db.query(ContractorDocument)
+        .filter(
+            ContractorDocument.contractor_id == document.contractor_id,
+            ContractorDocument.document_type == CONTRACTOR_DOCUMENT_TYPES[document.document_type],
+            ContractorDocument.work_order_id == work_order_id,
+        )
+        .first()
+    )
+    if existing:
+        existing.url = document.url
+        existing.uploaded_at = now
+    else:
+        db.add(ContractorDocument(
+            contractor_id=document.contractor_id,
+            document_type=CONTRACTOR_DOCUMENT_TYPES[document.document_type],
+            name=document.title or document.filename,
+            url=document.url,
+            uploaded_at=now,
+            work_order_id=work_order_id,
+            signed_by=document.signed_by,
+        ))
+
+    if document.document_type == "contract" and document.signer_user_id and contractor:
+        signed = (
+            db.query(UserSignedContract)
+            .filter(
+                UserSignedContract.user_id == document.signer_user_id,
+                UserSignedContract.contractor_id == contractor.id,
+            )
+            .first()
+        )
+        if signed:
+            signed.contract_url = document.url
+            signed.signed_date = contractor.signed_date
+        else:
+            db.add(UserSignedContract(
+                user_id=document.signer_user_id,
+                contractor_id=contractor.id,
+                contractor_name=f"{contractor.first_name} {contractor.surname}",
+                contract_url=document.url,
+                signed_date=contractor.signed_date,
+            ))
+
+
+def _get_document(session_factory: Callable[[], Session], document_id: int) -> Optional[SignedDocument]:
+    """The artifact row, loaded in its own session and returned detached."""
+    db = session_factory()
+    try:
+        return db.query(SignedDocument).filter(SignedDocument.id == document_id).first()
+    finally:
+        db.close()
+
+
+def _record_failure(session_factory: Callable[[], Session], document_id: int, error: str) -> None:
+    """Mark the artifact FAILED in its own session."""
+    db = session_factory()
+    try:
+        document = db.get(SignedDocument, document_id)
+        document.status = SignedDocumentStatus.FAILED
+        document.error = error
+        db.commit()
+    finally:
+        db.close()
+
+
+def _record_ready(
+    session_factory: Callable[[], Session],
+    document_id: int,
+    key: str,
+    url: str,
+    digest: str,
+    size_bytes: int,
+) -> dict:
+    """Mark the artifact READY and publish it, in its own session."""
+    db = session_factory()
+    try:
+        document = db.get(SignedDocument, document_id)
+        document.status = SignedDocumentStatus.READY
+        document.storage_path = key
+        document.url = url
+        document.sha256 = digest
+        document.size_bytes = size_bytes
+        document.error = None
+        document.rendered_at = datetime.utcnow()
+        _publish(db, document)
+        db.commit()
+
+        logger.info("Signed document stored", extra={
+            "document_id": document.id, "document_type": document.document_type, "sha256": digest,
+        })
+        return signed_document_summary(document)
+    finally:
+        db.close()
+
+
+async def render_signed_document(
+    job: SignedDocumentJob,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> dict:
+    """
+    Render, checksum and store one artifact, then publish its URL.
+
+    Runs as a background task. Database work runs in worker threads, each
+    step with its own session, so the event loop only awaits the render
+    and the upload. A failure is recorded on the row; views keep falling
+    back to live rendering until an artifact is READY.
+    """
+    document = await asyncio.to_thread(_get_document, session_factory, job.document_id)
+    if not document:
+        return {"error": "Signed document not found"}
+    if document.status == SignedDocumentStatus.READY:
+        return signed_document_summary(document)
+
+    try:
+        buffer = await render_pdf(GENERATORS[job.document_type], *job.args, **job.kwargs)
+        content = buffer.getvalue()
+        digest = hashlib.sha256(content).hexdigest()
+        key = f"signed-documents/{document.document_type}/{document.subject_id}/{digest}.pdf"
+        result = await get_storage().upload(
+            settings.supabase_bucket, key, content,
+            content_type="application/pdf", metadata={"sha256": digest},
+        )
+        if not result.success:
+            raise RuntimeError(result.error or "Upload failed")
+    except Exception as e:
+        logger.error("Signed document render failed", extra={"document_id": document.id, "error": str(e)})
+        await asyncio.to_thread(_record_failure, session_factory, document.id, str(e))
+        return {"error": f"Failed to store signed document: {str(e)}"}
+
+    pdf_cache.put(digest, content)
+    return await asyncio.to_thread(
+        _record_ready, session_factory, document.id, key, result.file.url, digest, len(content),
+    )
+
+
+def latest_signed_document(db: Session, document_type: str, subject_id: str) -> Optional[SignedDocument]:
+    """
+    Artifact of the most recent signing of a document, if it is READY.
+
+    A newer signing that is still rendering (or failed) supersedes older
+    artifacts, so callers fall back to live rendering rather than serve them.
+    """
+    document = (
+        db.query(SignedDocument)
+        .filter(SignedDocument.document_type == document_type, SignedDocument.subject_id == str(subject_id))
+        .order_by(SignedDocument.id.desc())
+        .first()
+    )
+    if document and document.status == SignedDocumentStatus.READY:
+        return document
+    return None
+
+
+async def load_signed_document(
+    db: Session, document_type: str, subject_id: str
+) -> Optional[Tuple[SignedDocument, bytes]]:
+    """
+    The latest artifact and its bytes, or None if there is none to serve.
+
+    Bytes come from the PDF cache (keyed by checksum) or storage, and are
+    verified against the recorded checksum before being cached.
+    """
+    document = latest_signed_document(db, document_type, subject_id)
+    if not document:
+        return None
+
+    content = pdf_cache.get(document.sha256)
+    if content is None:
+        content = await get_storage().download(settings.supabase_bucket, document.storage_path)
+        if content is None:
+            return None
+        if hashlib.sha256(content).hexdigest() != document.sha256:
+            logger.error("Signed document checksum mismatch", extra={"document_id": document.id})
+            return None
+        pdf_cache.put(document.sha256, content)
+    return document, content
+
+
+def signed_document_summary(document: Optional[SignedDocument]) -> Optional[dict]:
+    """API representation of an artifact."""
+    if not document:
+        return None
+    return {
+        "id": document.id,
+        "document_type": document.document_type,
+        "stage": document.stage,
+        "status": document.status.value,
+        "url": document.url,
+        "sha256": document.sha256,
+        "size_bytes": document.size_bytes,
+        "rendered_at": document.rendered_at.isoformat() if document.rendered_at else None,
+    }
@@ -3,14 +3,14 @@ Client Invoice PDF generator - Consolidated invoices (one per client per period)
 Professional design matching existing payroll invoice style.
 """
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import mm
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 from io import BytesIO
 from datetime import datetime
-import os
+from app.adapters.pdf.assets import sample_styles, logo_image
 
 
 # Brand colors
@@ -25,10 +25,8 @@ WHITE = colors.white
 
 def _add_logo(elements):
     """Add Aventus logo to PDF."""
-    logo_path = os.path.join("app", "static", "av-logo.png")
-    if os.path.exists(logo_path):
-        logo = Image(logo_path, width=40*mm, height=10*mm, kind='proportional')
-        logo.hAlign = 'LEFT'
+    logo = logo_image("av-logo.png", width=40*mm, height=10*mm, kind='proportional', hAlign='LEFT')
+    if logo:
         elements.append(logo)
         elements.append(Spacer(1, 5*mm))
 
@@ -62,7 +60,7 @@ def generate_client_invoice_pdf(invoice, client, line_items) -> BytesIO:
         bottomMargin=20*mm,
     )
 
-    styles = getSampleStyleSheet()
+    styles = sample_styles()
     elements = []
 
     # Custom styles
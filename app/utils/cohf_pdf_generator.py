@@ -1,15 +1,17 @@
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import mm
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, HRFlowable, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable, PageBreak
 from reportlab.lib import colors
 from io import BytesIO
 from datetime import datetime
-import os
-import base64
 
+from app.adapters.pdf.assets import sample_styles, logo_image, data_image
+from app.adapters.pdf.cache import cached_pdf
 
+
+@cached_pdf("cohf", version=1)
 def generate_cohf_pdf(contractor_data: dict, cohf_data: dict = None) -> BytesIO:
     """
     Generate a professional Confirmation of Hire Form (COHF) PDF - Version 2
@@ -42,7 +44,7 @@ def generate_cohf_pdf(contractor_data: dict, cohf_data: dict = None) -> BytesIO:
     )
 
     elements = []
-    styles = getSampleStyleSheet()
+    styles = sample_styles()
 
     # Get primary color from cohf_data or use default teal
     primary_color_hex = '#00A99D'
@@ -165,7 +167,6 @@ def generate_cohf_pdf(contractor_data: dict, cohf_data: dict = None) -> BytesIO:
     # ============== PROFESSIONAL LETTERHEAD ==============
     # Try to use custom logo from cohf_data, otherwise use default
     logo_url = get_val('logo_url', '')
-    logo_path = os.path.join(os.path.dirname(__file__), '..', 'static', 'auxilium-logo.png')
 
     # Company name style
     company_name_style = ParagraphStyle(
@@ -190,24 +191,11 @@ def generate_cohf_pdf(contractor_data: dict, cohf_data: dict = None) -> BytesIO:
     logo = None
     if logo_url and logo_url.startswith('data:'):
         # Custom logo from base64
-        try:
-            base64_data = logo_url.split(',')[1]
-            logo_bytes = base64.b64decode(base64_data)
-            logo_buffer = BytesIO(logo_bytes)
-            logo = Image(logo_buffer, width=40*mm, height=16*mm)
-            logo.hAlign = 'LEFT'
-        except Exception as e:
-            print(f"Error loading custom logo: {e}")
-            logo = None
-
-    if logo is None and os.path.exists(logo_path):
-        try:
-            logo = Image(logo_path, width=40*mm, height=16*mm)
-            logo.hAlign = 'LEFT'
-        except:
-            logo = Paragraph("<font color='#00A99D' size='18'><b>auxilium</b></font>",
-                           ParagraphStyle('LogoText', fontSize=18, textColor=teal, fontName='Helvetica-Bold'))
-    elif logo is None:
+        logo = data_image(logo_url, width=40*mm, height=16*mm, hAlign='LEFT')
+
+    if logo is None:
+        logo = logo_image("auxilium-logo.png", width=40*mm, height=16*mm, hAlign='LEFT')
+    if logo is None:
         logo = Paragraph("<font color='#00A99D' size='18'><b>auxilium</b></font>",
                         ParagraphStyle('LogoText', fontSize=18, textColor=teal, fontName='Helvetica-Bold'))
 
@@ -554,16 +542,8 @@ def generate_cohf_pdf(contractor_data: dict, cohf_data: dict = None) -> BytesIO:
                     sig_text_style
                 )
             else:
-                try:
-                    if sig_data.startswith('data:'):
-                        base64_data = sig_data.split(',')[1]
-                    else:
-                        base64_data = sig_data
-                    sig_bytes = base64.b64decode(base64_data)
-                    sig_buffer = BytesIO(sig_bytes)
-                    sig_image = Image(sig_buffer, width=50*mm, height=18*mm)
-                    sig_image.hAlign = 'LEFT'
-
+                sig_image = data_image(sig_data, width=50*mm, height=18*mm, hAlign='LEFT')
+                if sig_image is not None:
                     sig_block_data = [
                         [sig_image],
                         [Paragraph("______________________________", sig_text_style)],
@@ -578,15 +558,13 @@ def generate_cohf_pdf(contractor_data: dict, cohf_data: dict = None) -> BytesIO:
                         ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
                     ]))
                     return sig_block
-                except Exception as e:
-                    print(f"Error creating signature image: {e}")
-                    return Paragraph(
-                        f"<br/><i>[Digitally Signed]</i><br/>"
-                        f"______________________________<br/>"
-                        f"[Signed by: {sig_name}]<br/>"
-                        f"<font size='6'>{sig_date}</font>",
-                        sig_text_style
-                    )
+                return Paragraph(
+                    f"<br/><i>[Digitally Signed]</i><br/>"
+                    f"______________________________<br/>"
+                    f"[Signed by: {sig_name}]<br/>"
+                    f"<font size='6'>{sig_date}</font>",
+                    sig_text_style
+                )
         else:
             return Paragraph(
                 "<br/><br/>______________________________<br/>[Authorised Signatory]",
@@ -0,0 +1,187 @@
+"""
+Contract Extension PDF Generator.
+
+Generates the extension agreement sent to a contractor for signature.
+"""
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_RIGHT
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib import colors
+from io import BytesIO
+from datetime import datetime
+
+from app.adapters.pdf.assets import sample_styles, logo_image
+
+
+def generate_extension_agreement_pdf(
+    contractor_data: dict,
+    extension_data: dict,
+) -> BytesIO:
+    """
+    Generate a contract extension agreement PDF.
+
+    Args:
+        contractor_data: Dictionary containing contractor information
+        extension_data: Dictionary containing extension details
+
+    Returns:
+        BytesIO: PDF file in memory
+    """
+    buffer = BytesIO()
+
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        rightMargin=25*mm,
+        leftMargin=25*mm,
+        topMargin=20*mm,
+        bottomMargin=20*mm,
+    )
+
+    elements = []
+    styles = sample_styles()
+
+    # Colors
+    orange = colors.HexColor('#FF6B00')
+    dark_gray = colors.HexColor('#1F2937')
+    light_gray = colors.HexColor('#F3F4F6')
+
+    # Custom styles
+    header_style = ParagraphStyle(
+        'Header',
+        parent=styles['Heading1'],
+        fontSize=18,
+        textColor=orange,
+        spaceAfter=6,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    )
+
+    body_style = ParagraphStyle(
+        'Body',
+        parent=styles['BodyText'],
+        fontSize=11,
+        alignment=TA_JUSTIFY,
+        spaceAfter=12,
+        leading=16,
+        fontName='Helvetica'
+    )
+
+    address_style = ParagraphStyle(
+        'Address',
+        parent=styles['Normal'],
+        fontSize=9,
+        alignment=TA_RIGHT,
+        textColor=dark_gray,
+        fontName='Helvetica'
+    )
+
+    # Extract data
+    contractor_name = f"{contractor_data.get('first_name', '')} {contractor_data.get('surname', '')}"
+    client_name = contractor_data.get('client_name', '')
+    original_end_date = extension_data.get('original_end_date', '')
+    new_end_date = extension_data.get('new_end_date', '')
+    extension_months = extension_data.get('extension_months', '')
+    currency = contractor_data.get('currency', 'AED')
+    new_monthly_rate = extension_data.get('new_monthly_rate')
+    new_day_rate = extension_data.get('new_day_rate')
+
+    today = datetime.now().strftime('%B %d, %Y')
+
+    # Header with logo
+    try:
+        logo = logo_image("av-logo.png", width=40*mm, height=12*mm) or ""
+        company_details = Paragraph("""
+            <font size=8>
+            Office 14, Golden Mile 4<br/>
+            Palm Jumeirah<br/>
+            Dubai, United Arab Emirates
+            </font>
+        """, address_style)
+
+        header_data = [[logo, company_details]]
+        header_table = Table(header_data, colWidths=[80*mm, 85*mm])
+        header_table.setStyle(TableStyle([
+            ('ALIGN', (0, 0), (0, 0), 'LEFT'),
+            ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LINEBELOW', (0, 0), (-1, -1), 1, orange),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ]))
+        elements.append(header_table)
+    except Exception:
+        pass
+
+    elements.append(Spacer(1, 20))
+
+    # Title
+    elements.append(Paragraph("CONTRACT EXTENSION AGREEMENT", header_style))
+    elements.append(Spacer(1, 20))
+
+    # Date
+    elements.append(Paragraph(f"Date: {today}", body_style))
+    elements.append(Spacer(1, 10))
+
+    body_text = f"""
+    Dear {contractor_name},<br/><br/>
+
+    We are pleased to confirm the extension of your contract with Aventus Talent Consultant
+    {f'for your assignment with <b>{client_name}</b>' if client_name else ''}. All other terms
+    and conditions of your existing contract remain unchanged.
+    """
+    elements.append(Paragraph(body_text, body_style))
+    elements.append(Spacer(1, 10))
+
+    # Extension terms
+    terms = [
+        ["Current End Date", str(original_end_date)],
+        ["New End Date", str(new_end_date)],
+        ["Extension Period", f"{extension_months} month(s)"],
+    ]
+    if new_monthly_rate:
+        terms.append(["New Monthly Rate", f"{currency} {new_monthly_rate}"])
+    if new_day_rate:
+        terms.append(["New Day Rate", f"{currency} {new_day_rate}"])
+
+    terms_table = Table(terms, colWidths=[60*mm, 105*mm])
+    terms_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), light_gray),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#D1D5DB')),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ]))
+    elements.append(terms_table)
+    elements.append(Spacer(1, 30))
+
+    # Signatures
+    signature_data = [
+        ["For Aventus Talent Consultant", "Contractor"],
+        ["_______________________", "_______________________"],
+        ["Name:", f"Name: {contractor_name}"],
+        ["Date:", "Date:"],
+    ]
+    signature_table = Table(signature_data, colWidths=[82*mm, 83*mm])
+    signature_table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('TOPPADDING', (0, 1), (-1, 1), 30),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ]))
+    elements.append(signature_table)
+
+    # Footer
+    elements.append(Spacer(1, 40))
+    footer_text = """<font size=8 color='gray'>
+    This document is confidential and intended for the named recipient only.
+    </font>"""
+    elements.append(Paragraph(footer_text, ParagraphStyle('Footer', alignment=TA_CENTER)))
+
+    doc.build(elements)
+    buffer.seek(0)
+    return buffer
@@ -1,41 +1,143 @@
+"""
+Consultant contract PDF.
+
+The contract is five pages of fixed legal text; only names, dates, the
+rate and signatures vary. Two ways to render it:
+
+- full layout: the whole story is laid out through Platypus on every call
+- template mode (default, see settings.pdf_contract_template): the static
+  pages are laid out once per CONTRACT_TEMPLATE_VERSION per process, with
+  fixed-size reserved regions where the per-contractor blocks go. A render
+  replays the already-wrapped flowables at their recorded positions and
+  stamps each block into its region, so none of the legal text is re-wrapped.
+
+Both modes share one story (_contract_story), so the text cannot drift
+between them. Bump CONTRACT_TEMPLATE_VERSION whenever the story changes.
+"""
+import functools
+import threading
+from collections import defaultdict
+from datetime import datetime
+from io import BytesIO
+from typing import Callable, Dict, List, Optional, Tuple
+
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import mm
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT, TA_RIGHT
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle, Image
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import (
+    Flowable, KeepInFrame, SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle,
+)
 from reportlab.lib import colors
-from io import BytesIO
-from datetime import datetime
-import os
-import base64
-
-
-def generate_consultant_contract_pdf(
-    contractor_data: dict,
-    contractor_signature_type: str = None,
-    contractor_signature_data: str = None,
-    superadmin_signature_type: str = None,
-    superadmin_signature_data: str = None,
-    signed_date: str = None
-) -> BytesIO:
-    """
-    Generate a professional multi-page consultant contract PDF with Aventus branding
 
-    Args:
-        contractor_data: Dictionary containing contractor information
-        contractor_signature_type: "typed" or "drawn"
-        contractor_signature_data: Name for typed, base64 for drawn
-        superadmin_signature_type: "typed" or "drawn"
-        superadmin_signature_data: Name for typed, base64 for drawn
-        signed_date: Date when contract was signed
+from app.adapters.pdf.assets import COLORS, style_set, logo_image, data_image
+from app.adapters.pdf.cache import cached_pdf
+from app.config.settings import settings
+
+# Bump whenever the static text or layout changes; cached templates and
+# template-mode renders are keyed on it.
+CONTRACT_TEMPLATE_VERSION = 1
+
+# Height in points reserved for each per-contractor block in template mode.
+# Blocks are drawn top-aligned in their region and shrunk if they overflow
+# (e.g. a very long client address).
+TEMPLATE_REGIONS = {
+    "made_on": 40,
+    "parties": 130,
+    "engagement": 62,
+    "joining": 62,
+    "rate": 26,
+    "signatures": 270,
+}
+
+
+@style_set
+def _contract_styles(sample):
+    """Paragraph and table styles for the consultant contract, built once per process."""
+    orange = COLORS["orange"]
+    dark_gray = COLORS["dark_gray"]
 
-    Returns:
-        BytesIO: PDF file in memory
-    """
-    buffer = BytesIO()
+    body_style = ParagraphStyle(
+        'Body',
+        parent=sample['BodyText'],
+        fontSize=10,
+        alignment=TA_JUSTIFY,
+        spaceAfter=6,
+        leading=14,
+        fontName='Helvetica'
+    )
 
-    # Create PDF document
-    doc = SimpleDocTemplate(
+    return {
+        "header": ParagraphStyle(
+            'Header',
+            parent=sample['Heading1'],
+            fontSize=20,
+            textColor=orange,
+            spaceAfter=6,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        ),
+        "title": ParagraphStyle(
+            'Title',
+            parent=sample['Heading2'],
+            fontSize=14,
+            spaceAfter=12,
+            spaceBefore=8,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        ),
+        "section": ParagraphStyle(
+            'Section',
+            parent=sample['Heading3'],
+            fontSize=11,
+            textColor=dark_gray,
+            spaceAfter=6,
+            spaceBefore=10,
+            fontName='Helvetica-Bold',
+        ),
+        "body": body_style,
+        "small": ParagraphStyle(
+            'Small',
+            parent=body_style,
+            fontSize=9,
+            leading=12,
+        ),
+        "address": ParagraphStyle(
+            'Address',
+            parent=sample['Normal'],
+            fontSize=8,
+            alignment=TA_RIGHT,
+            textColor=dark_gray,
+            fontName='Helvetica'
+        ),
+        "footer": ParagraphStyle(
+            'Footer',
+            parent=body_style,
+            fontSize=9,
+            leading=12,
+            alignment=TA_CENTER,
+        ),
+        # Header band with logo and company details
+        "letterhead": TableStyle([
+            ('ALIGN', (0, 0), (0, 0), 'LEFT'),
+            ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LINEBELOW', (0, 0), (-1, -1), 1, orange),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ]),
+        # Grey numbered section headings
+        "section_header": TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), COLORS["light_gray"]),
+            ('LINEABOVE', (0, 0), (0, 0), 3, orange),
+            ('TOPPADDING', (0, 0), (-1, -1), 4),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+        ]),
+    }
+
+
+def _contract_doc(buffer: BytesIO) -> SimpleDocTemplate:
+    return SimpleDocTemplate(
         buffer,
         pagesize=A4,
         rightMargin=25*mm,
@@ -44,70 +146,40 @@ def generate_consultant_contract_pdf(
         bottomMargin=20*mm,
     )
 
-    elements = []
-    styles = getSampleStyleSheet()
-
-    # Define colors
-    orange = colors.HexColor('#FF6B00')
-    dark_gray = colors.HexColor('#1F2937')
-    light_gray = colors.HexColor('#F3F4F6')
-
-    # Custom styles
-    header_style = ParagraphStyle(
-        'Header',
-        parent=styles['Heading1'],
-        fontSize=20,
-        textColor=orange,
-        spaceAfter=6,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
 
-    title_style = ParagraphStyle(
-        'Title',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceAfter=12,
-        spaceBefore=8,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
+def _section_header(title: str, styles: dict) -> Table:
+    """Grey numbered section heading band"""
+    header = Table([[Paragraph(f"<b>{title}</b>", styles["section"])]], colWidths=[165*mm])
+    header.setStyle(styles["section_header"])
+    return header
 
-    section_style = ParagraphStyle(
-        'Section',
-        parent=styles['Heading3'],
-        fontSize=11,
-        textColor=dark_gray,
-        spaceAfter=6,
-        spaceBefore=10,
-        fontName='Helvetica-Bold',
-    )
 
-    body_style = ParagraphStyle(
-        'Body',
-        parent=styles['BodyText'],
-        fontSize=10,
-        alignment=TA_JUSTIFY,
-        spaceAfter=6,
-        leading=14,
-        fontName='Helvetica'
-    )
+def _signature(signature_type: Optional[str], signature_data: Optional[str], blank_line: str, body_style) -> Flowable:
+    """Drawn signature image, typed signature or a blank line to sign on"""
+    if not signature_data:
+        return Paragraph(blank_line, body_style)
+    if signature_type == "drawn":
+        # Render drawn signature as image - compact size to sit on line
+        # Balanced size to be visible while fitting on signature line
+        signature_img = data_image(signature_data, width=60*mm, height=15*mm)
+        # Fallback to line if image fails
+        return signature_img or Paragraph(blank_line, body_style)
+    # Render typed signature as text
+    return Paragraph(f"<i>{signature_data}</i>", body_style)
 
-    small_style = ParagraphStyle(
-        'Small',
-        parent=body_style,
-        fontSize=9,
-        leading=12,
-    )
 
-    address_style = ParagraphStyle(
-        'Address',
-        parent=styles['Normal'],
-        fontSize=8,
-        alignment=TA_RIGHT,
-        textColor=dark_gray,
-        fontName='Helvetica'
-    )
+def _contract_blocks(
+    contractor_data: dict,
+    contractor_signature_type: str = None,
+    contractor_signature_data: str = None,
+    superadmin_signature_type: str = None,
+    superadmin_signature_data: str = None,
+    signed_date: str = None,
+) -> Dict[str, List[Flowable]]:
+    """The per-contractor parts of the contract, keyed by region name"""
+    styles = _contract_styles()
+    body_style = styles["body"]
+    small_style = styles["small"]
 
     # Extract data
     contractor_name = f"{contractor_data.get('first_name', '')} {contractor_data.get('surname', '')}"
@@ -122,11 +194,66 @@ def generate_consultant_contract_pdf(
 
     today = datetime.now().strftime('%B %d, %Y')
 
-    # HEADER with logo and company details
-    logo_path = os.path.join(os.path.dirname(__file__), '..', 'static', 'av-logo.png')
+    parties_text = f"""
+    <b>(1)</b> Aventus Talent Consultant Office 14, Golden Mile 4, Palm Jumeirah, Dubai, United Arab Emirates (the "Principal"); and<br/><br/>
+    <b>(2)</b> <u><font color='#FF6B00'><b>{contractor_name}</b></font></u> (the "Consultant")<br/><br/>
+    <b>(3)</b> <u>{client_name}</u>, with its principal place of business at <u>{client_address}</u> ("client").
+    """
+
+    job_title_text = f"""
+    <b>1.1</b> The Consultant is engaged as <u><b>{job_title}</b></u> for the Principal. The place of work is <u><b>{location}</b></u>.
+    The consultant will be contracted for a duration of <u><b>{duration}</b></u> initially after which there may be extensions.
+    """
 
+    joining_text = f"""
+    <b>4.1</b> The engagement of the Consultant will commence on <u><b>{start_date}</b></u> (the "Commencement Date")
+    for a duration of <u><b>{duration}</b></u>. There will be a possibility for the contract to extend and this can be
+    determined prior to the end date.
+    """
+
+    # SIGNATURES SECTION
+    signatures = [
+        _signature(superadmin_signature_type, superadmin_signature_data, "_____________________", body_style),
+        Paragraph("PRINCIPAL<br/>AVENTUS HR Consultant<br/>Authorized Signatory", small_style),
+    ]
+    if signed_date:
+        signatures.append(Paragraph(f"Date: {signed_date}", small_style))
+    signatures += [
+        Spacer(1, 20),
+        Paragraph(f"<b>I, <u>{contractor_name}</u> the undersigned confirm my acceptance of the above terms and conditions.</b>", body_style),
+        Spacer(1, 15),
+        _signature(contractor_signature_type, contractor_signature_data, "__________________________", body_style),
+        Paragraph("CONSULTANT", small_style),
+    ]
+    if signed_date:
+        signatures.append(Paragraph(f"Date: {signed_date}", small_style))
+
+    return {
+        "made_on": [Paragraph(f"This Consultant Contract is made {today}", styles["title"])],
+        "parties": [Paragraph(parties_text, body_style)],
+        "engagement": [Paragraph(job_title_text, body_style)],
+        "joining": [Paragraph(joining_text, body_style)],
+        "rate": [Paragraph(f"<b>Contract Rate: <u><font color='#FF6B00'>{day_rate} {currency}</font></u> per Day</b>", body_style)],
+        "signatures": signatures,
+    }
+
+
+def _contract_story(block: Callable[[str], List[Flowable]]) -> List[Flowable]:
+    """
+    The full contract story.
+
+    `block(name)` supplies the flowables for each per-contractor region -
+    the real content for a full layout, or a placeholder of the reserved
+    height when laying out the template.
+    """
+    elements = []
+    styles = _contract_styles()
+    body_style = styles["body"]
+    address_style = styles["address"]
+
+    # HEADER with logo and company details
     # Logo on the left
-    logo = Image(logo_path, width=40*mm, height=12*mm)
+    logo = logo_image("av-logo.png", width=40*mm, height=12*mm) or ""
 
     # Company details on the right
     company_details = Paragraph("""
@@ -140,102 +267,42 @@ def generate_consultant_contract_pdf(
     # Create header table with logo and details
     header_data = [[logo, company_details]]
     header_table = Table(header_data, colWidths=[80*mm, 85*mm])
-    header_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-        ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('LINEBELOW', (0, 0), (-1, -1), 1, orange),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
+    header_table.setStyle(styles["letterhead"])
     elements.append(header_table)
     elements.append(Spacer(1, 12))
 
     # CONTRACT TITLE
-    elements.append(Paragraph(f"This Consultant Contract is made {today}", title_style))
+    elements.extend(block("made_on"))
     elements.append(Spacer(1, 12))
 
     # PARTIES SECTION
     elements.append(Paragraph("<b>BETWEEN:</b>", body_style))
     elements.append(Spacer(1, 6))
-
-    parties_text = f"""
-    <b>(1)</b> Aventus Talent Consultant Office 14, Golden Mile 4, Palm Jumeirah, Dubai, United Arab Emirates (the "Principal"); and<br/><br/>
-    <b>(2)</b> <u><font color='#FF6B00'><b>{contractor_name}</b></font></u> (the "Consultant")<br/><br/>
-    <b>(3)</b> <u>{client_name}</u>, with its principal place of business at <u>{client_address}</u> ("client").
-    """
-    elements.append(Paragraph(parties_text, body_style))
+    elements.extend(block("parties"))
     elements.append(Spacer(1, 12))
 
     # SECTION 1: JOB TITLE
-    section_header_1 = Table([[Paragraph("<b>1. JOB TITLE</b>", section_style)]], colWidths=[165*mm])
-    section_header_1.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), light_gray),
-        ('LINEABOVE', (0, 0), (0, 0), 3, orange),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(section_header_1)
-
-    job_title_text = f"""
-    <b>1.1</b> The Consultant is engaged as <u><b>{job_title}</b></u> for the Principal. The place of work is <u><b>{location}</b></u>.
-    The consultant will be contracted for a duration of <u><b>{duration}</b></u> initially after which there may be extensions.
-    """
-    elements.append(Paragraph(job_title_text, body_style))
+    elements.append(_section_header("1. JOB TITLE", styles))
+    elements.extend(block("engagement"))
     elements.append(Spacer(1, 8))
 
     # SECTION 2: DUTIES
-    section_header_2 = Table([[Paragraph("<b>2. DUTIES</b>", section_style)]], colWidths=[165*mm])
-    section_header_2.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), light_gray),
-        ('LINEABOVE', (0, 0), (0, 0), 3, orange),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(section_header_2)
-
+    elements.append(_section_header("2. DUTIES", styles))
     elements.append(Paragraph("<b>2.1</b> The Consultant shall during the term of this Contract serve the client to the best of their ability in the position stated above.", body_style))
     elements.append(Spacer(1, 8))
 
     # SECTION 3: REPORTING CHANNEL
-    section_header_3 = Table([[Paragraph("<b>3. REPORTING CHANNEL</b>", section_style)]], colWidths=[165*mm])
-    section_header_3.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), light_gray),
-        ('LINEABOVE', (0, 0), (0, 0), 3, orange),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(section_header_3)
-
+    elements.append(_section_header("3. REPORTING CHANNEL", styles))
     elements.append(Paragraph("<b>3.1</b> The Consultant shall report directly to selected members of The Client.", body_style))
     elements.append(Spacer(1, 8))
 
     # SECTION 4: JOINING DATE
-    section_header_4 = Table([[Paragraph("<b>4. JOINING DATE</b>", section_style)]], colWidths=[165*mm])
-    section_header_4.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), light_gray),
-        ('LINEABOVE', (0, 0), (0, 0), 3, orange),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(section_header_4)
-
-    joining_text = f"""
-    <b>4.1</b> The engagement of the Consultant will commence on <u><b>{start_date}</b></u> (the "Commencement Date")
-    for a duration of <u><b>{duration}</b></u>. There will be a possibility for the contract to extend and this can be
-    determined prior to the end date.
-    """
-    elements.append(Paragraph(joining_text, body_style))
+    elements.append(_section_header("4. JOINING DATE", styles))
+    elements.extend(block("joining"))
     elements.append(Spacer(1, 8))
 
     # SECTION 5: PROBATIONARY PERIOD
-    section_header_5 = Table([[Paragraph("<b>5. PROBATIONARY PERIOD</b>", section_style)]], colWidths=[165*mm])
-    section_header_5.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), light_gray),
-        ('LINEABOVE', (0, 0), (0, 0), 3, orange),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(section_header_5)
+    elements.append(_section_header("5. PROBATIONARY PERIOD", styles))
 
     probation_text = """
     <b>5.1</b> The Consultant shall be on probation for the first six (6) months from the joining date. During the
@@ -250,19 +317,16 @@ def generate_consultant_contract_pdf(
     elements.append(Spacer(1, 10))
 
     # SECTION 6: REMUNERATION
-    section_header_6 = Table([[Paragraph("<b>6. REMUNERATION</b>", section_style)]], colWidths=[165*mm])
-    section_header_6.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), light_gray),
-        ('LINEABOVE', (0, 0), (0, 0), 3, orange),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(section_header_6)
+    elements.append(_section_header("6. REMUNERATION", styles))
 
-    remuneration_text = f"""
+    remuneration_text = """
     <b>6.1</b> The Consultant shall be paid the following on a monthly basis in arrears and the Consultant shall keep
-    payments confidential and shall not disclose to anyone within or outside the Principal.<br/><br/>
-    <b>Contract Rate: <u><font color='#FF6B00'>{day_rate} {currency}</font></u> per Day</b><br/><br/>
+    payments confidential and shall not disclose to anyone within or outside the Principal.
+    """
+    elements.append(Paragraph(remuneration_text, body_style))
+    elements.extend(block("rate"))
+
+    remuneration_terms_text = """
     Part month calculation.<br/>
     Payment will be only for the days worked.<br/>
     Laptop will be provided by the consultant.<br/><br/>
@@ -275,18 +339,11 @@ def generate_consultant_contract_pdf(
     is responsible for settling any and all taxes in their home country or country of residence due to be paid arising
     out of this agreement.
     """
-    elements.append(Paragraph(remuneration_text, body_style))
+    elements.append(Paragraph(remuneration_terms_text, body_style))
     elements.append(Spacer(1, 10))
 
     # SECTION 7: WORKING HOURS
-    section_header_7 = Table([[Paragraph("<b>7. WORKING HOURS AND PLACE OF WORK</b>", section_style)]], colWidths=[165*mm])
-    section_header_7.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), light_gray),
-        ('LINEABOVE', (0, 0), (0, 0), 3, orange),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(section_header_7)
+    elements.append(_section_header("7. WORKING HOURS AND PLACE OF WORK", styles))
 
     working_hours_text = """
     <b>7.1</b> The Consultant's hours of work will be in synchronisation with client's working hours. This is usually
@@ -298,14 +355,7 @@ def generate_consultant_contract_pdf(
     elements.append(Spacer(1, 10))
 
     # SECTION 8: SICKNESS ABSENCE
-    section_header_8 = Table([[Paragraph("<b>8. SICKNESS ABSENCE</b>", section_style)]], colWidths=[165*mm])
-    section_header_8.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), light_gray),
-        ('LINEABOVE', (0, 0), (0, 0), 3, orange),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(section_header_8)
+    elements.append(_section_header("8. SICKNESS ABSENCE", styles))
 
     sickness_text = """
     <b>8.1</b> Reasonable sickness absence is expected throughout the year, however as the consultant works on a remote
@@ -316,15 +366,7 @@ def generate_consultant_contract_pdf(
     elements.append(Spacer(1, 10))
 
     # SECTION 9: DURATION & TERMINATION
-    section_header_9 = Table([[Paragraph("<b>9. DURATION & TERMINATION</b>", section_style)]], colWidths=[165*mm])
-    section_header_9.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), light_gray),
-        ('LINEABOVE', (0, 0), (0, 0), 3, orange),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(section_header_9)
-
+    elements.append(_section_header("9. DURATION & TERMINATION", styles))
     termination_text = """
     <b>9.1</b> After confirmation of the Engagement and completion of the Probation Period, either Party may terminate
     this Contract by providing 30 days written notice of intention to terminate the Engagement.<br/><br/>
@@ -341,14 +383,7 @@ def generate_consultant_contract_pdf(
     elements.append(Spacer(1, 10))
 
     # SECTION 10: POST TERMINATION RESTRICTIONS
-    section_header_10 = Table([[Paragraph("<b>10. POST TERMINATION RESTRICTIONS</b>", section_style)]], colWidths=[165*mm])
-    section_header_10.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), light_gray),
-        ('LINEABOVE', (0, 0), (0, 0), 3, orange),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(section_header_10)
+    elements.append(_section_header("10. POST TERMINATION RESTRICTIONS", styles))
 
     post_termination_text = """
     <b>10.1</b> Unless approved by the principal, The Consultant shall not during the Engagement or for a period of
@@ -364,14 +399,7 @@ def generate_consultant_contract_pdf(
     elements.append(Spacer(1, 10))
 
     # SECTION 11: CONFIDENTIALITY
-    section_header_11 = Table([[Paragraph("<b>11. CONFIDENTIALITY</b>", section_style)]], colWidths=[165*mm])
-    section_header_11.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), light_gray),
-        ('LINEABOVE', (0, 0), (0, 0), 3, orange),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(section_header_11)
+    elements.append(_section_header("11. CONFIDENTIALITY", styles))
 
     confidentiality_text = """
     <b>11.1</b> The Consultant shall not at any time (either during or after the termination of the Engagement)
@@ -404,14 +432,7 @@ def generate_consultant_contract_pdf(
     elements.append(Spacer(1, 10))
 
     # SECTION 12: GENERAL PROVISIONS
-    section_header_12 = Table([[Paragraph("<b>12. GENERAL PROVISIONS</b>", section_style)]], colWidths=[165*mm])
-    section_header_12.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), light_gray),
-        ('LINEABOVE', (0, 0), (0, 0), 3, orange),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(section_header_12)
+    elements.append(_section_header("12. GENERAL PROVISIONS", styles))
 
     general_text = """
     <b>12.1</b> This Contract contains the full agreement between the Principal and the Consultant regarding the
@@ -442,14 +463,7 @@ def generate_consultant_contract_pdf(
     elements.append(Spacer(1, 10))
 
     # SECTION 13: DISPUTE RESOLUTION
-    section_header_13 = Table([[Paragraph("<b>13. DISPUTE RESOLUTION</b>", section_style)]], colWidths=[165*mm])
-    section_header_13.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), light_gray),
-        ('LINEABOVE', (0, 0), (0, 0), 3, orange),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(section_header_13)
+    elements.append(_section_header("13. DISPUTE RESOLUTION", styles))
 
     dispute_text = """
     <b>13.1</b> Each party irrevocably agrees that the courts of the United Arab Emirates shall have exclusive
@@ -460,14 +474,7 @@ def generate_consultant_contract_pdf(
     elements.append(Spacer(1, 10))
 
     # SECTION 14: GOVERNING LAW
-    section_header_14 = Table([[Paragraph("<b>14. GOVERNING LAW</b>", section_style)]], colWidths=[165*mm])
-    section_header_14.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), light_gray),
-        ('LINEABOVE', (0, 0), (0, 0), 3, orange),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
-    elements.append(section_header_14)
+    elements.append(_section_header("14. GOVERNING LAW", styles))
 
     elements.append(Paragraph("<b>14.1</b> This contract shall be governed and be construed in accordance with the Laws of UAE", body_style))
     elements.append(Spacer(1, 15))
@@ -476,67 +483,9 @@ def generate_consultant_contract_pdf(
     elements.append(Paragraph("<b>IN WITNESS WHEREOF the Parties have caused this Contract to be executed as of the date written above.</b>", body_style))
     elements.append(Spacer(1, 20))
 
-    # SIGNATURES SECTION
     elements.append(Paragraph("<b>Signed for and on behalf of the Principal.</b>", body_style))
     elements.append(Spacer(1, 15))
-
-    # Render Superadmin Signature
-    if superadmin_signature_data:
-        if superadmin_signature_type == "drawn":
-            # Render drawn signature as image - compact size to sit on line
-            try:
-                # Remove data URL prefix if present
-                if superadmin_signature_data.startswith('data:image'):
-                    superadmin_signature_data = superadmin_signature_data.split(',')[1]
-
-                signature_img_data = base64.b64decode(superadmin_signature_data)
-                signature_img_buffer = BytesIO(signature_img_data)
-                # Balanced size to be visible while fitting on signature line
-                signature_img = Image(signature_img_buffer, width=60*mm, height=15*mm)
-                elements.append(signature_img)
-            except Exception as e:
-                # Fallback to line if image fails
-                elements.append(Paragraph("_____________________", body_style))
-        else:
-            # Render typed signature as text
-            elements.append(Paragraph(f"<i>{superadmin_signature_data}</i>", body_style))
-    else:
-        elements.append(Paragraph("_____________________", body_style))
-
-    elements.append(Paragraph("PRINCIPAL<br/>AVENTUS HR Consultant<br/>Authorized Signatory", small_style))
-    if signed_date:
-        elements.append(Paragraph(f"Date: {signed_date}", small_style))
-    elements.append(Spacer(1, 20))
-
-    elements.append(Paragraph(f"<b>I, <u>{contractor_name}</u> the undersigned confirm my acceptance of the above terms and conditions.</b>", body_style))
-    elements.append(Spacer(1, 15))
-
-    # Render Contractor Signature
-    if contractor_signature_data:
-        if contractor_signature_type == "drawn":
-            # Render drawn signature as image - compact size to sit on line
-            try:
-                # Remove data URL prefix if present
-                if contractor_signature_data.startswith('data:image'):
-                    contractor_signature_data = contractor_signature_data.split(',')[1]
-
-                signature_img_data = base64.b64decode(contractor_signature_data)
-                signature_img_buffer = BytesIO(signature_img_data)
-                # Balanced size to be visible while fitting on signature line
-                signature_img = Image(signature_img_buffer, width=60*mm, height=15*mm)
-                elements.append(signature_img)
-            except Exception as e:
-                # Fallback to line if image fails
-                elements.append(Paragraph("__________________________", body_style))
-        else:
-            # Render typed signature as text
-            elements.append(Paragraph(f"<i>{contractor_signature_data}</i>", body_style))
-    else:
-        elements.append(Paragraph("__________________________", body_style))
-
-    elements.append(Paragraph("CONSULTANT", small_style))
-    if signed_date:
-        elements.append(Paragraph(f"Date: {signed_date}", small_style))
+    elements.extend(block("signatures"))
 
     # Footer
     elements.append(Spacer(1, 15))
@@ -550,9 +499,153 @@ def generate_consultant_contract_pdf(
     AVENTUS Talent Consultant • Office 14, Golden Mile 4, Palm Jumeirah, Dubai, UAE<br/>
     This document is confidential and proprietary. Unauthorized distribution is prohibited.
     </font>"""
-    elements.append(Paragraph(footer_text, ParagraphStyle('Footer', parent=small_style, alignment=TA_CENTER)))
+    elements.append(Paragraph(footer_text, styles["footer"]))
+    return elements
+
+
+class _Region(Flowable):
+    """Fixed-height placeholder for a per-contractor block in the template"""
+
+    def __init__(self, name: str, height: float):
+        Flowable.__init__(self)
+        self.name = name
+        self.height = height
+
+    def wrap(self, availWidth, availHeight):
+        self.width = availWidth
+        return availWidth, self.height
+
+    def draw(self):
+        pass
+
+
+class _Placed(Flowable):
+    """Lays out a story flowable as usual and records where it was drawn"""
+
+    def __init__(self, flowable: Flowable, record: Callable[..., None]):
+        Flowable.__init__(self)
+        self.flowable = flowable
+        self.record = record
+
+    def wrap(self, availWidth, availHeight):
+        self.width, self.height = self.flowable.wrap(availWidth, availHeight)
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        return [_Placed(part, self.record) for part in self.flowable.split(availWidth, availHeight)]
 
-    # Build PDF
-    doc.build(elements)
+    def getSpaceBefore(self):
+        return self.flowable.getSpaceBefore()
+
+    def getSpaceAfter(self):
+        return self.flowable.getSpaceAfter()
+
+    def drawOn(self, canvas, x, y, _sW=0):
+        self.record(canvas.getPageNumber(), (self.flowable, x, y, _sW))
+        self.flowable.drawOn(canvas, x, y, _sW)
+
+
+def contract_template(version: int = CONTRACT_TEMPLATE_VERSION) -> Tuple[Tuple[tuple, ...], ...]:
+    """
+    The static pages laid out once: per page, (flowable, x, y, _sW) in draw order.
+
+    Reserved regions appear as _Region entries at the position their block
+    is stamped. A flowable holds the canvas while it draws, so each thread
+    gets its own copy and concurrent renders never share one; render pool
+    workers are single-threaded and lay the pages out once.
+    """
+    return _thread_template(version, threading.get_ident())
+
+
+@functools.lru_cache(maxsize=64)
+def _thread_template(version: int, thread_id: int) -> Tuple[Tuple[tuple, ...], ...]:
+    """Lay out the static pages; a reused thread id only belongs to a thread that has ended."""
+    placed = defaultdict(list)
+    story = [
+        flowable if isinstance(flowable, PageBreak) else _Placed(flowable, lambda page, item: placed[page].append(item))
+        for flowable in _contract_story(lambda name: [_Region(name, TEMPLATE_REGIONS[name])])
+    ]
+    doc = _contract_doc(BytesIO())
+    doc.build(story)
+    return tuple(tuple(placed[page]) for page in range(1, doc.page + 1))
+
+
+def _stamp(canvas: Canvas, region: _Region, x: float, y: float, flowables: List[Flowable]) -> None:
+    """Draw a block top-aligned in its region, shrunk to fit if needed"""
+    block = KeepInFrame(region.width, region.height, flowables, mode="shrink")
+    _, height = block.wrapOn(canvas, region.width, region.height)
+    block.drawOn(canvas, x, y + region.height - height)
+
+
+def _render_from_template(blocks: Dict[str, List[Flowable]]) -> BytesIO:
+    buffer = BytesIO()
+    canvas = Canvas(buffer, pagesize=A4)
+    for page in contract_template(CONTRACT_TEMPLATE_VERSION):
+        for flowable, x, y, sW in page:
+            if isinstance(flowable, _Region):
+                _stamp(canvas, flowable, x, y, blocks[flowable.name])
+            else:
+                flowable.drawOn(canvas, x, y, _sW=sW)
+        canvas.showPage()
+    canvas.save()
+    buffer.seek(0)
+    return buffer
+
+
+def _render_full_layout(blocks: Dict[str, List[Flowable]]) -> BytesIO:
+    buffer = BytesIO()
+    _contract_doc(buffer).build(_contract_story(blocks.__getitem__))
     buffer.seek(0)
     return buffer
+
+
+def _use_template(template: Optional[bool]) -> bool:
+    return settings.pdf_contract_template if template is None else template
+
+
+def _contract_cache_data(*args, template: Optional[bool] = None, **kwargs) -> dict:
+    """Cache key data; template renders are keyed on the template version"""
+    return {
+        "args": args,
+        "kwargs": kwargs,
+        "template": CONTRACT_TEMPLATE_VERSION if _use_template(template) else None,
+    }
+
+
+@cached_pdf("consultant_contract", version=1, key=_contract_cache_data, daily=True)
+def generate_consultant_contract_pdf(
+    contractor_data: dict,
+    contractor_signature_type: str = None,
+    contractor_signature_data: str = None,
+    superadmin_signature_type: str = None,
+    superadmin_signature_data: str = None,
+    signed_date: str = None,
+    template: Optional[bool] = None,
+) -> BytesIO:
+    """
+    Generate a professional multi-page consultant contract PDF with Aventus branding
+
+    Args:
+        contractor_data: Dictionary containing contractor information
+        contractor_signature_type: "typed" or "drawn"
+        contractor_signature_data: Name for typed, base64 for drawn
+        superadmin_signature_type: "typed" or "drawn"
+        superadmin_signature_data: Name for typed, base64 for drawn
+        signed_date: Date when contract was signed
+        template: Stamp into the precomputed static pages (True) or lay out
+            the whole contract (False); defaults to settings.pdf_contract_template
+
+    Returns:
+        BytesIO: PDF file in memory
+    """
+    blocks = _contract_blocks(
+        contractor_data,
+        contractor_signature_type,
+        contractor_signature_data,
+        superadmin_signature_type,
+        superadmin_signature_data,
+        signed_date,
+    )
+    if _use_template(template):
+        return _render_from_template(blocks)
+    return _render_full_layout(blocks)
@@ -54,6 +54,15 @@ class ContractorDataExtractor:
             client_name=self._extract_client_name(),
         )
 
+    def extract_leave_allowance(self) -> float:
+        """
+        Extract annual leave allowance without requiring a valid rate type.
+
+        Returns:
+            Annual leave allowance in days
+        """
+        return self._extract_leave_allowance()
+
     def _get_field(
         self,
         cds_key: Optional[str] = None,
@@ -61,11 +70,15 @@ class ContractorDataExtractor:
         costing_keys: Optional[list] = None,
         default: Any = None,
         converter: Optional[callable] = None,
+        direct_first: bool = False,
     ) -> Any:
         """
         Generic field extractor with fallback logic.
 
-        Priority: CDS form data → Direct field → Costing sheet → Default
+        Priority: CDS form data → Direct field → Costing sheet → Default,
+        or Direct field → CDS form data → ... when direct_first is set.
+        None, blank strings and values the converter rejects count as
+        missing, so the next source is tried.
 
         Args:
             cds_key: Key in CDS form data
@@ -73,29 +86,25 @@ class ContractorDataExtractor:
             costing_keys: List of keys to try in costing sheet data
             default: Default value if not found
             converter: Optional function to convert value (e.g., float, str.lower)
+            direct_first: Read the direct field before the CDS form data
 
         Returns:
             Extracted and optionally converted value
         """
-        # Try CDS form data first
-        if cds_key and cds_key in self.cds:
-            value = self.cds[cds_key]
-            if value is not None:
-                return converter(value) if converter else value
-
-        # Try direct field
-        if direct_field and hasattr(self.contractor, direct_field):
-            value = getattr(self.contractor, direct_field)
-            if value is not None:
-                return converter(value) if converter else value
-
-        # Try costing sheet keys
-        if costing_keys:
-            for key in costing_keys:
-                if key in self.costing:
-                    value = self.costing[key]
-                    if value is not None:
-                        return converter(value) if converter else value
+        cds = [self.cds.get(cds_key)] if cds_key else []
+        direct = [getattr(self.contractor, direct_field, None)] if direct_field else []
+        candidates = direct + cds if direct_first else cds + direct
+        candidates += [self.costing.get(key) for key in costing_keys or []]
+
+        for value in candidates:
+            if value is None or (isinstance(value, str) and not value.strip()):
+                continue
+            if converter is None:
+                return value
+            try:
+                return converter(value)
+            except (ValueError, TypeError):
+                continue
 
         return default
 
@@ -122,7 +131,8 @@ class ContractorDataExtractor:
         return self._get_field(
             cds_key="grossSalary",
             direct_field="gross_salary",
-            converter=float
+            converter=float,
+            direct_first=True,
         )
 
     def _extract_day_rate(self) -> Optional[float]:
@@ -130,7 +140,8 @@ class ContractorDataExtractor:
         return self._get_field(
             cds_key="dayRate",
             direct_field="day_rate",
-            converter=float
+            converter=float,
+            direct_first=True,
         )
 
     def _extract_charge_rate_month(self) -> Optional[float]:
@@ -138,7 +149,8 @@ class ContractorDataExtractor:
         return self._get_field(
             cds_key="chargeRateMonth",
             direct_field="charge_rate_month",
-            converter=float
+            converter=float,
+            direct_first=True,
         )
 
     def _extract_charge_rate_day(self) -> Optional[float]:
@@ -146,18 +158,22 @@ class ContractorDataExtractor:
         return self._get_field(
             cds_key="chargeRateDay",
             direct_field="charge_rate_day",
-            converter=float
+            converter=float,
+            direct_first=True,
         )
 
     def _extract_leave_allowance(self) -> float:
         """Extract annual leave allowance in days."""
         # Priority: leave_allowance field → CDS leaveAllowance → vacation_days → 30 default
-        return self._get_field(
+        allowance = self._get_field(
             cds_key="leaveAllowance",
             direct_field="leave_allowance",
-            default=30.0,
-            converter=float
-        ) or self._get_field(
+            converter=float,
+            direct_first=True,
+        )
+        if allowance is not None:
+            return allowance
+        return self._get_field(
             direct_field="vacation_days",
             default=30.0,
             converter=float
@@ -194,7 +210,7 @@ class ContractorDataExtractor:
     def _extract_accrual_airfare(self) -> float:
         """Extract airfare accrual."""
         return self._get_field(
-            costing_keys=["airfare"],
+            costing_keys=["flights", "airfare"],
             default=0.0,
             converter=float
         )
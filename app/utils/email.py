@@ -3,74 +3,460 @@ Email sending utilities.
 
 All emails are sent via AWS Lambda (which uses SES templates).
 The Lambda handles template rendering, company branding, and SES delivery.
+
+Every send_* helper takes an optional idempotency_key
+(app.utils.email_dedup.email_idempotency_key) for the logical email it
+sends; a repeat is skipped by the sender, and queued emails carry the key
+so the outbox dispatcher does not deliver it twice either.
 """
 import json
+import uuid
 import boto3
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
 
 from app.config import settings
+from app.models.email_outbox import EmailOutbox, EmailOutboxStatus
+from app.utils.email_dedup import claim_email, email_idempotency_key, recent_sends
 
 # Module-level cached Lambda client (created once, reused)
 _lambda_client = None
 
+# Bounded pool for concurrent batch invocations (created on first batch)
+_batch_executor: Optional[ThreadPoolExecutor] = None
+
 
 def _get_lambda_client():
     """Get or create cached Lambda client. Uses default credential chain."""
     global _lambda_client
+    if _lambda_client is None and settings.email_lambda_stub:
+        from app.adapters.email.stub_lambda import StubLambdaClient
+        _lambda_client = StubLambdaClient()
     if _lambda_client is None:
         _lambda_client = boto3.client(
             "lambda",
             region_name=settings.aws_region,
+            # One connection per concurrent batch invocation
+            config=Config(max_pool_connections=max(10, settings.email_batch_concurrency)),
         )
     return _lambda_client
 
 
-def _invoke_email_lambda(email_type: str, recipient: str, data: dict) -> bool:
+def _get_batch_executor() -> ThreadPoolExecutor:
+    """Get or create the pool that runs batch invocations concurrently."""
+    global _batch_executor
+    if _batch_executor is None:
+        _batch_executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.email_batch_concurrency),
+            thread_name_prefix="email-batch",
+        )
+    return _batch_executor
+
+
+# Lambda's limit for InvocationType="Event" payloads, with some headroom
+EVENT_PAYLOAD_MAX_BYTES = 250_000
+
+# Email types whose data carries a credential (a password or reset token).
+# They are always sent inline, never written to the outbox table.
+CREDENTIAL_EMAIL_TYPES = frozenset({"activation", "password_reset"})
+
+
+class EmailOutboxScope:
+    """
+    The session emails are queued into, and what was queued.
+
+    With queue False (the outbox disabled) emails are sent inline; the
+    session is still used to claim their idempotency keys, and their
+    outcome is recorded in it (see record()).
+    """
+
+    def __init__(self, db: Session, contractor_id: Optional[str] = None,
+                 subject: Optional[Tuple[str, Any]] = None, queue: bool = True):
+        self.db = db
+        self.queue = queue
+        self.contractor_id = contractor_id
+        self.subject = subject
+        self.message_ids: List[str] = []
+        self.subjects: List[Tuple[str, Any]] = []
+
+    def add(self, email_type: str, recipient: str, data: dict,
+            contractor_id: Optional[str] = None, wait: bool = True,
+            subject: Optional[Tuple[str, Any]] = None,
+            idempotency_key: Optional[bytes] = None) -> str:
+        subject = subject or self.subject
+        row = EmailOutbox(
+            id=str(uuid.uuid4()),
+            email_type=email_type,
+            recipient=recipient,
+            data=data,
+            contractor_id=contractor_id or self.contractor_id,
+            fire_and_forget=not wait,
+            subject_type=subject[0] if subject else None,
+            subject_id=str(subject[1]) if subject else None,
+            idempotency_key=idempotency_key.hex() if idempotency_key else None,
+        )
+        self.db.add(row)
+        self.message_ids.append(row.id)
+        if subject:
+            self.subjects.append(subject)
+        return row.id
+
+    def record(self, email_type: str, recipient: str, error: Optional[str] = None,
+               message_id: Optional[str] = None, contractor_id: Optional[str] = None,
+               wait: bool = True) -> str:
+        """
+        Record an email sent inline as SENT, or DEAD with its error.
+
+        The row only tracks delivery; it carries no template data and the
+        dispatcher never picks it up. A fire-and-forget email counts as
+        sent once it is handed off.
+        """
+        now = datetime.utcnow()
+        row = EmailOutbox(
+            id=message_id or str(uuid.uuid4()),
+            email_type=email_type,
+            recipient=recipient,
+            data={},
+            status=EmailOutboxStatus.SENT if error is None else EmailOutboxStatus.DEAD,
+            contractor_id=contractor_id or self.contractor_id,
+            fire_and_forget=not wait,
+            attempts=1,
+            next_attempt_at=now,
+            last_error=error,
+            sent_at=now if error is None else None,
+        )
+        self.db.add(row)
+        self.message_ids.append(row.id)
+        return row.id
+
+    def skip(self, subject: Optional[Tuple[str, Any]] = None) -> None:
+        """
+        Record a duplicate that was not queued.
+
+        Its subject is listed as queued: the email already queued for it
+        marks the record SENT once delivered, so callers must not.
+        """
+        subject = subject or self.subject
+        if subject:
+            self.subjects.append(subject)
+
+
+# Scope that send_* helpers queue into instead of invoking the Lambda
+_outbox_scope: ContextVar[Optional[EmailOutboxScope]] = ContextVar("email_outbox_scope", default=None)
+
+
+@contextmanager
+def email_outbox(db: Session, contractor_id: Optional[str] = None,
+                 subject: Optional[Tuple[str, Any]] = None):
     """
-    Invoke the AWS Lambda function to send an email.
+    Queue emails sent inside the block in db's transaction.
+
+    Every send_* helper (and _invoke_email_lambda) called while the block
+    is active writes an EmailOutbox row to db instead of invoking the
+    Lambda, so the email is only sent if the caller commits. The worker's
+    dispatcher delivers the row with retries. With EMAIL_OUTBOX_ENABLED
+    off, emails are sent inline and a row recording the outcome is
+    written to db instead, so delivery tracking works either way.
+    contractor_id files the emails under that contractor for delivery
+    tracking. subject is the (type, id) of a record the dispatcher marks
+    SENT once the email is delivered (see
+    email_outbox_service.EMAIL_SUBJECTS); queued subjects are listed in
+    outbox.subjects.
+
+    Usage:
+        with email_outbox(db, contractor_id=contractor.id) as outbox:
+            contractor.status = ContractorStatus.SIGNED
+            send_signed_contract_email(...)
+        db.commit()
+        outbox.message_ids  # One per queued email
+    """
+    scope = EmailOutboxScope(db, contractor_id, subject, queue=settings.email_outbox_enabled)
+    token = _outbox_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _outbox_scope.reset(token)
 
-    Wraps payload in a "body" key per the Lambda spec and uses
-    InvocationType="RequestResponse".
+
+def _send_email_event(email_type: str, recipient: str, data: dict,
+                      invocation_type: str = "RequestResponse") -> Optional[str]:
+    """
+    Invoke the email Lambda, raising if the email was not accepted.
+
+    Wraps payload in a "body" key per the Lambda spec. With
+    invocation_type="Event" Lambda queues the event and answers straight
+    away, so delivery errors are not reported back.
+
+    Returns:
+        The invocation's request id, used as the email's message id
+    """
+    if not settings.email_lambda_function_name:
+        raise RuntimeError("EMAIL_LAMBDA_FUNCTION_NAME not set")
+
+    event = {
+        "body": {
+            "email_type": email_type,
+            "recipient": recipient,
+            "data": data,
+        }
+    }
+
+    client = _get_lambda_client()
+    response = client.invoke(
+        FunctionName=settings.email_lambda_function_name,
+        InvocationType=invocation_type,
+        Payload=json.dumps(event).encode("utf-8"),
+    )
+    if isinstance(response, dict) and response.get("FunctionError"):
+        raise RuntimeError(f"Lambda function error: {response['FunctionError']}")
+    if isinstance(response, dict):
+        return response.get("ResponseMetadata", {}).get("RequestId")
+    return None
+
+
+def _send_in_background(email_type: str, recipient: str, data: dict) -> None:
+    try:
+        _send_email_event(email_type, recipient, data, invocation_type="Event")
+        print(f"[EMAIL] Lambda event queued: {email_type} -> {recipient}")
+    except Exception as e:
+        print(f"[EMAIL] ERROR invoking Lambda ({email_type}): {e}")
+
+
+def _invoke_email_lambda(email_type: str, recipient: str, data: dict, wait: bool = True,
+                         idempotency_key: Optional[bytes] = None) -> bool:
+    """
+    Send an email through the AWS Lambda function.
+
+    Inside an email_outbox() block the email is queued in the caller's
+    transaction instead and True means it was queued; with the outbox
+    disabled it is sent inline and its outcome recorded there.
+    CREDENTIAL_EMAIL_TYPES are sent inline, and not recorded, even there.
 
     Args:
         email_type: The template type (e.g. "activation", "contract_signing")
         recipient: Recipient email address
         data: Template data dict
+        wait: False for fire-and-forget notifications: the Lambda is
+            invoked with InvocationType="Event" from a background thread
+            and the call returns immediately
+        idempotency_key: email_idempotency_key() of this logical email;
+            a repeat within EMAIL_DEDUP_TTL_SECONDS is skipped
 
     Returns:
-        True if invocation succeeded, False otherwise
+        True if invocation succeeded (or was handed off, or is a
+        duplicate of one that was), False otherwise
     """
-    if not settings.email_lambda_function_name:
-        print("[EMAIL] ERROR: EMAIL_LAMBDA_FUNCTION_NAME not set")
-        return False
+    # Inject support_email if not already present
+    if "support_email" not in data:
+        data["support_email"] = settings.support_email
+
+    scope = _outbox_scope.get()
+    if email_type in CREDENTIAL_EMAIL_TYPES:
+        scope = None
+    # Claimed in the caller's session, so a key the caller claimed itself
+    # (e.g. before rotating a token) is not a duplicate of this send
+    if not claim_email(idempotency_key, scope.db if scope is not None else None):
+        print(f"[EMAIL] Duplicate skipped: {email_type} -> {recipient}")
+        if scope is not None and scope.queue:
+            scope.skip()
+        return True
 
-    try:
-        # Inject support_email if not already present
-        if "support_email" not in data:
-            data["support_email"] = settings.support_email
-
-        event = {
-            "body": {
-                "email_type": email_type,
-                "recipient": recipient,
-                "data": data,
-            }
-        }
+    if scope is not None and scope.queue:
+        scope.add(email_type, recipient, data, wait=wait, idempotency_key=idempotency_key)
+        print(f"[EMAIL] Queued: {email_type} -> {recipient}")
+        return True
 
-        client = _get_lambda_client()
-        client.invoke(
-            FunctionName=settings.email_lambda_function_name,
-            InvocationType="RequestResponse",
-            Payload=json.dumps(event).encode("utf-8"),
-        )
+    if not wait:
+        _get_batch_executor().submit(_send_in_background, email_type, recipient, data)
+        if scope is not None:
+            scope.record(email_type, recipient, wait=False)
+        return True
+
+    try:
+        message_id = _send_email_event(email_type, recipient, data)
         print(f"[EMAIL] Lambda invoked: {email_type} -> {recipient}")
+        if scope is not None:
+            scope.record(email_type, recipient, message_id=message_id)
         return True
     except Exception as e:
         print(f"[EMAIL] ERROR invoking Lambda ({email_type}): {e}")
+        if idempotency_key is not None:
+            recent_sends.release(idempotency_key)
+        if scope is not None:
+            scope.record(email_type, recipient, error=str(e) or e.__class__.__name__)
         return False
 
 
+# =============================================================================
+# Batch Sending
+# =============================================================================
+
+def _pack_email_batches(messages: List[dict], max_bytes: int, max_messages: int) -> List[List[int]]:
+    """
+    Group message indexes into batches that fit one invocation.
+
+    A batch holds at most max_messages messages and max_bytes of encoded
+    payload; a single message over max_bytes is sent on its own.
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    size = 0
+    for index, message in enumerate(messages):
+        message_size = len(json.dumps(message).encode("utf-8")) + 1
+        if current and (len(current) >= max_messages or size + message_size > max_bytes):
+            batches.append(current)
+            current, size = [], 0
+        current.append(index)
+        size += message_size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _invoke_email_batch(batch: List[dict], invocation_type: str = "RequestResponse") -> Dict[int, str]:
+    """
+    Send one batch in a single invocation.
+
+    Only used with EMAIL_LAMBDA_BATCH_ENABLED, for a Lambda that accepts
+    {"body": {"batch": [{email_type, recipient, data}, ...]}} and answers
+    {"failed": [{"index": i, "error": "..."}]}. A response without that
+    list (or one that cannot be read) raises, failing the whole batch.
+    Event invocations only report whether Lambda accepted it.
+
+    Returns:
+        Error message by batch index for the messages that were not sent
+    """
+    if not settings.email_lambda_function_name:
+        raise RuntimeError("EMAIL_LAMBDA_FUNCTION_NAME not set")
+
+    client = _get_lambda_client()
+    response = client.invoke(
+        FunctionName=settings.email_lambda_function_name,
+        InvocationType=invocation_type,
+        Payload=json.dumps({"body": {"batch": batch}}).encode("utf-8"),
+    )
+    if not isinstance(response, dict):
+        raise RuntimeError("Unexpected Lambda response")
+    if response.get("FunctionError"):
+        raise RuntimeError(f"Lambda function error: {response['FunctionError']}")
+    if invocation_type == "Event":
+        return {}
+
+    try:
+        result = json.loads(response["Payload"].read())
+        if isinstance(result.get("body"), str):
+            result = json.loads(result["body"])
+        return {int(f["index"]): str(f.get("error") or "Rejected by email Lambda") for f in result["failed"]}
+    except Exception as e:
+        raise RuntimeError(f"Unreadable email Lambda batch response: {e!r}") from e
+
+
+def _send_email_events(messages: List[dict], invocation_type: str = "RequestResponse") -> List[Optional[str]]:
+    """
+    Send many emails concurrently on a bounded thread pool
+    (EMAIL_BATCH_CONCURRENCY).
+
+    Each email is its own invocation, the event the email Lambda accepts.
+    With EMAIL_LAMBDA_BATCH_ENABLED they are packed into as few batch
+    invocations as the limits allow instead.
+
+    Returns:
+        One entry per message: None if it was sent, else the error
+    """
+    messages = [
+        {"email_type": m["email_type"], "recipient": m["recipient"], "data": m["data"]} for m in messages
+    ]
+    if not settings.email_lambda_batch_enabled:
+        def send_one(message: dict) -> Optional[str]:
+            try:
+                _send_email_event(message["email_type"], message["recipient"], message["data"], invocation_type)
+                return None
+            except Exception as e:
+                return str(e) or e.__class__.__name__
+
+        return list(_get_batch_executor().map(send_one, messages))
+
+    max_bytes = settings.email_batch_max_bytes
+    if invocation_type == "Event":
+        max_bytes = min(max_bytes, EVENT_PAYLOAD_MAX_BYTES)
+    batches = _pack_email_batches(messages, max_bytes, max(1, settings.email_batch_max_messages))
+
+    def send(indexes: List[int]) -> Dict[int, str]:
+        try:
+            failed = _invoke_email_batch([messages[i] for i in indexes], invocation_type)
+            return {indexes[i]: error for i, error in failed.items() if i < len(indexes)}
+        except Exception as e:
+            return {i: str(e) or e.__class__.__name__ for i in indexes}
+
+    errors: Dict[int, str] = {}
+    for failed in _get_batch_executor().map(send, batches):
+        errors.update(failed)
+    return [errors.get(i) for i in range(len(messages))]
+
+
+def send_email_batch(messages: List[dict]) -> List[bool]:
+    """
+    Send many emails at once.
+
+    Each message is {"email_type": ..., "recipient": ..., "data": {...}},
+    optionally with the "contractor_id" it is about, the "subject"
+    record it delivers (see email_outbox()) and an
+    "idempotency_key" (duplicates are skipped and count as sent). Inside
+    an email_outbox() block every message is queued in the caller's
+    transaction instead (the dispatcher sends them the same way); with
+    the outbox disabled they are sent now and their outcomes recorded
+    there.
+
+    Returns:
+        One bool per message, True if it was sent (or queued)
+    """
+    for message in messages:
+        message["data"].setdefault("support_email", settings.support_email)
+
+    scope = _outbox_scope.get()
+    db = scope.db if scope is not None else None
+    fresh = [i for i, m in enumerate(messages) if claim_email(m.get("idempotency_key"), db)]
+    if len(fresh) < len(messages):
+        print(f"[EMAIL] Duplicates skipped: {len(messages) - len(fresh)}")
+
+    if scope is not None and scope.queue:
+        queued = set(fresh)
+        for i, m in enumerate(messages):
+            if i not in queued:
+                scope.skip(m.get("subject"))
+                continue
+            scope.add(m["email_type"], m["recipient"], m["data"],
+                      contractor_id=m.get("contractor_id"), subject=m.get("subject"),
+                      idempotency_key=m.get("idempotency_key"))
+        print(f"[EMAIL] Queued batch of {len(fresh)}")
+        return [True] * len(messages)
+
+    sent = [True] * len(messages)
+    if not fresh:
+        return sent
+
+    errors = _send_email_events([messages[i] for i in fresh])
+    failed = sum(1 for e in errors if e)
+    print(f"[EMAIL] Batch sent: {len(fresh) - failed}/{len(fresh)}")
+    if failed:
+        print(f"[EMAIL] ERROR in batch: {next(e for e in errors if e)}")
+    for i, error in zip(fresh, errors):
+        if error:
+            sent[i] = False
+            if messages[i].get("idempotency_key") is not None:
+                recent_sends.release(messages[i]["idempotency_key"])
+        if scope is not None:
+            scope.record(messages[i]["email_type"], messages[i]["recipient"], error=error,
+                         contractor_id=messages[i].get("contractor_id"))
+    return sent
+
+
 # =============================================================================
 # Contract & Onboarding Emails
 # =============================================================================
@@ -79,20 +465,22 @@ def send_contract_email(
     contractor_email: str,
     contractor_name: str,
     contract_token: str,
-    expiry_date: datetime
+    expiry_date: datetime,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
     """Send contract signing email to contractor."""
     return _invoke_email_lambda("contract_signing", contractor_email, {
         "contractor_name": contractor_name,
         "contract_link": f"{settings.contract_signing_url}?token={contract_token}",
         "expiry_date": expiry_date.strftime("%B %d, %Y"),
-    })
+    }, idempotency_key=idempotency_key)
 
 
 def send_activation_email(
     contractor_email: str,
     contractor_name: str,
-    temporary_password: str
+    temporary_password: str,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
     """Send account activation email with login credentials."""
     return _invoke_email_lambda("activation", contractor_email, {
@@ -100,46 +488,50 @@ def send_activation_email(
         "contractor_email": contractor_email,
         "temporary_password": temporary_password,
         "login_link": settings.frontend_url,
-    })
+    }, idempotency_key=idempotency_key)
 
 
 def send_signed_contract_email(
     contractor_email: str,
     contractor_name: str,
-    pdf_url: str
+    pdf_url: str,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
     """Send signed contract copy to contractor."""
     return _invoke_email_lambda("signed_contract", contractor_email, {
         "contractor_name": contractor_name,
         "pdf_url": pdf_url,
         "login_link": settings.frontend_url,
-    })
+    }, idempotency_key=idempotency_key)
 
 
 def send_document_upload_email(
     contractor_email: str,
     contractor_name: str,
     upload_token: str,
-    expiry_date: datetime
+    expiry_date: datetime,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
     """Send document upload request email."""
     return _invoke_email_lambda("document_upload", contractor_email, {
         "contractor_name": contractor_name,
         "upload_link": f"{settings.frontend_url}/documents/upload/{upload_token}",
         "expiry_date": expiry_date.strftime("%B %d, %Y"),
-    })
+    }, idempotency_key=idempotency_key)
 
 
 def send_documents_uploaded_notification(
     admin_email: str,
     contractor_name: str,
-    contractor_id: int
+    contractor_id: int,
+    wait: bool = False,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
-    """Notify admin that contractor has uploaded documents."""
+    """Notify admin that contractor has uploaded documents (fire-and-forget by default)."""
     return _invoke_email_lambda("documents_uploaded", admin_email, {
         "contractor_name": contractor_name,
         "review_link": f"{settings.frontend_url}/admin/contractors/{contractor_id}",
-    })
+    }, wait=wait, idempotency_key=idempotency_key)
 
 
 # =============================================================================
@@ -150,14 +542,15 @@ def send_password_reset_email(
     email: str,
     name: str,
     reset_token: str,
-    expiry_date: datetime
+    expiry_date: datetime,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
     """Send password reset email."""
     return _invoke_email_lambda("password_reset", email, {
         "name": name,
         "reset_link": f"{settings.password_reset_url}?token={reset_token}",
         "expiry_date": expiry_date.strftime("%B %d, %Y"),
-    })
+    }, idempotency_key=idempotency_key)
 
 
 # =============================================================================
@@ -168,14 +561,16 @@ def send_review_notification(
     admin_email: str,
     contractor_name: str,
     contractor_id: int,
-    notification_type: str = "Review"
+    notification_type: str = "Review",
+    wait: bool = False,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
-    """Send review notification to admin."""
+    """Send review notification to admin (fire-and-forget by default)."""
     return _invoke_email_lambda("review_notification", admin_email, {
         "contractor_name": contractor_name,
         "notification_type": notification_type,
         "review_link": f"{settings.frontend_url}/admin/contractors/{contractor_id}",
-    })
+    }, wait=wait, idempotency_key=idempotency_key)
 
 
 # =============================================================================
@@ -190,7 +585,8 @@ def send_quote_sheet_request_email(
     expiry_date: datetime,
     cc_email: Optional[str] = None,
     custom_subject: Optional[str] = None,
-    custom_message: Optional[str] = None
+    custom_message: Optional[str] = None,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
     """Send quote sheet request to third party."""
     return _invoke_email_lambda("quote_sheet_request", third_party_email, {
@@ -198,7 +594,7 @@ def send_quote_sheet_request_email(
         "contractor_name": contractor_name,
         "quote_link": f"{settings.frontend_url}/quote-sheet/{quote_token}",
         "expiry_date": expiry_date.strftime("%B %d, %Y"),
-    })
+    }, idempotency_key=idempotency_key)
 
 
 def send_cohf_email(
@@ -207,7 +603,8 @@ def send_cohf_email(
     contractor_name: str,
     cohf_token: str,
     expiry_date: datetime,
-    custom_message: Optional[str] = None
+    custom_message: Optional[str] = None,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
     """Send COHF signature request to third party."""
     return _invoke_email_lambda("cohf", third_party_email, {
@@ -215,7 +612,7 @@ def send_cohf_email(
         "contractor_name": contractor_name,
         "signing_link": f"{settings.frontend_url}/cohf/sign/{cohf_token}",
         "expiry_date": expiry_date.strftime("%B %d, %Y"),
-    })
+    }, idempotency_key=idempotency_key)
 
 
 # =============================================================================
@@ -228,7 +625,8 @@ def send_work_order_email(
     contractor_name: str,
     work_order_token: str,
     expiry_date: datetime,
-    client_name: Optional[str] = None
+    client_name: Optional[str] = None,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
     """Send work order notification."""
     data = {
@@ -239,7 +637,7 @@ def send_work_order_email(
     }
     if client_name:
         data["client_name"] = client_name
-    return _invoke_email_lambda("work_order", recipient_email, data)
+    return _invoke_email_lambda("work_order", recipient_email, data, idempotency_key=idempotency_key)
 
 
 def send_work_order_to_client(
@@ -247,7 +645,8 @@ def send_work_order_to_client(
     client_name: str,
     contractor_name: str,
     work_order_token: str,
-    expiry_date: datetime
+    expiry_date: datetime,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
     """Send work order signing request to client."""
     return _invoke_email_lambda("work_order_client", client_email, {
@@ -255,7 +654,7 @@ def send_work_order_to_client(
         "contractor_name": contractor_name,
         "signing_link": f"{settings.frontend_url}/sign-work-order/{work_order_token}",
         "expiry_date": expiry_date.strftime("%B %d, %Y"),
-    })
+    }, idempotency_key=idempotency_key)
 
 
 # =============================================================================
@@ -268,7 +667,8 @@ def send_proposal_email(
     proposal_title: str,
     proposal_token: str,
     expiry_date: datetime,
-    contractor_name: Optional[str] = None
+    contractor_name: Optional[str] = None,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
     """Send proposal email."""
     data = {
@@ -279,7 +679,7 @@ def send_proposal_email(
     }
     if contractor_name:
         data["contractor_name"] = contractor_name
-    return _invoke_email_lambda("proposal", recipient_email, data)
+    return _invoke_email_lambda("proposal", recipient_email, data, idempotency_key=idempotency_key)
 
 
 # =============================================================================
@@ -294,7 +694,8 @@ def send_third_party_contractor_request(
     expiry_date: datetime,
     role: Optional[str] = None,
     client_name: Optional[str] = None,
-    custom_message: Optional[str] = None
+    custom_message: Optional[str] = None,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
     """Send contractor request to third party."""
     data = {
@@ -309,7 +710,7 @@ def send_third_party_contractor_request(
         data["client_name"] = client_name
     if custom_message:
         data["custom_message"] = custom_message
-    return _invoke_email_lambda("third_party_request", third_party_email, data)
+    return _invoke_email_lambda("third_party_request", third_party_email, data, idempotency_key=idempotency_key)
 
 
 # =============================================================================
@@ -328,7 +729,8 @@ def send_timesheet_to_manager(
     sick_days: int = 0,
     vacation_days: int = 0,
     pdf_content: Optional[bytes] = None,
-    client_name: Optional[str] = None
+    client_name: Optional[str] = None,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
     """Send timesheet notification to manager for approval."""
     data = {
@@ -340,7 +742,7 @@ def send_timesheet_to_manager(
     }
     if client_name:
         data["client_name"] = client_name
-    return _invoke_email_lambda("timesheet", manager_email, data)
+    return _invoke_email_lambda("timesheet", manager_email, data, idempotency_key=idempotency_key)
 
 
 def send_uploaded_timesheet_to_manager(
@@ -350,9 +752,11 @@ def send_uploaded_timesheet_to_manager(
     review_link: str,
     filename: Optional[str] = None,
     period: Optional[str] = None,
-    client_name: Optional[str] = None
+    client_name: Optional[str] = None,
+    wait: bool = False,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
-    """Send notification when timesheet document is uploaded."""
+    """Send notification when timesheet document is uploaded (fire-and-forget by default)."""
     data = {
         "manager_name": manager_name,
         "contractor_name": contractor_name,
@@ -364,7 +768,7 @@ def send_uploaded_timesheet_to_manager(
         data["period"] = period
     if client_name:
         data["client_name"] = client_name
-    return _invoke_email_lambda("timesheet_uploaded", manager_email, data)
+    return _invoke_email_lambda("timesheet_uploaded", manager_email, data, wait=wait, idempotency_key=idempotency_key)
 
 
 # =============================================================================
@@ -387,6 +791,7 @@ def send_batch_invoice_request(
     upload_link: str,
     deadline: str,
     custom_message: Optional[str] = None,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
     """Send invoice request to 3rd party for a payroll batch."""
     data = {
@@ -401,7 +806,7 @@ def send_batch_invoice_request(
     }
     if custom_message:
         data["custom_message"] = custom_message
-    return _invoke_email_lambda("batch_invoice_request", recipient_email, data)
+    return _invoke_email_lambda("batch_invoice_request", recipient_email, data, idempotency_key=idempotency_key)
 
 
 def send_freelancer_invoice_request(
@@ -412,6 +817,7 @@ def send_freelancer_invoice_request(
     currency: str,
     upload_link: str,
     deadline: str,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
     """Send invoice request to freelancer for their payroll batch."""
     return _invoke_email_lambda("freelancer_invoice_request", freelancer_email, {
@@ -420,7 +826,7 @@ def send_freelancer_invoice_request(
         "total_payable": f"{currency} {total_payable:,.2f}",
         "upload_link": upload_link,
         "deadline": deadline,
-    })
+    }, idempotency_key=idempotency_key)
 
 
 def send_batch_invoice_update_request(
@@ -430,6 +836,7 @@ def send_batch_invoice_update_request(
     client_name: str,
     finance_notes: str,
     upload_link: str,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
     """Request a corrected invoice from 3rd party after finance review."""
     return _invoke_email_lambda("batch_invoice_update_request", recipient_email, {
@@ -438,7 +845,7 @@ def send_batch_invoice_update_request(
         "client_name": client_name,
         "finance_notes": finance_notes,
         "upload_link": upload_link,
-    })
+    }, idempotency_key=idempotency_key)
 
 
 def send_client_invoice_email(
@@ -450,6 +857,7 @@ def send_client_invoice_email(
     currency: str,
     portal_link: str,
     due_date: str,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
     """Send consolidated client invoice notification."""
     return _invoke_email_lambda("client_invoice", client_email, {
@@ -459,7 +867,7 @@ def send_client_invoice_email(
         "total_amount": f"{currency} {total_amount:,.2f}",
         "portal_link": portal_link,
         "due_date": due_date,
-    })
+    }, idempotency_key=idempotency_key)
 
 
 # =============================================================================
@@ -473,7 +881,8 @@ def send_quote_sheet_request(
     upload_url: str,
     expiry_date: datetime,
     email_subject: Optional[str] = None,
-    email_cc: Optional[str] = None
+    email_cc: Optional[str] = None,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
     """Send quote sheet request to third party for Saudi route."""
     return _invoke_email_lambda("quote_sheet_request", third_party_email, {
@@ -481,7 +890,7 @@ def send_quote_sheet_request(
         "contractor_name": contractor_name,
         "quote_link": upload_url,
         "expiry_date": expiry_date.strftime("%B %d, %Y"),
-    })
+    }, idempotency_key=idempotency_key)
 
 
 def send_quote_sheet_form_link(
@@ -492,7 +901,8 @@ def send_quote_sheet_form_link(
     expiry_date: datetime,
     role: Optional[str] = None,
     location: Optional[str] = None,
-    client_name: Optional[str] = None
+    client_name: Optional[str] = None,
+    idempotency_key: Optional[bytes] = None,
 ) -> bool:
     """Send quote sheet form link to third party to fill and submit."""
     data = {
@@ -507,7 +917,7 @@ def send_quote_sheet_form_link(
         data["location"] = location
     if client_name:
         data["client_name"] = client_name
-    return _invoke_email_lambda("quote_sheet_form_link", third_party_email, data)
+    return _invoke_email_lambda("quote_sheet_form_link", third_party_email, data, idempotency_key=idempotency_key)
 
 
 def send_quote_sheet_pdf_email(
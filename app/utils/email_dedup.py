@@ -0,0 +1,136 @@
+"""
+Idempotency keys for outgoing emails.
+
+A retried request (a double-clicked "send COHF", a resent upload link)
+would otherwise send the same email twice. Each logical email gets a key
+built from its type, recipient, the entity it is about and that entity's
+version; the first send claims the key in an in-memory index of recent
+sends and repeats within EMAIL_DEDUP_TTL_SECONDS are skipped. Checking a
+key is O(1) and never touches the database.
+
+A key claimed inside a DB transaction is only kept if that transaction
+commits; if it rolls back (or the session closes without committing) the
+key is released so the retry can send.
+
+The index is per process, so it catches the common retry-to-the-same-
+worker case; it is not a cross-process guarantee. Queued emails store
+their key on the outbox row, and the dispatcher also skips a row whose
+key was queued by another process within the TTL (see
+app.services.email_outbox_service).
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+
+# Session.info entry holding keys claimed in the current transaction
+_SESSION_KEYS = "email_dedup_keys"
+
+
+def email_idempotency_key(email_type: str, recipient: str, entity_id: Any, version: Any = None) -> bytes:
+    """
+    Key for one logical email.
+
+    Args:
+        email_type: The template type (e.g. "cohf")
+        recipient: Recipient email address (case-insensitive)
+        entity_id: What the email is about (e.g. the contractor id)
+        version: Anything that makes a new email legitimate (e.g. a
+            digest of the form that was sent); None for "any"
+    """
+    raw = "\x1f".join([email_type, recipient.strip().lower(), str(entity_id), "" if version is None else str(version)])
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).digest()
+
+
+class RecentSends:
+    """
+    Keys sent within the last ttl_seconds.
+
+    Entries are kept in claim order, which is also expiry order since the
+    TTL is fixed, so expired entries are dropped from the front. At most
+    max_entries are kept; the oldest go first.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._expiry: "OrderedDict[bytes, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired keys, and the oldest until there is room for one more."""
+        while self._expiry:
+            expires = next(iter(self._expiry.values()))
+            if expires > now and len(self._expiry) < self.max_entries:
+                break
+            self._expiry.popitem(last=False)
+
+    def claim(self, key: bytes) -> bool:
+        """Record key as sent; False if it already was within the TTL."""
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            if key in self._expiry:
+                return False
+            self._expiry[key] = now + self.ttl_seconds
+            return True
+
+    def seen(self, key: bytes) -> bool:
+        """Whether key was sent within the TTL."""
+        with self._lock:
+            expires = self._expiry.get(key)
+            return expires is not None and expires > time.monotonic()
+
+    def release(self, *keys: bytes) -> None:
+        """Forget keys whose email was not sent after all."""
+        with self._lock:
+            for key in keys:
+                self._expiry.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expiry.clear()
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+
+recent_sends = RecentSends(settings.email_dedup_ttl_seconds, settings.email_dedup_max_entries)
+
+
+def claim_email(key: Optional[bytes], db: Optional[Session] = None) -> bool:
+    """
+    Claim an email's idempotency key.
+
+    Returns False for a duplicate, which the caller should skip. With db,
+    the claim is released again unless db's current transaction commits;
+    a key db's transaction already claimed (e.g. a route claiming before
+    it rotates a token, then passing the key to the send) is its own.
+    A None key is never a duplicate.
+    """
+    if key is None or not settings.email_dedup_enabled:
+        return True
+    if db is not None and key in db.info.get(_SESSION_KEYS, ()):
+        return True
+    if not recent_sends.claim(key):
+        return False
+    if db is not None:
+        db.info.setdefault(_SESSION_KEYS, []).append(key)
+    return True
+
+
+@event.listens_for(Session, "after_commit")
+def _keep_committed_claims(session: Session) -> None:
+    session.info.pop(_SESSION_KEYS, None)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _release_uncommitted_claims(session: Session, transaction) -> None:
+    if transaction.parent is None and _SESSION_KEYS in session.info:
+        recent_sends.release(*session.info.pop(_SESSION_KEYS))
@@ -7,14 +7,15 @@ Generates PDF documents for offboarding:
 - Clearance Certificate
 """
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import mm
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT, TA_RIGHT
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 from io import BytesIO
 from datetime import datetime
-import os
+
+from app.adapters.pdf.assets import sample_styles, logo_image
 
 
 def generate_termination_letter_pdf(
@@ -43,7 +44,7 @@ def generate_termination_letter_pdf(
     )
 
     elements = []
-    styles = getSampleStyleSheet()
+    styles = sample_styles()
 
     # Colors
     orange = colors.HexColor('#FF6B00')
@@ -89,9 +90,8 @@ def generate_termination_letter_pdf(
     today = datetime.now().strftime('%B %d, %Y')
 
     # Header with logo
-    logo_path = os.path.join(os.path.dirname(__file__), '..', 'static', 'av-logo.png')
     try:
-        logo = Image(logo_path, width=40*mm, height=12*mm)
+        logo = logo_image("av-logo.png", width=40*mm, height=12*mm) or ""
         company_details = Paragraph("""
             <font size=8>
             Office 14, Golden Mile 4<br/>
@@ -207,7 +207,7 @@ def generate_experience_letter_pdf(
     )
 
     elements = []
-    styles = getSampleStyleSheet()
+    styles = sample_styles()
 
     # Colors
     orange = colors.HexColor('#FF6B00')
@@ -253,9 +253,8 @@ def generate_experience_letter_pdf(
     today = datetime.now().strftime('%B %d, %Y')
 
     # Header with logo
-    logo_path = os.path.join(os.path.dirname(__file__), '..', 'static', 'av-logo.png')
     try:
-        logo = Image(logo_path, width=40*mm, height=12*mm)
+        logo = logo_image("av-logo.png", width=40*mm, height=12*mm) or ""
         company_details = Paragraph("""
             <font size=8>
             Office 14, Golden Mile 4<br/>
@@ -359,7 +358,7 @@ def generate_clearance_certificate_pdf(
     )
 
     elements = []
-    styles = getSampleStyleSheet()
+    styles = sample_styles()
 
     # Colors
     orange = colors.HexColor('#FF6B00')
@@ -404,9 +403,8 @@ def generate_clearance_certificate_pdf(
     today = datetime.now().strftime('%B %d, %Y')
 
     # Header with logo
-    logo_path = os.path.join(os.path.dirname(__file__), '..', 'static', 'av-logo.png')
     try:
-        logo = Image(logo_path, width=40*mm, height=12*mm)
+        logo = logo_image("av-logo.png", width=40*mm, height=12*mm) or ""
         company_details = Paragraph("""
             <font size=8>
             Office 14, Golden Mile 4<br/>
@@ -0,0 +1,68 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Lists ordered newest-first by (created_at, id) page with an opaque cursor
+holding the last row's sort key, so each page is an index range scan
+regardless of how deep into the history it is. Rows without a created_at
+sort after every dated row, by id.
+
+The index backing a list must be (created_at DESC NULLS LAST, id DESC).
+Dated and undated rows are read as two separate ranges of it, never with
+an OR in one predicate, so neither needs a sort.
+"""
+import base64
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import tuple_
+
+
+def encode_cursor(created_at: Optional[datetime], row_id: int) -> str:
+    """Encode a row's (created_at, id) sort key as an opaque cursor."""
+    raw = f"{created_at.isoformat() if created_at else ''}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return (datetime.fromisoformat(created_at) if created_at else None), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_page(query: Any, created_at_col: Any, id_col: Any, cursor: Optional[str], limit: int):
+    """
+    Apply newest-first keyset pagination to a query.
+
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    Rows must expose the created_at and id columns under their names.
+    """
+    created_at, row_id = decode_cursor(cursor) if cursor else (None, None)
+
+    rows = []
+    if not cursor or created_at is not None:
+        dated = query.filter(created_at_col.isnot(None))
+        if cursor:
+            dated = dated.filter(tuple_(created_at_col, id_col) < tuple_(created_at, row_id))
+        rows = dated.order_by(created_at_col.desc().nulls_last(), id_col.desc()).limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        # The dated range is used up; continue into the undated one
+        undated = query.filter(created_at_col.is_(None))
+        if cursor and created_at is None:
+            undated = undated.filter(id_col < row_id)
+        rows += undated.order_by(id_col.desc()).limit(limit + 1 - len(rows)).all()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, created_at_col.key), getattr(last, id_col.key))
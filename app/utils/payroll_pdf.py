@@ -3,15 +3,18 @@ Payroll PDF generators for payslips and invoices.
 Clean, professional design with single color scheme.
 """
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import mm
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 from io import BytesIO
 from datetime import datetime
 from calendar import monthrange
-import os
+from types import SimpleNamespace
+
+from app.adapters.pdf.assets import logo_image
+from app.adapters.pdf.cache import cached_pdf
 
 
 # Brand color
@@ -26,11 +29,9 @@ WHITE = colors.white
 
 def _add_logo(elements):
     """Add Aventus logo to PDF with proper sizing."""
-    logo_path = os.path.join("app", "static", "av-logo.png")
-    if os.path.exists(logo_path):
-        # Proper aspect ratio for logo
-        logo = Image(logo_path, width=40*mm, height=10*mm, kind='proportional')
-        logo.hAlign = 'LEFT'
+    # Proper aspect ratio for logo
+    logo = logo_image("av-logo.png", width=40*mm, height=10*mm, kind='proportional', hAlign='LEFT')
+    if logo:
         elements.append(logo)
         elements.append(Spacer(1, 5*mm))
 
@@ -80,6 +81,38 @@ def _number_to_words(amount: float, currency: str = "AED") -> str:
     return f"{words} {currency_word}"
 
 
+# Every payroll/contractor attribute the payslip and invoice read; the PDF
+# cache key is built from these, so keep them in step with the layouts below.
+PAYROLL_PDF_FIELDS = (
+    "id", "period", "currency", "gross_pay", "net_salary", "monthly_rate", "day_rate",
+    "days_worked", "total_calendar_days", "leave_deductibles", "deductions",
+    "expenses_reimbursement", "invoice_total", "vat_rate", "vat_amount", "total_payable",
+    "total_accruals", "management_fee",
+)
+CONTRACTOR_PDF_FIELDS = (
+    "first_name", "surname", "role", "client_name", "contractor_bank_name", "contractor_iban",
+    "invoice_address_line1", "invoice_address_line2", "invoice_country", "client_payment_terms",
+)
+
+
+def payroll_pdf_args(payroll, contractor) -> tuple:
+    """
+    Plain snapshots of the payroll and contractor holding just the fields the
+    PDFs read, so renders can run in another process (see render_pdf).
+    """
+    return (
+        SimpleNamespace(**{f: getattr(payroll, f, None) for f in PAYROLL_PDF_FIELDS}),
+        SimpleNamespace(**{f: getattr(contractor, f, None) for f in CONTRACTOR_PDF_FIELDS}),
+    )
+
+
+def _pdf_cache_key(payroll, contractor) -> dict:
+    return {
+        "payroll": {f: getattr(payroll, f, None) for f in PAYROLL_PDF_FIELDS},
+        "contractor": {f: getattr(contractor, f, None) for f in CONTRACTOR_PDF_FIELDS},
+    }
+
+
 def _get_pay_period_string(period: str) -> str:
     """Convert 'November 2024' to 'November 01 - November 30, 2024'."""
     try:
@@ -90,6 +123,7 @@ def _get_pay_period_string(period: str) -> str:
         return period or "Current Period"
 
 
+@cached_pdf("payslip", version=1, key=_pdf_cache_key, daily=True)
 def generate_payslip_pdf(payroll, contractor) -> BytesIO:
     """
     Generate a clean, professional payslip PDF.
@@ -151,10 +185,9 @@ def generate_payslip_pdf(payroll, contractor) -> BytesIO:
     pay_period = _get_pay_period_string(payroll.period)
 
     # Logo + title on the right
-    logo_path = os.path.join("app", "static", "av-logo.png")
+    logo = logo_image("av-logo.png", width=35*mm, height=9*mm, kind='proportional')
     right_content = []
-    if os.path.exists(logo_path):
-        logo = Image(logo_path, width=35*mm, height=9*mm, kind='proportional')
+    if logo:
         right_content.append([logo])
     right_content.append([Paragraph("Payslip", title_style)])
 
@@ -505,6 +538,7 @@ Aventus Talent Consultancy LLC | Dubai, UAE"""
     return buffer
 
 
+@cached_pdf("invoice", version=1, key=_pdf_cache_key, daily=True)
 def generate_invoice_pdf(payroll, contractor) -> BytesIO:
     """
     Generate a clean, professional invoice PDF.
@@ -0,0 +1,72 @@
+"""
+Pay period helpers.
+
+Payroll, batch and client invoice periods are displayed as "January 2026"
+but stored alongside integer year/month_number columns for indexed
+filtering and ordering. These helpers convert between the two.
+"""
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import and_, tuple_
+
+PERIOD_FORMAT = "%B %Y"
+
+
+def parse_period(period: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Parse "January 2026" into (2026, 1). Returns None if unparseable."""
+    if not period:
+        return None
+    try:
+        parsed = datetime.strptime(period.strip(), PERIOD_FORMAT)
+    except (ValueError, AttributeError):
+        return None
+    return parsed.year, parsed.month
+
+
+def format_period(year: int, month: int) -> str:
+    """Format (2026, 1) as "January 2026"."""
+    return datetime(year, month, 1).strftime(PERIOD_FORMAT)
+
+
+def previous_period(year: int, month: int) -> Tuple[int, int]:
+    """Return the (year, month) before the given one."""
+    return (year - 1, 12) if month == 1 else (year, month - 1)
+
+
+def period_filter(model: Any, period: str):
+    """
+    Filter clause matching `model` rows for a display period.
+
+    Uses the indexed year/month_number columns when the period parses,
+    falling back to the display string otherwise.
+    """
+    parsed = parse_period(period)
+    if parsed is None:
+        return model.period == period
+    year, month = parsed
+    return and_(model.year == year, model.month_number == month)
+
+
+def period_range_filter(model: Any, start: Optional[str] = None, end: Optional[str] = None):
+    """
+    Filter clause matching `model` rows from `start` through `end` (inclusive).
+
+    Either bound may be omitted. Uses the indexed year/month_number columns.
+
+    Raises:
+        ValueError: If a given bound is not a "Month YYYY" period
+    """
+    def _parse(bound: str) -> Tuple[int, int]:
+        parsed = parse_period(bound)
+        if parsed is None:
+            raise ValueError(f"Period must be in 'Month YYYY' format, got '{bound}'")
+        return parsed
+
+    key = tuple_(model.year, model.month_number)
+    clauses = []
+    if start:
+        clauses.append(key >= tuple_(*_parse(start)))
+    if end:
+        clauses.append(key <= tuple_(*_parse(end)))
+    return and_(True, *clauses)
@@ -1,14 +1,17 @@
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import mm
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 from io import BytesIO
 from datetime import datetime
-import base64
 import os
 
+from app.adapters.pdf.assets import sample_styles, logo_image, data_image
+from app.adapters.pdf.cache import cached_pdf
+from app.adapters.pdf.remote_assets import remote_image
+
 
 def format_currency(value, default="-"):
     """Format a number as currency with comma separators"""
@@ -23,6 +26,7 @@ def format_currency(value, default="-"):
         return default
 
 
+@cached_pdf("quote_sheet", version=1)
 def generate_quote_sheet_pdf(quote_sheet_data: dict) -> BytesIO:
     """
     Generate Quote Sheet PDF matching the new A-H section structure.
@@ -47,7 +51,7 @@ def generate_quote_sheet_pdf(quote_sheet_data: dict) -> BytesIO:
     )
 
     elements = []
-    styles = getSampleStyleSheet()
+    styles = sample_styles()
 
     # Get primary color from data or use default dark red
     primary_color_hex = quote_sheet_data.get('primary_color', '#9B1B1B')
@@ -170,73 +174,25 @@ def generate_quote_sheet_pdf(quote_sheet_data: dict) -> BytesIO:
     if logo_url:
         try:
             if logo_url.startswith('data:image'):
-                import re
-                match = re.match(r'data:image/(\w+);base64,(.+)', logo_url)
-                if match:
-                    img_data = base64.b64decode(match.group(2))
-                    img_buffer = BytesIO(img_data)
-                    fnrco_logo_element = Image(img_buffer, width=22*mm, height=12*mm)
+                fnrco_logo_element = data_image(logo_url, width=22*mm, height=12*mm)
             elif logo_url.startswith('http'):
-                import urllib.request
-                with urllib.request.urlopen(logo_url, timeout=5) as response:
-                    img_data = response.read()
-                    img_buffer = BytesIO(img_data)
-                    fnrco_logo_element = Image(img_buffer, width=22*mm, height=12*mm)
+                fnrco_logo_element = remote_image(logo_url, width=22*mm, height=12*mm)
             else:
-                if os.path.exists(logo_url):
-                    fnrco_logo_element = Image(logo_url, width=22*mm, height=12*mm)
+                fnrco_logo_element = logo_image(os.path.abspath(logo_url), width=22*mm, height=12*mm)
         except Exception as e:
             print(f"Error loading logo: {e}")
 
-    # Try default FNRCO logo paths
+    # Default FNRCO logo
     if fnrco_logo_element is None:
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        app_dir = os.path.dirname(current_dir)
-
-        default_logo_paths = [
-            os.path.join(app_dir, 'static', 'fnrco-logo.png'),
-            os.path.join(current_dir, 'static', 'fnrco-logo.png'),
-            '/app/static/fnrco-logo.png',
-            'static/fnrco-logo.png',
-            'app/static/fnrco-logo.png',
-        ]
-        for path in default_logo_paths:
-            if os.path.exists(path):
-                try:
-                    fnrco_logo_element = Image(path, width=22*mm, height=12*mm)
-                    break
-                except:
-                    pass
-
-    # Load Aventus logo for right side
-    aventus_logo_element = None
-    aventus_logo_paths = [
-        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'av-logo.png'),
-        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'av-logo.png'),
-        '/app/static/av-logo.png',
-        'static/av-logo.png',
-        'app/static/av-logo.png',
-    ]
+        fnrco_logo_element = logo_image("fnrco-logo.png", width=22*mm, height=12*mm)
 
-    for path in aventus_logo_paths:
-        if os.path.exists(path):
-            try:
-                aventus_logo_element = Image(path, width=22*mm, height=12*mm)
-                break
-            except:
-                pass
+    # Aventus logo for right side
+    aventus_logo_element = logo_image("av-logo.png", width=22*mm, height=12*mm)
 
     # If no local file, try to fetch from Supabase
     if aventus_logo_element is None:
-        try:
-            import urllib.request
-            aventus_url = "https://mhrmbwsjjivckttokdiz.supabase.co/storage/v1/object/public/assets/logos/av-logo.png"
-            with urllib.request.urlopen(aventus_url, timeout=5) as response:
-                img_data = response.read()
-                img_buffer = BytesIO(img_data)
-                aventus_logo_element = Image(img_buffer, width=22*mm, height=12*mm)
-        except Exception as e:
-            print(f"Error loading Aventus logo: {e}")
+        aventus_url = "https://mhrmbwsjjivckttokdiz.supabase.co/storage/v1/object/public/assets/logos/av-logo.png"
+        aventus_logo_element = remote_image(aventus_url, width=22*mm, height=12*mm)
 
     # Build header with logos on both sides and centered title
     left_element = fnrco_logo_element if fnrco_logo_element else Paragraph("", cell_style)
@@ -0,0 +1,93 @@
+"""
+HTTP responses for stored files with single-range (RFC 9110) support.
+
+Used to serve stored documents: the ETag is the content checksum, so
+clients revalidate with If-None-Match (a 304 when nothing changed) and
+fetch pages of large PDFs with Range requests. The document URLs are not
+keyed by content (a document is replaced when it is counter-signed or
+captured again), so responses must be revalidated; only a URL that
+contains the checksum may be served as immutable.
+"""
+import re
+from typing import Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Inclusive (start, end) for a single `bytes=` range.
+
+    Returns None for syntax this helper does not serve (multiple ranges,
+    other units) so the caller sends the whole file, and raises ValueError
+    when the range cannot be satisfied.
+    """
+    match = _RANGE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag (weak comparison)."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def range_response(
+    request: Request,
+    content: bytes,
+    filename: str,
+    media_type: str = "application/pdf",
+    etag: Optional[str] = None,
+    immutable: bool = False,
+) -> Response:
+    """
+    Full, partial (206), not-modified (304) or 416 response for `content`.
+
+    With an etag the response may be cached but is revalidated on every
+    use. Pass immutable=True only when the URL itself contains the
+    checksum, so new content always gets a new URL.
+    """
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'inline; filename="{filename}"',
+    }
+    if etag:
+        headers["ETag"] = f'"{etag}"'
+        headers["Cache-Control"] = "private, max-age=31536000, immutable" if immutable else "private, no-cache"
+        if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range == headers.get("ETag")):
+        size = len(content)
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        if byte_range:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            return Response(content[start:end + 1], status_code=206, media_type=media_type, headers=headers)
+
+    return Response(content, media_type=media_type, headers=headers)
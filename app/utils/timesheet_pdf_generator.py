@@ -1,12 +1,13 @@
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import mm
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 from io import BytesIO
 from datetime import datetime
-import os
+
+from app.adapters.pdf.assets import sample_styles, logo_image
 
 
 def generate_timesheet_pdf(timesheet_data: dict) -> BytesIO:
@@ -32,7 +33,7 @@ def generate_timesheet_pdf(timesheet_data: dict) -> BytesIO:
     )
 
     elements = []
-    styles = getSampleStyleSheet()
+    styles = sample_styles()
 
     # Define colors
     orange = colors.HexColor('#FF6B00')
@@ -104,10 +105,8 @@ def generate_timesheet_pdf(timesheet_data: dict) -> BytesIO:
     notes = timesheet_data.get('notes', '')
 
     # Add logo if available
-    logo_path = os.path.join("app", "static", "av-logo.png")
-    if os.path.exists(logo_path):
-        logo = Image(logo_path, width=50*mm, height=12*mm)
-        logo.hAlign = 'CENTER'
+    logo = logo_image("av-logo.png", width=50*mm, height=12*mm, hAlign='CENTER')
+    if logo:
         elements.append(logo)
         elements.append(Spacer(1, 3*mm))
 
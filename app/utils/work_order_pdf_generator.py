@@ -1,15 +1,17 @@
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import mm
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 from io import BytesIO
 from datetime import datetime
-import os
-import base64
 
+from app.adapters.pdf.assets import sample_styles, logo_image, data_image
+from app.adapters.pdf.cache import cached_pdf
 
+
+@cached_pdf("work_order", version=1)
 def generate_work_order_pdf(work_order_data: dict) -> BytesIO:
     """
     Generate a professional work order PDF with clean table-based design
@@ -26,7 +28,7 @@ def generate_work_order_pdf(work_order_data: dict) -> BytesIO:
     )
 
     elements = []
-    styles = getSampleStyleSheet()
+    styles = sample_styles()
 
     # Define colors
     orange = colors.HexColor('#FF6B00')
@@ -119,10 +121,8 @@ def generate_work_order_pdf(work_order_data: dict) -> BytesIO:
     rate_type = work_order_data.get('rate_type', 'monthly')  # monthly or daily
 
     # Logo - proper aspect ratio
-    logo_path = os.path.join("app", "static", "av-logo.png")
-    if os.path.exists(logo_path):
-        logo = Image(logo_path, width=60*mm, height=18*mm, kind='proportional')
-        logo.hAlign = 'CENTER'
+    logo = logo_image("av-logo.png", width=60*mm, height=18*mm, kind='proportional', hAlign='CENTER')
+    if logo:
         elements.append(logo)
         elements.append(Spacer(1, 4*mm))
 
@@ -305,15 +305,8 @@ def generate_work_order_pdf(work_order_data: dict) -> BytesIO:
 
         if sig_data:
             if sig_type == "drawn":
-                try:
-                    if sig_data.startswith('data:image'):
-                        sig_data = sig_data.split(',')[1]
-                    sig_image_data = base64.b64decode(sig_data)
-                    sig_buffer = BytesIO(sig_image_data)
-                    sig_image = Image(sig_buffer, width=45*mm, height=15*mm)
-                    content.append(sig_image)
-                except:
-                    content.append(Paragraph("[Signature]", signature_text_style))
+                sig_image = data_image(sig_data, width=45*mm, height=15*mm)
+                content.append(sig_image or Paragraph("[Signature]", signature_text_style))
             else:
                 content.append(Paragraph(f"<i>{sig_data}</i>", signature_text_style))
             content.append(Spacer(1, 2*mm))
@@ -0,0 +1,38 @@
+"""
+Worker process entry point (docker/Dockerfile.worker).
+
+Runs the email outbox dispatcher and the payslip run and document job
+reapers until SIGINT or SIGTERM, letting the work in flight finish before
+exiting.
+
+Usage:
+    python -m app.workers.main
+"""
+import asyncio
+import signal
+
+from app.adapters.pdf.assets import configure_reportlab
+from app.config.settings import settings
+from app.services.document_job_service import run_document_job_reaper
+from app.services.email_outbox_service import run_email_dispatcher
+from app.services.payslip_run_service import run_payslip_run_reaper
+from app.telemetry.logger import setup_logging
+
+
+async def main() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await asyncio.gather(
+        run_email_dispatcher(stop),
+        run_payslip_run_reaper(stop),
+        run_document_job_reaper(stop),
+    )
+
+
+if __name__ == "__main__":
+    setup_logging(settings.log_level, json_format=settings.log_format == "json")
+    configure_reportlab()
+    asyncio.run(main())
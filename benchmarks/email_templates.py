@@ -0,0 +1,76 @@
+"""
+Render-throughput benchmark for the email templates.
+
+Reports, per template in app/templates/email, renders per second with
+the precompiled engine, and the cost of the first render when a template
+has to be parsed and compiled from source, loaded from the bytecode
+cache, or is already compiled.
+
+Usage:
+    python -m benchmarks.email_templates [--runs 200] [--only payslip,invoice]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jinja2 import meta  # noqa: E402
+
+from app.adapters.email.template_engine import EmailTemplateEngine  # noqa: E402
+from app.config.settings import settings  # noqa: E402
+
+# Variables the templates format as numbers
+NUMERIC = {"total_amount", "net_salary", "balance", "notice_period_days"}
+
+
+def sample_context(engine: EmailTemplateEngine, name: str) -> dict:
+    """A value for every variable the template (and base.html) reads."""
+    source = engine.env.loader.get_source(engine.env, f"email/{name}.html")[0]
+    variables = meta.find_undeclared_variables(engine.env.parse(source))
+    return {v: 12500.0 if v in NUMERIC else f"Sample {v.replace('_', ' ')}" for v in variables}
+
+
+def first_render_ms(name: str, context: dict, cache_dir: str, bytecode: bool) -> float:
+    """Fresh engine: compile (or load) the template, then render it once."""
+    settings.email_template_bytecode_cache = bytecode
+    settings.email_template_cache_dir = cache_dir
+
+    def run():
+        EmailTemplateEngine().render(name, **context)
+
+    return min(timeit.repeat(run, number=1, repeat=5)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200, help="Renders per timing (default 200)")
+    parser.add_argument("--only", help="Comma-separated template names")
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix="email-templates-")
+    settings.email_template_cache_dir = cache_dir
+    engine = EmailTemplateEngine()
+    engine.precompile()
+
+    names = sorted(
+        t[len("email/"):-len(".html")] for t in engine.env.list_templates()
+        if t.startswith("email/") and not os.path.basename(t).startswith(("_", "base"))
+    )
+    if args.only:
+        names = [n for n in names if n in args.only.split(",")]
+
+    print(f"{'template':<30} {'renders/s':>10} {'render ms':>10} {'source ms':>10} {'bytecode ms':>12}")
+    for name in names:
+        context = sample_context(engine, name)
+        engine.render(name, **context)
+        per_render = min(timeit.repeat(lambda: engine.render(name, **context), number=args.runs, repeat=3)) / args.runs
+        source = first_render_ms(name, context, cache_dir, bytecode=False)
+        cached = first_render_ms(name, context, cache_dir, bytecode=True)
+        print(f"{name:<30} {1 / per_render:10.0f} {per_render * 1000:10.3f} {source:10.2f} {cached:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
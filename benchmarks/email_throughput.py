@@ -0,0 +1,75 @@
+"""
+Throughput benchmark for email sending against the local stub Lambda.
+
+Sends the same emails one synchronous invocation at a time (the old
+path), as fire-and-forget Event invocations, and as concurrent batch
+invocations, with a simulated Lambda round trip and no AWS access.
+
+Usage:
+    python -m benchmarks.email_throughput [--emails 500] [--latency-ms 60]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.adapters.email import StubLambdaClient  # noqa: E402
+from app.config.settings import settings  # noqa: E402
+from app.utils import email  # noqa: E402
+
+
+def messages(count: int):
+    return [
+        {"email_type": "payslip", "recipient": f"contractor{n}@example.com",
+         "data": {"contractor_name": f"Contractor {n}", "period": "March 2026", "net_salary": "12000.00", "currency": "AED"}}
+        for n in range(count)
+    ]
+
+
+def timed(stub: StubLambdaClient, count: int, send) -> float:
+    """Seconds until the stub has received every email."""
+    with contextlib.redirect_stdout(io.StringIO()):  # Per-email [EMAIL] lines
+        start = time.perf_counter()
+        send()
+        while len(stub.delivered) < count:
+            time.sleep(0.001)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--emails", type=int, default=500, help="Emails per mode (default 500)")
+    parser.add_argument("--latency-ms", type=float, default=60.0, help="Simulated RequestResponse round trip (default 60)")
+    parser.add_argument("--event-latency-ms", type=float, default=8.0, help="Simulated Event round trip (default 8)")
+    args = parser.parse_args()
+
+    settings.email_lambda_function_name = settings.email_lambda_function_name or "stub-email-lambda"
+
+    def stub() -> StubLambdaClient:
+        email._lambda_client = StubLambdaClient(
+            latency_seconds=args.latency_ms / 1000,
+            per_message_seconds=0.0005,
+            event_latency_seconds=args.event_latency_ms / 1000,
+        )
+        return email._lambda_client
+
+    modes = {
+        "sync, one per invoke": lambda: [email._invoke_email_lambda(m["email_type"], m["recipient"], m["data"]) for m in messages(args.emails)],
+        "fire-and-forget (Event)": lambda: [email._invoke_email_lambda(m["email_type"], m["recipient"], m["data"], wait=False) for m in messages(args.emails)],
+        "batched, concurrent": lambda: email.send_email_batch(messages(args.emails)),
+    }
+
+    print(f"{args.emails} emails, {args.latency_ms:.0f} ms round trip, "
+          f"{settings.email_batch_concurrency} concurrent invocations, {settings.email_batch_max_messages} per batch")
+    for name, send in modes.items():
+        client = stub()
+        seconds = timed(client, args.emails, send)
+        print(f"  {name:<26} {seconds * 1000:8.0f} ms  {args.emails / seconds:8.0f} emails/s  {len(client.invocations):5d} invocations")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Micro-benchmark for the shared PDF style and asset registry.
+
+Compares what each render used to do (build the sample stylesheet and
+custom styles, read and decode logo PNGs, ASCII85-encode streams) with
+the shared registry in app.adapters.pdf.assets.
+
+Usage:
+    python -m benchmarks.pdf_assets [--runs 20]
+"""
+import argparse
+import os
+import sys
+import timeit
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab import rl_config  # noqa: E402
+from reportlab.lib.styles import getSampleStyleSheet  # noqa: E402
+from reportlab.lib.units import mm  # noqa: E402
+from reportlab.platypus import Image, SimpleDocTemplate  # noqa: E402
+
+from app.adapters.pdf import assets  # noqa: E402
+from app.utils.contract_pdf_generator import _contract_styles, generate_consultant_contract_pdf  # noqa: E402
+from app.utils.timesheet_pdf_generator import generate_timesheet_pdf  # noqa: E402
+from app.utils.work_order_pdf_generator import generate_work_order_pdf  # noqa: E402
+
+LOGO = os.path.join(assets.STATIC_DIR, "av-logo.png")
+
+
+def best_ms(func, runs: int) -> float:
+    """Best of 3 repeats, in milliseconds per call."""
+    return min(timeit.repeat(func, number=runs, repeat=3)) / runs * 1000
+
+
+def logo_page(make_logo) -> bytes:
+    buffer = BytesIO()
+    SimpleDocTemplate(buffer).build([make_logo()])
+    return buffer.getvalue()
+
+
+def with_a85(enabled: bool, func):
+    """Run func with ASCII85 stream encoding switched on or off."""
+    def run():
+        previous = rl_config.useA85
+        rl_config.useA85 = int(enabled)
+        try:
+            return func()
+        finally:
+            rl_config.useA85 = previous
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Calls per timing (default 20)")
+    runs = parser.parse_args().runs
+
+    assets.warm()
+    sample = assets.sample_styles()
+    contractor = {"first_name": "Ada", "surname": "Lovelace", "client_name": "ACME", "role": "Engineer"}
+
+    cases = [
+        ("Sample stylesheet",
+         getSampleStyleSheet,
+         assets.sample_styles),
+        ("Contract styles",
+         lambda: _contract_styles.__wrapped__(sample),
+         _contract_styles),
+        ("Logo page (decode vs shared reader)",
+         with_a85(True, lambda: logo_page(lambda: Image(LOGO, width=40 * mm, height=12 * mm))),
+         lambda: logo_page(lambda: assets.logo_image("av-logo.png", width=40 * mm, height=12 * mm))),
+        ("Consultant contract, 5 pages",
+         with_a85(True, lambda: generate_consultant_contract_pdf.uncached(contractor)),
+         lambda: generate_consultant_contract_pdf.uncached(contractor)),
+        ("Work order",
+         with_a85(True, lambda: generate_work_order_pdf.uncached(contractor)),
+         lambda: generate_work_order_pdf.uncached(contractor)),
+        ("Timesheet",
+         with_a85(True, lambda: generate_timesheet_pdf(contractor)),
+         lambda: generate_timesheet_pdf(contractor)),
+    ]
+
+    print(f"{'Case':<40} {'Before (ms)':>12} {'Shared (ms)':>12} {'Saved':>8}")
+    print("-" * 76)
+    for name, before, after in cases:
+        before_ms = best_ms(before, runs)
+        after_ms = best_ms(after, runs)
+        saved = (1 - after_ms / before_ms) * 100 if before_ms else 0
+        print(f"{name:<40} {before_ms:>12.3f} {after_ms:>12.3f} {saved:>7.0f}%")
+    print("\nFull renders (uncached) compare ASCII85 streams on/off; both use the shared logos and styles.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+Benchmark suite for the PDF generators, with a regression gate.
+
+Runs every PDFGeneratorRegistry document type, plus the generators in
+app/utils that are not registered (payslip, invoice, client invoice and
+offboarding letters), against synthetic small, typical and worst-case
+data: long names and addresses, large drawn signatures and hundreds of
+client-invoice cost lines. For each case it reports p50/p95 latency,
+peak Python memory (tracemalloc) and output size. It then compares them
+with the stored baseline and exits non-zero if any case regressed by
+more than --threshold. Latency is gated on the fastest timed run.
+
+The PDF cache is disabled so every call renders. Timings depend on the
+machine: record the baseline on the host that runs the check (e.g. the
+CI runner) with --update-baseline.
+
+Usage:
+    python -m benchmarks.pdf_generators [--runs 15] [--only quote_sheet]
+    python -m benchmarks.pdf_generators --update-baseline
+"""
+import argparse
+import base64
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date
+from io import BytesIO
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image as PILImage  # noqa: E402
+
+from app.adapters.pdf import PDFGeneratorRegistry, assets  # noqa: E402
+from app.config.settings import settings  # noqa: E402
+from app.utils.client_invoice_pdf import generate_client_invoice_pdf  # noqa: E402
+from app.utils.offboarding_pdf_generator import (  # noqa: E402
+    generate_clearance_certificate_pdf,
+    generate_experience_letter_pdf,
+    generate_termination_letter_pdf,
+)
+from app.utils.payroll_pdf import generate_invoice_pdf, generate_payslip_pdf  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "pdf_generators.json")
+SIZES = ("small", "typical", "worst")
+
+# Fields a document type expects in another form than the shared fixture
+# (the quote sheet passes form values straight to Paragraph, so strings)
+OVERRIDES = {
+    "quote_sheet": {"vacation_days": "30", "num_dependents": "3"},
+}
+
+# Metrics gated against the baseline. Latency is gated on the fastest run,
+# which is far less sensitive to noise from other processes than p50.
+GATED = ("min_ms", "peak_kib", "size_bytes")
+
+
+@functools.lru_cache(maxsize=None)
+def _signature(width: int, height: int) -> str:
+    """Noisy PNG data URI, so image encoding is not unrealistically cheap."""
+    buffer = BytesIO()
+    PILImage.effect_noise((width, height), 64).convert("RGBA").save(buffer, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+def _text(size: str, typical: str, repeat: int = 8) -> str:
+    """A field value: empty for small, long for worst-case."""
+    if size == "small":
+        return ""
+    return " ".join([typical] * repeat) if size == "worst" else typical
+
+
+def contractor_data(size: str) -> dict:
+    """Dict-based generator input (contract, work order, COHF, quote sheet, timesheet)."""
+    signature = {"small": None, "typical": _signature(600, 150), "worst": _signature(2400, 600)}[size]
+    data = {
+        "contractor_name": "Ada Lovelace",
+        "first_name": "Ada",
+        "surname": "Lovelace",
+        "employee_name": "Ada Lovelace",
+        "client_name": _text(size, "ACME Holdings International", 4) or "ACME",
+        "client_address": _text(size, "Building 5, Dubai Internet City, Dubai, UAE"),
+        "home_address": _text(size, "Villa 12, Arabian Ranches, Dubai"),
+        "role": "Senior Data Engineer",
+        "position": "Senior Data Engineer",
+        "location": "Dubai",
+        "project_name": _text(size, "Data platform migration", 6),
+        "start_date": "2026-11-01",
+        "end_date": "2027-04-30",
+        "duration": "6 months",
+        "candidate_pay_rate": "1500",
+        "charge_rate": "1800",
+        "rate_type": "daily",
+        "currency": "AED",
+        "work_order_number": "WO-2026-0042",
+        "month": "October 2026",
+        "work_days": 21,
+        "sick_days": 1,
+        "vacation_days": 2,
+        "holiday_days": 1,
+        "notes": _text(size, "Worked on the ingestion pipeline and on-call rota.", 20),
+        "basic_salary": "12,000",
+        "housing_allowance": "4,000",
+        "transportation_allowance": "1,000",
+        "employee_medical_annual": "6,500",
+        "fnrco_service_charge": "1,200",
+    }
+    if signature:
+        for prefix in ("aventus", "client", "cohf_aventus"):
+            data[f"{prefix}_signature_type"] = "drawn"
+            data[f"{prefix}_signature_data"] = signature
+            data[f"{prefix}_signed_date"] = "2026-10-16"
+        data["superadmin_signature"] = signature
+    if size == "worst":
+        data["logo_url"] = _signature(1600, 800)
+    return data
+
+
+def payroll_args(size: str) -> tuple:
+    payroll = SimpleNamespace(
+        id=1, period="October 2026", currency="AED", gross_pay=33000, net_salary=31500,
+        monthly_rate=33000, day_rate=1500, days_worked=22, total_calendar_days=31,
+        leave_deductibles=0 if size == "small" else 1, deductions=1500, expenses_reimbursement=250,
+        invoice_total=39600, vat_rate=0.05, vat_amount=1980, total_payable=41580,
+        total_accruals=0, management_fee=1200,
+    )
+    contractor = SimpleNamespace(
+        first_name="Ada", surname="Lovelace", role="Senior Data Engineer",
+        client_name=_text(size, "ACME Holdings International", 4) or "ACME",
+        contractor_bank_name="Emirates NBD", contractor_iban="AE070331234567890123456",
+        invoice_address_line1=_text(size, "Building 5, Dubai Internet City"), invoice_address_line2="Dubai",
+        invoice_country="UAE", client_payment_terms="Net 30",
+    )
+    return payroll, contractor
+
+
+def client_invoice_args(size: str) -> tuple:
+    lines = {"small": 1, "typical": 25, "worst": 400}[size]
+    invoice = SimpleNamespace(
+        invoice_number="CI-2026-10-0001", invoice_date=date(2026, 10, 31), due_date=date(2026, 11, 30),
+        payment_terms="Net 30", period="October 2026", currency="AED",
+        subtotal=1000.0 * lines, vat_rate=0.05, vat_amount=50.0 * lines, total_amount=1050.0 * lines,
+        amount_paid=0, balance=1050.0 * lines, notes=_text(size, "Payment by bank transfer only.", 10) or None,
+    )
+    client = SimpleNamespace(
+        company_name="ACME Holdings", address_line1="Building 5", address_line2="Dubai Internet City",
+        address_line3="Dubai", address_line4="UAE",
+    )
+    items = [
+        SimpleNamespace(
+            contractor_name=f"Contractor {i}",
+            description=_text(size, f"Consulting services, October 2026 ({i})", 3) or "Consulting",
+            subtotal=1000.0, vat_amount=50.0, total=1050.0,
+        )
+        for i in range(1, lines + 1)
+    ]
+    return invoice, client, items
+
+
+def offboarding_args(size: str) -> tuple:
+    offboarding = {
+        "id": "off-1",
+        "reason": "resignation",
+        "last_working_date": "2026-12-31",
+        "effective_termination_date": "2026-12-31",
+    }
+    return contractor_data(size), offboarding
+
+
+def _bytes(output) -> bytes:
+    """Generators return BytesIO; registry generators return PDFResult."""
+    if hasattr(output, "getvalue"):
+        return output.getvalue()
+    if not output.success:
+        raise RuntimeError(output.error)
+    return output.content
+
+
+def cases() -> List[Tuple[str, Callable[[], object]]]:
+    """(case id, render) for every generator and data size."""
+    found = []
+    for size in SIZES:
+        for document_type in sorted(PDFGeneratorRegistry.available_types()):
+            generator = PDFGeneratorRegistry.get(document_type)
+            data = {**contractor_data(size), **OVERRIDES.get(document_type, {})}
+            found.append((f"{document_type}/{size}", lambda g=generator, d=data: g.generate(dict(d))))
+
+        extras = {
+            "payslip": (generate_payslip_pdf, payroll_args(size)),
+            "invoice": (generate_invoice_pdf, payroll_args(size)),
+            "client_invoice": (generate_client_invoice_pdf, client_invoice_args(size)),
+            "termination_letter": (generate_termination_letter_pdf, offboarding_args(size)),
+            "experience_letter": (generate_experience_letter_pdf, offboarding_args(size)),
+            "clearance_certificate": (generate_clearance_certificate_pdf, offboarding_args(size)),
+        }
+        for name, (func, args) in extras.items():
+            found.append((f"{name}/{size}", lambda f=func, a=args: f(*a)))
+    return sorted(found)
+
+
+def percentile(samples: List[float], p: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def measure(render: Callable[[], object], runs: int) -> Dict[str, float]:
+    """Latency over `runs` calls after a warm-up, then peak memory of one more."""
+    content = _bytes(render())
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        render()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    try:
+        render()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "min_ms": round(min(samples), 3),
+        "p50_ms": round(percentile(samples, 0.5), 3),
+        "p95_ms": round(percentile(samples, 0.95), 3),
+        "peak_kib": round(peak / 1024, 1),
+        "size_bytes": len(content),
+    }
+
+
+def regressions(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float, min_delta_ms: float) -> List[str]:
+    """
+    Metrics more than `threshold` (fraction) above their baseline.
+
+    Latency must also be at least `min_delta_ms` slower, so scheduler noise
+    on renders of a few milliseconds does not fail the check.
+    """
+    failed = []
+    for case, metrics in results.items():
+        base = baseline.get(case)
+        if not base:
+            continue
+        for metric in GATED:
+            if not base.get(metric) or metrics[metric] <= base[metric] * (1 + threshold):
+                continue
+            if metric == "min_ms" and metrics[metric] - base[metric] < min_delta_ms:
+                continue
+            failed.append(f"{case} {metric}: {metrics[metric]} vs baseline {base[metric]}")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=15, help="Timed calls per case (default 15)")
+    parser.add_argument("--only", default="", help="Only run cases whose id contains this text")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed regression over the baseline as a fraction (default 0.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=10.0,
+                        help="Smallest latency increase counted as a regression (default 10)")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Write these results as the new baseline")
+    options = parser.parse_args()
+
+    settings.pdf_cache_enabled = False
+    assets.warm()
+
+    results = {}
+    print(f"{'Case':<34} {'p50 (ms)':>10} {'p95 (ms)':>10} {'Peak (KiB)':>11} {'Size (B)':>10}")
+    print("-" * 79)
+    for case, render in cases():
+        if options.only not in case:
+            continue
+        metrics = results[case] = measure(render, options.runs)
+        print(f"{case:<34} {metrics['p50_ms']:>10.2f} {metrics['p95_ms']:>10.2f} "
+              f"{metrics['peak_kib']:>11.1f} {metrics['size_bytes']:>10}")
+
+    if options.update_baseline:
+        baseline = {}
+        if options.only and os.path.exists(options.baseline):
+            with open(options.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        os.makedirs(os.path.dirname(options.baseline), exist_ok=True)
+        with open(options.baseline, "w") as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {options.baseline}")
+        return
+
+    if not os.path.exists(options.baseline):
+        print(f"\nNo baseline at {options.baseline}; run with --update-baseline to record one.")
+        return
+
+    with open(options.baseline) as f:
+        failed = regressions(results, json.load(f), options.threshold, options.min_delta_ms)
+    if failed:
+        print(f"\nRegressions beyond {options.threshold:.0%} of the baseline:")
+        for line in failed:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {options.threshold:.0%} of the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Consistency check for payroll batch totals.
+
+Batch contractor_count / total_net_salary / total_payable are maintained
+incrementally as payrolls are assigned, adjusted and removed. This script
+recomputes them from the payrolls with one grouped SUM and reports drift.
+
+Run: python check_batch_aggregates.py [--fix] [--batch-id ID]
+"""
+import argparse
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.database import SessionLocal
+import app.models  # noqa: F401 - register all tables
+from app.services.payroll_batch_service import recalculate_batch_aggregates
+
+
+def check(fix: bool = False, batch_id: int = None):
+    db = SessionLocal()
+    try:
+        corrected = recalculate_batch_aggregates(db, batch_id)
+        for entry in corrected:
+            print(f"[DRIFT] Batch {entry['batch_id']}: stored {entry['stored']} -> actual {entry['actual']}")
+
+        if not corrected:
+            print("[OK] All batch totals match their payrolls")
+        elif fix:
+            db.commit()
+            print(f"\n[SUCCESS] Rebuilt totals for {len(corrected)} batch(es)")
+        else:
+            db.rollback()
+            print(f"\n[WARNING] {len(corrected)} batch(es) out of date. Re-run with --fix to rebuild them.")
+            sys.exit(1)
+    except Exception as e:
+        db.rollback()
+        print(f"[ERROR] Error checking batch totals: {str(e)}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fix", action="store_true", help="Write the recomputed totals")
+    parser.add_argument("--batch-id", type=int, default=None, help="Only check this batch")
+    args = parser.parse_args()
+    check(fix=args.fix, batch_id=args.batch_id)
@@ -0,0 +1,48 @@
+"""
+Consistency check for the cached payroll status counters.
+
+When PAYROLL_STATUS_COUNTERS is on, payroll_status_counts is adjusted in
+the same transaction as every payroll change. This script recomputes the
+counts from the payrolls with one grouped COUNT and reports drift.
+
+Run: python check_status_counts.py [--fix]
+"""
+import argparse
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.database import SessionLocal
+import app.models  # noqa: F401 - register all tables
+from app.services.payroll_stats_service import reconcile_status_counts
+
+
+def check(fix: bool = False):
+    db = SessionLocal()
+    try:
+        corrected = reconcile_status_counts(db)
+        for entry in corrected:
+            print(f"[DRIFT] Status {entry['status']}: stored {entry['stored']} -> actual {entry['actual']}")
+
+        if not corrected:
+            print("[OK] All status counters match the payrolls")
+        elif fix:
+            db.commit()
+            print(f"\n[SUCCESS] Rebuilt counters for {len(corrected)} status(es)")
+        else:
+            db.rollback()
+            print(f"\n[WARNING] {len(corrected)} status counter(s) out of date. Re-run with --fix to rebuild them.")
+            sys.exit(1)
+    except Exception as e:
+        db.rollback()
+        print(f"[ERROR] Error checking status counters: {str(e)}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fix", action="store_true", help="Write the recomputed counters")
+    args = parser.parse_args()
+    check(fix=args.fix)
@@ -29,6 +29,38 @@ def mock_db_session():
     return session
 
 
+@pytest.fixture
+def db_engine():
+    """In-memory SQLite engine with every table, shared by all its sessions and threads."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import StaticPool
+    from app.database import Base
+    import app.models  # noqa: F401 - register all tables
+
+    engine = create_engine(
+        "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    """Session factory over the in-memory SQLite database."""
+    from sqlalchemy.orm import sessionmaker
+
+    return sessionmaker(bind=db_engine, autoflush=False)
+
+
+@pytest.fixture
+def test_db(session_factory):
+    """Fresh in-memory SQLite session per test."""
+    session = session_factory()
+    yield session
+    session.close()
+
+
 # =============================================================================
 # Contractor Fixtures
 # =============================================================================
@@ -0,0 +1,120 @@
+"""
+Unit tests for the consultant contract's template mode.
+
+Page streams are inflated so the rendered text can be checked without a
+PDF parser.
+"""
+import re
+import threading
+import zlib
+
+import pytest
+from reportlab import rl_config
+
+from app.adapters.pdf.assets import configure_reportlab
+from app.utils import contract_pdf_generator
+from app.utils.contract_pdf_generator import generate_consultant_contract_pdf
+
+CONTRACTOR = {
+    "first_name": "Ada",
+    "surname": "Lovelace",
+    "client_name": "ACME Holdings",
+    "role": "Data Engineer",
+    "candidate_pay_rate": "1500",
+    "currency": "AED",
+}
+
+
+def _pages_and_text(pdf: bytes):
+    streams = re.findall(rb"\nstream\r?\n(.*?)\r?\n?endstream", pdf, re.S)
+    text = b"".join(zlib.decompress(s) for s in streams if s.startswith(b"x"))
+    return pdf.count(b"/Type /Page\n"), text
+
+
+@pytest.fixture(autouse=True)
+def binary_streams(monkeypatch):
+    """Render as the app's processes do (see assets.configure_reportlab)."""
+    monkeypatch.setattr(rl_config, "useA85", rl_config.useA85)
+    configure_reportlab()
+
+
+@pytest.fixture(autouse=True)
+def fresh_template():
+    contract_pdf_generator._thread_template.cache_clear()
+    yield
+    contract_pdf_generator._thread_template.cache_clear()
+
+
+class TestContractTemplate:
+    """Tests for stamping into the pre-laid-out static pages."""
+
+    def test_template_render_matches_full_layout(self):
+        """Test both modes produce the same pages and per-contractor text."""
+        render = generate_consultant_contract_pdf.uncached
+        args = (CONTRACTOR, "typed", "Ada Lovelace", "typed", "Super Admin", "2026-10-16")
+
+        full_pages, full_text = _pages_and_text(render(*args, template=False).getvalue())
+        pages, text = _pages_and_text(render(*args, template=True).getvalue())
+
+        assert pages == full_pages == 5
+        for value in (b"Ada Lovelace", b"ACME Holdings", b"Data Engineer", b"1500 AED", b"Super Admin", b"2026-10-16"):
+            assert value in full_text
+            assert value in text
+        assert b"GOVERNING LAW" in text
+
+    def test_static_pages_laid_out_once(self, monkeypatch):
+        """Test later renders reuse the layout instead of rebuilding the story."""
+        calls = []
+        story = contract_pdf_generator._contract_story
+
+        def counting_story(block):
+            calls.append(block)
+            return story(block)
+
+        monkeypatch.setattr(contract_pdf_generator, "_contract_story", counting_story)
+
+        for name in ("Ada", "Grace", "Alan"):
+            pdf = generate_consultant_contract_pdf.uncached({**CONTRACTOR, "first_name": name}, template=True)
+            assert name.encode() in _pages_and_text(pdf.getvalue())[1]
+
+        assert len(calls) == 1
+
+    def test_threads_render_from_their_own_layout(self):
+        """Test concurrent renders neither share laid-out flowables nor wait on each other."""
+        results = {}
+        barrier = threading.Barrier(2)
+
+        def render(name):
+            layout = contract_pdf_generator.contract_template()
+            barrier.wait(timeout=10)
+            pdf = generate_consultant_contract_pdf.uncached({**CONTRACTOR, "first_name": name}, template=True)
+            results[name] = (layout, _pages_and_text(pdf.getvalue()))
+
+        threads = [threading.Thread(target=render, args=(name,)) for name in ("Ada", "Grace")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        (ada_layout, (ada_pages, ada_text)), (grace_layout, (grace_pages, grace_text)) = results["Ada"], results["Grace"]
+        assert ada_layout is not grace_layout
+        assert ada_pages == grace_pages == 5
+        assert b"Ada Lovelace" in ada_text and b"Grace" not in ada_text
+        assert b"Grace Lovelace" in grace_text
+        assert contract_pdf_generator.contract_template() is contract_pdf_generator.contract_template()
+
+    def test_oversized_block_is_shrunk_into_its_region(self):
+        """Test a block taller than its region does not push the static text."""
+        data = {**CONTRACTOR, "client_address": "Building 5, Dubai Internet City, Dubai " * 12}
+
+        pages, text = _pages_and_text(generate_consultant_contract_pdf.uncached(data, template=True).getvalue())
+
+        assert pages == 5
+        assert b"Dubai Internet City" in text
+
+    def test_cache_key_depends_on_mode(self):
+        """Test template and full renders are cached separately."""
+        template_key = generate_consultant_contract_pdf.cache_address(CONTRACTOR, template=True)
+        full_key = generate_consultant_contract_pdf.cache_address(CONTRACTOR, template=False)
+
+        assert template_key != full_key
@@ -149,6 +149,41 @@ class TestEmailTemplateEngine:
         # Default context should include company_name
         assert html is not None
 
+    def test_precompile_compiles_every_template(self, engine):
+        """Test precompile() compiles each email template up front."""
+        templates = [t for t in engine.env.list_templates() if t.startswith("email/")]
+
+        assert engine.precompile() == len(templates)
+        assert len(engine.env.cache) == len(templates)
+
+    def test_bytecode_cache_shared_across_engines(self, tmp_path, monkeypatch):
+        """Test compiled templates are written to and reused from disk."""
+        from app.adapters.email import template_engine
+
+        monkeypatch.setattr(template_engine.settings, "email_template_cache_dir", str(tmp_path))
+        EmailTemplateEngine().precompile()
+        cached = sorted(p.name for p in tmp_path.iterdir())
+
+        assert cached
+        html = EmailTemplateEngine().render("password_reset", name="Ada", reset_link="https://example.com/r")
+        assert "Ada" in html
+        assert sorted(p.name for p in tmp_path.iterdir()) == cached
+
+    def test_branding_fragments_memoized(self, engine):
+        """Test base.html styles, header and footer render once per branding."""
+        first = engine.render("document_upload", contractor_name="Ada", upload_link="x", expiry_date="Jan 15")
+        engine.render("activation", contractor_name="Grace", login_link="x")
+
+        assert len(engine._fragments) == 3
+        assert ".cta-button" in first
+        assert "automated message" in first
+
+        branded = engine.render("document_upload", company_name="Acme HR", contractor_name="Ada", upload_link="x")
+
+        assert len(engine._fragments) == 6
+        assert '<h1 class="header-title">Acme HR</h1>' in branded
+        assert "Acme HR. All rights reserved." in branded
+
 
 class TestEmailMessage:
     """Tests for EmailMessage dataclass."""
@@ -0,0 +1,152 @@
+"""
+Unit tests for the shared PDF style and asset registry.
+"""
+import base64
+import subprocess
+import sys
+from io import BytesIO
+
+import pytest
+from PIL import Image as PILImage
+from reportlab import rl_config
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate
+
+from app.adapters.pdf import assets
+from app.adapters.pdf.base import BasePDFGenerator
+
+
+class TestStyles:
+    """Tests for sample_styles() and style_set."""
+
+    def test_style_set_builds_once_and_is_read_only(self):
+        """Test the builder runs once and the mapping cannot be changed."""
+        calls = []
+
+        @assets.style_set
+        def styles(sample):
+            calls.append(sample)
+            return {"body": ParagraphStyle("Body", parent=sample["Normal"], fontSize=10)}
+
+        assert styles() is styles()
+        assert styles()["body"].fontSize == 10
+        assert len(calls) == 1
+        with pytest.raises(TypeError):
+            styles()["body"] = None
+
+    def test_sample_styles_include_aliases(self):
+        """Test styles are reachable by name and alias like a stylesheet."""
+        sample = assets.sample_styles()
+
+        assert sample["Heading1"] is sample["h1"]
+
+    def test_base_generator_styles_override_sample_body_text(self):
+        """Test the base generator can be built (its BodyText used to clash)."""
+        class Generator(BasePDFGenerator):
+            document_type = "test"
+
+            def build_content(self, data):
+                return []
+
+            def get_template_fields(self):
+                return []
+
+        first, second = Generator(), Generator()
+
+        assert first.styles is second.styles
+        assert first.styles["BodyText"].fontSize == 10
+        assert "FieldLabel" in first.styles
+
+
+class TestLogos:
+    """Tests for pre-decoded logos."""
+
+    def test_logo_decoded_once_and_shared(self):
+        """Test each flowable is new but draws the same decoded image."""
+        first = assets.logo_image("av-logo.png", width=40, height=12)
+        second = assets.logo_image("av-logo.png", width=80, height=24, hAlign="LEFT")
+
+        assert first is not second
+        assert first._img is second._img
+        assert (second.drawWidth, second.hAlign) == (80, "LEFT")
+
+    def test_missing_logo_returns_none(self):
+        """Test callers can fall back when a logo is not available."""
+        assert assets.logo_image("no-such-logo.png") is None
+
+    def test_shared_logo_renders(self):
+        """Test a shared logo draws into a document."""
+        buffer = BytesIO()
+        SimpleDocTemplate(buffer).build([assets.logo_image("av-logo.png", width=40, height=12)])
+
+        assert buffer.getvalue().startswith(b"%PDF")
+
+
+def _png_data_uri(size=(1200, 400)) -> str:
+    buffer = BytesIO()
+    PILImage.new("RGBA", size, (0, 0, 0, 0)).save(buffer, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+class TestDataImages:
+    """Tests for the decoded signature/data-URI LRU."""
+
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        assets._data_images.clear()
+        yield
+        assets._data_images.clear()
+
+    def test_same_data_decoded_once_and_pre_scaled(self, monkeypatch):
+        """Test a signature is decoded once, with or without its data URL prefix."""
+        decodes = []
+        decode = assets._decode_data_image
+        monkeypatch.setattr(assets, "_decode_data_image", lambda payload: decodes.append(payload) or decode(payload))
+        data_uri = _png_data_uri()
+
+        first = assets.data_image(data_uri, width=60, height=15)
+        second = assets.data_image(data_uri.split(",", 1)[1], width=45, height=15)
+
+        assert len(decodes) == 1
+        assert first._img is second._img
+        assert max(first._img.getSize()) == assets.SIGNATURE_MAX_PX
+
+    def test_cache_is_bounded(self, monkeypatch):
+        """Test the least recently used signature is evicted past the limit."""
+        monkeypatch.setattr(assets.settings, "pdf_signature_cache_size", 2)
+        first, second, third = (_png_data_uri((10 + i, 10)) for i in range(3))
+
+        assets.data_image_reader(first)
+        assets.data_image_reader(second)
+        assets.data_image_reader(first)
+        assets.data_image_reader(third)
+
+        assert len(assets._data_images) == 2
+        assert assets.data_image_reader(first) is not None
+        assert assets._data_images.popitem(last=False)[1].getSize() == (12, 10)
+
+    def test_invalid_data_returns_none(self):
+        """Test callers can fall back when a signature cannot be decoded."""
+        assert assets.data_image("data:image/png;base64,bm90IGFuIGltYWdl") is None
+
+
+class TestReportLabConfig:
+    """Tests for the process-wide ReportLab settings."""
+
+    def test_import_leaves_reportlab_defaults(self):
+        """Test importing the assets module does not change global ReportLab output."""
+        code = "from app.adapters.pdf import assets; from reportlab import rl_config; print(rl_config.useA85)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == "1"
+
+    def test_configure_writes_binary_streams(self, monkeypatch):
+        """Test configured renders skip ASCII85 encoding."""
+        monkeypatch.setattr(rl_config, "useA85", 1)
+        assets.configure_reportlab()
+        buffer = BytesIO()
+
+        SimpleDocTemplate(buffer).build([assets.logo_image("av-logo.png", width=40, height=12)])
+
+        assert rl_config.useA85 == 0
+        assert b"/ASCII85Decode" not in buffer.getvalue()
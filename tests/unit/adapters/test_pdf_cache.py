@@ -0,0 +1,157 @@
+"""
+Unit tests for the content-addressed PDF cache.
+"""
+import os
+import time
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+
+from app.adapters.pdf import cache as pdf_cache_module
+from app.adapters.pdf.cache import PDFCache, cache_key, cached_pdf
+from app.config import settings
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    """Swap in an empty memory-only cache."""
+    cache = PDFCache(max_memory_bytes=1024 * 1024)
+    monkeypatch.setattr(pdf_cache_module, "pdf_cache", cache)
+    monkeypatch.setattr(settings, "pdf_cache_enabled", True)
+    return cache
+
+
+class TestCacheKey:
+    """Tests for cache_key()."""
+
+    def test_key_ignores_dict_order(self):
+        """Test equal data in a different order hashes the same."""
+        assert cache_key("cohf", 1, {"a": 1, "b": [1, 2]}) == cache_key("cohf", 1, {"b": [1, 2], "a": 1})
+
+    def test_key_covers_generator_version_and_signature(self):
+        """Test name, version and signature bytes all change the key."""
+        base = cache_key("contract", 1, {"signature": b"sig-1"})
+
+        assert cache_key("cohf", 1, {"signature": b"sig-1"}) != base
+        assert cache_key("contract", 2, {"signature": b"sig-1"}) != base
+        assert cache_key("contract", 1, {"signature": b"sig-2"}) != base
+
+
+class TestPDFCache:
+    """Tests for the two cache tiers."""
+
+    def test_memory_tier_evicts_least_recently_used(self):
+        """Test total bytes stay under the bound."""
+        cache = PDFCache(max_memory_bytes=10)
+        cache.put("a", b"12345")
+        cache.put("b", b"12345")
+        cache.get("a")
+        cache.put("c", b"12345")
+
+        assert cache.get("a") == b"12345"
+        assert cache.get("b") is None
+        assert cache.get("c") == b"12345"
+
+    def test_disk_tier_survives_a_new_process(self, tmp_path):
+        """Test a second cache instance reads what the first wrote."""
+        PDFCache(max_memory_bytes=1024, directory=str(tmp_path)).put("ab12", b"%PDF-1.4")
+
+        assert PDFCache(max_memory_bytes=1024, directory=str(tmp_path)).get("ab12") == b"%PDF-1.4"
+
+    def test_disk_tier_pruned_by_age_then_size(self, tmp_path):
+        """Test expired files go first, then the least recently used until the tier fits."""
+        cache = PDFCache(max_memory_bytes=1024, directory=str(tmp_path), max_disk_bytes=10, max_disk_age=3600)
+        for key in ("aa01", "bb02", "cc03", "dd04"):
+            cache.put(key, b"12345")
+        now = time.time()
+        os.utime(cache._path("aa01"), (now - 7200, now - 7200))  # Expired
+        os.utime(cache._path("bb02"), (now - 60, now - 60))  # Least recently used
+
+        assert cache.prune_disk() == 2
+        assert [os.path.exists(cache._path(key)) for key in ("aa01", "bb02", "cc03", "dd04")] == [
+            False, False, True, True,
+        ]
+
+    def test_disk_files_are_private(self, tmp_path):
+        """Test cached PDFs are readable by the service user only."""
+        cache = PDFCache(max_memory_bytes=1024, directory=str(tmp_path))
+        cache.put("ab12", b"%PDF-1.4")
+
+        assert os.stat(cache._path("ab12")).st_mode & 0o077 == 0
+
+
+class TestCachedPdf:
+    """Tests for the cached_pdf decorator."""
+
+    def _generator(self, calls):
+        @cached_pdf("test_doc", version=1)
+        def generate(data: dict) -> BytesIO:
+            calls.append(data)
+            return BytesIO(f"%PDF {data['name']}".encode())
+        return generate
+
+    def test_repeat_render_is_served_from_cache(self, fresh_cache):
+        """Test identical input renders once and changed input re-renders."""
+        calls = []
+        generate = self._generator(calls)
+
+        first = generate({"name": "Jane"})
+        second = generate({"name": "Jane"})
+        changed = generate({"name": "John"})
+
+        assert len(calls) == 2
+        assert first.getvalue() == second.getvalue() == b"%PDF Jane"
+        assert changed.getvalue() == b"%PDF John"
+        assert second.tell() == 0
+
+    def test_disabled_cache_always_renders(self, fresh_cache, monkeypatch):
+        """Test the setting turns caching off."""
+        monkeypatch.setattr(settings, "pdf_cache_enabled", False)
+        calls = []
+        generate = self._generator(calls)
+
+        generate({"name": "Jane"})
+        generate({"name": "Jane"})
+
+        assert len(calls) == 2
+
+    def test_payslip_key_tracks_record_changes(self, fresh_cache):
+        """Test a payslip re-renders after the payroll changes."""
+        from app.utils.payroll_pdf import generate_payslip_pdf
+
+        payroll = SimpleNamespace(
+            id=1, period="January 2026", currency="AED", gross_pay=10000.0, net_salary=10000.0,
+            monthly_rate=10000.0, day_rate=None, days_worked=22, total_calendar_days=31,
+            leave_deductibles=0, deductions=0, expenses_reimbursement=0,
+        )
+        contractor = SimpleNamespace(
+            first_name="Jane", surname="Doe", role="Engineer", client_name="ACME",
+            contractor_bank_name=None, contractor_iban=None,
+        )
+
+        first = generate_payslip_pdf(payroll, contractor).getvalue()
+        assert generate_payslip_pdf(payroll, contractor).getvalue() == first
+        assert fresh_cache.hits == 1
+
+        payroll.net_salary = 9000.0
+        generate_payslip_pdf(payroll, contractor)
+        assert fresh_cache.misses == 2
+
+    def test_daily_renders_stay_off_disk(self, monkeypatch, tmp_path):
+        """Test renders keyed by today's date are cached in memory only."""
+        cache = PDFCache(max_memory_bytes=1024 * 1024, directory=str(tmp_path))
+        monkeypatch.setattr(pdf_cache_module, "pdf_cache", cache)
+        monkeypatch.setattr(settings, "pdf_cache_enabled", True)
+        calls = []
+
+        @cached_pdf("test_letter", daily=True)
+        def generate(data: dict) -> BytesIO:
+            calls.append(data)
+            return BytesIO(b"%PDF letter")
+
+        generate({"name": "Jane"})
+        generate({"name": "Jane"})
+
+        assert len(calls) == 1
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,157 @@
+"""
+Unit tests for the PDF render service.
+"""
+import threading
+import time
+from io import BytesIO
+
+import pytest
+
+from app.adapters.pdf import cache as pdf_cache_module
+from app.adapters.pdf import render_service as render_service_module
+from app.adapters.pdf.cache import PDFCache, cached_pdf
+from app.adapters.pdf.interface import PDFResult
+from app.adapters.pdf.registry import PDFGeneratorRegistry
+from app.adapters.pdf.render_service import PDFRenderService, PDFRenderTimeout
+from app.config import settings
+from app.utils.cohf_pdf_generator import generate_cohf_pdf
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    """Swap in an empty memory-only cache."""
+    cache = PDFCache(max_memory_bytes=1024 * 1024)
+    monkeypatch.setattr(pdf_cache_module, "pdf_cache", cache)
+    monkeypatch.setattr(settings, "pdf_cache_enabled", True)
+    return cache
+
+
+@pytest.fixture
+def service():
+    """Thread-backed service (workers=0) so tests need no child processes."""
+    svc = PDFRenderService(workers=0, timeout_seconds=5)
+    yield svc
+    svc.shutdown()
+
+
+def _fake_pdf(text: str) -> BytesIO:
+    return BytesIO(f"%PDF {text}".encode())
+
+
+class TestRender:
+    """Tests for PDFRenderService.render()."""
+
+    @pytest.mark.asyncio
+    async def test_renders_off_the_calling_thread(self, service):
+        """Test the generator runs on the render thread and bytes come back."""
+        threads = []
+
+        def generator(text):
+            threads.append(threading.current_thread().name)
+            return _fake_pdf(text)
+
+        buffer = await service.render(generator, "hello")
+
+        assert buffer.getvalue() == b"%PDF hello"
+        assert threads[0].startswith("pdf-render")
+        assert service.stats()["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_the_pool(self, service, fresh_cache):
+        """Test a cached generator renders once for the same data."""
+        calls = []
+
+        @cached_pdf("render-test")
+        def generator(data):
+            calls.append(data)
+            return _fake_pdf(data["name"])
+
+        first = await service.render(generator, {"name": "a"})
+        second = await service.render(generator, {"name": "a"})
+
+        assert first.getvalue() == second.getvalue() == b"%PDF a"
+        assert len(calls) == 1
+        assert service.stats()["completed"] == 1
+        assert fresh_cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_daily_renders_stay_off_disk(self, service, monkeypatch, tmp_path):
+        """Test a render keyed by today's date is cached in memory only."""
+        cache = PDFCache(max_memory_bytes=1024 * 1024, directory=str(tmp_path))
+        monkeypatch.setattr(pdf_cache_module, "pdf_cache", cache)
+        monkeypatch.setattr(settings, "pdf_cache_enabled", True)
+
+        @cached_pdf("render-daily", daily=True)
+        def daily(data):
+            return _fake_pdf(data["name"])
+
+        @cached_pdf("render-stable")
+        def stable(data):
+            return _fake_pdf(data["name"])
+
+        await service.render(daily, {"name": "a"})
+        assert list(tmp_path.iterdir()) == []
+        assert (await service.render(daily, {"name": "a"})).getvalue() == b"%PDF a"
+        assert cache.hits == 1
+
+        await service.render(stable, {"name": "a"})
+        assert len(list(tmp_path.rglob("*.pdf"))) == 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_raises_and_is_counted(self, service):
+        """Test a slow render raises PDFRenderTimeout."""
+        def slow(_):
+            time.sleep(0.5)
+            return _fake_pdf("late")
+
+        with pytest.raises(PDFRenderTimeout):
+            await service.render(slow, "x", timeout=0.05)
+
+        stats = service.stats()
+        assert stats["timeouts"] == 1
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_generator_errors_propagate(self, service):
+        """Test failures reach the caller and are counted."""
+        def broken(_):
+            raise ValueError("bad data")
+
+        with pytest.raises(ValueError, match="bad data"):
+            await service.render(broken, "x")
+
+        assert service.stats()["failed"] == 1
+        assert service.stats()["completed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_process_pool_renders_cached_generator(self, fresh_cache):
+        """Test a real generator is picklable and renders in a worker process."""
+        svc = PDFRenderService(workers=1, timeout_seconds=120)
+        try:
+            buffer = await svc.render(generate_cohf_pdf, {"first_name": "Ada", "surname": "Lovelace"}, {})
+        finally:
+            svc.shutdown()
+
+        assert buffer.getvalue().startswith(b"%PDF")
+        assert svc.stats()["latency_ms"]["max"] is not None
+
+
+class TestRegistryRender:
+    """Tests for PDFGeneratorRegistry.render()."""
+
+    @pytest.mark.asyncio
+    async def test_registry_render_uses_service(self, monkeypatch, service):
+        """Test document types render through the service."""
+        monkeypatch.setattr(render_service_module, "pdf_render_service", service)
+
+        result = await PDFGeneratorRegistry.render("timesheet", {"contractor_name": "Ada"})
+
+        assert isinstance(result, PDFResult)
+        assert result.success
+        assert result.content.startswith(b"%PDF")
+
+    @pytest.mark.asyncio
+    async def test_unknown_type_fails_fast(self):
+        """Test unknown document types raise before anything is queued."""
+        with pytest.raises(KeyError):
+            await PDFGeneratorRegistry.render("no_such_document", {})
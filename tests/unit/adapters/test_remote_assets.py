@@ -0,0 +1,122 @@
+"""
+Unit tests for the disk-backed remote PDF asset cache.
+
+The network is replaced by a fake urlopen that serves one PNG and
+answers conditional requests with 304.
+"""
+import email.message
+import time
+import urllib.error
+from io import BytesIO
+
+import pytest
+from PIL import Image as PILImage
+
+from app.adapters.pdf import remote_assets
+from app.adapters.pdf.remote_assets import RemoteAssetCache
+
+URL = "https://cdn.example.com/logo.png"
+
+
+class FakeServer:
+    """Serves a PNG with an ETag and records every request."""
+
+    def __init__(self):
+        self.requests = []
+        self.etag = '"v1"'
+        self.fail = False
+        self.body = self._png((40, 20))
+
+    @staticmethod
+    def _png(size):
+        buffer = BytesIO()
+        PILImage.new("RGB", size, (255, 107, 0)).save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    def urlopen(self, request, timeout=None):
+        self.requests.append(dict(request.header_items()))
+        if self.fail:
+            raise urllib.error.URLError("unreachable")
+        headers = email.message.Message()
+        headers["ETag"] = self.etag
+        if request.get_header("If-none-match") == self.etag:
+            raise urllib.error.HTTPError(request.full_url, 304, "Not Modified", headers, None)
+        response = BytesIO(self.body)
+        response.headers = headers
+        return response
+
+
+@pytest.fixture
+def server(monkeypatch):
+    fake = FakeServer()
+    monkeypatch.setattr(remote_assets.urllib.request, "urlopen", fake.urlopen)
+    return fake
+
+
+@pytest.fixture
+def revalidate_inline(monkeypatch):
+    """Run background revalidation on the calling thread."""
+    class InlineThread:
+        def __init__(self, target, args, daemon):
+            self.run = lambda: target(*args)
+
+        def start(self):
+            self.run()
+
+    monkeypatch.setattr(remote_assets.threading, "Thread", InlineThread)
+
+
+class TestRemoteAssetCache:
+    """Tests for fetching, serving from disk and revalidating."""
+
+    def test_first_fetch_stored_on_disk_and_reused(self, tmp_path, server):
+        """Test a logo is fetched once and later processes load it from disk."""
+        cache = RemoteAssetCache(str(tmp_path), ttl_seconds=60, timeout_seconds=1)
+
+        reader = cache.get(URL)
+        assert reader.getSize() == (40, 20)
+        assert cache.get(URL) is reader
+
+        other_process = RemoteAssetCache(str(tmp_path), ttl_seconds=60, timeout_seconds=1)
+        assert other_process.get(URL).getSize() == (40, 20)
+        assert len(server.requests) == 1
+
+    def test_stale_copy_served_then_revalidated_with_etag(self, tmp_path, server, revalidate_inline):
+        """Test an expired copy is still served and revalidated conditionally."""
+        cache = RemoteAssetCache(str(tmp_path), ttl_seconds=60, timeout_seconds=1)
+        reader = cache.get(URL)
+        cache._entries[URL].checked_at = time.time() - 120
+
+        assert cache.get(URL) is reader
+        assert server.requests[-1]["If-none-match"] == '"v1"'
+        assert time.time() - cache._entries[URL].checked_at < 5
+
+    def test_changed_logo_replaces_stale_copy(self, tmp_path, server, revalidate_inline):
+        """Test a 200 on revalidation swaps in the new logo for later renders."""
+        cache = RemoteAssetCache(str(tmp_path), ttl_seconds=0, timeout_seconds=1)
+        cache.get(URL)
+        server.etag, server.body = '"v2"', server._png((60, 20))
+
+        cache.get(URL)
+
+        assert cache.get(URL).getSize() == (60, 20)
+
+    def test_unreachable_host_keeps_serving_the_cached_copy(self, tmp_path, server, revalidate_inline):
+        """Test a failed revalidation keeps the stale copy until the next TTL."""
+        cache = RemoteAssetCache(str(tmp_path), ttl_seconds=60, timeout_seconds=1)
+        reader = cache.get(URL)
+        cache._entries[URL].checked_at = time.time() - 120
+        server.fail = True
+
+        assert cache.get(URL) is reader
+        assert cache.get(URL) is reader
+        assert len(server.requests) == 2
+
+    def test_failed_first_fetch_is_not_retried_every_render(self, tmp_path, server):
+        """Test an unreachable URL is only tried once per retry window."""
+        server.fail = True
+        cache = RemoteAssetCache(str(tmp_path), ttl_seconds=60, timeout_seconds=1)
+
+        assert cache.get(URL) is None
+        assert cache.get(URL) is None
+        assert len(server.requests) == 1
@@ -1,6 +1,8 @@
 """
 Unit tests for storage adapters.
 """
+import threading
+
 import pytest
 from unittest.mock import MagicMock, AsyncMock
 from datetime import datetime
@@ -243,6 +245,41 @@ class TestInMemoryStorageAdapter:
         assert "signed=true" in url
 
 
+class TestSupabaseStorageAdapter:
+    """Tests for SupabaseStorageAdapter over a fake synchronous client."""
+
+    @pytest.fixture
+    def adapter(self):
+        from app.adapters.storage.supabase_adapter import SupabaseStorageAdapter
+
+        adapter = SupabaseStorageAdapter.__new__(SupabaseStorageAdapter)
+        adapter.client = MagicMock()
+        self.threads = []
+        bucket = adapter.client.storage.from_.return_value
+
+        def record(result):
+            def call(*args, **kwargs):
+                self.threads.append(threading.current_thread())
+                return result
+            return call
+
+        bucket.upload.side_effect = record({})
+        bucket.download.side_effect = record(b"%PDF")
+        bucket.get_public_url.return_value = "https://example.com/doc.pdf"
+        return adapter
+
+    @pytest.mark.asyncio
+    async def test_client_calls_run_off_the_event_loop(self, adapter):
+        """Test the blocking client calls run in worker threads."""
+        upload = await adapter.upload("bucket", "doc.pdf", b"%PDF", content_type="application/pdf")
+        content = await adapter.download("bucket", "doc.pdf")
+
+        assert upload.success is True
+        assert content == b"%PDF"
+        assert len(self.threads) == 2
+        assert threading.current_thread() not in self.threads
+
+
 class TestStorageFile:
     """Tests for StorageFile dataclass."""
 
@@ -0,0 +1,145 @@
+"""
+Unit tests for columnar payroll calculation.
+
+Checks PayrollCalculatorFactory.calculate_many() against the scalar
+calculators row by row.
+"""
+import random
+from decimal import Decimal
+
+import pytest
+
+from app.domain.payroll import (
+    ContractorPayInfo,
+    LeaveAdjustment,
+    Money,
+    PayrollCalculatorFactory,
+    RateType,
+)
+
+
+MONTHS = [
+    "January 2024", "February 2024", "February 2025", "April 2026",
+    "December 2026", "not a period",
+]
+
+
+def _pay_info(rng, rate_type, currency="AED"):
+    return ContractorPayInfo(
+        rate_type=rate_type,
+        currency=currency,
+        monthly_rate=round(rng.uniform(3000, 90000), 2),
+        day_rate=round(rng.uniform(100, 4000), 2),
+        charge_rate_month=None,
+        charge_rate_day=None,
+        leave_allowance=30,
+        third_party_name="TP",
+        management_fee=round(rng.uniform(0, 2500), 2),
+        accrual_gratuity=round(rng.uniform(0, 1500), 2),
+        accrual_airfare=round(rng.uniform(0, 800), 2),
+        accrual_annual_leave=round(rng.uniform(0, 900), 3),
+        country=rng.choice(["UAE", "Saudi Arabia", "KSA", "Dubai", ""]),
+        client_name="ACME",
+    )
+
+
+def _leave(rng, info):
+    deductible = Decimal(str(round(rng.uniform(0, 400), 2))) if rng.random() < 0.3 else Decimal("0")
+    return LeaveAdjustment(
+        leave_allowance=30,
+        carry_over_leave=0,
+        total_leave_allowance=30,
+        total_leave_taken=0,
+        leave_balance=30,
+        leave_deductibles=Money(deductible, info.currency),
+    )
+
+
+def _book(size, seed=7):
+    """Generate a deterministic book of scalar calculator arguments."""
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(size):
+        info = _pay_info(rng, rng.choice([RateType.MONTHLY, RateType.DAILY]), rng.choice(["AED", "SAR", "USD"]))
+        rows.append({
+            "contractor_info": info,
+            "days_worked": rng.choice([0, 1, 10.5, 19, 22, 30, round(rng.uniform(0, 31), 1)]),
+            "period": rng.choice(MONTHS),
+            "leave_adjustment": _leave(rng, info),
+            "manual_accruals": {"accrual_gosi": round(rng.uniform(0, 300), 2), "accrual_other": rng.choice([0, 12.5])},
+            "expenses_reimbursement": rng.choice([0, 49.99, round(rng.uniform(0, 2000), 2)]),
+        })
+    return rows
+
+
+def _columns(rows):
+    return PayrollCalculatorFactory.to_columns(
+        contractor_infos=[r["contractor_info"] for r in rows],
+        days_worked=[r["days_worked"] for r in rows],
+        periods=[r["period"] for r in rows],
+        leave_adjustments=[r["leave_adjustment"] for r in rows],
+        manual_accruals=[r["manual_accruals"] for r in rows],
+        expenses_reimbursements=[r["expenses_reimbursement"] for r in rows],
+    )
+
+
+class TestCalculateMany:
+    """Tests for PayrollCalculatorFactory.calculate_many()."""
+
+    def test_parity_with_scalar_calculators(self):
+        """Test every row matches the scalar calculator exactly."""
+        rows = _book(500)
+        table = PayrollCalculatorFactory.calculate_many(_columns(rows))
+
+        assert len(table) == len(rows)
+        for i, args in enumerate(rows):
+            calculator = PayrollCalculatorFactory.create(args["contractor_info"].rate_type)
+            try:
+                scalar = calculator.calculate(**args)
+            except ValueError as exc:
+                assert table.errors[i] is not None, f"row {i}: scalar raised {exc}"
+                continue
+
+            assert table.errors[i] is None
+            assert table.prorata_day_rate[i] == scalar.prorata_day_rate.amount
+            assert table.gross_pay[i] == scalar.gross_pay.amount
+            assert table.net_salary[i] == scalar.net_salary.amount
+            assert table.invoice_total[i] == scalar.invoice_total.amount
+            assert table.vat_amount[i] == scalar.vat_amount.amount
+            assert table.total_payable[i] == scalar.total_payable.amount
+            assert table.currency[i] == scalar.net_salary.currency
+
+    def test_missing_rate_is_reported_per_row(self):
+        """Test a row without a rate fails alone instead of raising."""
+        rows = _book(3)
+        info = rows[1]["contractor_info"]
+        rows[1]["contractor_info"] = ContractorPayInfo(**{**info.__dict__, "rate_type": RateType.DAILY, "day_rate": None})
+
+        table = PayrollCalculatorFactory.calculate_many(_columns(rows))
+
+        assert table.errors[1] == "Day rate not configured for this contractor"
+        assert table.row(1)["net_salary"] is None
+        assert table.errors[0] is None and table.errors[2] is None
+
+    def test_deductibles_exceeding_pay_are_rejected(self):
+        """Test rows the scalar path rejects as negative are flagged."""
+        rows = _book(1)
+        info = rows[0]["contractor_info"]
+        rows[0]["contractor_info"] = ContractorPayInfo(**{**info.__dict__, "rate_type": RateType.MONTHLY})
+        rows[0]["days_worked"] = 0
+        rows[0]["leave_adjustment"] = LeaveAdjustment(
+            leave_allowance=30, carry_over_leave=0, total_leave_allowance=30,
+            total_leave_taken=35, leave_balance=-5,
+            leave_deductibles=Money(Decimal("100"), info.currency),
+        )
+
+        table = PayrollCalculatorFactory.calculate_many(_columns(rows))
+
+        assert table.errors[0] == "Amount cannot be negative"
+
+    def test_mismatched_column_lengths_raise(self):
+        """Test columns of different lengths are rejected."""
+        columns = _columns(_book(2))
+
+        with pytest.raises(ValueError):
+            type(columns)(**{**columns.__dict__, "rate": columns.rate[:1]})
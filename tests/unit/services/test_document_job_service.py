@@ -0,0 +1,273 @@
+"""
+Unit tests for asynchronous document generation jobs.
+
+Uses an in-memory SQLite database shared between sessions, in-memory
+storage, a thread-backed PDF render service and a test generator
+registered for the duration of each test.
+"""
+import threading
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi import BackgroundTasks, HTTPException
+
+from app.adapters.pdf import PDFGeneratorRegistry, PDFResult
+from app.adapters.pdf import render_service as render_service_module
+from app.adapters.pdf.render_service import PDFRenderService
+from app.adapters.storage import MemoryStorageAdapter
+from app.models.contractor import Contractor, ContractorStatus, OnboardingRoute
+from app.config.settings import settings
+from app.models.document_job import DocumentJob, DocumentJobStatus
+from app.models.offboarding import OffboardingReason, OffboardingRecord, OffboardingStatus
+from app.models.user import User, UserRole
+from app.routes.jobs import allowed_document_types, create_job, retry_job
+from app.schemas.document_job import DocumentJobCreate
+from app.services import signed_document_service
+from app.services.document_job_service import (
+    create_document_job,
+    process_document_job,
+    get_document_job,
+    reclaim_stale_jobs,
+)
+from app.services.offboarding_service import OffboardingService
+
+
+class LetterGenerator:
+    """Registry generator that echoes its input."""
+
+    document_type = "test_letter"
+    calls = []
+
+    def validate_data(self, data):
+        return [f for f in ("contractor_name",) if f not in data]
+
+    def generate(self, data):
+        self.calls.append(data)
+        if data.get("fail"):
+            return PDFResult(success=False, error="Template missing")
+        return PDFResult(success=True, content=f"%PDF {data['contractor_name']}".encode(), filename="letter.pdf")
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    """Thread-backed render service, in-memory storage and the test generator."""
+    service = PDFRenderService(workers=0, timeout_seconds=5)
+    memory = MemoryStorageAdapter()
+    monkeypatch.setattr(render_service_module, "pdf_render_service", service)
+    monkeypatch.setattr(signed_document_service, "_storage", memory)
+    monkeypatch.setitem(PDFGeneratorRegistry._generators, "test_letter", LetterGenerator)
+    monkeypatch.setitem(PDFGeneratorRegistry._instances, "test_letter", LetterGenerator())
+    LetterGenerator.calls.clear()
+    yield memory
+    service.shutdown()
+
+
+def _offboarding(db):
+    """An active contractor whose offboarding awaits its documents."""
+    db.add(Contractor(
+        id="contractor-1", first_name="Ada", surname="Doe", gender="female",
+        nationality="UAE", phone="+971000000", email="ada@example.com", dob="1990-01-01",
+        currency="AED", status=ContractorStatus.ACTIVE, onboarding_route=OnboardingRoute.FREELANCER,
+    ))
+    db.add(OffboardingRecord(
+        id="offboarding-1", contractor_id="contractor-1", reason=OffboardingReason.RESIGNATION,
+        status=OffboardingStatus.PENDING_DOCUMENTS, initiated_by="admin-1",
+        last_working_date=date(2026, 11, 30),
+    ))
+    db.commit()
+
+
+class TestDocumentJobs:
+    """Tests for queueing, processing and polling jobs."""
+
+    def test_unknown_type_and_missing_fields_rejected(self, session_factory, storage):
+        """Test invalid requests are refused without creating a job."""
+        db = session_factory()
+
+        assert "Unknown document type" in create_document_job(db, "nope", {})["error"]
+        assert "contractor_name" in create_document_job(db, "test_letter", {})["error"]
+        assert db.query(DocumentJob).count() == 0
+
+    @pytest.mark.asyncio
+    async def test_job_renders_and_stores_result(self, session_factory, storage):
+        """Test a queued job ends COMPLETED with the stored document's URL."""
+        db = session_factory()
+        result = create_document_job(db, "test_letter", {"contractor_name": "Ada"}, requested_by=None)
+        db.commit()
+
+        assert get_document_job(db, result["job_id"])["status"] == "queued"
+
+        job = await process_document_job(result["job_id"], session_factory=session_factory)
+
+        key = f"document-jobs/test_letter/{result['job_id']}/letter.pdf"
+        assert job["status"] == "completed"
+        assert job["url"] == f"memory://contractor-documents/{key}"
+        assert storage.storage["contractor-documents"][key]["content"] == b"%PDF Ada"
+
+    @pytest.mark.asyncio
+    async def test_failed_generation_is_recorded(self, session_factory, storage):
+        """Test a generator error marks the job FAILED with the reason."""
+        db = session_factory()
+        result = create_document_job(db, "test_letter", {"contractor_name": "Ada", "fail": True})
+        db.commit()
+
+        job = await process_document_job(result["job_id"], session_factory=session_factory)
+
+        assert (job["status"], job["error"], job["url"]) == ("failed", "Template missing", None)
+
+    @pytest.mark.asyncio
+    async def test_job_processed_once(self, session_factory, storage):
+        """Test a job that already ran is not rendered again."""
+        db = session_factory()
+        result = create_document_job(db, "test_letter", {"contractor_name": "Ada"})
+        db.commit()
+        first = await process_document_job(result["job_id"], session_factory=session_factory)
+
+        again = await process_document_job(result["job_id"], session_factory=session_factory)
+
+        assert again == first
+        assert len(LetterGenerator.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_database_work_stays_off_the_event_loop(self, session_factory, storage):
+        """Test every session the job opens is used from a worker thread."""
+        db = session_factory()
+        result = create_document_job(db, "test_letter", {"contractor_name": "Ada"})
+        db.commit()
+        db.close()
+        threads = []
+
+        def tracking_factory():
+            threads.append(threading.current_thread())
+            return session_factory()
+
+        job = await process_document_job(result["job_id"], session_factory=tracking_factory)
+
+        assert job["status"] == "completed"
+        assert threads and threading.current_thread() not in threads
+
+    def test_roles_limited_to_their_document_types(self, session_factory):
+        """Test a role cannot queue a document type outside its allowlist."""
+        db = session_factory()
+        admin = User(id="admin-1", role=UserRole.ADMIN)
+        request = DocumentJobCreate(document_type="contract", data={})
+
+        with pytest.raises(HTTPException) as exc:
+            create_job(request, BackgroundTasks(), db=db, current_user=admin)
+
+        assert exc.value.status_code == 403
+        assert db.query(DocumentJob).count() == 0
+
+    def test_roles_derived_from_registry(self):
+        """Test admins may queue every registered type except contracts."""
+        admin = allowed_document_types(UserRole.ADMIN)
+
+        assert {"termination_letter", "experience_letter", "clearance_certificate", "contract_extension"} <= admin
+        assert "contract" not in admin
+        assert "contract" in allowed_document_types(UserRole.SUPERADMIN)
+        assert allowed_document_types(UserRole.CONTRACTOR) == set()
+
+    @pytest.mark.asyncio
+    async def test_offboarding_documents_published_to_record(self, session_factory, storage):
+        """Test finished letter jobs store their URLs and move offboarding to approval."""
+        db = session_factory()
+        _offboarding(db)
+
+        jobs = (await OffboardingService(db).generate_offboarding_documents("offboarding-1"))["jobs"]
+        for job_id in jobs.values():
+            job = await process_document_job(job_id, session_factory=session_factory)
+            assert job["status"] == "completed"
+
+        db.expire_all()
+        record = db.get(OffboardingRecord, "offboarding-1")
+        assert record.termination_letter_url.endswith(f"/{jobs['termination_letter']}/termination_letter.pdf")
+        assert record.clearance_certificate_url.endswith(f"/{jobs['clearance_certificate']}/clearance_certificate.pdf")
+        assert record.experience_letter_url
+        assert record.status == OffboardingStatus.PENDING_APPROVAL
+
+    @pytest.mark.asyncio
+    async def test_api_jobs_never_publish(self, session_factory, storage):
+        """Test a job queued through the API cannot overwrite a record's documents."""
+        db = session_factory()
+        _offboarding(db)
+        admin = User(id="admin-1", role=UserRole.ADMIN)
+        request = DocumentJobCreate(document_type="termination_letter", data={
+            "contractor": {"first_name": "Eve", "surname": "Doe"},
+            "offboarding": {"reason": "termination", "id": "offboarding-1"},
+        })
+
+        result = create_job(request, BackgroundTasks(), db=db, current_user=admin)
+        job = await process_document_job(result["job_id"], session_factory=session_factory)
+
+        db.expire_all()
+        assert job["status"] == "completed"
+        assert db.get(DocumentJob, result["job_id"]).subject_id is None
+        assert db.get(OffboardingRecord, "offboarding-1").termination_letter_url is None
+
+    @pytest.mark.asyncio
+    async def test_stale_jobs_reclaimed(self, session_factory, storage):
+        """Test jobs left RUNNING by a dead process, or never started, are rendered by the reaper."""
+        db = session_factory()
+        expired = datetime.utcnow() - timedelta(seconds=settings.document_job_lease_seconds + 1)
+        running = create_document_job(db, "test_letter", {"contractor_name": "Ada"})["job_id"]
+        lost = create_document_job(db, "test_letter", {"contractor_name": "Bob"})["job_id"]
+        db.get(DocumentJob, running).status = DocumentJobStatus.RUNNING
+        db.get(DocumentJob, running).started_at = expired
+        db.get(DocumentJob, lost).created_at = expired
+        db.commit()
+
+        assert await reclaim_stale_jobs(session_factory) == 2
+
+        db.expire_all()
+        assert {get_document_job(db, job_id)["status"] for job_id in (running, lost)} == {"completed"}
+
+    @pytest.mark.asyncio
+    async def test_live_job_is_not_reclaimed(self, session_factory, storage):
+        """Test a job whose lease is current, or that was just queued, is left alone."""
+        db = session_factory()
+        running = create_document_job(db, "test_letter", {"contractor_name": "Ada"})["job_id"]
+        create_document_job(db, "test_letter", {"contractor_name": "Bob"})
+        db.get(DocumentJob, running).status = DocumentJobStatus.RUNNING
+        db.get(DocumentJob, running).started_at = datetime.utcnow()
+        db.commit()
+
+        assert await reclaim_stale_jobs(session_factory) == 0
+        assert await process_document_job(running, session_factory=session_factory) == get_document_job(db, running)
+        assert LetterGenerator.calls == []
+
+    @pytest.mark.asyncio
+    async def test_failed_offboarding_letter_retried(self, session_factory, storage, monkeypatch):
+        """Test a failed job can be queued again and still publishes to its record."""
+        db = session_factory()
+        _offboarding(db)
+        admin = User(id="admin-1", role=UserRole.ADMIN)
+        jobs = (await OffboardingService(db).generate_offboarding_documents("offboarding-1"))["jobs"]
+        job_id = jobs["termination_letter"]
+        monkeypatch.setitem(PDFGeneratorRegistry._instances, "termination_letter", LetterGenerator())
+        db.get(DocumentJob, job_id).data = {"contractor_name": "Ada", "fail": True}
+        db.commit()
+        assert (await process_document_job(job_id, session_factory=session_factory))["status"] == "failed"
+        db.get(DocumentJob, job_id).data = {"contractor_name": "Ada"}
+        db.commit()
+
+        result = retry_job(job_id, BackgroundTasks(), db=db, current_user=admin)
+        job = await process_document_job(job_id, session_factory=session_factory)
+
+        db.expire_all()
+        assert result["status"] == "queued"
+        assert (job["status"], job["error"]) == ("completed", None)
+        assert db.get(OffboardingRecord, "offboarding-1").termination_letter_url == job["url"]
+
+    def test_only_failed_jobs_retried(self, session_factory):
+        """Test retrying a job that has not failed is refused."""
+        db = session_factory()
+        job_id = create_document_job(db, "termination_letter", {
+            "contractor": {"first_name": "Eve", "surname": "Doe"},
+            "offboarding": {"reason": "termination", "id": "offboarding-1"},
+        })["job_id"]
+        db.commit()
+
+        with pytest.raises(HTTPException) as exc:
+            retry_job(job_id, BackgroundTasks(), db=db, current_user=User(id="admin-1", role=UserRole.ADMIN))
+
+        assert exc.value.status_code == 400
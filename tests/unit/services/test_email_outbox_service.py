@@ -0,0 +1,421 @@
+"""
+Unit tests for the transactional email outbox and its dispatcher.
+
+Uses an in-memory SQLite database shared between sessions and a fake
+sender or the local stub Lambda in place of the email Lambda.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.adapters.email import StubLambdaClient
+from app.config.settings import settings
+from app.models.contractor import Contractor, ContractorStatus, OnboardingRoute
+from app.models.email_outbox import EmailOutbox, EmailOutboxStatus
+from app.models.payroll import Payroll, PayrollStatus
+from app.models.payslip import Payslip, PayslipStatus
+from app.repositories.implementations.payslip_repo import PayslipRepository
+from app.services.email_outbox_service import (
+    claim_due_emails,
+    dispatch_once,
+    get_email_status,
+    list_contractor_emails,
+    purge_finished_emails,
+)
+from app.services.payslip_service import PayslipService
+from app.utils import email
+from app.utils.email import email_outbox, send_activation_email, send_review_notification, send_signed_contract_email
+from app.utils.email_dedup import email_idempotency_key, recent_sends
+
+PDF_URL = "https://example.com/signed.pdf"
+
+
+@pytest.fixture(autouse=True)
+def outbox_enabled(monkeypatch):
+    """Queue emails in the outbox (off by default without a worker)."""
+    monkeypatch.setattr(settings, "email_outbox_enabled", True)
+
+
+@pytest.fixture(autouse=True)
+def dedup_index():
+    """Empty recent-sends index, so keys from other tests are not duplicates."""
+    recent_sends.clear()
+    yield recent_sends
+    recent_sends.clear()
+
+
+@pytest.fixture
+def stub_lambda(monkeypatch):
+    """Local stub Lambda in place of the boto3 client."""
+    stub = StubLambdaClient(latency_seconds=0.01, event_latency_seconds=0, fail_recipients={"bounce@example.com"})
+    monkeypatch.setattr(settings, "email_lambda_function_name", "test-email-lambda")
+    monkeypatch.setattr(email, "_get_lambda_client", lambda: stub)
+    return stub
+
+
+class FakeSender:
+    """Batch sender that records deliveries; fails for recipients in `failing`."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.sent = []
+
+    def __call__(self, messages, invocation_type="RequestResponse"):
+        errors = []
+        for message in messages:
+            if message["recipient"] in self.failing:
+                errors.append("Lambda unavailable")
+            else:
+                self.sent.append((message["email_type"], message["recipient"], message["data"]))
+                errors.append(None)
+        return errors
+
+
+def _queue(db, recipient="ada@example.com"):
+    with email_outbox(db):
+        assert send_signed_contract_email(recipient, "Ada Doe", PDF_URL) is True
+
+
+def _payslips(db, count):
+    """Generated payslips, one per contractor, emailed to user{i}@example.com."""
+    for i in range(count):
+        db.add(Contractor(
+            id=f"contractor-{i}", first_name="Ada", surname="Doe", gender="female",
+            nationality="UAE", phone="+971000000", email=f"user{i}@example.com", dob="1990-01-01",
+            currency="AED", status=ContractorStatus.ACTIVE, onboarding_route=OnboardingRoute.FREELANCER,
+        ))
+        db.add(Payroll(
+            id=i + 1, timesheet_id=i + 1, contractor_id=f"contractor-{i}", period="March 2026",
+            net_salary=1000.0, currency="AED", status=PayrollStatus.APPROVED,
+        ))
+        db.add(Payslip(
+            id=i + 1, payroll_id=i + 1, contractor_id=f"contractor-{i}",
+            document_number=f"PS-2026-{i:06d}", period="March 2026", access_token=f"token-{i}",
+        ))
+    db.commit()
+
+
+class TestEmailOutbox:
+    """Tests for queueing and dispatching outbox emails."""
+
+    def test_email_follows_the_transaction(self, session_factory, monkeypatch):
+        """Test queued emails are kept on commit and dropped on rollback."""
+        db = session_factory()
+
+        _queue(db, "kept@example.com")
+        db.commit()
+        _queue(db, "dropped@example.com")
+        db.rollback()
+
+        rows = session_factory().query(EmailOutbox).all()
+        assert [(r.email_type, r.recipient, r.status) for r in rows] == [
+            ("signed_contract", "kept@example.com", EmailOutboxStatus.PENDING)
+        ]
+        assert rows[0].data["pdf_url"] == PDF_URL
+
+    @pytest.mark.asyncio
+    async def test_dispatch_sends_and_marks_sent(self, session_factory):
+        """Test due emails are delivered once and marked SENT."""
+        db = session_factory()
+        for n in range(3):
+            _queue(db, f"user{n}@example.com")
+        db.commit()
+        sender = FakeSender()
+
+        counts = await dispatch_once(session_factory, send=sender)
+        again = await dispatch_once(session_factory, send=sender)
+
+        assert counts == {"sent": 3, "retry": 0, "dead": 0}
+        assert again == {"sent": 0, "retry": 0, "dead": 0}
+        assert sorted(r for _, r, _ in sender.sent) == [f"user{n}@example.com" for n in range(3)]
+        statuses = {r.status for r in session_factory().query(EmailOutbox)}
+        assert statuses == {EmailOutboxStatus.SENT}
+
+    @pytest.mark.asyncio
+    async def test_failures_back_off_then_dead_letter(self, session_factory, monkeypatch):
+        """Test a failing email is retried later and dead-lettered at the limit."""
+        monkeypatch.setattr(settings, "email_dispatch_max_attempts", 2)
+        db = session_factory()
+        _queue(db, "down@example.com")
+        db.commit()
+        sender = FakeSender(failing={"down@example.com"})
+
+        assert await dispatch_once(session_factory, send=sender) == {"sent": 0, "retry": 1, "dead": 0}
+        row = session_factory().query(EmailOutbox).one()
+        assert row.status == EmailOutboxStatus.PENDING
+        assert row.next_attempt_at > datetime.utcnow()
+        assert row.last_error == "Lambda unavailable"
+
+        # Not due yet
+        assert await dispatch_once(session_factory, send=sender) == {"sent": 0, "retry": 0, "dead": 0}
+
+        db = session_factory()
+        db.query(EmailOutbox).update({"next_attempt_at": datetime.utcnow()})
+        db.commit()
+        assert await dispatch_once(session_factory, send=sender) == {"sent": 0, "retry": 0, "dead": 1}
+        row = session_factory().query(EmailOutbox).one()
+        assert (row.status, row.attempts) == (EmailOutboxStatus.DEAD, 2)
+
+    @pytest.mark.asyncio
+    async def test_finished_rows_redacted_then_purged(self, session_factory, monkeypatch):
+        """Test SENT and DEAD rows lose their data and are deleted after the retention period."""
+        monkeypatch.setattr(settings, "email_dispatch_max_attempts", 1)
+        db = session_factory()
+        for recipient in ("ada@example.com", "down@example.com"):
+            _queue(db, recipient)
+        db.commit()
+
+        await dispatch_once(session_factory, send=FakeSender(failing={"down@example.com"}))
+        _queue(db, "later@example.com")
+        db.commit()
+
+        db = session_factory()
+        assert {r.recipient: r.data for r in db.query(EmailOutbox) if r.status != EmailOutboxStatus.PENDING} == {
+            "ada@example.com": {}, "down@example.com": {},
+        }
+        assert purge_finished_emails(db) == 0
+        later = datetime.utcnow() + timedelta(days=settings.email_outbox_retention_days, seconds=1)
+        assert purge_finished_emails(db, now=later) == 2
+        db.commit()
+        assert [r.recipient for r in session_factory().query(EmailOutbox)] == ["later@example.com"]
+
+    def test_credentials_are_never_queued(self, session_factory, stub_lambda):
+        """Test an activation email is sent inline even inside an outbox block."""
+        db = session_factory()
+        with email_outbox(db):
+            assert send_activation_email("ada@example.com", "Ada Doe", "TempPass123!") is True
+        db.commit()
+
+        assert stub_lambda.delivered_to() == ["ada@example.com"]
+        assert session_factory().query(EmailOutbox).count() == 0
+
+    def test_stale_claims_are_reclaimed(self, session_factory):
+        """Test an email left SENDING by a dead worker is claimed again after its lease."""
+        db = session_factory()
+        _queue(db)
+        db.commit()
+
+        assert len(claim_due_emails(db, 10)) == 1
+        assert claim_due_emails(db, 10) == []
+
+        later = datetime.utcnow() + timedelta(seconds=settings.email_dispatch_lease_seconds + 1)
+        assert len(claim_due_emails(db, 10, now=later)) == 1
+
+
+class TestDeliveryTracking:
+    """Tests for fire-and-forget sends and per-contractor delivery status."""
+
+    def test_fire_and_forget_does_not_wait(self, stub_lambda, monkeypatch):
+        """Test a fire-and-forget send returns before the Lambda answers."""
+        gate = threading.Event()
+        invoke = stub_lambda.invoke
+
+        def slow_invoke(**kwargs):
+            gate.wait(5)
+            return invoke(**kwargs)
+
+        monkeypatch.setattr(stub_lambda, "invoke", slow_invoke)
+
+        assert send_review_notification("admin@example.com", "Ada Doe", "contractor-1") is True
+        assert stub_lambda.delivered_to() == []
+
+        gate.set()
+        deadline = time.monotonic() + 5
+        while not stub_lambda.delivered_to() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert stub_lambda.delivered_to() == ["admin@example.com"]
+        assert stub_lambda.invocations == [("Event", 1)]
+
+    @pytest.mark.asyncio
+    async def test_statuses_per_contractor(self, session_factory, stub_lambda, monkeypatch):
+        """Test each email's message id reports queued, then sent or failed."""
+        monkeypatch.setattr(settings, "email_dispatch_max_attempts", 1)
+        db = session_factory()
+        with email_outbox(db, contractor_id="contractor-1") as outbox:
+            send_signed_contract_email("ada@example.com", "Ada Doe", PDF_URL)
+            send_signed_contract_email("bounce@example.com", "Ada Doe", PDF_URL)
+            send_review_notification("admin@example.com", "Ada Doe", "contractor-1")
+        with email_outbox(db, contractor_id="contractor-2"):
+            send_signed_contract_email("grace@example.com", "Grace Doe", PDF_URL)
+        db.commit()
+
+        assert get_email_status(db, outbox.message_ids[0])["status"] == "queued"
+
+        await dispatch_once(session_factory)
+
+        emails = {e["recipient"]: e for e in list_contractor_emails(session_factory(), "contractor-1")}
+        assert {r: e["status"] for r, e in emails.items()} == {
+            "ada@example.com": "sent", "bounce@example.com": "failed", "admin@example.com": "sent",
+        }
+        assert emails["bounce@example.com"]["error"] == "Lambda function error: Unhandled"
+        assert emails["admin@example.com"]["fire_and_forget"] is True
+        assert sorted(stub_lambda.invocations) == [("Event", 1)] + [("RequestResponse", 1)] * 3
+
+    def test_statuses_with_outbox_disabled(self, session_factory, stub_lambda, monkeypatch):
+        """Test emails sent inline are tracked under their message ids too."""
+        monkeypatch.setattr(settings, "email_outbox_enabled", False)
+        db = session_factory()
+        with email_outbox(db, contractor_id="contractor-1") as outbox:
+            assert send_signed_contract_email("ada@example.com", "Ada Doe", PDF_URL) is True
+            assert send_signed_contract_email("bounce@example.com", "Ada Doe", PDF_URL) is False
+            send_review_notification("admin@example.com", "Ada Doe", "contractor-1")
+        db.commit()
+
+        assert len(outbox.message_ids) == 3
+        emails = {e["recipient"]: e for e in list_contractor_emails(session_factory(), "contractor-1")}
+        assert {r: e["status"] for r, e in emails.items()} == {
+            "ada@example.com": "sent", "bounce@example.com": "failed", "admin@example.com": "sent",
+        }
+        assert emails["bounce@example.com"]["error"] == "Lambda function error: Unhandled"
+        assert emails["admin@example.com"]["fire_and_forget"] is True
+        assert get_email_status(db, outbox.message_ids[0])["status"] == "sent"
+        # Tracking rows carry no template data and are never dispatched
+        assert claim_due_emails(db, 10) == []
+
+    @pytest.mark.asyncio
+    async def test_stub_throughput(self, session_factory, stub_lambda, monkeypatch):
+        """Test a large outbox drains in a handful of concurrent batch invocations."""
+        monkeypatch.setattr(settings, "email_lambda_batch_enabled", True)
+        monkeypatch.setattr(settings, "email_batch_max_messages", 50)
+        db = session_factory()
+        with email_outbox(db):
+            for n in range(200):
+                send_signed_contract_email(f"user{n}@example.com", "User", PDF_URL)
+        db.commit()
+
+        counts = await dispatch_once(session_factory)
+
+        assert counts["sent"] == 200
+        assert stub_lambda.invocations == [("RequestResponse", 50)] * 4
+
+
+class TestRecordDelivery:
+    """Tests for records that are marked SENT only once their email is delivered."""
+
+    @pytest.mark.asyncio
+    async def test_payslip_sent_on_delivery(self, session_factory, monkeypatch):
+        """Test a queued payslip stays GENERATED until the dispatcher delivers it."""
+        db = session_factory()
+        _payslips(db, 1)
+
+        assert await PayslipService(PayslipRepository(db), db).send_payslip(1) is True
+
+        payslip = session_factory().get(Payslip, 1)
+        assert (payslip.status, payslip.sent_at) == (PayslipStatus.GENERATED, None)
+        row = session_factory().query(EmailOutbox).one()
+        assert (row.subject_type, row.subject_id) == ("payslip", "1")
+
+        await dispatch_once(session_factory, send=FakeSender())
+
+        payslip = session_factory().get(Payslip, 1)
+        assert payslip.status == PayslipStatus.SENT
+        assert payslip.sent_at is not None
+
+    @pytest.mark.asyncio
+    async def test_dead_letter_leaves_record_unsent(self, session_factory, monkeypatch):
+        """Test a bulk send marks only payslips whose emails were delivered."""
+        monkeypatch.setattr(settings, "email_dispatch_max_attempts", 1)
+        db = session_factory()
+        _payslips(db, 2)
+
+        results = await PayslipService(PayslipRepository(db), db).send_bulk([1, 2])
+        assert results == {"success": [1, 2], "failed": []}
+        assert {p.status for p in session_factory().query(Payslip)} == {PayslipStatus.GENERATED}
+
+        counts = await dispatch_once(session_factory, send=FakeSender(failing={"user1@example.com"}))
+
+        assert counts == {"sent": 1, "retry": 0, "dead": 1}
+        statuses = {p.id: (p.status, p.sent_at is not None) for p in session_factory().query(Payslip)}
+        assert statuses == {1: (PayslipStatus.SENT, True), 2: (PayslipStatus.GENERATED, False)}
+
+
+class TestDuplicateDelivery:
+    """Tests for emails queued twice with the same idempotency key."""
+
+    def _queue_keyed(self, db, recipient="ada@example.com"):
+        with email_outbox(db):
+            assert send_signed_contract_email(
+                recipient, "Ada Doe", PDF_URL,
+                idempotency_key=email_idempotency_key("signed_contract", recipient, "contract-1"),
+            ) is True
+
+    @pytest.mark.asyncio
+    async def test_duplicates_from_two_processes_sent_once(self, session_factory, dedup_index):
+        """Test rows sharing a key are delivered once, even when queued in separate processes."""
+        db = session_factory()
+        self._queue_keyed(db)
+        db.commit()
+        dedup_index.clear()  # A second process has its own index
+        self._queue_keyed(db)
+        db.commit()
+        sender = FakeSender()
+
+        counts = await dispatch_once(session_factory, send=sender)
+        # The second row waited for the first; it is now skipped as delivered
+        assert claim_due_emails(db, 10, now=datetime.utcnow() + timedelta(hours=1)) == []
+
+        assert counts["sent"] == 1
+        assert [r for _, r, _ in sender.sent] == ["ada@example.com"]
+        rows = session_factory().query(EmailOutbox).all()
+        assert {r.status for r in rows} == {EmailOutboxStatus.SENT}
+        assert rows[0].idempotency_key == rows[1].idempotency_key is not None
+
+    @pytest.mark.asyncio
+    async def test_duplicate_waits_for_the_email_being_sent(self, session_factory, dedup_index):
+        """Test a duplicate of an in-flight email is postponed, then skipped once it is delivered."""
+        db = session_factory()
+        self._queue_keyed(db)
+        db.commit()
+        first = claim_due_emails(db, 10)
+        dedup_index.clear()
+        self._queue_keyed(db)
+        db.commit()
+
+        assert claim_due_emails(db, 10) == []
+        duplicate = db.query(EmailOutbox).filter(EmailOutbox.id != first[0].id).one()
+        assert duplicate.status == EmailOutboxStatus.PENDING
+
+        first[0].status = EmailOutboxStatus.SENT
+        db.commit()
+        assert claim_due_emails(db, 10, now=datetime.utcnow() + timedelta(hours=1)) == []
+        db.refresh(duplicate)
+        assert (duplicate.status, duplicate.data) == (EmailOutboxStatus.SENT, {})
+
+    @pytest.mark.asyncio
+    async def test_later_resend_is_delivered(self, session_factory, dedup_index, monkeypatch):
+        """Test the same key queued after the dedup window is a new email."""
+        monkeypatch.setattr(settings, "email_dedup_ttl_seconds", 60)
+        db = session_factory()
+        self._queue_keyed(db)
+        db.commit()
+        await dispatch_once(session_factory, send=FakeSender())
+        row = db.query(EmailOutbox).one()
+        row.created_at = datetime.utcnow() - timedelta(minutes=5)
+        db.commit()
+        dedup_index.clear()
+        self._queue_keyed(db)
+        db.commit()
+        sender = FakeSender()
+
+        await dispatch_once(session_factory, send=sender)
+
+        assert len(sender.sent) == 1
+
+    @pytest.mark.asyncio
+    async def test_repeated_payslip_send_waits_for_delivery(self, session_factory):
+        """Test a skipped repeat does not mark the payslip SENT before its email is delivered."""
+        db = session_factory()
+        _payslips(db, 1)
+        service = PayslipService(PayslipRepository(db), db)
+
+        assert await service.send_payslip(1) is True
+        assert await service.send_payslip(1) is True
+
+        assert session_factory().get(Payslip, 1).status == PayslipStatus.GENERATED
+        assert session_factory().query(EmailOutbox).count() == 1
+
+        await dispatch_once(session_factory, send=FakeSender())
+
+        assert session_factory().get(Payslip, 1).status == PayslipStatus.SENT
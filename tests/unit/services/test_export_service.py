@@ -0,0 +1,79 @@
+"""
+Unit tests for streaming CSV/XLSX exports.
+
+Uses an in-memory SQLite database.
+"""
+import csv
+import io
+import zipfile
+
+import pytest
+
+from app.models.client import Client
+from app.models.payroll import Payroll, PayrollStatus
+from app.models.third_party import ThirdParty
+from app.services import export_service
+from app.services.export_service import export_rows, stream_csv, stream_xlsx
+
+
+def _seed(db):
+    db.add(ThirdParty(id="tp-1", company_name="Third Party"))
+    db.add(Client(id="client-1", company_name="ACME & Sons", third_party_id="tp-1"))
+    for i, period in enumerate(["March 2026", "January 2026", "February 2026", "December 2025"]):
+        db.add(Payroll(
+            timesheet_id=i + 1, contractor_id="contractor-1", period=period,
+            net_salary=1000.5 + i, status=PayrollStatus.APPROVED,
+        ))
+    db.commit()
+
+
+class TestExports:
+    """Tests for export_rows() and the CSV/XLSX writers."""
+
+    def test_csv_is_period_ordered_and_range_filtered(self, test_db):
+        """Test rows come in period order limited to the requested range."""
+        _seed(test_db)
+
+        headers, rows = export_rows(test_db, "payroll", "January 2026", "February 2026")
+        data = b"".join(stream_csv(headers, rows)).decode()
+        parsed = list(csv.DictReader(io.StringIO(data)))
+
+        assert [r["Period"] for r in parsed] == ["January 2026", "February 2026"]
+        assert parsed[0]["Status"] == "approved"
+        assert parsed[0]["Net Salary"] == "1001.5"
+
+    def test_csv_yields_in_chunks(self, test_db, monkeypatch):
+        """Test output is produced incrementally rather than in one block."""
+        monkeypatch.setattr(export_service, "CHUNK_ROWS", 1)
+        _seed(test_db)
+
+        headers, rows = export_rows(test_db, "payroll")
+        chunks = list(stream_csv(headers, rows))
+
+        assert len(chunks) == 5
+        assert chunks[0].startswith(b"Payroll ID,Period")
+
+    def test_xlsx_is_a_valid_workbook(self, monkeypatch):
+        """Test the streamed zip opens and holds one row per record."""
+        monkeypatch.setattr(export_service, "CHUNK_ROWS", 2)
+
+        data = b"".join(stream_xlsx(["Client", "Amount"], iter([("ACME & Sons <UAE>", 10.5), (None, 3)] * 3)))
+        with zipfile.ZipFile(io.BytesIO(data)) as workbook:
+            assert "xl/workbook.xml" in workbook.namelist()
+            sheet = workbook.read("xl/worksheets/sheet1.xml").decode()
+
+        assert sheet.count("<row>") == 7
+        assert "ACME &amp; Sons &lt;UAE&gt;" in sheet
+        assert "<v>10.5</v>" in sheet
+
+    def test_other_datasets_and_invalid_input(self, test_db):
+        """Test batch/invoice exports run and invalid input raises ValueError."""
+        for dataset in ("batches", "client-invoices"):
+            headers, rows = export_rows(test_db, dataset, to_period="March 2026")
+            assert b"".join(stream_csv(headers, rows)).count(b"\n") == 1  # header only
+
+
+        with pytest.raises(ValueError):
+            export_rows(test_db, "contractors")
+        with pytest.raises(ValueError):
+            export_rows(test_db, "batches", from_period="2026-01")
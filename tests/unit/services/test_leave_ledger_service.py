@@ -0,0 +1,141 @@
+"""
+Unit tests for the leave ledger service.
+
+Uses an in-memory SQLite database so ledger refreshes run for real.
+"""
+from app.models.contractor import Contractor, ContractorStatus, OnboardingRoute
+from app.models.leave_ledger import LeaveLedger
+from app.models.timesheet import Timesheet, TimesheetStatus
+from app.services.leave_ledger_service import (
+    refresh_for_timesheet,
+    get_leave_position,
+    get_leave_positions,
+    rebuild_ledger,
+)
+
+
+def _add_contractor(db, contractor_id="contractor-1", leave_allowance="20"):
+    db.add(Contractor(
+        id=contractor_id,
+        first_name="Jane",
+        surname="Doe",
+        gender="female",
+        nationality="UAE",
+        phone="+971000000",
+        email=f"{contractor_id}@example.com",
+        dob="1990-01-01",
+        status=ContractorStatus.ACTIVE,
+        onboarding_route=OnboardingRoute.FREELANCER,
+        cds_form_data={"leaveAllowance": leave_allowance},
+    ))
+    db.flush()
+
+
+def _add_timesheet(db, year, month, vacation_days, contractor_id="contractor-1", status=TimesheetStatus.APPROVED):
+    timesheet = Timesheet(
+        contractor_id=contractor_id,
+        month=f"{month:02d}/{year}",
+        year=year,
+        month_number=month,
+        vacation_days=vacation_days,
+        sick_days=1,
+        status=status,
+    )
+    db.add(timesheet)
+    db.flush()
+    refresh_for_timesheet(db, timesheet)
+    return timesheet
+
+
+class TestLeaveLedger:
+    """Tests for incremental leave ledger maintenance."""
+
+    def test_running_year_to_date_and_balance(self, test_db):
+        """Test each month carries the running vacation total and balance."""
+        _add_contractor(test_db)
+        _add_timesheet(test_db, 2026, 1, 2)
+        _add_timesheet(test_db, 2026, 3, 3)
+
+        position = get_leave_position(test_db, "contractor-1", 2026, 2)
+        assert position.month == 1
+        assert position.ytd_vacation_days == 2
+
+        position = get_leave_position(test_db, "contractor-1", 2026)
+        assert position.ytd_vacation_days == 5
+        assert position.sick_days == 1
+        assert position.leave_balance == 15
+
+    def test_pending_timesheets_are_ignored_until_approved(self, test_db):
+        """Test only approved timesheets count and approval updates the ledger."""
+        _add_contractor(test_db)
+        timesheet = _add_timesheet(test_db, 2026, 1, 4, status=TimesheetStatus.PENDING_APPROVAL)
+        assert get_leave_position(test_db, "contractor-1", 2026) is None
+
+        timesheet.status = TimesheetStatus.APPROVED
+        refresh_for_timesheet(test_db, timesheet)
+
+        assert get_leave_position(test_db, "contractor-1", 2026).ytd_vacation_days == 4
+
+    def test_earlier_month_change_rolls_forward(self, test_db):
+        """Test declining an earlier month updates later running totals."""
+        _add_contractor(test_db)
+        january = _add_timesheet(test_db, 2026, 1, 2)
+        _add_timesheet(test_db, 2026, 2, 3)
+
+        january.status = TimesheetStatus.DECLINED
+        refresh_for_timesheet(test_db, january)
+
+        assert test_db.query(LeaveLedger).count() == 1
+        assert get_leave_position(test_db, "contractor-1", 2026).ytd_vacation_days == 3
+
+    def test_deleting_timesheet_removes_month(self, test_db):
+        """Test deleting the only timesheet of a month removes its ledger row."""
+        _add_contractor(test_db)
+        timesheet = _add_timesheet(test_db, 2026, 1, 2)
+
+        test_db.delete(timesheet)
+        refresh_for_timesheet(test_db, timesheet)
+
+        assert test_db.query(LeaveLedger).count() == 0
+
+    def test_carry_over_capped_at_five_days(self, test_db):
+        """Test unused leave carries into next year up to five days."""
+        _add_contractor(test_db)
+        _add_timesheet(test_db, 2025, 12, 10)
+        _add_timesheet(test_db, 2026, 1, 1)
+
+        position = get_leave_position(test_db, "contractor-1", 2026)
+        assert position.carry_over_days == 5
+        assert position.leave_balance == 24
+
+    def test_bulk_positions_match_single_lookup(self, test_db):
+        """Test the bulk lookup returns each contractor's latest month."""
+        _add_contractor(test_db, "contractor-1")
+        _add_contractor(test_db, "contractor-2")
+        _add_timesheet(test_db, 2026, 1, 2, contractor_id="contractor-1")
+        _add_timesheet(test_db, 2026, 2, 1, contractor_id="contractor-1")
+        _add_timesheet(test_db, 2026, 1, 3, contractor_id="contractor-2")
+
+        positions = get_leave_positions(test_db, ["contractor-1", "contractor-2"], 2026, 2)
+
+        assert positions["contractor-1"].ytd_vacation_days == 3
+        assert positions["contractor-2"].ytd_vacation_days == 3
+
+    def test_rebuild_matches_incremental(self, test_db):
+        """Test a full rebuild reproduces the incrementally maintained rows."""
+        _add_contractor(test_db)
+        _add_timesheet(test_db, 2025, 11, 4)
+        _add_timesheet(test_db, 2026, 1, 2)
+        _add_timesheet(test_db, 2026, 2, 3)
+        before = [
+            (r.year, r.month, r.ytd_vacation_days, r.carry_over_days, r.leave_balance)
+            for r in test_db.query(LeaveLedger).order_by(LeaveLedger.year, LeaveLedger.month)
+        ]
+
+        assert rebuild_ledger(test_db) == 3
+
+        after = [
+            (r.year, r.month, r.ytd_vacation_days, r.carry_over_days, r.leave_balance)
+            for r in test_db.query(LeaveLedger).order_by(LeaveLedger.year, LeaveLedger.month)
+        ]
+        assert after == before
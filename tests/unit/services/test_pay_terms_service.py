@@ -0,0 +1,194 @@
+"""
+Unit tests for persisted contractor pay-terms snapshots.
+
+Uses an in-memory SQLite database so the flush listener runs for real.
+"""
+import pytest
+
+from app.models.client import Client
+from app.models.third_party import ThirdParty
+from app.models.contractor import Contractor, ContractorStatus, OnboardingRoute
+from app.models.contractor_pay_terms import ContractorPayTerms
+from app.models.payroll import Payroll, RateType
+from app.models.timesheet import Timesheet, TimesheetStatus
+from app.routes.payroll import auto_calculate_payroll
+from app.services.pay_terms_service import (
+    get_pay_terms,
+    get_pay_terms_bulk,
+    to_pay_info,
+    snapshot,
+)
+from app.utils.contractor_data_extractor import ContractorDataExtractor
+
+
+def _add_contractor(db, contractor_id="contractor-1", cds=None):
+    db.add(ThirdParty(id="tp-1", company_name="Third Party")) if not db.get(ThirdParty, "tp-1") else None
+    db.add(Client(id="client-1", company_name="ACME", third_party_id="tp-1")) if not db.get(Client, "client-1") else None
+    contractor = Contractor(
+        id=contractor_id,
+        first_name="Jane",
+        surname="Doe",
+        gender="female",
+        nationality="UAE",
+        phone="+971000000",
+        email=f"{contractor_id}@example.com",
+        dob="1990-01-01",
+        currency="AED",
+        status=ContractorStatus.ACTIVE,
+        onboarding_route=OnboardingRoute.FREELANCER,
+        client_id="client-1",
+        cds_form_data=cds if cds is not None else {"rateType": "monthly", "grossSalary": "12000"},
+        costing_sheet_data={"eosb": "250", "managementFee": "300"},
+    )
+    db.add(contractor)
+    db.commit()
+    return contractor
+
+
+def _terms(db, contractor_id="contractor-1"):
+    return db.query(ContractorPayTerms).filter(ContractorPayTerms.contractor_id == contractor_id).one()
+
+
+class TestPayTerms:
+    """Tests for the pay-terms snapshot lifecycle."""
+
+    def test_snapshot_created_on_insert_matches_extractor(self, test_db):
+        """Test a new contractor gets terms equal to the extractor output."""
+        contractor = _add_contractor(test_db)
+
+        terms = _terms(test_db)
+
+        assert to_pay_info(terms) == ContractorDataExtractor(contractor).extract_pay_info()
+        assert terms.version == 1
+
+    def test_cds_change_refreshes_and_bumps_version(self, test_db):
+        """Test replacing the CDS form updates the stored rate."""
+        contractor = _add_contractor(test_db)
+
+        contractor.cds_form_data = {"rateType": "daily", "dayRate": "650"}
+        test_db.commit()
+
+        terms = _terms(test_db)
+        assert terms.rate_type == RateType.DAILY.value
+        assert terms.day_rate == 650
+        assert terms.version == 2
+
+    def test_deal_terms_change_refreshes(self, test_db):
+        """Test a change on the deal-terms child row refreshes the snapshot."""
+        contractor = _add_contractor(test_db, cds={"rateType": "monthly"})
+
+        contractor.gross_salary = "15000"
+        test_db.commit()
+
+        assert _terms(test_db).monthly_rate == 15000
+
+    def test_unrelated_change_keeps_version(self, test_db):
+        """Test edits that do not change pay terms leave the version alone."""
+        contractor = _add_contractor(test_db)
+
+        contractor.phone = "+971111111"
+        test_db.commit()
+
+        assert _terms(test_db).version == 1
+
+    def test_client_rename_updates_client_name(self, test_db):
+        """Test renaming a client updates its contractors' snapshots."""
+        _add_contractor(test_db)
+
+        test_db.get(Client, "client-1").company_name = "ACME Holdings"
+        test_db.commit()
+        test_db.expire_all()
+
+        assert _terms(test_db).client_name == "ACME Holdings"
+
+    def test_third_party_rename_refreshes(self, test_db):
+        """Test renaming a third party updates the name its contractors fall back to."""
+        contractor = _add_contractor(test_db)
+        contractor.third_party_id = "tp-1"
+        test_db.commit()
+        assert _terms(test_db).third_party_name == "Third Party"
+
+        test_db.get(ThirdParty, "tp-1").company_name = "Third Party Ltd"
+        test_db.commit()
+        test_db.expire_all()
+
+        assert _terms(test_db).third_party_name == "Third Party Ltd"
+
+    def test_invalid_rate_type_is_stored_and_raised_on_read(self, test_db):
+        """Test extraction failures are kept on the row and raised by to_pay_info."""
+        _add_contractor(test_db, cds={"rateType": "weekly"})
+
+        terms = _terms(test_db)
+        assert terms.error
+
+        with pytest.raises(ValueError):
+            to_pay_info(terms)
+
+    def test_missing_snapshot_built_on_read(self, test_db):
+        """Test contractors without a row get one built on first lookup."""
+        contractor = _add_contractor(test_db)
+        test_db.query(ContractorPayTerms).delete()
+        test_db.commit()
+
+        assert get_pay_terms(test_db, contractor).monthly_rate == 12000
+        assert set(get_pay_terms_bulk(test_db, ["contractor-1"])) == {"contractor-1"}
+
+    def test_read_only_lookup_persists_nothing(self, test_db):
+        """Test persist=False builds missing terms without touching the session."""
+        _add_contractor(test_db)
+        test_db.query(ContractorPayTerms).delete()
+        test_db.commit()
+
+        terms = get_pay_terms_bulk(test_db, ["contractor-1"], persist=False)
+
+        assert terms["contractor-1"].monthly_rate == 12000
+        assert not test_db.new
+        test_db.commit()
+        assert test_db.query(ContractorPayTerms).count() == 0
+
+    def test_calculation_reads_the_snapshot(self, test_db):
+        """Test the route calculator uses the snapshot's direct-field-first rates."""
+        contractor = _add_contractor(test_db)
+        contractor.gross_salary = "9000"  # Takes priority over CDS grossSalary (12000)
+        test_db.add(Timesheet(
+            contractor_id=contractor.id, month="January 2026", year=2026, month_number=1,
+            work_days=20, status=TimesheetStatus.APPROVED,
+        ))
+        test_db.commit()
+
+        payroll = test_db.get(Payroll, auto_calculate_payroll(test_db.query(Timesheet).one().id, test_db))
+
+        assert payroll.monthly_rate == _terms(test_db).monthly_rate == 9000
+        assert payroll.pay_terms == snapshot(_terms(test_db))
+
+    def test_blank_cds_values_fall_back_to_fields(self, test_db):
+        """Test blank or unparseable CDS values are skipped instead of failing extraction."""
+        contractor = _add_contractor(test_db, cds={
+            "rateType": "", "grossSalary": "", "dayRate": "n/a", "leaveAllowance": " ",
+        })
+        contractor.rate_type = "monthly"
+        contractor.gross_salary = "10000"
+        test_db.add(Timesheet(
+            contractor_id=contractor.id, month="January 2026", year=2026, month_number=1,
+            work_days=20, status=TimesheetStatus.APPROVED,
+        ))
+        test_db.commit()
+
+        terms = _terms(test_db)
+        assert terms.error is None
+        assert terms.monthly_rate == 10000
+        assert terms.day_rate is None
+        assert terms.leave_allowance == 30
+
+        payroll_id = auto_calculate_payroll(test_db.query(Timesheet).one().id, test_db)
+        assert test_db.get(Payroll, payroll_id).monthly_rate == 10000
+
+    def test_snapshot_includes_version(self, test_db):
+        """Test the payroll copy of the terms records the version used."""
+        _add_contractor(test_db)
+
+        data = snapshot(_terms(test_db))
+
+        assert data["version"] == 1
+        assert data["monthly_rate"] == 12000
+        assert "error" not in data
@@ -0,0 +1,212 @@
+"""
+Unit tests for incrementally maintained payroll batch totals.
+
+Uses an in-memory SQLite database.
+"""
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+
+from app.models.client import Client
+from app.models.contractor import Contractor, ContractorStatus, OnboardingRoute
+from app.config import settings
+from app.models.payroll import Payroll, PayrollStatus
+from app.models.payroll_batch import PayrollBatch, BatchStatus
+from app.models.third_party import ThirdParty
+from app.services.payroll_batch_service import (
+    assign_payroll_to_batch,
+    assign_payrolls_to_batches,
+    adjust_payroll_in_batch,
+    approve_all_payrolls_in_batch,
+    generate_payslips_for_batch,
+    mark_paid,
+    remove_payroll_from_batch,
+    recalculate_batch_aggregates,
+    _transition_statement,
+)
+from app.services.payroll_stats_service import count_payrolls_by_status, get_status_counts
+
+
+def _seed(db, count=3):
+    """One client with `count` freelancers, each with an unbatched March 2026 payroll."""
+    db.add(ThirdParty(id="tp-1", company_name="Third Party"))
+    db.add(Client(id="client-1", company_name="ACME", third_party_id="tp-1"))
+    payrolls, contractors = [], {}
+    for i in range(count):
+        contractor = Contractor(
+            id=f"contractor-{i}", first_name=f"Name{i}", surname="Doe", gender="male",
+            nationality="UAE", phone="+971000000", email=f"c{i}@example.com", dob="1990-01-01",
+            currency="AED", status=ContractorStatus.ACTIVE,
+            onboarding_route=OnboardingRoute.FREELANCER, client_id="client-1",
+        )
+        payroll = Payroll(
+            timesheet_id=i + 1, contractor_id=contractor.id, period="March 2026",
+            net_salary=1000.0 * (i + 1), total_payable=1100.0 * (i + 1),
+            vat_rate=0.1, currency="AED",
+        )
+        db.add_all([contractor, payroll])
+        contractors[contractor.id] = contractor
+        payrolls.append(payroll)
+    db.commit()
+    return payrolls, contractors
+
+
+def _totals(batch):
+    return batch.contractor_count, batch.total_net_salary, batch.total_payable
+
+
+class TestBatchTotals:
+    """Tests for delta-maintained batch totals."""
+
+    def test_bulk_and_single_assign_add_each_payroll_once(self, test_db):
+        """Test assigning adds amounts and re-assigning is a no-op."""
+        payrolls, contractors = _seed(test_db)
+
+        assign_payrolls_to_batches(test_db, payrolls[:2], contractors)
+        batch_id = assign_payroll_to_batch(test_db, payrolls[2].id)
+        assign_payroll_to_batch(test_db, payrolls[2].id)
+        test_db.commit()
+
+        batch = test_db.get(PayrollBatch, batch_id)
+        assert _totals(batch) == (3, 6000.0, 6600.0)
+        assert recalculate_batch_aggregates(test_db) == []
+
+    def test_adjust_and_remove_apply_deltas(self, test_db):
+        """Test an adjustment moves totals by the difference and removal subtracts."""
+        payrolls, contractors = _seed(test_db)
+        assign_payrolls_to_batches(test_db, payrolls, contractors)
+        batch = test_db.query(PayrollBatch).one()
+
+        result = adjust_payroll_in_batch(
+            test_db, batch.id, payrolls[0].id, {"net_salary": 1500.0}, "corrected", "admin",
+        )
+        assert result["success"]
+        assert batch.total_net_salary == 6500.0
+        assert batch.total_payable == pytest.approx(payrolls[1].total_payable + payrolls[2].total_payable + payrolls[0].total_payable)
+
+        remove_payroll_from_batch(test_db, payrolls[1])
+        test_db.delete(payrolls[1])
+        test_db.commit()
+
+        assert batch.contractor_count == 2
+        assert recalculate_batch_aggregates(test_db) == []
+
+    def test_interleaved_deltas_are_not_lost(self, test_db, session_factory):
+        """Test two sessions that loaded the same batch both land their deltas."""
+        payrolls, contractors = _seed(test_db)
+        batch_id = assign_payroll_to_batch(test_db, payrolls[0].id)
+        test_db.commit()
+
+        # Both sessions hold the batch as it was before either delta
+        first, second = session_factory(), session_factory()
+        first_batch, second_batch = first.get(PayrollBatch, batch_id), second.get(PayrollBatch, batch_id)
+        assign_payroll_to_batch(first, payrolls[1].id)
+        assign_payroll_to_batch(second, payrolls[2].id)
+        first.commit()
+        second.commit()
+
+        assert _totals(first_batch) == _totals(second_batch) == (3, 6000.0, 6600.0)
+
+    def test_consistency_check_rebuilds_drifted_totals(self, test_db):
+        """Test the grouped SUM rebuild reports and fixes stale totals."""
+        payrolls, contractors = _seed(test_db)
+        assign_payrolls_to_batches(test_db, payrolls, contractors)
+        batch = test_db.query(PayrollBatch).one()
+        batch.contractor_count = 99
+        batch.total_net_salary = 0
+        test_db.commit()
+
+        corrected = recalculate_batch_aggregates(test_db)
+
+        assert [c["batch_id"] for c in corrected] == [batch.id]
+        assert corrected[0]["actual"]["contractor_count"] == 3
+        assert _totals(batch) == (3, 6000.0, 6600.0)
+        assert recalculate_batch_aggregates(test_db, batch.id) == []
+
+
+class TestBulkTransitions:
+    """Tests for set-based batch status transitions."""
+
+    @pytest.fixture(autouse=True)
+    def counters_on(self, monkeypatch):
+        monkeypatch.setattr(settings, "payroll_status_counters", True)
+
+    def _batch(self, db, count=3):
+        payrolls, contractors = _seed(db, count)
+        assign_payrolls_to_batches(db, payrolls, contractors)
+        db.commit()
+        get_status_counts(db)  # build the cached counters
+        return payrolls, db.query(PayrollBatch).one()
+
+    def test_approve_all_only_moves_calculated(self, test_db):
+        """Test approve-all skips non-calculated payrolls and advances the batch."""
+        payrolls, batch = self._batch(test_db)
+        payrolls[0].status = PayrollStatus.MISMATCH_3RD_PARTY
+        test_db.commit()
+
+        result = approve_all_payrolls_in_batch(test_db, batch.id)
+        test_db.commit()
+
+        assert result["approved_count"] == 2
+        assert result["batch_status"] == BatchStatus.PARTIALLY_APPROVED.value
+        assert payrolls[1].status == PayrollStatus.APPROVED and payrolls[1].approved_at
+        assert payrolls[0].status == PayrollStatus.MISMATCH_3RD_PARTY
+        assert get_status_counts(test_db) == count_payrolls_by_status(test_db)
+        assert "error" in approve_all_payrolls_in_batch(test_db, batch.id)
+
+    def test_mark_paid_and_payslips_move_approved(self, test_db):
+        """Test both approved statuses become paid with a paid_at stamp."""
+        payrolls, batch = self._batch(test_db)
+        payrolls[0].status = PayrollStatus.APPROVED_ADJUSTED
+        payrolls[1].status = PayrollStatus.APPROVED
+        batch.status = BatchStatus.READY_FOR_PAYMENT
+        test_db.commit()
+
+        assert mark_paid(test_db, batch.id, "REF-1", "admin") == {"success": True}
+        test_db.commit()
+
+        assert [p.status for p in payrolls] == [PayrollStatus.PAID, PayrollStatus.PAID, PayrollStatus.CALCULATED]
+        assert payrolls[0].paid_at == batch.paid_at
+        assert get_status_counts(test_db) == count_payrolls_by_status(test_db)
+
+    def test_generate_payslips_returns_all_batch_payrolls(self, test_db):
+        """Test direct-route payslip generation pays approved payrolls."""
+        payrolls, batch = self._batch(test_db, count=2)
+        payrolls[0].status = PayrollStatus.APPROVED
+        batch.status = BatchStatus.SUBMIT_FOR_INVOICE
+        test_db.commit()
+
+        result = generate_payslips_for_batch(test_db, batch.id)
+        test_db.commit()
+
+        assert sorted(result["payroll_ids"]) == sorted(p.id for p in payrolls)
+        assert payrolls[0].status == PayrollStatus.PAID
+        assert batch.status == BatchStatus.PAYSLIPS_GENERATED
+        assert get_status_counts(test_db) == count_payrolls_by_status(test_db)
+
+    def test_transition_is_one_update_returning_old_status(self):
+        """Test Postgres gets a single UPDATE that locks, moves and returns the old status."""
+        sql = str(_transition_statement(
+            7, (PayrollStatus.APPROVED, PayrollStatus.APPROVED_ADJUSTED), PayrollStatus.PAID, {},
+        ).compile(dialect=postgresql.dialect()))
+
+        assert sql.count("UPDATE payrolls") == 1
+        assert 'WITH "old" AS' in sql and "FOR UPDATE" in sql
+        assert "payrolls.status IN" in sql
+        assert sql.endswith('RETURNING payrolls.id, "old".old_status')
+
+    def test_counter_deltas_apply_in_one_statement(self, test_db, db_engine):
+        """Test a transition from several statuses adjusts the counters with one UPDATE."""
+        payrolls, batch = self._batch(test_db)
+        payrolls[0].status = PayrollStatus.APPROVED_ADJUSTED
+        payrolls[1].status = PayrollStatus.APPROVED
+        batch.status = BatchStatus.READY_FOR_PAYMENT
+        test_db.commit()
+
+        statements = []
+        event.listen(db_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        mark_paid(test_db, batch.id, "REF-1", "admin")
+
+        assert sum("UPDATE payroll_status_counts" in sql for sql in statements) == 1
+        test_db.commit()
+        assert get_status_counts(test_db) == count_payrolls_by_status(test_db)
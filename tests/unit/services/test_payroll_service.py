@@ -0,0 +1,241 @@
+"""
+Unit tests for PayrollService period runs.
+
+Uses an in-memory SQLite database so bulk queries run for real.
+"""
+import pytest
+from datetime import date
+
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from app.models.client import Client
+from app.models.third_party import ThirdParty
+from app.models.contractor import Contractor, ContractorStatus, OnboardingRoute
+from app.models.timesheet import Timesheet, TimesheetStatus
+from app.models.expense import Expense, ExpenseStatus, ExpenseCategory
+from app.models.payroll import Payroll
+from app.utils.pagination import keyset_page
+from app.models.payroll_batch import PayrollBatch
+from app.repositories.implementations.payroll_repo import PayrollRepository
+from app.services.payroll_service import PayrollService
+from app.services.leave_ledger_service import rebuild_ledger
+
+
+def _seed_period(db, count=4):
+    """Create one client and `count` freelancers with approved January 2026 timesheets."""
+    db.add(ThirdParty(id="tp-1", company_name="Third Party"))
+    db.add(Client(id="client-1", company_name="ACME", third_party_id="tp-1"))
+    for i in range(count):
+        contractor_id = f"contractor-{i}"
+        db.add(Contractor(
+            id=contractor_id,
+            first_name=f"Name{i}",
+            surname="Doe",
+            gender="male",
+            nationality="UAE",
+            phone="+971000000",
+            email=f"contractor{i}@example.com",
+            dob="1990-01-01",
+            currency="AED",
+            status=ContractorStatus.ACTIVE,
+            onboarding_route=OnboardingRoute.FREELANCER,
+            client_id="client-1",
+            cds_form_data={
+                "rateType": "monthly" if i % 2 == 0 else "daily",
+                "grossSalary": "10000",
+                "dayRate": "500",
+            },
+            costing_sheet_data={"eosb": "100"},
+        ))
+        db.add(Timesheet(
+            contractor_id=contractor_id,
+            month="January 2026",
+            year=2026,
+            month_number=1,
+            work_days=20,
+            vacation_days=2,
+            status=TimesheetStatus.APPROVED,
+        ))
+        db.add(Expense(
+            contractor_id=contractor_id,
+            date=date(2026, 1, 10),
+            month="January 2026",
+            category=ExpenseCategory.TRAVEL,
+            description="Taxi",
+            amount=50,
+            status=ExpenseStatus.APPROVED,
+        ))
+    db.flush()
+    rebuild_ledger(db)
+    db.commit()
+
+
+class TestRunPayrollForPeriod:
+    """Tests for PayrollService.run_payroll_for_period()."""
+
+    def test_run_creates_payrolls_and_batch(self, test_db):
+        """Test every approved timesheet gets a payroll assigned to one batch."""
+        _seed_period(test_db)
+        service = PayrollService(PayrollRepository(test_db), test_db)
+
+        result = service.run_payroll_for_period("January 2026")
+
+        assert result["calculated"] == 4
+        assert result["failed"] == []
+        assert len(result["batch_ids"]) == 1
+
+        batch = test_db.query(PayrollBatch).one()
+        assert batch.contractor_count == 4
+        assert all(p.batch_id == batch.id for p in test_db.query(Payroll).all())
+
+    def test_run_reports_failures_without_aborting(self, test_db):
+        """Test a misconfigured contractor is reported and the rest still run."""
+        _seed_period(test_db)
+        test_db.get(Contractor, "contractor-1").cds_form_data = {"rateType": "daily"}
+        test_db.commit()
+        service = PayrollService(PayrollRepository(test_db), test_db)
+
+        result = service.run_payroll_for_period("January 2026")
+
+        assert result["calculated"] == 3
+        assert [f["contractor_id"] for f in result["failed"]] == ["contractor-1"]
+
+    @pytest.mark.asyncio
+    async def test_run_matches_single_calculation(self, test_db):
+        """Test bulk results equal the per-timesheet calculate_payroll path."""
+        _seed_period(test_db, count=2)
+        service = PayrollService(PayrollRepository(test_db), test_db)
+        service.run_payroll_for_period("January 2026")
+        bulk = {p.contractor_id: p for p in test_db.query(Payroll).all()}
+
+        for p in list(bulk.values()):
+            test_db.delete(p)
+        test_db.commit()
+
+        for ts in test_db.query(Timesheet).all():
+            single = await service.calculate_payroll(ts.id, {})
+            assert single.net_salary == bulk[ts.contractor_id].net_salary
+            assert single.total_payable == bulk[ts.contractor_id].total_payable
+            assert single.total_leave_taken == bulk[ts.contractor_id].total_leave_taken
+            assert single.expenses_reimbursement == bulk[ts.contractor_id].expenses_reimbursement
+
+    def test_run_skips_timesheets_with_payroll(self, test_db):
+        """Test a second run for the same period calculates nothing."""
+        _seed_period(test_db, count=2)
+        service = PayrollService(PayrollRepository(test_db), test_db)
+        service.run_payroll_for_period("January 2026")
+
+        result = service.run_payroll_for_period("January 2026")
+
+        assert result["calculated"] == 0
+
+    def test_run_rejects_invalid_period(self, test_db):
+        """Test an unparseable period raises ValueError."""
+        service = PayrollService(PayrollRepository(test_db), test_db)
+
+        with pytest.raises(ValueError):
+            service.run_payroll_for_period("2026-01")
+
+
+class TestPayrollListing:
+    """Tests for PayrollService.get_all_payroll_records() keyset pages."""
+
+    def _run(self, db, count=5):
+        _seed_period(db, count=count)
+        service = PayrollService(PayrollRepository(db), db)
+        service.run_payroll_for_period("January 2026")
+        return service
+
+    def test_pages_cover_all_rows_once_in_order(self, test_db):
+        """Test walking the cursor returns every payroll newest first, ties broken by id."""
+        service = self._run(test_db)
+        payrolls = test_db.query(Payroll).all()
+        same_time = payrolls[0].created_at
+        for p in payrolls[:3]:
+            p.created_at = same_time
+        test_db.commit()
+
+        seen, cursor = [], None
+        while True:
+            page = service.get_all_payroll_records(cursor=cursor, limit=2)
+            seen.extend(row.id for row in page["rows"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        expected = [p.id for p in sorted(payrolls, key=lambda p: (p.created_at, p.id), reverse=True)]
+        assert seen == expected
+
+    def test_undated_rows_page_last(self, test_db):
+        """Test rows without created_at follow the dated ones instead of breaking the cursor."""
+        service = self._run(test_db)
+        payrolls = test_db.query(Payroll).order_by(Payroll.id).all()
+        for p in payrolls[1:4]:
+            p.created_at = None
+        test_db.commit()
+
+        seen, cursor = [], None
+        while True:
+            page = service.get_all_payroll_records(cursor=cursor, limit=2)
+            seen.extend(row.id for row in page["rows"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        dated = sorted((p for p in payrolls if p.created_at), key=lambda p: (p.created_at, p.id), reverse=True)
+        assert seen == [p.id for p in dated] + [p.id for p in reversed(payrolls[1:4])]
+
+    def test_pages_read_index_ranges_without_or(self, test_db, db_engine):
+        """Test dated and undated rows are separate ranges of a DESC NULLS LAST index."""
+        ddl = {
+            str(CreateIndex(i).compile(dialect=postgresql.dialect()))
+            for i in Payroll.__table__.indexes if i.name == "ix_payrolls_created_at_id"
+        }
+        assert "CREATE INDEX ix_payrolls_created_at_id ON payrolls (created_at DESC NULLS LAST, id DESC)" in ddl
+
+        self._run(test_db)
+        statements = []
+        event.listen(db_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        rows, cursor = keyset_page(test_db.query(Payroll), Payroll.created_at, Payroll.id, None, 2)
+        keyset_page(test_db.query(Payroll), Payroll.created_at, Payroll.id, cursor, 2)
+
+        assert statements and not any(" OR " in sql for sql in statements)
+
+    def test_filters_and_slim_columns(self, test_db):
+        """Test server-side filters and joined names on the slim rows."""
+        service = self._run(test_db, count=3)
+        batch = test_db.query(PayrollBatch).one()
+
+        page = service.get_all_payroll_records(client_id="client-1", route="freelancer", batch_id=batch.id, period="January 2026")
+        assert len(page["rows"]) == 3
+        assert page["rows"][0].client_name == "ACME"
+        assert page["rows"][0].contractor_email.endswith("@example.com")
+
+        assert (service.get_all_payroll_records(status_filter="paid"))["rows"] == []
+        assert (service.get_all_payroll_records(period="February 2026"))["rows"] == []
+        assert (service.get_all_payroll_records(client_id="other"))["rows"] == []
+
+    def test_route_keeps_the_unpaged_shape(self, test_db):
+        """Test the list route still returns every record and total without paging parameters."""
+        from app.routes.payroll import get_all_payroll_records
+
+        self._run(test_db, count=3)
+
+        response = get_all_payroll_records(limit=None, db=test_db)
+        assert len(response["payrolls"]) == response["total"] == response["count"] == 3
+        assert response["next_cursor"] is None
+        assert response["calculated"] == 3
+
+        first = get_all_payroll_records(limit=2, db=test_db)
+        assert (first["total"], first["count"]) == (3, 2)
+        rest = get_all_payroll_records(cursor=first["next_cursor"], limit=2, db=test_db)
+        assert (rest["total"], rest["count"], rest["next_cursor"]) == (3, 1, None)
+
+    def test_rejects_malformed_cursor(self, test_db):
+        """Test a garbage cursor raises ValueError."""
+        service = PayrollService(PayrollRepository(test_db), test_db)
+
+        with pytest.raises(ValueError):
+            service.get_all_payroll_records(cursor="not-a-cursor")
@@ -0,0 +1,215 @@
+"""
+Unit tests for payroll status counts.
+
+Uses an in-memory SQLite database so the flush listener runs for real.
+"""
+import pytest
+from sqlalchemy import event, inspect
+
+from app.config import settings
+from app.services import payroll_stats_service
+from app.models.payroll import Payroll, PayrollStatus
+from app.models.payroll_status_count import PayrollStatusCount
+from app.models.timesheet import Timesheet, TimesheetStatus
+from app.services.payroll_stats_service import (
+    count_payrolls_by_status,
+    get_status_counts,
+    get_payroll_stats,
+    rebuild_status_counts,
+    reconcile_status_counts,
+    apply_status_deltas,
+)
+
+
+@pytest.fixture
+def counters_on(monkeypatch, test_db):
+    """Counters enabled and built, as on the first read after turning them on."""
+    monkeypatch.setattr(payroll_stats_service, "_counters_rebuilt", False)
+    monkeypatch.setattr(settings, "payroll_status_counters", True)
+    get_status_counts(test_db)
+
+
+def _timesheet(db, ts_id, status=TimesheetStatus.APPROVED):
+    db.add(Timesheet(
+        id=ts_id, contractor_id="contractor-1", month="March 2026",
+        year=2026, month_number=3, status=status,
+    ))
+
+
+def _payroll(db, ts_id, status=None, batch_id=None):
+    _timesheet(db, ts_id)
+    payroll = Payroll(timesheet_id=ts_id, contractor_id="contractor-1", period="March 2026", batch_id=batch_id)
+    if status:
+        payroll.status = status
+    db.add(payroll)
+    return payroll
+
+
+def _cached(db):
+    return {row.status: row.count for row in db.query(PayrollStatusCount).all()}
+
+
+class TestGroupedCounts:
+    """Tests for the grouped aggregate path."""
+
+    def test_counts_every_status_with_zero_fill(self, test_db):
+        """Test one grouped query returns all statuses."""
+        _payroll(test_db, 1)
+        _payroll(test_db, 2, PayrollStatus.APPROVED, batch_id=7)
+        _payroll(test_db, 3, PayrollStatus.APPROVED, batch_id=7)
+        _payroll(test_db, 4, PayrollStatus.PAID)
+        test_db.commit()
+
+        counts = count_payrolls_by_status(test_db)
+
+        assert counts["calculated"] == 1
+        assert counts["approved"] == 2
+        assert counts["paid"] == 1
+        assert counts["approved_adjusted"] == 0
+        assert count_payrolls_by_status(test_db, batch_id=7)["approved"] == 2
+        assert sum(count_payrolls_by_status(test_db, batch_id=7).values()) == 2
+
+    def test_stats_include_ready_timesheets(self, test_db):
+        """Test approved timesheets without payroll are counted as ready."""
+        _payroll(test_db, 1, PayrollStatus.PAID)
+        _timesheet(test_db, 2)
+        _timesheet(test_db, 3)
+        _timesheet(test_db, 4, TimesheetStatus.PENDING_APPROVAL)
+        test_db.commit()
+
+        stats = get_payroll_stats(test_db)
+
+        assert stats["ready"] == 2
+        assert stats["paid"] == 1
+        assert stats["calculated"] == 0
+
+
+class TestCachedCounters:
+    """Tests for the optional payroll_status_counts table."""
+
+    def test_disabled_counters_are_not_maintained(self, test_db):
+        """Test payroll flushes issue no counter statements while the setting is off."""
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = test_db.get_bind()
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            payroll = _payroll(test_db, 1)
+            test_db.commit()
+            payroll.status = PayrollStatus.APPROVED
+            test_db.commit()
+            test_db.delete(payroll)
+            test_db.commit()
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert statements
+        assert not any("payroll_status_counts" in statement for statement in statements)
+        assert _cached(test_db) == {}
+
+    def test_insert_status_change_and_delete(self, test_db, counters_on):
+        """Test counters follow payroll changes in the same transaction."""
+        first = _payroll(test_db, 1)
+        _payroll(test_db, 2)
+        test_db.commit()
+        assert _cached(test_db)[PayrollStatus.CALCULATED] == 2
+
+        first.status = PayrollStatus.APPROVED
+        test_db.commit()
+        assert _cached(test_db)[PayrollStatus.CALCULATED] == 1
+        assert _cached(test_db)[PayrollStatus.APPROVED] == 1
+
+        test_db.delete(first)
+        test_db.commit()
+        assert _cached(test_db)[PayrollStatus.APPROVED] == 0
+        assert get_status_counts(test_db) == count_payrolls_by_status(test_db)
+
+    def test_status_change_on_expired_row_loads_old_value(self, test_db, counters_on):
+        """Test a status set on an expired row records the stored status as the old value."""
+        payroll = _payroll(test_db, 1)
+        test_db.commit()
+        test_db.expire(payroll)
+
+        payroll.status = PayrollStatus.APPROVED
+
+        assert inspect(payroll).attrs.status.history.deleted == [PayrollStatus.CALCULATED]
+        test_db.commit()
+        assert _cached(test_db)[PayrollStatus.CALCULATED] == 0
+        assert _cached(test_db)[PayrollStatus.APPROVED] == 1
+
+    def test_rollback_discards_counter_changes(self, test_db, counters_on):
+        """Test counters roll back with the payroll change."""
+        _payroll(test_db, 1)
+        test_db.commit()
+
+        _payroll(test_db, 2)
+        test_db.flush()
+        test_db.rollback()
+
+        assert _cached(test_db)[PayrollStatus.CALCULATED] == 1
+
+    def test_rebuild_and_set_based_deltas(self, test_db, counters_on):
+        """Test rebuild matches the table and deltas adjust it."""
+        _payroll(test_db, 1, PayrollStatus.APPROVED)
+        _payroll(test_db, 2, PayrollStatus.APPROVED)
+        test_db.commit()
+        test_db.query(PayrollStatusCount).delete()
+        test_db.commit()
+
+        assert get_status_counts(test_db)["approved"] == 2  # rebuilt on first read
+        assert len(_cached(test_db)) == len(PayrollStatus)  # and committed
+
+        test_db.query(Payroll).update({"status": PayrollStatus.PAID}, synchronize_session=False)
+        apply_status_deltas(test_db, {PayrollStatus.APPROVED: -2, PayrollStatus.PAID: 2})
+        test_db.commit()
+
+        assert get_status_counts(test_db) == count_payrolls_by_status(test_db)
+        assert rebuild_status_counts(test_db)["paid"] == 2
+
+    def test_changes_while_disabled_rebuilt_on_enable(self, test_db, counters_on, monkeypatch):
+        """Test changes made with the counters off are not lost when they are turned back on."""
+        _payroll(test_db, 1)
+        test_db.commit()
+
+        monkeypatch.setattr(settings, "payroll_status_counters", False)
+        _payroll(test_db, 2, PayrollStatus.PAID)
+        test_db.commit()
+        assert _cached(test_db)[PayrollStatus.PAID] == 0  # left stale, not emptied
+
+        # Turning the setting on takes a restart, so the new process has not rebuilt yet
+        monkeypatch.setattr(payroll_stats_service, "_counters_rebuilt", False)
+        monkeypatch.setattr(settings, "payroll_status_counters", True)
+        counts = get_status_counts(test_db)
+
+        assert counts == count_payrolls_by_status(test_db)
+        assert counts["paid"] == 1
+        assert _cached(test_db)[PayrollStatus.PAID] == 1
+
+    def test_missing_rows_drop_deltas_until_rebuilt(self, test_db, counters_on):
+        """Test deltas against emptied counters are dropped rather than stored as partial counts."""
+        _payroll(test_db, 1)
+        test_db.commit()
+        test_db.query(PayrollStatusCount).delete()
+        test_db.commit()
+
+        _payroll(test_db, 2)
+        test_db.commit()
+
+        assert _cached(test_db) == {}
+        assert get_status_counts(test_db)["calculated"] == 2
+
+    def test_reconcile_reports_and_fixes_drift(self, test_db, counters_on):
+        """Test reconcile lists drifted statuses and rebuilds them."""
+        _payroll(test_db, 1, PayrollStatus.APPROVED)
+        test_db.commit()
+        test_db.query(PayrollStatusCount).filter(
+            PayrollStatusCount.status == PayrollStatus.APPROVED
+        ).update({"count": 5})
+        test_db.commit()
+
+        assert reconcile_status_counts(test_db) == [{"status": "approved", "stored": 5, "actual": 1}]
+        test_db.commit()
+        assert reconcile_status_counts(test_db) == []
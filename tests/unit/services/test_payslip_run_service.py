@@ -0,0 +1,195 @@
+"""
+Unit tests for background payslip runs.
+
+Uses an in-memory SQLite database shared between sessions, and a
+thread-backed PDF render service.
+"""
+import threading
+from datetime import datetime, timedelta
+from io import BytesIO
+
+import pytest
+
+from app.adapters.pdf import render_service as render_service_module
+from app.adapters.pdf.render_service import PDFRenderService
+from app.config.settings import settings
+from app.models.client import Client
+from app.models.contractor import Contractor, ContractorStatus, OnboardingRoute
+from app.models.email_outbox import EmailOutbox
+from app.models.payroll import Payroll, PayrollStatus
+from app.models.payroll_batch import PayrollBatch, BatchStatus
+from app.models.payslip_run import PayslipRun, PayslipRunItem, PayslipRunItemStatus, PayslipRunStatus
+from app.models.third_party import ThirdParty
+from app.services import payslip_run_service
+from app.services.payslip_run_service import (
+    start_payslip_run,
+    process_payslip_run,
+    get_payslip_run,
+    reclaim_stale_runs,
+)
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """Fake render/upload steps that record what they were asked to do."""
+    calls = {"uploads": []}
+    service = PDFRenderService(workers=0, timeout_seconds=5)
+    monkeypatch.setattr(render_service_module, "pdf_render_service", service)
+
+    def fake_payslip(payroll, contractor):
+        if contractor.first_name == "Broken":
+            raise ValueError("Missing bank details")
+        return BytesIO(b"%PDF payslip")
+
+    def fake_upload(buffer, filename, folder):
+        calls["uploads"].append(f"{folder}/{filename}")
+        return f"https://storage/{folder}/{filename}"
+
+    monkeypatch.setattr(payslip_run_service, "generate_payslip_pdf", fake_payslip)
+    monkeypatch.setattr(payslip_run_service, "upload_file", fake_upload)
+    monkeypatch.setattr(settings, "email_outbox_enabled", True)
+    yield calls
+    service.shutdown()
+
+
+def _seed(db, names):
+    """A Freelancer batch awaiting payslips with one approved payroll per name."""
+    db.add(ThirdParty(id="tp-1", company_name="Third Party"))
+    db.add(Client(id="client-1", company_name="ACME", third_party_id="tp-1"))
+    batch = PayrollBatch(
+        period="March 2026", client_id="client-1", onboarding_route=OnboardingRoute.FREELANCER.value,
+        status=BatchStatus.SUBMIT_FOR_INVOICE,
+    )
+    db.add(batch)
+    db.flush()
+    for i, (first_name, email) in enumerate(names):
+        contractor = Contractor(
+            id=f"contractor-{i}", first_name=first_name, surname="Doe", gender="male",
+            nationality="UAE", phone="+971000000", email=email, dob="1990-01-01",
+            currency="AED", status=ContractorStatus.ACTIVE,
+            onboarding_route=OnboardingRoute.FREELANCER, client_id="client-1",
+        )
+        db.add_all([contractor, Payroll(
+            timesheet_id=i + 1, contractor_id=contractor.id, period="March 2026",
+            net_salary=1000.0, total_payable=1100.0, currency="AED",
+            status=PayrollStatus.APPROVED, batch_id=batch.id,
+        )])
+    db.commit()
+    return batch.id
+
+
+class TestPayslipRun:
+    """Tests for starting, processing and polling a run."""
+
+    def test_start_queues_one_item_per_payroll(self, session_factory):
+        """Test the batch moves on and every payroll gets a pending item."""
+        db = session_factory()
+        batch_id = _seed(db, [("Ada", "a@example.com"), ("Bob", "b@example.com")])
+
+        result = start_payslip_run(db, batch_id)
+        db.commit()
+
+        run = get_payslip_run(db, result["run_id"])
+        assert run["status"] == "queued"
+        assert run["counts"]["pending"] == 2
+        assert db.get(PayrollBatch, batch_id).status == BatchStatus.PAYSLIPS_GENERATED
+
+    def test_start_rejects_batches_in_the_wrong_status(self, session_factory):
+        """Test service errors are passed through without creating a run."""
+        db = session_factory()
+        batch_id = _seed(db, [("Ada", "a@example.com")])
+        db.get(PayrollBatch, batch_id).status = BatchStatus.PAID
+        db.commit()
+
+        assert "error" in start_payslip_run(db, batch_id)
+        assert db.query(PayslipRunItem).count() == 0
+
+    @pytest.mark.asyncio
+    async def test_failures_are_isolated_per_payslip(self, session_factory, pipeline):
+        """Test one bad contractor does not stop the rest, whose emails are queued in the outbox."""
+        db = session_factory()
+        batch_id = _seed(db, [
+            ("Ada", "a@example.com"),
+            ("Broken", "broken@example.com"),
+            ("Bob", "b@example.com"),
+        ])
+        run_id = start_payslip_run(db, batch_id)["run_id"]
+        db.commit()
+        db.close()
+
+        summary = await process_payslip_run(run_id, session_factory=session_factory)
+
+        assert summary["status"] == "completed"
+        assert summary["counts"] == {"pending": 0, "uploaded": 0, "sent": 2, "failed": 1}
+        assert len(pipeline["uploads"]) == 2
+        queued = session_factory().query(EmailOutbox).order_by(EmailOutbox.recipient).all()
+        assert [(e.email_type, e.recipient, e.contractor_id) for e in queued] == [
+            ("payslip", "a@example.com", "contractor-0"),
+            ("payslip", "b@example.com", "contractor-2"),
+        ]
+
+        items = {i["contractor_id"]: i for i in get_payslip_run(session_factory(), run_id)["items"]}
+        assert items["contractor-0"]["status"] == "sent"
+        assert items["contractor-0"]["pdf_url"] == "https://storage/payslips/contractor-0/payslip-1.pdf"
+        assert items["contractor-1"]["error"] == "Missing bank details"
+        assert items["contractor-2"]["status"] == "sent"
+
+    @pytest.mark.asyncio
+    async def test_database_work_stays_off_the_event_loop(self, session_factory, pipeline):
+        """Test every session the run opens is used from a worker thread."""
+        db = session_factory()
+        run_id = start_payslip_run(db, _seed(db, [("Ada", "a@example.com")]))["run_id"]
+        db.commit()
+        db.close()
+        threads = []
+
+        def tracking_factory():
+            threads.append(threading.current_thread())
+            return session_factory()
+
+        await process_payslip_run(run_id, session_factory=tracking_factory)
+
+        assert threads and threading.current_thread() not in threads
+
+    @pytest.mark.asyncio
+    async def test_stale_run_resumed_without_repeating_work(self, session_factory, pipeline):
+        """Test a run left RUNNING by a dead process is reclaimed and only its unfinished items are redone."""
+        db = session_factory()
+        run_id = start_payslip_run(db, _seed(db, [
+            ("Ada", "a@example.com"), ("Bob", "b@example.com"), ("Cy", "c@example.com"),
+        ]))["run_id"]
+        db.commit()
+        # The process died after emailing Ada and storing Bob's PDF
+        expired = datetime.utcnow() - timedelta(seconds=settings.payslip_run_lease_seconds + 1)
+        run = db.get(PayslipRun, run_id)
+        run.status, run.started_at, run.claimed_at = PayslipRunStatus.RUNNING, expired, expired
+        ada, bob, _ = run.items
+        ada.status = PayslipRunItemStatus.SENT
+        bob.status, bob.pdf_url = PayslipRunItemStatus.UPLOADED, "https://storage/payslips/contractor-1/payslip-2.pdf"
+        db.commit()
+        db.close()
+
+        assert await reclaim_stale_runs(session_factory) == 1
+
+        assert pipeline["uploads"] == ["payslips/contractor-2/payslip-3.pdf"]
+        queued = sorted(e.recipient for e in session_factory().query(EmailOutbox))
+        assert queued == ["b@example.com", "c@example.com"]
+        run = get_payslip_run(session_factory(), run_id)
+        assert run["status"] == "completed"
+        assert run["counts"]["sent"] == 3
+        assert run["started_at"] == expired.isoformat()
+
+    @pytest.mark.asyncio
+    async def test_live_run_is_not_reclaimed(self, session_factory, pipeline):
+        """Test a run whose lease is current is left to the process holding it."""
+        db = session_factory()
+        run_id = start_payslip_run(db, _seed(db, [("Ada", "a@example.com")]))["run_id"]
+        run = db.get(PayslipRun, run_id)
+        run.status, run.claimed_at = PayslipRunStatus.RUNNING, datetime.utcnow()
+        db.commit()
+        db.close()
+
+        assert await reclaim_stale_runs(session_factory) == 0
+        assert "error" in await process_payslip_run(run_id, session_factory=session_factory)
+        assert pipeline["uploads"] == []
+        assert session_factory().query(EmailOutbox).count() == 0
@@ -0,0 +1,192 @@
+"""
+Unit tests for immutable signed-document artifacts.
+
+Uses an in-memory SQLite database shared between sessions, in-memory
+storage and a thread-backed PDF render service.
+"""
+import threading
+from io import BytesIO
+
+import pytest
+
+from app.adapters.pdf import render_service as render_service_module
+from app.adapters.pdf.cache import pdf_cache
+from app.adapters.pdf.render_service import PDFRenderService
+from app.adapters.storage import MemoryStorageAdapter
+from app.models.contractor import Contractor, ContractorDocument, ContractorStatus, OnboardingRoute
+from app.models.signed_document import SignedDocument, SignedDocumentStatus
+from app.models.user import User, UserRole, UserSignedContract
+from app.services import signed_document_service
+from app.services.signed_document_service import (
+    capture_signed_document,
+    render_signed_document,
+    load_signed_document,
+    latest_signed_document,
+)
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Fake generators and in-memory storage; records every render."""
+    calls = []
+    service = PDFRenderService(workers=0, timeout_seconds=5)
+    storage = MemoryStorageAdapter()
+    monkeypatch.setattr(render_service_module, "pdf_render_service", service)
+    monkeypatch.setattr(signed_document_service, "_storage", storage)
+
+    def fake_contract(data, **signatures):
+        calls.append(signatures)
+        return BytesIO(f"%PDF contract {data['first_name']} {signatures}".encode())
+
+    monkeypatch.setitem(signed_document_service.GENERATORS, "contract", fake_contract)
+    pdf_cache.clear()
+    yield calls, storage
+    pdf_cache.clear()
+    service.shutdown()
+
+
+def _seed(db):
+    db.add(User(id="user-1", name="Super Admin", email="admin@example.com", password_hash="x", role=UserRole.SUPERADMIN))
+    db.add(Contractor(
+        id="contractor-1", first_name="Ada", surname="Doe", gender="female",
+        nationality="UAE", phone="+971000000", email="ada@example.com", dob="1990-01-01",
+        currency="AED", status=ContractorStatus.SIGNED, onboarding_route=OnboardingRoute.FREELANCER,
+    ))
+    db.commit()
+
+
+def _capture(db, signature="drawn-v1"):
+    job = capture_signed_document(
+        db, "contract", "contractor-1", "counter_signed", "signed_contract_Ada_Doe.pdf",
+        ({"first_name": "Ada"},), {"superadmin_signature_data": signature},
+        contractor_id="contractor-1", title="Signed Contract - Ada Doe",
+        signed_by="Super Admin", signer_user_id="user-1",
+    )
+    db.commit()
+    return job
+
+
+class TestSignedDocuments:
+    """Tests for capturing, storing and serving artifacts."""
+
+    @pytest.mark.asyncio
+    async def test_rendered_once_stored_and_published(self, session_factory, renders):
+        """Test the artifact is checksummed, stored and linked from the contractor."""
+        calls, storage = renders
+        db = session_factory()
+        _seed(db)
+        job = _capture(db)
+
+        summary = await render_signed_document(job, session_factory=session_factory)
+
+        assert summary["status"] == "ready"
+        key = f"signed-documents/contract/contractor-1/{summary['sha256']}.pdf"
+        assert summary["url"] == f"memory://contractor-documents/{key}"
+        assert len(calls) == 1
+
+        db = session_factory()
+        assert db.get(Contractor, "contractor-1").signed_contract_url == summary["url"]
+        doc = db.query(ContractorDocument).one()
+        assert (doc.document_type, doc.name, doc.signed_by) == ("signed_contract", "Signed Contract - Ada Doe", "Super Admin")
+        assert db.query(UserSignedContract).one().contract_url == summary["url"]
+
+    @pytest.mark.asyncio
+    async def test_views_never_rerender(self, session_factory, renders):
+        """Test views serve the stored bytes even after the record or cache changes."""
+        calls, storage = renders
+        db = session_factory()
+        _seed(db)
+        summary = await render_signed_document(_capture(db), session_factory=session_factory)
+        pdf_cache.clear()
+
+        document, content = await load_signed_document(session_factory(), "contract", "contractor-1")
+
+        assert document.sha256 == summary["sha256"]
+        assert content.startswith(b"%PDF contract Ada")
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_tampered_storage_is_not_served(self, session_factory, renders):
+        """Test bytes that no longer match the checksum are refused."""
+        calls, storage = renders
+        db = session_factory()
+        _seed(db)
+        summary = await render_signed_document(_capture(db), session_factory=session_factory)
+        pdf_cache.clear()
+        key = f"signed-documents/contract/contractor-1/{summary['sha256']}.pdf"
+        storage.storage["contractor-documents"][key]["content"] = b"%PDF edited"
+
+        assert await load_signed_document(session_factory(), "contract", "contractor-1") is None
+
+    @pytest.mark.asyncio
+    async def test_newer_signing_supersedes_until_ready(self, session_factory, renders):
+        """Test a re-signed document is not served from the previous artifact."""
+        db = session_factory()
+        _seed(db)
+        await render_signed_document(_capture(db), session_factory=session_factory)
+        second = _capture(db, signature="drawn-v2")
+
+        assert latest_signed_document(db, "contract", "contractor-1") is None
+
+        await render_signed_document(second, session_factory=session_factory)
+        assert latest_signed_document(session_factory(), "contract", "contractor-1").id == second.document_id
+
+    @pytest.mark.asyncio
+    async def test_resigning_updates_the_published_rows(self, session_factory, renders):
+        """Test a later signing stage replaces the links instead of adding rows."""
+        db = session_factory()
+        _seed(db)
+        await render_signed_document(_capture(db), session_factory=session_factory)
+        second = await render_signed_document(_capture(db, signature="drawn-v2"), session_factory=session_factory)
+
+        db = session_factory()
+        assert [d.url for d in db.query(ContractorDocument).all()] == [second["url"]]
+        assert [s.contract_url for s in db.query(UserSignedContract).all()] == [second["url"]]
+
+    @pytest.mark.asyncio
+    async def test_database_work_stays_off_the_event_loop(self, session_factory, renders):
+        """Test every session the render opens is used from a worker thread."""
+        db = session_factory()
+        _seed(db)
+        job = _capture(db)
+        db.close()
+        threads = []
+
+        def tracking_factory():
+            threads.append(threading.current_thread())
+            return session_factory()
+
+        summary = await render_signed_document(job, session_factory=tracking_factory)
+
+        assert summary["status"] == "ready"
+        assert threads and threading.current_thread() not in threads
+
+    @pytest.mark.asyncio
+    async def test_render_failure_is_recorded(self, session_factory, renders, monkeypatch):
+        """Test a failed render marks the row FAILED and publishes nothing."""
+        def broken(data, **signatures):
+            raise ValueError("Bad signature image")
+
+        monkeypatch.setitem(signed_document_service.GENERATORS, "contract", broken)
+        db = session_factory()
+        _seed(db)
+        job = _capture(db)
+
+        result = await render_signed_document(job, session_factory=session_factory)
+
+        assert "error" in result
+        db = session_factory()
+        document = db.get(SignedDocument, job.document_id)
+        assert (document.status, document.error) == (SignedDocumentStatus.FAILED, "Bad signature image")
+        assert db.get(Contractor, "contractor-1").signed_contract_url is None
+
+    def test_capture_snapshots_arguments(self, session_factory):
+        """Test later edits to the source data do not change what is rendered."""
+        db = session_factory()
+        _seed(db)
+        data = {"first_name": "Ada"}
+        job = capture_signed_document(db, "contract", "contractor-1", "signed", "c.pdf", (data,))
+
+        data["first_name"] = "Changed"
+
+        assert job.args[0]["first_name"] == "Ada"
@@ -0,0 +1,206 @@
+"""
+Unit tests for email idempotency keys and the recent-sends index.
+"""
+import pytest
+
+from sqlalchemy import event
+
+from app.models.contractor import Contractor, ContractorStatus, OnboardingRoute
+from app.routes.contractors import resend_document_upload_link, send_cohf_email_endpoint, send_contract_to_contractor
+from app.schemas.contractor import COHFEmailData
+
+from app.adapters.email import StubLambdaClient
+from app.config.settings import settings
+from app.models.email_outbox import EmailOutbox
+from app.utils import email
+from app.utils.email import email_outbox, send_email_batch
+from app.utils.email_dedup import RecentSends, claim_email, email_idempotency_key, recent_sends
+
+
+@pytest.fixture(autouse=True)
+def dedup(monkeypatch):
+    """Dedup enabled with an empty index."""
+    monkeypatch.setattr(settings, "email_dedup_enabled", True)
+    recent_sends.clear()
+    yield recent_sends
+    recent_sends.clear()
+
+
+@pytest.fixture
+def stub_lambda(monkeypatch):
+    """Local stub Lambda in place of the boto3 client."""
+    stub = StubLambdaClient(latency_seconds=0, fail_recipients={"bounce@example.com"})
+    monkeypatch.setattr(settings, "email_lambda_function_name", "test-email-lambda")
+    monkeypatch.setattr(email, "_get_lambda_client", lambda: stub)
+    return stub
+
+
+def _cohf(recipient="ops@thirdparty.ae", version="v1"):
+    return email_idempotency_key("cohf", recipient, "contractor-1", version)
+
+
+class TestRecentSends:
+    """Tests for the in-memory index."""
+
+    def test_keys_identify_the_logical_email(self):
+        """Test keys ignore recipient case and change with type, entity or version."""
+        assert _cohf() == _cohf(" OPS@ThirdParty.ae")
+        assert len(_cohf()) == 16
+        assert len({
+            _cohf(),
+            _cohf(version="v2"),
+            email_idempotency_key("cohf", "ops@thirdparty.ae", "contractor-2", "v1"),
+            email_idempotency_key("document_upload", "ops@thirdparty.ae", "contractor-1", "v1"),
+        }) == 4
+
+    def test_claims_expire_after_ttl(self, monkeypatch):
+        """Test a key is a duplicate within the TTL and free again after it."""
+        now = [100.0]
+        monkeypatch.setattr("app.utils.email_dedup.time.monotonic", lambda: now[0])
+        index = RecentSends(ttl_seconds=60, max_entries=10)
+
+        assert index.claim(b"a") is True
+        assert index.claim(b"a") is False
+        now[0] += 61
+        assert index.seen(b"a") is False
+        assert index.claim(b"a") is True
+
+    def test_oldest_entries_evicted_at_capacity(self):
+        """Test the index never holds more than max_entries keys."""
+        index = RecentSends(ttl_seconds=60, max_entries=3)
+        for key in (b"a", b"b", b"c", b"d"):
+            index.claim(key)
+
+        assert len(index) == 3
+        assert index.seen(b"a") is False
+        assert index.seen(b"d") is True
+
+
+class TestDuplicateSends:
+    """Tests for skipping duplicate emails."""
+
+    def test_duplicate_skipped_without_lambda_or_db(self, stub_lambda, db_engine):
+        """Test a repeated send is skipped without invoking Lambda or querying the DB."""
+        statements = []
+        event.listen(db_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        for _ in range(2):
+            assert email._invoke_email_lambda("cohf", "ops@thirdparty.ae", {}, idempotency_key=_cohf()) is True
+
+        assert stub_lambda.delivered_to() == ["ops@thirdparty.ae"]
+        assert statements == []
+
+    def test_failed_send_releases_the_key(self, stub_lambda, monkeypatch):
+        """Test a send that fails can be retried straight away."""
+        monkeypatch.setattr(stub_lambda, "invoke", lambda **kwargs: 1 / 0)
+        assert email._invoke_email_lambda("cohf", "ops@thirdparty.ae", {}, idempotency_key=_cohf()) is False
+
+        assert recent_sends.seen(_cohf()) is False
+
+    def test_claim_follows_the_transaction(self, test_db, monkeypatch):
+        """Test a queued email's key is kept on commit and released on rollback."""
+        monkeypatch.setattr(settings, "email_outbox_enabled", True)
+        db = test_db
+
+        with email_outbox(db):
+            email._invoke_email_lambda("cohf", "ops@thirdparty.ae", {}, idempotency_key=_cohf("rolled@back.ae"))
+        db.rollback()
+        with email_outbox(db):
+            email._invoke_email_lambda("cohf", "ops@thirdparty.ae", {}, idempotency_key=_cohf())
+        db.commit()
+        with email_outbox(db):
+            email._invoke_email_lambda("cohf", "ops@thirdparty.ae", {}, idempotency_key=_cohf())
+        db.commit()
+
+        assert db.query(EmailOutbox).count() == 1
+        assert recent_sends.seen(_cohf()) is True
+        assert recent_sends.seen(_cohf("rolled@back.ae")) is False
+        assert claim_email(_cohf("rolled@back.ae")) is True
+
+    def test_key_claimed_by_the_transaction_is_its_own(self, test_db, monkeypatch):
+        """Test a route that claims a key first can still queue the email with it."""
+        monkeypatch.setattr(settings, "email_outbox_enabled", True)
+        db = test_db
+
+        assert claim_email(_cohf(), db) is True
+        with email_outbox(db):
+            assert email._invoke_email_lambda("cohf", "ops@thirdparty.ae", {}, idempotency_key=_cohf()) is True
+        db.commit()
+
+        assert db.query(EmailOutbox).one().idempotency_key == _cohf().hex()
+        assert claim_email(_cohf(), db) is False
+
+    def test_batch_skips_duplicates(self, stub_lambda):
+        """Test a batch sends each logical email once and releases failed keys."""
+        messages = [
+            {"email_type": "payslip", "recipient": r, "data": {}, "idempotency_key": email_idempotency_key("payslip", r, n)}
+            for n, r in enumerate(["ada@example.com", "bounce@example.com"])
+        ]
+
+        assert send_email_batch(messages) == [True, False]
+        assert send_email_batch(messages) == [True, False]
+
+        assert stub_lambda.delivered_to() == ["ada@example.com"]
+        assert len(stub_lambda.invocations) == 3
+
+    def test_disabled_sends_everything(self, stub_lambda, monkeypatch):
+        """Test no email is skipped with dedup turned off."""
+        monkeypatch.setattr(settings, "email_dedup_enabled", False)
+        for _ in range(2):
+            email._invoke_email_lambda("cohf", "ops@thirdparty.ae", {}, idempotency_key=_cohf())
+
+        assert stub_lambda.delivered_to() == ["ops@thirdparty.ae"] * 2
+
+
+def _contractor(db, status, route=OnboardingRoute.FREELANCER):
+    contractor = Contractor(
+        id="contractor-1", first_name="Ada", surname="Doe", gender="female", nationality="UAE",
+        phone="+971000000", email="ada@example.com", dob="1990-01-01", currency="AED",
+        status=status, onboarding_route=route,
+    )
+    db.add(contractor)
+    db.commit()
+    return contractor
+
+
+class TestRouteClaims:
+    """Tests for routes that claim a key before rotating a token, with the outbox disabled."""
+
+    @pytest.fixture(autouse=True)
+    def outbox_disabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "email_outbox_enabled", False)
+
+    @pytest.mark.asyncio
+    async def test_upload_link_resend_sends_once(self, test_db, stub_lambda):
+        """Test the resent upload link is emailed once, and a repeat keeps the token."""
+        contractor = _contractor(test_db, ContractorStatus.PENDING_DOCUMENTS)
+
+        await resend_document_upload_link(contractor.id, db=test_db, current_user=None)
+        token = contractor.document_upload_token
+        await resend_document_upload_link(contractor.id, db=test_db, current_user=None)
+
+        assert stub_lambda.invocations == [("RequestResponse", 1)]
+        assert contractor.document_upload_token == token
+
+    @pytest.mark.asyncio
+    async def test_contract_send_sends_once(self, test_db, stub_lambda):
+        """Test the contract email is sent once when the route claimed its key first."""
+        contractor = _contractor(test_db, ContractorStatus.APPROVED)
+
+        result = await send_contract_to_contractor(contractor.id, db=test_db, current_user=None)
+
+        assert result["status"] == "pending_signature"
+        assert stub_lambda.invocations == [("RequestResponse", 1)]
+        assert stub_lambda.delivered[0]["email_type"] == "contract_signing"
+
+    @pytest.mark.asyncio
+    async def test_cohf_send_sends_once(self, test_db, stub_lambda):
+        """Test the COHF email is sent once, and a repeat of the same form is skipped."""
+        contractor = _contractor(test_db, ContractorStatus.PENDING_COHF, route=OnboardingRoute.UAE)
+        data = COHFEmailData(third_party_email="ops@thirdparty.ae", cohf_data={"salary": "1000"})
+
+        await send_cohf_email_endpoint(contractor.id, data, db=test_db, current_user=None)
+        await send_cohf_email_endpoint(contractor.id, data, db=test_db, current_user=None)
+
+        assert stub_lambda.invocations == [("RequestResponse", 1)]
+        assert stub_lambda.delivered_to() == ["ops@thirdparty.ae"]
@@ -1,6 +1,7 @@
 """
 Unit tests for email utility functions.
 """
+import json
 import pytest
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
@@ -181,3 +182,103 @@ class TestEmailUtilFunctions:
             )
 
             assert result is False
+
+
+class TestEmailBatch:
+    """Tests for sending many emails per Lambda invocation."""
+
+    @pytest.fixture
+    def lambda_client(self, monkeypatch):
+        """Lambda client that rejects recipients starting with 'reject'."""
+        import io
+        from app.utils import email
+
+        monkeypatch.setattr(email.settings, "email_lambda_function_name", "test-email-lambda")
+        monkeypatch.setattr(email.settings, "email_lambda_batch_enabled", True)
+        monkeypatch.setattr(email.settings, "email_batch_max_messages", 3)
+        monkeypatch.setattr(email.settings, "email_batch_max_bytes", 1_000_000)
+        client = MagicMock()
+
+        def invoke(FunctionName, InvocationType, Payload):
+            batch = json.loads(Payload)["body"]["batch"]
+            failed = [
+                {"index": i, "error": "Address rejected"}
+                for i, m in enumerate(batch) if m["recipient"].startswith("reject")
+            ]
+            return {"StatusCode": 200, "Payload": io.BytesIO(json.dumps({"failed": failed}).encode())}
+
+        client.invoke = MagicMock(side_effect=invoke)
+        monkeypatch.setattr(email, "_get_lambda_client", lambda: client)
+        yield client
+
+    @staticmethod
+    def _messages(recipients):
+        return [{"email_type": "payslip", "recipient": r, "data": {"period": "March 2026"}} for r in recipients]
+
+    def test_pack_respects_count_and_size_limits(self):
+        """Test batches close at the message count or the byte budget."""
+        from app.utils.email import _pack_email_batches
+
+        messages = self._messages([f"user{i}@example.com" for i in range(7)])
+        assert _pack_email_batches(messages, 1_000_000, 3) == [[0, 1, 2], [3, 4, 5], [6]]
+
+        one = len(json.dumps(messages[0]).encode()) + 1
+        assert _pack_email_batches(messages[:3], one * 2, 10) == [[0, 1], [2]]
+        assert _pack_email_batches(messages[:2], 1, 10) == [[0], [1]]
+
+    def test_batch_send_uses_few_invocations(self, lambda_client):
+        """Test seven emails go out in three invocations with per-message results."""
+        from app.utils.email import send_email_batch
+
+        recipients = [f"user{i}@example.com" for i in range(6)] + ["reject@example.com"]
+        messages = self._messages(recipients)
+
+        assert send_email_batch(messages) == [True] * 6 + [False]
+        assert lambda_client.invoke.call_count == 3
+        assert messages[0]["data"]["support_email"]
+
+    def test_failed_invocation_fails_its_batch_only(self, lambda_client):
+        """Test an invocation error marks every message of that batch as failed."""
+        from app.utils.email import send_email_batch
+
+        invoke = lambda_client.invoke.side_effect
+
+        def flaky(**kwargs):
+            if b"down" in kwargs["Payload"]:
+                raise RuntimeError("Throttled")
+            return invoke(**kwargs)
+
+        lambda_client.invoke.side_effect = flaky
+        recipients = ["a@example.com", "b@example.com", "c@example.com", "down@example.com"]
+
+        assert send_email_batch(self._messages(recipients)) == [True, True, True, False]
+
+    def test_response_without_failed_list_fails_the_batch(self, lambda_client):
+        """Test a batch answer the sender cannot read counts as a failure, not a send."""
+        import io
+        from app.utils.email import send_email_batch
+
+        lambda_client.invoke.side_effect = lambda **kwargs: {"StatusCode": 200, "Payload": io.BytesIO(b'{"ok": true}')}
+
+        assert send_email_batch(self._messages(["a@example.com", "b@example.com"])) == [False, False]
+
+    def test_single_message_events_by_default(self, lambda_client, monkeypatch):
+        """Test each email is its own single-message invocation unless batching is enabled."""
+        import io
+        from app.utils import email
+        from app.utils.email import send_email_batch
+
+        monkeypatch.setattr(email.settings, "email_lambda_batch_enabled", False)
+        events = []
+
+        def invoke(FunctionName, InvocationType, Payload):
+            events.append(json.loads(Payload)["body"])
+            if events[-1]["recipient"].startswith("reject"):
+                return {"StatusCode": 200, "FunctionError": "Unhandled", "Payload": io.BytesIO(b"{}")}
+            return {"StatusCode": 200, "Payload": io.BytesIO(b"{}")}
+
+        lambda_client.invoke.side_effect = invoke
+
+        assert send_email_batch(self._messages(["a@example.com", "reject@example.com"])) == [True, False]
+        assert sorted(e["recipient"] for e in events) == ["a@example.com", "reject@example.com"]
+        assert all("batch" not in e for e in events)
@@ -56,6 +56,36 @@ class TestPayrollModel:
         for field in timestamp_fields:
             assert hasattr(Payroll, field), f"Missing field: {field}"
 
+    def test_period_sets_year_and_month_number(self):
+        """Test assigning a period fills the indexed year/month_number columns."""
+        from app.models.payroll import Payroll
+        from app.models.payroll_batch import PayrollBatch
+        from app.models.client_invoice import ClientInvoice
+
+        for model in (Payroll, PayrollBatch, ClientInvoice):
+            record = model(period="March 2026")
+            assert (record.year, record.month_number) == (2026, 3)
+
+            record.period = "not a period"
+            assert (record.year, record.month_number) == (None, None)
+
+    def test_period_filter_uses_year_and_month_number(self):
+        """Test period filters compile against the integer columns."""
+        from app.models.payroll import Payroll
+        from app.utils.period import period_filter
+
+        clause = str(period_filter(Payroll, "December 2025"))
+        assert "payrolls.year" in clause
+        assert "payrolls.month_number" in clause
+        assert "payrolls.period" in str(period_filter(Payroll, "Q4"))
+
+    def test_previous_period_wraps_year(self):
+        """Test previous period of January is December of the prior year."""
+        from app.utils.period import previous_period
+
+        assert previous_period(2026, 1) == (2025, 12)
+        assert previous_period(2026, 5) == (2026, 4)
+
 
 class TestPayrollCalculations:
     """Tests for payroll calculation logic."""
@@ -0,0 +1,100 @@
+"""
+Unit tests for range responses used to serve stored documents.
+"""
+import pytest
+from starlette.requests import Request
+
+from app.utils.range_response import parse_range, range_response
+
+CONTENT = bytes(range(100))
+
+
+def _request(**headers) -> Request:
+    raw = [(k.replace("_", "-").lower().encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+class TestParseRange:
+    """Tests for parse_range()."""
+
+    @pytest.mark.parametrize("header, expected", [
+        ("bytes=0-9", (0, 9)),
+        ("bytes=90-", (90, 99)),
+        ("bytes=-10", (90, 99)),
+        ("bytes=95-200", (95, 99)),
+        ("bytes=0-1,5-6", None),
+        ("items=0-1", None),
+    ])
+    def test_ranges(self, header, expected):
+        """Test supported forms and the ones answered with the whole file."""
+        assert parse_range(header, 100) == expected
+
+    @pytest.mark.parametrize("header", ["bytes=100-", "bytes=10-5", "bytes=-0"])
+    def test_unsatisfiable(self, header):
+        """Test ranges outside the file are rejected."""
+        with pytest.raises(ValueError):
+            parse_range(header, 100)
+
+
+class TestRangeResponse:
+    """Tests for range_response()."""
+
+    def test_full_response_is_cacheable(self):
+        """Test the whole file is sent with its checksum as ETag."""
+        response = range_response(_request(), CONTENT, "doc.pdf", etag="abc")
+
+        assert response.status_code == 200
+        assert response.body == CONTENT
+        assert response.headers["etag"] == '"abc"'
+        assert response.headers["accept-ranges"] == "bytes"
+        # Document URLs are not keyed by content, so always revalidate
+        assert response.headers["cache-control"] == "private, no-cache"
+
+    def test_immutable_only_when_requested(self):
+        """Test a checksum-keyed URL can be cached without revalidation."""
+        response = range_response(_request(), CONTENT, "doc.pdf", etag="abc", immutable=True)
+
+        assert response.headers["cache-control"] == "private, max-age=31536000, immutable"
+
+    def test_partial_content(self):
+        """Test a byte range returns 206 with Content-Range."""
+        response = range_response(_request(range="bytes=10-19"), CONTENT, "doc.pdf", etag="abc")
+
+        assert response.status_code == 206
+        assert response.body == CONTENT[10:20]
+        assert response.headers["content-range"] == "bytes 10-19/100"
+
+    def test_unsatisfiable_range(self):
+        """Test an out-of-bounds range returns 416."""
+        response = range_response(_request(range="bytes=500-"), CONTENT, "doc.pdf")
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == "bytes */100"
+
+    def test_not_modified(self):
+        """Test a matching If-None-Match returns 304 without a body."""
+        response = range_response(_request(if_none_match='"abc"'), CONTENT, "doc.pdf", etag="abc")
+
+        assert response.status_code == 304
+        assert response.body == b""
+
+    @pytest.mark.parametrize("header", ['"old", "abc"', 'W/"abc"', "*"])
+    def test_not_modified_lists_and_weak_tags(self, header):
+        """Test If-None-Match lists, weak tags and * also match."""
+        response = range_response(_request(if_none_match=header), CONTENT, "doc.pdf", etag="abc")
+
+        assert response.status_code == 304
+
+    def test_changed_document_is_sent_again(self):
+        """Test a stale ETag gets the new content."""
+        response = range_response(_request(if_none_match='"old"'), CONTENT, "doc.pdf", etag="abc")
+
+        assert response.status_code == 200
+        assert response.body == CONTENT
+
+    def test_stale_if_range_gets_whole_file(self):
+        """Test a range for another version of the file is ignored."""
+        response = range_response(_request(range="bytes=0-9", if_range='"old"'), CONTENT, "doc.pdf", etag="abc")
+
+        assert response.status_code == 200
+        assert response.body == CONTENT